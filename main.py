@@ -1,15 +1,90 @@
+import argparse
+from contextlib import nullcontext
+
 from dotenv import load_dotenv
 
 from src.graph.debate_graph import DebateGraph
+from src.graph.debate_profiles import check_budget, create_graph, profile_options
+from src.memory.agent_memory import DEFAULT_MAX_ENTRIES, open_agent_memory
+from src.models.debate_profile import DEFAULT_CONFIG, load_profiles
+from src.tools.evidence_retrieval import EvidencePolicy
+from src.utils.cancellation import CancellationToken
+from src.utils.stub_llm import StubChatModel
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a debate")
+    parser.add_argument("topic", nargs="?", default="Is AI beneficial for society?")
+    parser.add_argument("--config-profile", help="debate profile from the config file")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="profiles file")
+    parser.add_argument("--stub", action="store_true", help="use the offline stub LLM")
+    parser.add_argument("--evidence", metavar="INDEX", help="evidence index to cite")
+    parser.add_argument("--memory", metavar="DB", help="cross-debate agent memory")
+    parser.add_argument(
+        "--memory-max-entries",
+        type=int,
+        default=DEFAULT_MAX_ENTRIES,
+        metavar="N",
+        help=f"memory items kept per debater (default: {DEFAULT_MAX_ENTRIES})",
+    )
+    parser.add_argument(
+        "--deadline", type=float, metavar="SECONDS", help="stop the debate after"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="logs",
+        metavar="DIR",
+        help="write CPU and allocation profiles per node and phase (default: logs)",
+    )
+    args = parser.parse_args()
+
     load_dotenv()
-    # Initialize the DebateGraph with verbose output
-    debate_graph = DebateGraph(verbose=False)
+    llm = StubChatModel() if args.stub else None
+    evidence = EvidencePolicy(index=args.evidence) if args.evidence else None
+    if args.config_profile:
+        # Profiles are validated, and checked against their budget, up front
+        try:
+            profile = load_profiles(args.config).get(args.config_profile)
+            check_budget(profile, topic=args.topic)
+        except (OSError, KeyError, ValueError) as error:
+            message = error.args[0] if isinstance(error, KeyError) else error
+            parser.error(f"invalid debate profile: {message}")
+        options = profile_options(profile, llm=llm)
+        if evidence is not None and "evidence" in options:
+            options["evidence"] = evidence
+        if args.memory:
+            options["memory"] = open_agent_memory(args.memory, args.memory_max_entries)
+        debate_graph = create_graph(profile.variant, profile.panel_size, **options)
+        max_steps = profile.max_steps
+    else:
+        # Initialize the DebateGraph with verbose output
+        memory = (
+            open_agent_memory(args.memory, args.memory_max_entries)
+            if args.memory
+            else None
+        )
+        debate_graph = DebateGraph(
+            verbose=False, llm=llm, evidence=evidence, memory=memory
+        )
+        max_steps = 3
     print("Starting the debate...")
 
     # Run a debate on a specific topic
-    result = debate_graph.run_debate("Is AI beneficial for society?")
+    cancellation = CancellationToken(timeout=args.deadline) if args.deadline else None
+    profiling = debate_graph.profiling(args.profile) if args.profile else nullcontext()
+    with profiling as profiler:
+        result = debate_graph.run_debate(args.topic, max_steps, cancellation)
 
-    # Print the results of the debate
-    debate_graph.print_debate(result)
+        # Print the results of the debate
+        with profiler.section("print_debate") if profiler else nullcontext():
+            debate_graph.print_debate(result)
+    if "cancelled" in result:
+        print(f"Debate stopped early: {result['cancelled']}")
+    for retrieval in result.get("retrievals", []):
+        print(
+            f"evidence {retrieval['kind']} for {retrieval['speaker']} in round "
+            f"{retrieval['round']}: {len(retrieval['passages'])} passages in "
+            f"{retrieval['latency'] * 1000:.2f} ms"
+        )
+    if args.profile:
+        print(f"Profile written to {profiler.output}")
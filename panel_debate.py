@@ -0,0 +1,15 @@
+from dotenv import load_dotenv
+
+from src.graph.panel_debate_graph import PanelDebateGraph, default_panel
+
+if __name__ == "__main__":
+    load_dotenv()
+    # Initialize the PanelDebateGraph with a panel of four debaters
+    debate_graph = PanelDebateGraph(panel=default_panel(4), verbose=False)
+    print("Starting the panel debate...")
+
+    # Run a debate on a specific topic
+    result = debate_graph.run_debate("Is AI beneficial for society?", max_steps=3)
+
+    # Print the results of the debate
+    debate_graph.print_debate(result)
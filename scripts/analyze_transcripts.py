@@ -0,0 +1,69 @@
+"""
+Score novelty, repetition and rebuttal coverage of stored debates, and
+suggest a max_steps after which further rounds add little.
+
+    python -m scripts.analyze_transcripts results/ --threshold 0.3
+    python -m scripts.analyze_transcripts debates.jsonl --out turns.jsonl
+"""
+
+import argparse
+import json
+
+import numpy as np
+
+from src.graph.replay import iter_stored_debates, stored_state
+from src.utils.transcript_analytics import TranscriptAnalyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="JSON/JSONL files or directories")
+    parser.add_argument("--ngram-size", type=int, default=2)
+    parser.add_argument("--bucket-bits", type=int, default=22)
+    parser.add_argument(
+        "--threshold", type=float, default=0.3, help="novelty of a stale round"
+    )
+    parser.add_argument(
+        "--share", type=float, default=0.9, help="share of debates max_steps covers"
+    )
+    parser.add_argument("--out", help="write per-turn scores as JSON lines")
+    args = parser.parse_args()
+
+    documents, transcripts, turns_per_round = [], [], []
+    for document in iter_stored_debates(args.paths):
+        state = stored_state(document)
+        documents.append(document)
+        transcripts.append(state["messages"])
+        turns_per_round.append(len(state.get("participants") or ()) or 2)
+    if not transcripts:
+        parser.error("no stored debates found")
+
+    analyzer = TranscriptAnalyzer(args.ngram_size, args.bucket_bits)
+    scores = analyzer.score(transcripts, turns_per_round)
+    print(f"{scores.debates} debates, {len(scores)} turns")
+    print(
+        f"{'round':>5} {'turns':>7} {'novelty':>8} {'self rep':>9} "
+        f"{'boiler':>7} {'coverage':>9}"
+    )
+    for row in scores.round_summary():
+        print(
+            f"{row['round']:>5} {row['turns']:>7} {row['novelty']:>8.3f} "
+            f"{row['self_repetition']:>9.3f} {row['boilerplate']:>7.3f} "
+            f"{row['rebuttal_coverage']:>9.3f}"
+        )
+    useful = scores.useful_rounds(args.threshold)
+    played = (~np.isnan(scores.debate_round_novelty())).sum(axis=1)
+    print(
+        f"{int((useful < played).sum())} debates go stale before their last round; "
+        f"suggested max_steps: {scores.suggest_max_steps(args.threshold, args.share)}"
+    )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as file:
+            for record in scores.records():
+                record["source"] = documents[record["debate"]]["source"]
+                file.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Archive stored debates, or freshly run stub debates, in the content-addressed
+debate archive and report the deduplication ratio and the write time per
+turn; or look archived debates up by id, topic, date or variant.
+
+    python -m scripts.archive_debates results/ debates.jsonl --archive data/debates.sqlite
+    python -m scripts.archive_debates --stub 500 --variant simple strategic panel
+    python -m scripts.archive_debates --topic "Is AI beneficial for society?" --days 7
+    python -m scripts.archive_debates --get 3f2a9c --prompts
+    python -m scripts.archive_debates --gc
+
+Stored debates are archived with the prompt versions they carry under
+"prompts" (as printed by --get --prompts), and without any otherwise.
+"""  # noqa: E501
+
+import argparse
+import itertools
+import json
+import os
+import time
+
+from src.api.store import debate_result
+from src.graph.debate_profiles import create_graph
+from src.graph.replay import iter_stored_debates
+from src.memory.debate_archive import DEFAULT_ARCHIVE_DB, DebateArchive, content_hash
+from src.models.debate_request import DebateVariant
+from src.utils.stub_llm import StubChatModel
+
+TOPICS = [
+    "Is AI beneficial for society?",
+    "Should governments regulate social media?",
+    "Should college education be free?",
+    "Is nuclear power necessary to fight climate change?",
+]
+
+
+def stored_entries(paths):
+    """
+    (id, result, config, prompts, created_at) of stored debates, dated by
+    their files.
+    """
+    for document in iter_stored_debates(paths):
+        source = document.pop("source")
+        prompts = document.pop("prompts", None)
+        debate_id = document.get("id") or content_hash(source.encode())[:16]
+        created_at = os.path.getmtime(source.rsplit(":", 1)[0])
+        yield debate_id, document, None, prompts, created_at
+
+
+def stub_entries(count: int, variants: list[DebateVariant], steps: int):
+    """(id, result, config, prompts, created_at) of freshly run stub debates."""
+    graphs = {
+        variant: create_graph(variant, llm=StubChatModel()) for variant in variants
+    }
+    jobs = zip(itertools.cycle(variants), itertools.cycle(TOPICS))
+    for number, (variant, topic) in enumerate(itertools.islice(jobs, count)):
+        graph = graphs[variant]
+        state = graph.run_debate(topic, steps)
+        result = {"id": f"stub{number}", "variant": variant.value}
+        config = {"variant": variant.value, "max_steps": steps}
+        yield (
+            result["id"],
+            result | debate_result(state),
+            config,
+            graph.prompt_versions(),
+            time.time(),
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="*", help="JSON/JSONL files or directories")
+    parser.add_argument("--archive", default=DEFAULT_ARCHIVE_DB)
+    parser.add_argument("--stub", type=int, default=0, help="stub debates to archive")
+    parser.add_argument(
+        "--variant",
+        nargs="+",
+        choices=[variant.value for variant in DebateVariant],
+        default=[DebateVariant.SIMPLE.value],
+    )
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--get", help="print the archived debate with this id")
+    parser.add_argument("--prompts", action="store_true", help="with --get")
+    parser.add_argument("--topic", help="list archived debates on this topic")
+    parser.add_argument("--days", type=float, help="list debates of the last days")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument(
+        "--gc", action="store_true", help="delete blobs of replaced debates"
+    )
+    args = parser.parse_args()
+
+    archive = DebateArchive(args.archive)
+    if args.get:
+        result = archive.get(args.get, prompts=args.prompts)
+        if result is None:
+            parser.error(f"no archived debate {args.get}")
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+
+    entries = stored_entries(args.paths) if args.paths else iter(())
+    if args.stub:
+        variants = list(map(DebateVariant, args.variant))
+        entries = itertools.chain(
+            entries, stub_entries(args.stub, variants, args.steps)
+        )
+
+    debates = turns = 0
+    seconds = 0.0
+    for debate_id, result, config, prompts, created_at in entries:
+        start = time.perf_counter()
+        archive.put(
+            debate_id, result, config=config, prompts=prompts, created_at=created_at
+        )
+        seconds += time.perf_counter() - start
+        debates += 1
+        turns += len(result.get("messages", []))
+    if debates:
+        print(
+            f"archived {debates} debates, {turns} turns: "
+            f"{seconds / debates * 1000:.3f} ms/debate, "
+            f"{seconds / max(turns, 1) * 1e6:.0f} us/turn"
+        )
+    if args.gc:
+        print(f"deleted {archive.gc()} unreferenced blobs")
+
+    stats = archive.stats()
+    print(
+        f"{stats['debates']} debates, {stats['blobs']} blobs: "
+        f"{stats['document_bytes']:,} B of documents, "
+        f"{stats['unique_bytes']:,} B unique, {stats['stored_bytes']:,} B stored "
+        f"({stats['ratio']:.1f}x)"
+    )
+
+    if args.topic or args.days:
+        since = time.time() - args.days * 86400 if args.days else None
+        for entry in archive.find(topic=args.topic, since=since, limit=args.limit):
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.created_at))
+            print(
+                f"{entry.id:<20} {created}  {entry.variant or '-':<9} "
+                f"{entry.turns:>3} turns  {entry.topic}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Fill an AgentMemory with synthetic debate notes and time recall at that size,
+against exact search over the same vectors.
+
+    python -m scripts.bench_agent_memory --entries 1000000
+    python -m scripts.bench_agent_memory --entries 200000 --max-entries 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.memory.agent_memory import ARGUMENT, FEEDBACK, REBUTTAL, AgentMemory
+from src.memory.vector_index import embed_texts
+
+
+def synthetic_notes(entries: int, topics: int = 2000, seed: int = 0):
+    """
+    (topic, text) notes: each topic has its own words, and every note mixes
+    some of them with words shared by all topics.
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"term{number}" for number in range(30_000)])
+    topic_words = rng.choice(vocabulary.size, (topics, 30))
+    titles = [
+        f"Should {' '.join(vocabulary[words[:4]])} be regulated?"
+        for words in topic_words
+    ]
+    topic_of = rng.integers(topics, size=entries)
+    own = np.take_along_axis(
+        topic_words[topic_of], rng.integers(30, size=(entries, 12)), 1
+    )
+    shared = rng.integers(vocabulary.size, size=(entries, 10))
+    words = vocabulary[np.concatenate((own, shared), axis=1)]
+    return [(titles[topic], " ".join(row) + ".") for topic, row in zip(topic_of, words)]
+
+
+def percentiles(latencies: list[float]) -> str:
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return f"p50 {p50:.2f} ms, p95 {p95:.2f} ms, p99 {p99:.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--nprobe", type=int, default=16)
+    parser.add_argument(
+        "--max-entries", type=int, help="size cap, --entries by default"
+    )
+    parser.add_argument("--db", default=":memory:")
+    args = parser.parse_args()
+
+    memory = AgentMemory(
+        args.db, max_entries=args.max_entries or args.entries, nprobe=args.nprobe
+    )
+    notes = synthetic_notes(args.entries)
+    kinds = (ARGUMENT, REBUTTAL, FEEDBACK)
+    start = time.perf_counter()
+    for first in range(0, len(notes), 50_000):
+        memory.add_many(
+            ("Favor", kinds[number % 3], topic, text)
+            for number, (topic, text) in enumerate(notes[first : first + 50_000])
+        )
+    elapsed = time.perf_counter() - start
+    print(
+        f"stored {args.entries:,} notes in {elapsed:.1f}s "
+        f"({args.entries / elapsed:,.0f}/s), {memory.count('Favor'):,} kept"
+    )
+
+    rng = np.random.default_rng(1)
+    queries = [
+        f"{topic} {' '.join(text.split()[:6])}"
+        for topic, text in (
+            notes[i] for i in rng.integers(len(notes), size=args.queries)
+        )
+    ]
+    index = memory._indexes["Favor"]
+    ids, vectors = index._all()
+    query_vectors = embed_texts(queries, memory.dim)
+
+    search, exact, found = [], [], 0
+    for vector in query_vectors:
+        start = time.perf_counter()
+        approximate, _ = index.search(vector, args.k)
+        search.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        scores = vectors @ vector
+        best = ids[np.argpartition(-scores, args.k)[: args.k]]
+        exact.append(time.perf_counter() - start)
+        found += len(set(approximate.tolist()) & set(best.tolist()))
+    recall = []
+    for query in queries:
+        start = time.perf_counter()
+        memory.recall("Favor", query, args.k)
+        recall.append(time.perf_counter() - start)
+
+    print(f"ANN search:   {percentiles(search)}")
+    print(f"exact search: {percentiles(exact)}")
+    print(f"recall():     {percentiles(recall)} (embedding, ANN, SQLite, LRU update)")
+    print(
+        f"recall@{args.k} against exact search: {found / (args.k * len(queries)):.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
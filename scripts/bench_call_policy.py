@@ -0,0 +1,60 @@
+"""
+Compare debate completion rate and tail latency with and without a CallPolicy
+against a StubChatModel that injects transient errors and slow responses.
+
+    python -m scripts.bench_call_policy --debates 20
+"""
+
+import argparse
+import time
+
+from src.graph.debate_graph import DebateGraph
+from src.utils.call_policy import CallPolicy
+from src.utils.stub_llm import StubChatModel
+
+
+def run(debates: int, max_steps: int, policy) -> tuple[int, list[float], dict]:
+    llm = StubChatModel(
+        latency=0.02, error_rate=0.05, slow_rate=0.05, slow_latency=2.0, seed=7
+    )
+    fallback = StubChatModel(model_name="stub-fallback", latency=0.03)
+    graph = DebateGraph(llm=llm, call_policy=policy, fallback_llm=fallback)
+
+    completed, latencies = 0, []
+    for _ in range(debates):
+        start = time.perf_counter()
+        try:
+            graph.run_debate("Is AI beneficial for society?", max_steps=max_steps)
+            completed += 1
+        except Exception:
+            pass
+        latencies.append(time.perf_counter() - start)
+    return completed, sorted(latencies), graph.instrumentation.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--debates", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=4)
+    args = parser.parse_args()
+
+    policy = CallPolicy(
+        default_timeout=0.5, timeouts={}, hedge_min_samples=10, backoff_base=0.05
+    )
+    for name, candidate in (("no policy", None), ("call policy", policy)):
+        completed, latencies, summary = run(args.debates, args.steps, candidate)
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        events = {
+            key: sum(phase[key] for phase in summary["phases"].values())
+            for key in ("retries", "hedges", "fallbacks")
+        }
+        print(
+            f"{name:<12} completed {completed}/{args.debates}  "
+            f"debate p50 {p50:.2f}s p95 {p95:.2f}s max {latencies[-1]:.2f}s  "
+            f"{events}"
+        )
+
+
+if __name__ == "__main__":
+    main()
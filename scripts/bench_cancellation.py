@@ -0,0 +1,100 @@
+"""
+Measure how quickly cancellation and deadlines stop debates on the stub LLM:
+the time from cancelling a run to run_debate returning, and the LLM calls
+the model received beyond those admitted before the stop, which should be
+none.
+
+    python -m scripts.bench_cancellation --runs 20 --latency 0.2
+"""
+
+import argparse
+import random
+import threading
+import time
+from typing import Any
+
+import numpy as np
+from pydantic import PrivateAttr
+
+from src.graph.debate_graph import DebateGraph
+from src.graph.panel_debate_graph import PanelDebateGraph
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.utils.call_policy import CallPolicy
+from src.utils.cancellation import CancellationToken
+from src.utils.stub_llm import StubChatModel
+
+TOPIC = "Is AI beneficial for society?"
+
+
+class CountingStub(StubChatModel):
+    """Stub that counts the calls it receives."""
+
+    _calls: int = PrivateAttr(default=0)
+    _calls_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def _generate(self, *args, **kwargs):
+        with self._calls_lock:
+            self._calls += 1
+        return super()._generate(*args, **kwargs)
+
+    @property
+    def calls(self) -> int:
+        with self._calls_lock:
+            return self._calls
+
+
+def run(graph_class, llm: CountingStub, policy, runs: int, steps: int, mode: str):
+    """Stop latencies (ms), late calls, and runs that finished before the stop."""
+    graph = graph_class(llm=llm, call_policy=policy)
+    start = time.perf_counter()
+    graph.run_debate(TOPIC, steps)
+    duration = time.perf_counter() - start
+
+    rng = random.Random(0)
+    stops, late, finished = [], 0, 0
+    for _ in range(runs):
+        calls = llm.calls
+        after = rng.uniform(0.1, 0.9) * duration
+        if mode == "deadline":
+            token = CancellationToken(timeout=after)
+        else:
+            token = CancellationToken()
+            threading.Timer(after, token.cancel).start()
+        result = graph.run_debate(TOPIC, steps, token)
+        returned = time.perf_counter()
+        if "cancelled" not in result:
+            finished += 1
+            continue
+        stops.append((returned - token.cancelled_at) * 1000)
+        # Abandoned calls admitted before the stop still reach the model
+        time.sleep(0.02)
+        late += llm.calls - calls - token.calls_at_cancel
+    return duration, stops, late, finished
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds/call")
+    args = parser.parse_args()
+
+    policy = CallPolicy(default_timeout=5.0, timeouts={}, hedge=False)
+    for graph_class in (DebateGraph, StrategicDebateGraph, PanelDebateGraph):
+        for mode in ("cancel", "deadline"):
+            for name, candidate in (("no policy", None), ("call policy", policy)):
+                llm = CountingStub(latency=args.latency)
+                duration, stops, late, finished = run(
+                    graph_class, llm, candidate, args.runs, args.steps, mode
+                )
+                p50, p95, worst = np.percentile(stops, [50, 95, 100])
+                print(
+                    f"{graph_class.__name__:<21} {mode:<9} {name:<12} "
+                    f"debate {duration:5.2f}s  stop p50 {p50:5.2f} ms "
+                    f"p95 {p95:5.2f} ms max {worst:5.2f} ms  "
+                    f"calls after stop {late}  finished first {finished}"
+                )
+
+
+if __name__ == "__main__":
+    main()
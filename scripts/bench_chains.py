@@ -0,0 +1,71 @@
+"""
+Judge many finished debates on the stub LLM with the current invoke loop
+(one JudgeAgent call after another) and with the judge chain's batch and
+abatch, and compare wall time and verdicts.
+
+    python -m scripts.bench_chains --debates 500 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import time
+
+from src.agents import JudgeAgent
+from src.chains.debate_chains import ajudge_debates, judge_debates
+from src.graph.debate_graph import DebateGraph
+from src.utils.stub_llm import StubChatModel
+
+
+def finished_debates(count: int, max_steps: int) -> list[dict]:
+    """Stub debates on `count` distinct topics, ready to be judged."""
+    graph = DebateGraph(llm=StubChatModel())
+    template = graph.run_debate("Is AI beneficial for society?", max_steps)
+    # Drop the verdict, and vary the topic so every prompt is distinct
+    return [
+        template
+        | {
+            "topic": f"Is AI beneficial for society? (case {number})",
+            "messages": template["messages"][:-1],
+        }
+        for number in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--debates", type=int, default=500)
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds/call")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32])
+    args = parser.parse_args()
+
+    states = finished_debates(args.debates, args.steps)
+    llm = StubChatModel(latency=args.latency)
+
+    start = time.perf_counter()
+    judge = JudgeAgent(llm=llm)
+    baseline = [judge.judge_and_conclude(state) for state in states]
+    elapsed = time.perf_counter() - start
+    print(f"{'invoke loop':<22} {elapsed:7.2f}s  {len(states) / elapsed:7.1f}/s")
+
+    for limit in args.concurrency:
+        for name, judge_all in (
+            ("batch", lambda: judge_debates(llm, states, max_concurrency=limit)),
+            (
+                "abatch",
+                lambda: asyncio.run(ajudge_debates(llm, states, max_concurrency=limit)),
+            ),
+        ):
+            start = time.perf_counter()
+            verdicts = judge_all()
+            elapsed = time.perf_counter() - start
+            failed = sum(isinstance(verdict, Exception) for verdict in verdicts)
+            print(
+                f"{f'{name} (max {limit})':<22} {elapsed:7.2f}s  "
+                f"{len(states) / elapsed:7.1f}/s  failed {failed}  "
+                f"same verdicts as the loop: {verdicts == baseline}"
+            )
+
+
+if __name__ == "__main__":
+    main()
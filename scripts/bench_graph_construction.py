@@ -0,0 +1,63 @@
+"""
+Measure debate graph construction cost per request: compiling the topology
+for every instance versus sharing one compiled graph per variant.
+
+    python -m scripts.bench_graph_construction --requests 200
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.graph.debate_graph import DebateGraph
+from src.graph.panel_debate_graph import PanelDebateGraph
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.utils.stub_llm import StubChatModel
+
+VARIANTS = (DebateGraph, StrategicDebateGraph, PanelDebateGraph)
+
+
+def per_request(fn, requests: int) -> float:
+    start = time.perf_counter()
+    for index in range(requests):
+        fn(index)
+    return (time.perf_counter() - start) / requests * 1000
+
+
+def check_isolation(graph_class):
+    """Instances with different models share the graph but not their settings."""
+    graphs = [
+        graph_class(llm=StubChatModel(model_name=f"stub-{index}", latency=0.01))
+        for index in range(4)
+    ]
+    assert len({id(graph.app) for graph in graphs}) == 1
+    with ThreadPoolExecutor(max_workers=len(graphs)) as executor:
+        list(executor.map(lambda graph: graph.run_debate("Is AI good?", 2), graphs))
+    for index, graph in enumerate(graphs):
+        models = {record.model for record in graph.instrumentation.records}
+        assert models == {f"stub-{index}"}, models
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    llm = StubChatModel()
+    print(f"{'variant':<22} {'compile per request':>20} {'shared graph':>14}")
+    for graph_class in VARIANTS:
+        compiled = per_request(lambda _: graph_class._build_graph(), args.requests)
+        shared = per_request(
+            lambda index: graph_class(llm=llm, temperature=index % 10 / 10),
+            args.requests,
+        )
+        print(
+            f"{graph_class.__name__:<22} {compiled + shared:>17.2f} ms "
+            f"{shared:>11.3f} ms"
+        )
+        check_isolation(graph_class)
+    print("Concurrent instances with different models kept their own settings.")
+
+
+if __name__ == "__main__":
+    main()
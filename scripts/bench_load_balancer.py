@@ -0,0 +1,159 @@
+"""
+Compare throughput, latency and errors of routing modes over a pool of stub
+endpoints with different latencies and error rates, one of them down. Each
+stub serves a few calls at a time, like the concurrency quota of an API key.
+
+    python -m scripts.bench_load_balancer --calls 400 --concurrency 16
+"""
+
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+from pydantic import PrivateAttr
+
+from src.graph.debate_graph import DebateGraph
+from src.utils.load_balancer import (
+    EndpointConfig,
+    LoadBalancedChatModel,
+    LoadBalancerPolicy,
+)
+from src.utils.stub_llm import StubChatModel
+
+# (name, latency, slow_rate, error_rate)
+ENDPOINTS = (
+    ("fast", 0.02, 0.0, 0.0),
+    ("steady", 0.05, 0.0, 0.01),
+    ("tail", 0.03, 0.15, 0.0),
+    ("down", 0.01, 0.0, 1.0),
+)
+PROMPT = "Argue briefly, in at most 20 words, that AI is beneficial."
+
+
+class QuotaStub(StubChatModel):
+    """Stub endpoint that queues calls beyond `quota` concurrent ones."""
+
+    quota: int = 4
+
+    _slots: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, context: Any):
+        self._slots = threading.Semaphore(self.quota)
+
+    def _generate(self, *args, **kwargs):
+        with self._slots:
+            return super()._generate(*args, **kwargs)
+
+
+def stub_endpoints(seed: int, quota: int) -> list[StubChatModel]:
+    return [
+        QuotaStub(
+            model_name=name,
+            quota=quota,
+            latency=latency,
+            slow_rate=slow_rate,
+            slow_latency=0.5,
+            error_rate=error_rate,
+            seed=seed + number,
+        )
+        for number, (name, latency, slow_rate, error_rate) in enumerate(ENDPOINTS)
+    ]
+
+
+def run(call, calls: int, concurrency: int) -> tuple[float, list[float], Counter]:
+    """Make `calls` calls from `concurrency` threads; the served endpoint counts."""
+
+    def timed(_):
+        start = time.perf_counter()
+        try:
+            endpoint = call()
+        except Exception:
+            endpoint = "error"
+        return time.perf_counter() - start, endpoint
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(timed, range(calls)))
+    elapsed = time.perf_counter() - start
+    return (
+        elapsed,
+        [latency for latency, _ in results],
+        Counter(endpoint for _, endpoint in results),
+    )
+
+
+def report(name: str, calls: int, elapsed: float, latencies, served: Counter):
+    p50, p95 = np.percentile(np.array(latencies) * 1000, [50, 95])
+    shares = ", ".join(
+        f"{endpoint} {count / calls:.0%}"
+        for endpoint, count in sorted(served.items())
+        if endpoint != "error"
+    )
+    print(
+        f"{name:<18} {calls / elapsed:6.1f} calls/s  p50 {p50:6.1f} ms  "
+        f"p95 {p95:6.1f} ms  errors {served['error']:>3}  [{shares}]"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--quota", type=int, default=4, help="concurrent calls/key")
+    parser.add_argument("--max-outstanding", type=int, default=4)
+    parser.add_argument("--cooldown", type=float, default=1.0)
+    parser.add_argument("--debates", type=int, default=2, help="stub debates to run")
+    args = parser.parse_args()
+
+    endpoints = stub_endpoints(seed=1, quota=args.quota)
+    names = [endpoint.model_name for endpoint in endpoints]
+
+    def single_key():
+        return endpoints[0].invoke(PROMPT) and names[0]
+
+    def random_key():
+        number = random.randrange(len(endpoints))
+        return endpoints[number].invoke(PROMPT) and names[number]
+
+    report("single key", args.calls, *run(single_key, args.calls, args.concurrency))
+    report("random", args.calls, *run(random_key, args.calls, args.concurrency))
+
+    for routing in ("least_outstanding", "latency"):
+        policy = LoadBalancerPolicy(
+            endpoints=[EndpointConfig(name=name) for name in names],
+            routing=routing,
+            max_outstanding=args.max_outstanding,
+            cooldown=args.cooldown,
+        )
+        balancer = LoadBalancedChatModel(
+            endpoints=stub_endpoints(seed=1, quota=args.quota),
+            endpoint_names=names,
+            policy=policy,
+        )
+
+        def balanced():
+            return balancer.invoke(PROMPT).response_metadata["endpoint"]
+
+        report(routing, args.calls, *run(balanced, args.calls, args.concurrency))
+        opens = {stats["name"]: stats["circuit_opens"] for stats in balancer.stats()}
+        print(f"{'':<18} circuit opens {opens}")
+
+    if args.debates:
+        graph = DebateGraph(llm=balancer)
+        start = time.perf_counter()
+        for _ in range(args.debates):
+            graph.run_debate("Is AI beneficial for society?", max_steps=3)
+        print(
+            f"\n{args.debates} stub debates over the pool in "
+            f"{time.perf_counter() - start:.2f}s; endpoints "
+            f"{ {stats['name']: stats['requests'] for stats in balancer.stats()} }"
+        )
+
+
+if __name__ == "__main__":
+    main()
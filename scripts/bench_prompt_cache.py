@@ -0,0 +1,56 @@
+"""
+Measure the share of prompt tokens served from the provider prefix cache per
+debate, using the offline StubChatModel.
+
+    python -m scripts.bench_prompt_cache --steps 3 6 10
+"""
+
+import argparse
+
+from src.graph.debate_graph import DebateGraph
+from src.graph.panel_debate_graph import PanelDebateGraph
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.utils.instrumentation import Instrumentation
+from src.utils.stub_llm import StubChatModel
+
+GRAPHS = {
+    "simple": DebateGraph,
+    "strategic": StrategicDebateGraph,
+    "panel": PanelDebateGraph,
+}
+
+
+def measure(variant: str, max_steps: int, explicit_cache: bool, topic: str) -> dict:
+    llm = StubChatModel()
+    instrumentation = Instrumentation()
+    graph = GRAPHS[variant](
+        llm=llm, instrumentation=instrumentation, use_context_cache=explicit_cache
+    )
+    graph.run_debate(topic, max_steps=max_steps)
+    return instrumentation.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--steps", type=int, nargs="+", default=[3, 6, 10])
+    parser.add_argument("--topic", default="Is AI beneficial for society?")
+    args = parser.parse_args()
+
+    print(
+        f"{'variant':<10} {'steps':>5} {'explicit':>8} {'calls':>5} "
+        f"{'prompt tok':>10} {'cached tok':>10} {'ratio':>6}"
+    )
+    for variant in GRAPHS:
+        for max_steps in args.steps:
+            for explicit_cache in (False, True):
+                summary = measure(variant, max_steps, explicit_cache, args.topic)
+                print(
+                    f"{variant:<10} {max_steps:>5} {str(explicit_cache):>8} "
+                    f"{summary['calls']:>5} {summary['prompt_tokens']:>10} "
+                    f"{summary['cached_tokens']:>10} "
+                    f"{summary['cached_token_ratio']:>6.1%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
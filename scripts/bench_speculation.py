@@ -0,0 +1,88 @@
+"""
+Compare strong-model-only debates with draft-model speculation on a fixed
+topic set: debate latency, draft acceptance rate and cost. Both models are
+stubs whose latency grows with the number of generated tokens.
+
+    python -m scripts.bench_speculation --steps 4
+"""
+
+import argparse
+import statistics
+import time
+
+from src.graph.debate_graph import DebateGraph
+from src.utils.speculation import SpeculationPolicy
+from src.utils.stub_llm import StubChatModel
+
+TOPICS = (
+    "Is AI beneficial for society?",
+    "Should remote work become the default for office jobs?",
+    "Should nuclear power be expanded to fight climate change?",
+    "Should social media platforms be liable for user content?",
+    "Should university education be free?",
+)
+
+# (input, output) USD per million tokens
+PRICES = {"strong": (1.25, 5.0), "draft": (0.075, 0.3)}
+
+
+def run(steps: int, speculation) -> dict:
+    strong = StubChatModel(
+        model_name="strong",
+        latency=0.05,
+        latency_per_token=0.001,
+        review_accept_rate=0.7,
+    )
+    draft = StubChatModel(
+        model_name="draft", latency=0.02, latency_per_token=0.0002, seed=1
+    )
+    graph = DebateGraph(llm=strong, speculation=speculation, draft_llm=draft)
+
+    latencies = []
+    for topic in TOPICS:
+        start = time.perf_counter()
+        graph.run_debate(topic, max_steps=steps)
+        latencies.append(time.perf_counter() - start)
+
+    summary = graph.instrumentation.summary()
+    argument = summary["phases"].get("argument", {})
+    return {
+        "latency": statistics.mean(latencies),
+        "cost": graph.instrumentation.cost(PRICES),
+        "strong_output_tokens": sum(
+            r.completion_tokens
+            for r in graph.instrumentation.records
+            if r.model == "strong"
+        ),
+        "drafts": argument.get("drafts", 0),
+        "accepted": argument.get("drafts_accepted", 0),
+        "edited": argument.get("drafts_edited", 0),
+        "rejected": argument.get("drafts_rejected", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--steps", type=int, default=4)
+    args = parser.parse_args()
+
+    baseline = run(args.steps, None)
+    speculative = run(args.steps, SpeculationPolicy())
+
+    print(f"{len(TOPICS)} topics, {args.steps} rounds, speculation on arguments")
+    print(f"{'mode':<12} {'debate s':>9} {'cost $':>9} {'strong out tok':>15}")
+    for name, stats in (("strong only", baseline), ("speculative", speculative)):
+        print(
+            f"{name:<12} {stats['latency']:>9.2f} {stats['cost']:>9.4f} "
+            f"{stats['strong_output_tokens']:>15}"
+        )
+    drafts = speculative["drafts"]
+    print(
+        f"drafts: {drafts}, accepted {speculative['accepted'] / drafts:.0%}, "
+        f"edited {speculative['edited'] / drafts:.0%}, "
+        f"rejected {speculative['rejected'] / drafts:.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Time TranscriptAnalyzer on a synthetic archive, against Python set
+comparisons of every turn pair on a sample of it.
+
+    python -m scripts.bench_transcript_analytics --debates 10000 --rounds 5
+"""
+
+import argparse
+import math
+import re
+import time
+
+import numpy as np
+
+from src.utils.transcript_analytics import TranscriptAnalyzer
+
+_WORD = re.compile(r"\w+")
+
+
+def synthetic_archive(
+    debates: int, rounds: int, words: int, seed: int = 0
+) -> list[list[tuple[str, str]]]:
+    """
+    Two-party debates that repeat more of their earlier turns every round,
+    over a Zipf-like vocabulary of 20k words.
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"w{number}" for number in range(20_000)])
+    weights = 1 / np.arange(1, vocabulary.size + 1)
+    turns = 2 * rounds
+    drawn = rng.choice(
+        vocabulary.size, (debates, turns, words), p=weights / weights.sum()
+    )
+    archive = []
+    for debate in drawn:
+        transcript = []
+        for index, turn in enumerate(debate):
+            # Later rounds copy longer runs of earlier turns
+            copied = words * (index // 2) // rounds
+            if index and copied:
+                source = debate[rng.integers(index)]
+                start = rng.integers(words - copied + 1)
+                turn[:copied] = source[start : start + copied]
+            speaker = "Favor" if index % 2 == 0 else "Against"
+            transcript.append((speaker, " ".join(vocabulary[turn]) + "."))
+        archive.append(transcript)
+    return archive
+
+
+def pairwise_scores(archive: list[list[tuple[str, str]]]) -> list[tuple]:
+    """
+    The naive version: novelty, self-repetition and rebuttal coverage with
+    Python sets, comparing each turn with every earlier turn of its debate.
+    """
+    tokenized = [
+        [(speaker, _WORD.findall(message.lower())) for speaker, message in transcript]
+        for transcript in archive
+    ]
+    frequency: dict[str, int] = {}
+    for transcript in tokenized:
+        for _, words in transcript:
+            for word in set(words):
+                frequency[word] = frequency.get(word, 0) + 1
+    turns = sum(len(transcript) for transcript in tokenized)
+    idf = {word: math.log(turns / count) for word, count in frequency.items()}
+
+    scores = []
+    for transcript in tokenized:
+        grams = [set(zip(words, words[1:])) for _, words in transcript]
+        for index, (speaker, words) in enumerate(transcript):
+            current, seen, own = grams[index], set(), set()
+            for (earlier_speaker, _), earlier in zip(transcript, grams[:index]):
+                seen |= current & earlier
+                if earlier_speaker == speaker:
+                    own |= current & earlier
+            size = len(current) or math.nan
+            coverage = math.nan
+            if index and transcript[index - 1][0] != speaker:
+                previous = set(transcript[index - 1][1])
+                weight = sum(idf[word] for word in previous)
+                taken_up = sum(idf[word] for word in previous & set(words))
+                coverage = taken_up / weight if weight else math.nan
+            scores.append((1 - len(seen) / size, len(own) / size, coverage))
+    return scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--debates", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--words", type=int, default=150)
+    parser.add_argument("--sample", type=int, default=500, help="debates for the loop")
+    args = parser.parse_args()
+
+    archive = synthetic_archive(args.debates, args.rounds, args.words)
+    turns = sum(len(transcript) for transcript in archive)
+    analyzer = TranscriptAnalyzer()
+
+    start = time.perf_counter()
+    scores = analyzer.score(archive)
+    elapsed = time.perf_counter() - start
+    print(
+        f"vectorized: {turns} turns in {elapsed:.2f}s ({turns / elapsed:,.0f} turns/s)"
+    )
+
+    sample = archive[: args.sample]
+    sample_turns = sum(len(transcript) for transcript in sample)
+    start = time.perf_counter()
+    naive = pairwise_scores(sample)
+    loop = time.perf_counter() - start
+    print(
+        f"set loop:   {sample_turns} turns in {loop:.2f}s "
+        f"({sample_turns / loop:,.0f} turns/s), without boilerplate"
+    )
+    # Scored on its own, the sample gets the same IDF weights as the loop
+    check = analyzer.score(sample)
+    vectorized = zip(check.novelty, check.self_repetition, check.rebuttal_coverage)
+    difference = max(
+        abs(expected - actual)
+        for row, other in zip(naive, vectorized)
+        for expected, actual in zip(row, other)
+        if not math.isnan(expected)
+    )
+    print(f"max score difference on the sample (hash collisions): {difference:.4f}")
+
+    print(f"{'round':>5} {'novelty':>8} {'self rep':>9} {'boiler':>7} {'coverage':>9}")
+    for row in scores.round_summary():
+        print(
+            f"{row['round']:>5} {row['novelty']:>8.3f} {row['self_repetition']:>9.3f} "
+            f"{row['boilerplate']:>7.3f} {row['rebuttal_coverage']:>9.3f}"
+        )
+    print(f"suggested max_steps: {scores.suggest_max_steps()}")
+
+
+if __name__ == "__main__":
+    main()
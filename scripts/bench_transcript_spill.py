@@ -0,0 +1,74 @@
+"""
+Peak RSS of long debates with the full transcript kept in state versus
+older turns spilled to disk, using the stub LLM. Every run happens in a fresh
+process so that peak RSS is measured per debate.
+
+    python -m scripts.bench_transcript_spill --steps 50 100 200 400
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+
+from src.graph.debate_graph import DebateGraph
+from src.memory.transcript_log import TranscriptSpill
+from src.utils.stub_llm import StubChatModel
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(steps: int, words: int, spill: bool) -> dict:
+    # A one-prompt cache window keeps the stub's own memory out of the numbers.
+    llm = StubChatModel(default_words=words, cache_window=1)
+    with tempfile.TemporaryDirectory() as directory:
+        graph = DebateGraph(
+            llm=llm,
+            spill=TranscriptSpill(directory=directory) if spill else None,
+        )
+        baseline = peak_rss_mb()
+        result = graph.run_debate("Is AI beneficial for society?", max_steps=steps)
+        transcript = result.get("transcript", result["messages"])
+        return {
+            "turns": len(transcript),
+            "state_turns": len(result["messages"]),
+            "peak_rss_growth_mb": peak_rss_mb() - baseline,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--steps", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--words", type=int, default=300)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--spill", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.steps[0], args.words, args.spill)))
+        return
+
+    print(f"{'steps':>6} {'mode':>6} {'turns':>6} {'in state':>9} {'peak RSS +':>11}")
+    for steps in args.steps:
+        for spill in (False, True):
+            command = [
+                sys.executable, "-m", "scripts.bench_transcript_spill", "--child",
+                "--steps", str(steps), "--words", str(args.words),
+            ] + (["--spill"] if spill else [])  # fmt: skip
+            output = subprocess.run(
+                command, capture_output=True, text=True, check=True
+            ).stdout
+            stats = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{steps:>6} {'spill' if spill else 'full':>6} {stats['turns']:>6} "
+                f"{stats['state_turns']:>9} {stats['peak_rss_growth_mb']:>8.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
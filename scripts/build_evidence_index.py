@@ -0,0 +1,50 @@
+"""
+Build the BM25 evidence index that debaters cite from, out of text, Markdown
+and JSONL documents, and optionally time a few queries against it.
+
+    python -m scripts.build_evidence_index corpus/ --out data/evidence
+    python -m scripts.build_evidence_index corpus/ --query "Is AI beneficial?"
+"""
+
+import argparse
+import os
+import time
+
+from src.tools.evidence_retrieval import (
+    DEFAULT_EVIDENCE_INDEX,
+    EvidenceIndex,
+    build_evidence_index,
+    iter_corpus,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="files or directories")
+    parser.add_argument("--out", default=DEFAULT_EVIDENCE_INDEX)
+    parser.add_argument("--passage-words", type=int, default=120)
+    parser.add_argument("--query", action="append", default=[], help="test query")
+    parser.add_argument("-k", type=int, default=5, help="passages per query")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    passages = build_evidence_index(
+        iter_corpus(args.paths), args.out, passage_words=args.passage_words
+    )
+    size = sum(entry.stat().st_size for entry in os.scandir(args.out))
+    print(
+        f"{passages} passages in {time.perf_counter() - start:.2f}s, "
+        f"{size / 2**20:.1f} MiB in {args.out}"
+    )
+
+    index = EvidenceIndex(args.out)
+    for query in args.query:
+        start = time.perf_counter()
+        hits = index.search(query, args.k)
+        print(f"\n{query!r}: {(time.perf_counter() - start) * 1000:.2f} ms")
+        for hit in hits:
+            print(f"  {hit.score:6.2f}  {hit.source}: {hit.text[:100]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Render a debate graph locally as Mermaid, Graphviz DOT or ASCII, optionally
+with a performance overlay from traced stub runs: each node annotated with
+its runs, time, share of the debate and LLM calls.
+
+    python -m scripts.draw_graph --variant strategic --format dot --out graph.dot
+    python -m scripts.draw_graph --variant panel --format ascii --overlay 5 --latency 0.05
+"""  # noqa: E501
+
+import argparse
+
+from src.graph.debate_profiles import create_graph
+from src.graph.graph_diagram import DiagramFormat, node_stats_from_spans
+from src.models.debate_request import DebateVariant
+from src.utils.stub_llm import StubChatModel
+from src.utils.tracing import InMemorySpanExporter, Tracer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--variant",
+        choices=[variant.value for variant in DebateVariant],
+        default=DebateVariant.SIMPLE.value,
+    )
+    parser.add_argument(
+        "--format",
+        choices=[fmt.value for fmt in DiagramFormat],
+        default=DiagramFormat.MERMAID.value,
+    )
+    parser.add_argument(
+        "--overlay", type=int, default=0, help="stub debates to annotate nodes from"
+    )
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds/call")
+    parser.add_argument("--out", help="file to write instead of stdout")
+    args = parser.parse_args()
+
+    exporter = InMemorySpanExporter()
+    graph = create_graph(
+        DebateVariant(args.variant),
+        llm=StubChatModel(latency=args.latency),
+        tracer=Tracer(exporter),
+    )
+    for _ in range(args.overlay):
+        graph.run_debate("Is AI beneficial for society?", args.steps)
+    overlay = node_stats_from_spans(exporter.spans) if args.overlay else None
+
+    diagram = graph.get_graph(args.format, overlay)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as file:
+            file.write(diagram)
+    else:
+        print(diagram, end="")
+
+
+if __name__ == "__main__":
+    main()
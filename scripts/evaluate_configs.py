@@ -0,0 +1,238 @@
+"""
+Evaluate a grid of debate configurations over a fixed topic set: latency,
+tokens, cost and reference-judge quality, with the Pareto frontier as a
+table and an SVG plot. Calls are cached across configurations (and across
+reruns with --cache), so the grid does not pay for shared prefixes twice.
+
+    python -m scripts.evaluate_configs --topics topics.txt --rounds 2 3 5 --cache data/responses.sqlite
+    python -m scripts.evaluate_configs --stub --count 8 --rounds 2 3 4 --max-output-tokens 128 1024
+"""  # noqa: E501
+
+import argparse
+import json
+from dataclasses import asdict
+from html import escape
+
+from langchain_google_genai.chat_models import ChatGoogleGenerativeAI
+
+from src.graph.debate_planner import MODEL_PROFILES
+from src.graph.evaluation import (
+    DEFAULT_REFERENCE_MODEL,
+    ConfigResult,
+    EvaluationConfig,
+    EvaluationHarness,
+    config_grid,
+    pareto_front,
+)
+from src.memory.response_cache import ResponseCache
+from src.models.debate_request import DebateVariant
+from src.utils.stub_llm import StubChatModel
+
+STUB_TOPICS = [
+    "Is AI beneficial for society?",
+    "Should governments regulate social media?",
+    "Should college education be free?",
+    "Is nuclear power necessary to fight climate change?",
+    "Should remote work become the norm?",
+    "Do cryptocurrencies do more harm than good?",
+    "Should voting be mandatory?",
+    "Is space exploration worth its cost?",
+]
+
+
+def stub_llm_factory(time_scale: float):
+    """Stub models with the latency profile of the model they stand in for."""
+
+    def create(config: EvaluationConfig) -> StubChatModel:
+        profile = MODEL_PROFILES[config.model_name]
+        return StubChatModel(
+            model_name=config.model_name,
+            max_output_tokens=config.max_output_tokens,
+            latency=profile.call_overhead * time_scale,
+            latency_per_token=time_scale / profile.completion_tokens_per_second,
+        )
+
+    return create
+
+
+def print_table(results: list[ConfigResult]):
+    print(
+        f"{'configuration':<38} {'quality':>7} {'latency s':>9} {'tokens':>8} "
+        f"{'cost $':>9} {'cached':>7} {'failed':>6}  pareto"
+    )
+    for result in sorted(results, key=lambda r: (r.cost or 0, r.latency or 0)):
+        calls = sum(d.calls for d in result.debates)
+        cached = sum(d.cached_calls for d in result.debates)
+
+        def number(value, spec):
+            return "-" if value is None else format(value, spec)
+
+        print(
+            f"{result.config.label:<38} {number(result.quality, '7.2f')} "
+            f"{number(result.latency, '9.2f')} {number(result.tokens, '8.0f')} "
+            f"{number(result.cost, '9.5f')} {cached / max(1, calls):>7.0%} "
+            f"{result.failed:>6}  {'*' if result.pareto else ''}"
+        )
+
+
+def pareto_svg(results: list[ConfigResult], path: str):
+    """Quality against latency; frontier points are filled and labelled."""
+    points = [r for r in results if r.quality is not None]
+    if not points:
+        return
+    width, height, margin = 720, 480, 60
+    low_x, high_x = min(r.latency for r in points), max(r.latency for r in points)
+    low_y, high_y = min(r.quality for r in points), max(r.quality for r in points)
+    high_cost = max(r.cost for r in points) or 1.0
+
+    def x(value: float) -> float:
+        return margin + (value - low_x) / ((high_x - low_x) or 1) * (width - 2 * margin)
+
+    def y(value: float) -> float:
+        return (
+            height
+            - margin
+            - (value - low_y) / ((high_y - low_y) or 1) * (height - 2 * margin)
+        )
+
+    shapes = [
+        f'<rect width="{width}" height="{height}" fill="white"/>',
+        f'<line x1="{margin}" y1="{height - margin}" x2="{width - margin}" '
+        f'y2="{height - margin}" stroke="black"/>',
+        f'<line x1="{margin}" y1="{margin}" x2="{margin}" y2="{height - margin}" '
+        'stroke="black"/>',
+        f'<text x="{width / 2}" y="{height - 20}" text-anchor="middle">'
+        f"latency per debate (s), {low_x:.1f} to {high_x:.1f}</text>",
+        f'<text x="20" y="{height / 2}" text-anchor="middle" '
+        f'transform="rotate(-90 20 {height / 2})">'
+        f"reference quality, {low_y:.2f} to {high_y:.2f}</text>",
+        f'<text x="{width / 2}" y="30" text-anchor="middle">'
+        "Debate configurations (area: cost; filled: Pareto frontier)</text>",
+    ]
+    for result in sorted(points, key=lambda r: r.pareto):
+        radius = 4 + 10 * (result.cost / high_cost) ** 0.5
+        fill = "#1f77b4" if result.pareto else "none"
+        shapes.append(
+            f'<circle cx="{x(result.latency):.1f}" cy="{y(result.quality):.1f}" '
+            f'r="{radius:.1f}" fill="{fill}" stroke="#1f77b4">'
+            f"<title>{escape(result.config.label)}: ${result.cost:.5f}</title>"
+            "</circle>"
+        )
+        if result.pareto:
+            shapes.append(
+                f'<text x="{x(result.latency) + radius + 3:.1f}" '
+                f'y="{y(result.quality) + 4:.1f}" font-size="11">'
+                f"{escape(result.config.label)}</text>"
+            )
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+            f'height="{height}" font-family="sans-serif" font-size="13">\n'
+            + "\n".join(shapes)
+            + "\n</svg>\n"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("topics", nargs="*", help="debate topics")
+    parser.add_argument("--topics", dest="topics_file", help="file, one topic per line")
+    parser.add_argument(
+        "--variant",
+        nargs="+",
+        choices=[DebateVariant.SIMPLE.value, DebateVariant.STRATEGIC.value],
+        default=[DebateVariant.SIMPLE.value, DebateVariant.STRATEGIC.value],
+    )
+    parser.add_argument("--rounds", type=int, nargs="+", default=[3])
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        choices=sorted(MODEL_PROFILES),
+        default=["gemini-1.5-flash"],
+    )
+    parser.add_argument("--max-output-tokens", type=int, nargs="+", default=[1024])
+    parser.add_argument("--reference-model", default=DEFAULT_REFERENCE_MODEL)
+    parser.add_argument("--cache", help="SQLite response cache, kept across runs")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--plot", default="pareto.svg", help="SVG plot path")
+    parser.add_argument("--out", help="JSON lines of every evaluated debate")
+    parser.add_argument("--stub", action="store_true", help="offline stub models")
+    parser.add_argument("--count", type=int, help="stub topics to use")
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.01,
+        help="stub latency as a fraction of the modelled model's",
+    )
+    args = parser.parse_args()
+
+    topics = list(args.topics)
+    if args.topics_file:
+        with open(args.topics_file, encoding="utf-8") as file:
+            topics += [line.strip() for line in file if line.strip()]
+    if args.stub:
+        topics = topics or STUB_TOPICS[: args.count or len(STUB_TOPICS)]
+    if not topics:
+        parser.error("no topics given")
+
+    configs = config_grid(
+        map(DebateVariant, args.variant),
+        args.rounds,
+        args.models,
+        args.max_output_tokens,
+    )
+    if args.stub:
+        reference_llm = StubChatModel(model_name=args.reference_model)
+        harness = EvaluationHarness(
+            topics,
+            reference_llm,
+            create_llm=stub_llm_factory(args.time_scale),
+            responses=ResponseCache(args.cache),
+            max_workers=args.workers,
+        )
+    else:
+        reference_llm = ChatGoogleGenerativeAI(
+            model=args.reference_model, temperature=0.0
+        )
+        harness = EvaluationHarness(
+            topics,
+            reference_llm,
+            responses=ResponseCache(args.cache),
+            max_workers=args.workers,
+        )
+
+    print(f"{len(configs)} configurations x {len(topics)} topics")
+    results = harness.run(configs)
+    print_table(results)
+
+    print("\nPareto frontier:")
+    for result in pareto_front(results):
+        print(
+            f"  {result.config.label:<38} quality {result.quality:.2f}  "
+            f"{result.latency:.2f}s  ${result.cost:.5f}"
+        )
+
+    debates = [d for result in results for d in result.debates]
+    standalone = sum(d.cost for d in debates)
+    spent = sum(d.spent for d in debates)
+    stats = harness.responses.stats()
+    print(
+        f"\n{stats['misses']} LLM calls made, {stats['hits']} answered from the "
+        f"cache ({stats['hit_ratio']:.0%}); debater cost ${spent:.4f} "
+        f"instead of ${standalone:.4f} for independent runs"
+    )
+
+    pareto_svg(results, args.plot)
+    print(f"Plot written to {args.plot}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as file:
+            for debate in debates:
+                record = asdict(debate) | {
+                    "config": debate.config.model_dump(mode="json"),
+                    "scores": debate.scores.model_dump() if debate.scores else None,
+                }
+                file.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
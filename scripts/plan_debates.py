@@ -0,0 +1,90 @@
+"""
+Estimate LLM calls, tokens, cost and critical-path latency of a debate sweep
+before launching it, without making any LLM calls.
+
+    python -m scripts.plan_debates "Is AI beneficial?" --rounds 3 5 10
+    python -m scripts.plan_debates --topics topics.txt --variant panel --calls
+"""
+
+import argparse
+
+from src.graph.debate_planner import MODEL_PROFILES, DebatePlanner
+from src.models.debate_request import DebateVariant
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("topics", nargs="*", help="debate topics")
+    parser.add_argument("--topics", dest="topics_file", help="file, one topic per line")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[3])
+    parser.add_argument(
+        "--variant",
+        nargs="+",
+        choices=[variant.value for variant in DebateVariant],
+        default=[variant.value for variant in DebateVariant],
+    )
+    parser.add_argument("--panel-size", type=int, default=4)
+    parser.add_argument(
+        "--model", choices=sorted(MODEL_PROFILES), default="gemini-1.5-flash"
+    )
+    parser.add_argument("--max-output-tokens", type=int, default=1024)
+    parser.add_argument("--context-window", type=int, help="override the model's")
+    parser.add_argument("--calls", action="store_true", help="print every call")
+    args = parser.parse_args()
+
+    topics = list(args.topics)
+    if args.topics_file:
+        with open(args.topics_file, encoding="utf-8") as file:
+            topics += [line.strip() for line in file if line.strip()]
+    if not topics:
+        parser.error("no topics given")
+
+    profile = MODEL_PROFILES[args.model]
+    if args.context_window:
+        profile = profile.model_copy(update={"context_window": args.context_window})
+    planner = DebatePlanner(
+        model_name=args.model,
+        max_output_tokens=args.max_output_tokens,
+        profile=profile,
+    )
+
+    print(f"{len(topics)} topics on {args.model} ({profile.context_window} tokens)")
+    print(
+        f"{'variant':<10} {'rounds':>6} {'calls':>7} {'prompt tok':>11} "
+        f"{'output tok':>11} {'max prompt':>11} {'cost $':>9} {'path s':>8}"
+    )
+    warnings = []
+    for variant in map(DebateVariant, args.variant):
+        for rounds in args.rounds:
+            plans = planner.plan_many(topics, rounds, variant, args.panel_size)
+            print(
+                f"{variant.value:<10} {rounds:>6} "
+                f"{sum(len(plan.calls) for plan in plans):>7} "
+                f"{sum(plan.prompt_tokens for plan in plans):>11} "
+                f"{sum(plan.completion_tokens for plan in plans):>11} "
+                f"{max(plan.max_prompt_tokens for plan in plans):>11} "
+                f"{sum(plan.cost for plan in plans):>9.4f} "
+                f"{max(plan.critical_path_latency for plan in plans):>8.1f}"
+            )
+            warned = [plan for plan in plans if plan.warnings]
+            if warned:
+                warnings += [
+                    f"{variant.value}, {rounds} rounds, {len(warned)} of "
+                    f"{len(plans)} topics: {warning}"
+                    for warning in warned[0].warnings
+                ]
+            if args.calls:
+                for call in plans[0].calls:
+                    print(
+                        f"    stage {call.stage:>3} round {call.round:>3} "
+                        f"{call.phase.value:<14} {call.speaker:<16} "
+                        f"{call.prompt_tokens:>8} in {call.completion_tokens:>6} out "
+                        f"{call.latency:>6.1f}s"
+                    )
+
+    for warning in warnings:
+        print(f"warning: {warning}")
+
+
+if __name__ == "__main__":
+    main()
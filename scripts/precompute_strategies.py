@@ -0,0 +1,79 @@
+"""
+Precompute debate strategies for a list of topics into the strategy store, so
+strategic debates on those topics skip both strategy calls.
+
+    python -m scripts.precompute_strategies --topics topics.txt --rounds 3
+    python -m scripts.precompute_strategies "Is AI beneficial?" --stub --prune
+"""
+
+import argparse
+import time
+
+from dotenv import load_dotenv
+
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.memory.strategy_store import (
+    DEFAULT_STRATEGY_DB,
+    StrategyStore,
+    strategy_prompt_version,
+)
+from src.prompts.agent_prompts import (
+    AGAINST_AGENT_SYSTEM_PROMPT,
+    FAVOR_AGENT_SYSTEM_PROMPT,
+)
+from src.utils.stub_llm import StubChatModel
+
+
+def current_versions() -> list[str]:
+    """Prompt versions of the strategies the current prompts would produce."""
+    return [
+        strategy_prompt_version(system_prompt, strategic)
+        for system_prompt in (FAVOR_AGENT_SYSTEM_PROMPT, AGAINST_AGENT_SYSTEM_PROMPT)
+        for strategic in (True, False)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("topics", nargs="*", help="debate topics")
+    parser.add_argument("--topics", dest="topics_file", help="file, one topic per line")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--db", default=DEFAULT_STRATEGY_DB)
+    parser.add_argument("--model", default="gemini-1.5-flash")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--stub", action="store_true", help="use the offline stub LLM")
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="delete strategies generated with older prompt versions",
+    )
+    args = parser.parse_args()
+
+    topics = list(args.topics)
+    if args.topics_file:
+        with open(args.topics_file, encoding="utf-8") as file:
+            topics += [line.strip() for line in file if line.strip()]
+    if not topics:
+        parser.error("no topics given")
+
+    load_dotenv()
+    store = StrategyStore(args.db)
+    if args.prune:
+        print(f"Pruned {store.invalidate(current_versions())} stale strategies")
+
+    graph = StrategicDebateGraph(
+        model_name=args.model,
+        llm=StubChatModel() if args.stub else None,
+        strategy_store=store,
+    )
+    start = time.perf_counter()
+    generated = graph.precompute_strategies(topics, args.rounds, args.workers)
+    print(
+        f"{len(topics)} topics: generated {generated} strategies, "
+        f"{2 * len(topics) - generated} already stored "
+        f"({time.perf_counter() - start:.1f}s, {len(store)} in {args.db})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Re-run selected nodes of stored debates with a new model, prompt or judge,
+without repeating the debater turns. Results are written as JSON lines.
+
+    python -m scripts.replay_debates results/ --nodes judge --out rejudged.jsonl
+    python -m scripts.replay_debates debate.json --nodes judge meta_analysis round:2
+    python -m scripts.replay_debates results/ --judge-prompt judge.txt --stub
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from dotenv import load_dotenv
+
+from src.graph.replay import ReplayEngine, iter_stored_debates
+from src.utils.stub_llm import StubChatModel
+
+
+def parse_nodes(nodes: list[str]) -> dict:
+    """Turn node names into ReplayEngine.replay_all keyword arguments."""
+    options = {"judge": False, "meta_analysis": False, "rounds": []}
+    for node in nodes:
+        if node in ("judge", "meta_analysis"):
+            options[node] = True
+        elif node.startswith("round:") and node[len("round:") :].isdigit():
+            options["rounds"].append(int(node[len("round:") :]))
+        else:
+            raise ValueError(f"unknown node {node!r}")
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="JSON/JSONL files or directories")
+    parser.add_argument(
+        "--nodes",
+        nargs="+",
+        default=["judge"],
+        help="judge, meta_analysis and/or round:N",
+    )
+    parser.add_argument("--out", help="output JSONL file (default: stdout)")
+    parser.add_argument("--model", default="gemini-1.5-flash")
+    parser.add_argument("--judge-prompt", help="file with a new judge system prompt")
+    parser.add_argument("--strategic", action="store_true", help="strategic prompts")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--stub", action="store_true", help="use the offline stub LLM")
+    args = parser.parse_args()
+
+    try:
+        options = parse_nodes(args.nodes)
+    except ValueError as error:
+        parser.error(str(error))
+
+    judge_prompt = None
+    if args.judge_prompt:
+        with open(args.judge_prompt, encoding="utf-8") as file:
+            judge_prompt = file.read()
+
+    load_dotenv()
+    engine = ReplayEngine(
+        model_name=args.model,
+        llm=StubChatModel() if args.stub else None,
+        use_strategic_prompt=args.strategic,
+        judge_system_prompt=judge_prompt,
+        max_workers=args.workers,
+        batch_size=args.batch_size,
+    )
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    start = time.perf_counter()
+    replayed = failed = 0
+    try:
+        for result in engine.replay_all(iter_stored_debates(args.paths), **options):
+            out.write(json.dumps(result) + "\n")
+            replayed += 1
+            failed += "error" in result
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    calls = {
+        phase: stats["calls"]
+        for phase, stats in engine.instrumentation.summary()["phases"].items()
+    }
+    print(
+        f"Replayed {replayed} debates ({failed} failed) in "
+        f"{time.perf_counter() - start:.1f}s; LLM calls by phase: {calls}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
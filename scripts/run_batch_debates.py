@@ -0,0 +1,92 @@
+"""
+Run a debate sweep in lock-step batches: every graph step of every debate
+goes out as one batch submission. With --checkpoint an interrupted run is
+resumed by running the same command again.
+
+    python -m scripts.run_batch_debates --topics topics.txt --rounds 3 --out out.jsonl
+    python -m scripts.run_batch_debates --stub --count 1000 --error-rate 0.02
+"""
+
+import argparse
+import json
+import time
+
+from dotenv import load_dotenv
+from langchain_google_genai.chat_models import ChatGoogleGenerativeAI
+
+from src.api.store import debate_result
+from src.graph.batch_runner import BatchDebateRunner, LocalBatchEndpoint
+from src.models.debate_request import DebateVariant
+from src.utils.stub_llm import StubChatModel
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("topics", nargs="*", help="debate topics")
+    parser.add_argument("--topics", dest="topics_file", help="file, one topic per line")
+    parser.add_argument("--count", type=int, help="generate this many stub topics")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument(
+        "--variant",
+        choices=[variant.value for variant in DebateVariant],
+        default=DebateVariant.SIMPLE.value,
+    )
+    parser.add_argument("--panel-size", type=int, default=4)
+    parser.add_argument("--model", default="gemini-1.5-flash")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--checkpoint", help="checkpoint file for resuming the run")
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--out", help="write finished debates as JSON lines")
+    parser.add_argument("--stub", action="store_true", help="use the offline stub LLM")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stub only")
+    args = parser.parse_args()
+
+    topics = list(args.topics)
+    if args.topics_file:
+        with open(args.topics_file, encoding="utf-8") as file:
+            topics += [line.strip() for line in file if line.strip()]
+    if args.count:
+        topics += [f"Debate topic number {number}" for number in range(args.count)]
+    if not topics:
+        parser.error("no topics given")
+
+    load_dotenv()
+    if args.stub:
+        llm = StubChatModel(latency=0.01, error_rate=args.error_rate)
+    else:
+        llm = ChatGoogleGenerativeAI(model=args.model, max_output_tokens=1024)
+    runner = BatchDebateRunner(
+        LocalBatchEndpoint(llm, max_concurrency=args.concurrency),
+        variant=DebateVariant(args.variant),
+        panel_size=args.panel_size,
+        checkpoint=args.checkpoint,
+        max_attempts=args.max_attempts,
+    )
+
+    start = time.perf_counter()
+    results = runner.run(topics, args.rounds)
+    elapsed = time.perf_counter() - start
+
+    for number, stats in enumerate(runner.batches, start=1):
+        print(
+            f"batch {number:>3}: {stats.requests:>6} requests, "
+            f"{stats.failed:>4} failed, {stats.seconds:>6.2f}s"
+        )
+    failed = [result for result in results if "error" in result]
+    calls = len(runner.instrumentation.records)
+    print(
+        f"{len(results)} debates ({len(failed)} failed) in {len(runner.batches)} "
+        f"batches, {calls} LLM calls, {elapsed:.1f}s "
+        f"({len(results) / elapsed:.1f} debates/s)"
+    )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as file:
+            for result in results:
+                messages = result.get("transcript", result["messages"])
+                record = debate_result(result) | {"messages": list(messages)}
+                file.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Run thousands of stub debates in one process and check that RSS, traced
+Python memory, open file descriptors and threads stop growing: fails (exit
+status 1) when growth per debate after the warmup exceeds the limits, and
+reports the allocation sites that kept growing.
+
+    python -m scripts.soak_test --debates 2000 --variant simple strategic panel
+    python -m scripts.soak_test --debates 5000 --workers 4 --graph-per-debate
+"""
+
+import argparse
+import itertools
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.graph.debate_profiles import create_graph
+from src.models.debate_request import DebateVariant
+from src.utils.instrumentation import Instrumentation
+from src.utils.soak import SoakLimits, SoakMonitor
+from src.utils.stub_llm import StubChatModel
+
+TOPICS = [
+    "Is AI beneficial for society?",
+    "Should governments regulate social media?",
+    "Should college education be free?",
+    "Is nuclear power necessary to fight climate change?",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--debates", type=int, default=2000)
+    parser.add_argument(
+        "--variant",
+        nargs="+",
+        choices=[variant.value for variant in DebateVariant],
+        default=[DebateVariant.SIMPLE.value],
+    )
+    parser.add_argument("--steps", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--graph-per-debate",
+        action="store_true",
+        help="create a graph for every debate, like one-shot CLI runs; by "
+        "default graphs are reused, like the debate service",
+    )
+    parser.add_argument("--interval", type=int, default=100, help="debates/sample")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=1, help="tracemalloc frames")
+    parser.add_argument("--top", type=int, default=10)
+    defaults = SoakLimits()
+    for metric in SoakLimits.model_fields:
+        parser.add_argument(
+            f"--max-{metric}-growth",
+            type=float,
+            default=getattr(defaults, metric),
+            help=f"per debate (default {getattr(defaults, metric)})",
+        )
+    args = parser.parse_args()
+    if args.debates <= args.warmup + args.interval:
+        parser.error("--debates must leave at least two samples after the warmup")
+    limits = SoakLimits(
+        **{
+            metric: getattr(args, f"max_{metric}_growth")
+            for metric in SoakLimits.model_fields
+        }
+    )
+
+    llm = StubChatModel()
+    # Bounded like the debate service's, so kept records are not a leak
+    instrumentation = Instrumentation(max_records=1000)
+    graphs = {}
+
+    def graph_for(variant: DebateVariant):
+        if args.graph_per_debate or variant not in graphs:
+            graphs[variant] = create_graph(
+                variant, llm=llm, instrumentation=instrumentation
+            )
+        return graphs[variant]
+
+    jobs = itertools.islice(
+        zip(itertools.cycle(map(DebateVariant, args.variant)), itertools.cycle(TOPICS)),
+        args.debates,
+    )
+    monitor = SoakMonitor(args.interval, args.warmup, args.frames, args.top)
+    finished = itertools.count(1)
+    lock = threading.Lock()
+
+    def run(job):
+        variant, topic = job
+        with lock:
+            graph = graph_for(variant)
+        graph.run_debate(topic, args.steps)
+        sample = monitor.record(next(finished))
+        if sample is not None:
+            print(
+                f"{sample.debates:>7} debates {sample.elapsed:7.1f}s  "
+                f"rss {sample.rss / 2**20:8.1f} MiB  "
+                f"traced {sample.traced / 2**20:7.2f} MiB  "
+                f"fds {sample.fds:>4}  threads {sample.threads:>3}",
+                flush=True,
+            )
+
+    monitor.start()
+    with ThreadPoolExecutor(args.workers) as executor:
+        list(executor.map(run, jobs))
+    monitor.stop(args.debates)
+
+    print("\nGrowth per debate after the warmup:")
+    for metric, slope in monitor.growth().items():
+        print(f"  {metric:<8} {slope:>12.4g}  (limit {getattr(limits, metric):.4g})")
+    sites = monitor.growing_sites()
+    if sites:
+        print(f"\nTop {len(sites)} growing allocation sites since the warmup:")
+        for diff in sites:
+            frames = " <- ".join(
+                f"{frame.filename}:{frame.lineno}" for frame in diff.traceback
+            )
+            print(f"  {diff.size_diff:>+12,} B {diff.count_diff:>+8} blocks  {frames}")
+
+    failures = monitor.failures(limits)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: no growth above the limits")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,12 @@ from .against_agent import AgainstAgent
 from .base_agent import DebateBaseAgent
 from .favor_agent import FavorAgent
 from .judge_agent import JudgeAgent
+from .panelist_agent import PanelistAgent
 
-__all__ = ["AgainstAgent", "DebateBaseAgent", "FavorAgent", "JudgeAgent"]
\ No newline at end of file
+__all__ = [
+    "AgainstAgent",
+    "DebateBaseAgent",
+    "FavorAgent",
+    "JudgeAgent",
+    "PanelistAgent",
+]
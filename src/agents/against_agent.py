@@ -22,5 +22,8 @@ class AgainstAgent(DebateBaseAgent):
             system_prompt=AGAINST_AGENT_SYSTEM_PROMPT,
         ),
         use_strategic_prompt: bool = False,
+        **kwargs,
     ):
-        super().__init__(config, llm, use_strategic_prompt=use_strategic_prompt)
+        super().__init__(
+            config, llm, use_strategic_prompt=use_strategic_prompt, **kwargs
+        )
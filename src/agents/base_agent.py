@@ -1,11 +1,27 @@
+import time
 from abc import ABC, abstractmethod
+from dataclasses import replace
+from typing import Callable, Optional
 
 from langchain_core.language_models import BaseLanguageModel
 
+from src.chains.debate_chains import debate_transcript, position, render_action
+from src.memory.agent_memory import AgentMemory
 from src.models.agent_config import AgentConfig
-from src.models.debate_state import AgentRole, DebateState
-from src.prompts.action_prompts import ActionPrompts
-from src.prompts.strategic_action_prompts import StrategicActionPrompts
+from src.models.debate_state import AgentRole, DebatePhase, DebateState
+from src.prompts.prompt_layout import CacheablePrompt
+from src.utils.call_policy import CallPolicyRunner
+from src.utils.cancellation import DebateCancelledError, current_cancellation
+from src.utils.context_cache import ContextCache
+from src.utils.instrumentation import CallRecord, Instrumentation, usage_from_response
+from src.utils.profiling import profiled_phase
+from src.utils.speculation import Speculator
+from src.utils.tracing import Tracer
+
+# Phases whose prompts get the turn's evidence block, if the agent has one
+EVIDENCE_PHASES = (DebatePhase.OPENING, DebatePhase.ARGUMENT, DebatePhase.CONCLUSION)
+# Phases whose prompts get items recalled from the agent's memory
+MEMORY_PHASES = (DebatePhase.STRATEGY, *EVIDENCE_PHASES)
 
 
 class DebateBaseAgent(ABC):
@@ -20,63 +36,234 @@ class DebateBaseAgent(ABC):
         config: AgentConfig,
         llm: BaseLanguageModel,
         use_strategic_prompt: bool = False,
+        instrumentation: Optional[Instrumentation] = None,
+        context_cache: Optional[ContextCache] = None,
+        call_policy: Optional[CallPolicyRunner] = None,
+        speculation: Optional[Speculator] = None,
+        tracer: Optional[Tracer] = None,
+        evidence: Optional[str] = None,
+        memory: Optional[AgentMemory] = None,
     ):
         self.name = config.name
         self.role = config.role
         self.system_prompt = config.system_prompt
         self.llm = llm
         self.use_strategic_prompt = use_strategic_prompt
+        self.instrumentation = instrumentation
+        self.context_cache = context_cache
+        self.call_policy = call_policy
+        self.speculation = speculation
+        self.tracer = tracer
+        self.evidence = evidence
+        self.memory = memory
 
-    def introduce_topic(self, state: DebateState) -> str:
+    def _model_name(self) -> str:
+        return getattr(self.llm, "model_name", None) or getattr(
+            self.llm, "model", type(self.llm).__name__
+        )
+
+    def _invoke(
+        self, prompt: CacheablePrompt, phase: DebatePhase, state: Optional[dict] = None
+    ) -> str:
         """
-        The agent will give the introducing argument for the debate topic.
+        Send a prompt to the LLM and record the call.
+        With an explicit context cache the static head is sent as a cache
+        handle and only the transcript and the volatile suffix go over the wire.
+        With a call policy the call gets a phase timeout, retries, hedging and
+        a fallback model. With speculation for the phase the turn is drafted by
+        the draft model and reviewed by this agent's model. Evidence for the
+        turn and items recalled from memory for `state` are appended to the
+        volatile suffix, after the cacheable prefix.
         """
-        if not state or "topic" not in state or not self.system_prompt:
-            raise ValueError("Invalid state or system prompt.")
+        with profiled_phase(phase):
+            prompt = self._with_context(prompt, phase, state)
+            if self.speculation is not None and self.speculation.applies(phase):
+                return self._speculate(prompt, phase)
+            return self._call(prompt, phase)
 
-        if self.use_strategic_prompt:
-            strategy = state.get(self.role.value + "_strategy", "")
-            context = StrategicActionPrompts.create_opening_prompt().format(
-                system_prompt=self.system_prompt,
-                role=self.role.value,
-                topic=state["topic"],
-                strategy=strategy,
-                total_rounds=state.get("max_steps", 3),
-            )
-        else:
-            context = ActionPrompts.create_introduction_prompt().format(
-                system_prompt=self.system_prompt,
-                role=self.role.value,
-                topic=state["topic"],
+    def _with_context(
+        self, prompt: CacheablePrompt, phase: DebatePhase, state: Optional[dict]
+    ) -> CacheablePrompt:
+        context = ""
+        if self.evidence and phase in EVIDENCE_PHASES:
+            context += self.evidence
+        if self.memory is not None and state is not None and phase in MEMORY_PHASES:
+            context += (
+                self.memory.prompt_block(
+                    self.name, state["topic"], state.get("messages", [])
+                )
+                or ""
             )
-        return self.llm.invoke(context).content
+        if not context:
+            return prompt
+        return replace(prompt, volatile=prompt.volatile + context)
 
-    def create_strategy(self, state: DebateState) -> str:
+    def _call(
+        self,
+        prompt: CacheablePrompt,
+        phase: DebatePhase,
+        llm: Optional[BaseLanguageModel] = None,
+        events: Optional[list[str]] = None,
+        outcome: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> str:
         """
-        The agent will create a strategy based on the current state of the debate.
+        Make one LLM call (with `llm`, this agent's model by default) and
+        record it. `outcome` may add an event describing the response.
+        With a tracer the call gets its own span.
         """
-        if not state or "messages" not in state:
-            raise ValueError("Invalid state.")
+        if self.tracer is None:
+            return self._send(prompt, phase, llm, events, outcome)
+        with self.tracer.span(
+            "llm_call",
+            **{"gen_ai.operation.name": phase.value, "debate.role": self.role.value},
+        ):
+            return self._send(prompt, phase, llm, events, outcome)
 
-        if self.use_strategic_prompt:
-            context = (
-                StrategicActionPrompts.create_strategy_formulation_prompt().format(
-                    system_prompt=self.system_prompt,
-                    role=self.role.value,
-                    total_rounds=state.get("total_rounds", 3),
-                    topic=state.get("topic", "No topic specified"),
-                    position="In favor to topic"
-                    if self.role == AgentRole.FAVOR
-                    else "Against the topic",
+    def _send(
+        self,
+        prompt: CacheablePrompt,
+        phase: DebatePhase,
+        llm: Optional[BaseLanguageModel],
+        events: Optional[list[str]],
+        outcome: Optional[Callable[[str], Optional[str]]],
+    ) -> str:
+        llm = llm or self.llm
+        events = events if events is not None else []
+        handle = None
+        if self.context_cache is not None and llm is self.llm:
+            handle = self.context_cache.handle_for(prompt.static)
+
+        def send(model: BaseLanguageModel):
+            # Cache handles are model specific, so a fallback model gets it all.
+            if handle and model is self.llm:
+                return model.invoke(
+                    prompt.transcript + prompt.volatile, cached_content=handle
+                )
+            return model.invoke(prompt.text)
+
+        # The token of the running debate, which abandons the call when it
+        # is cancelled or its deadline passes
+        cancellation = current_cancellation()
+        start = time.perf_counter()
+        try:
+            if self.call_policy is not None:
+                response = self.call_policy.invoke(
+                    send, llm, phase, events, cancellation
                 )
+            elif cancellation is not None:
+                response = cancellation.run(lambda: send(llm))
+            else:
+                response = send(llm)
+        except Exception as error:
+            self._record(phase, time.perf_counter() - start, None, events, error)
+            raise
+        if outcome is not None and (event := outcome(response.content)):
+            events.append(event)
+        self._record(phase, time.perf_counter() - start, response, events)
+        return response.content
+
+    def _speculate(self, prompt: CacheablePrompt, phase: DebatePhase) -> str:
+        """
+        Draft the turn with the draft model, then have this agent's model
+        accept or lightly edit it, or rewrite it if the draft fails the local
+        quality check.
+        """
+        speculation = self.speculation
+        try:
+            draft = self._call(prompt, phase, speculation.draft_llm, ["draft"])
+            reason = speculation.check(draft, prompt)
+        except DebateCancelledError:
+            raise
+        except Exception as error:
+            draft, reason = "", f"draft failed: {type(error).__name__}"
+        if reason is not None:
+            return self._call(prompt, phase, events=[f"draft rejected ({reason})"])
+        if not speculation.policy.review:
+            return draft
+
+        review = self._call(
+            speculation.review_prompt(prompt, draft),
+            phase,
+            outcome=speculation.review_event,
+        )
+        return draft if speculation.is_accepted(review) else review.strip()
+
+    def _record(
+        self,
+        phase: DebatePhase,
+        latency: float,
+        response,
+        events: list[str],
+        error: Optional[Exception] = None,
+    ):
+        if self.instrumentation is None and self.tracer is None:
+            return
+        usage = usage_from_response(response)
+        metadata = getattr(response, "response_metadata", None) or {}
+        model = metadata.get("model_name") or self._model_name()
+        if self.tracer is not None and (span := self.tracer.current_span()):
+            span.set_attributes(
+                {
+                    "gen_ai.request.model": model,
+                    "gen_ai.usage.input_tokens": usage.prompt_tokens,
+                    "gen_ai.usage.output_tokens": usage.completion_tokens,
+                    "gen_ai.usage.cached_tokens": usage.cached_tokens,
+                    "debate.events": events,
+                }
             )
-        else:
-            context = ActionPrompts.create_strategy_prompt().format(
-                system_prompt=self.system_prompt,
+        if self.instrumentation is None:
+            return
+        self.instrumentation.record(
+            CallRecord(
+                phase=phase.value,
                 role=self.role.value,
-                messages=state["messages"],
+                model=model,
+                latency=latency,
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens,
+                cached_tokens=usage.cached_tokens,
+                events=events,
+                error=None if error is None else f"{type(error).__name__}: {error}",
             )
-        return self.llm.invoke(context).content
+        )
+
+    @staticmethod
+    def _transcript(state: dict, messages: Optional[list] = None) -> str:
+        """Format the transcript of `state`, including spilled turn summaries."""
+        return debate_transcript(state, messages)
+
+    def _position(self) -> str:
+        return position(self.role)
+
+    def _action(
+        self, phase: DebatePhase, state: DebateState, recall: bool = True
+    ) -> str:
+        """
+        Render the action's prompt with the prompt runnable of its chain in
+        src.chains, and send it through this agent's call path. Without
+        `recall` nothing is recalled from the agent's memory.
+        """
+        prompt = render_action(
+            phase, state, self.use_strategic_prompt, self.role, self.system_prompt
+        )
+        return self._invoke(prompt, phase, state if recall else None)
+
+    def introduce_topic(self, state: DebateState) -> str:
+        """
+        The agent will give the introducing argument for the debate topic.
+        """
+        if not state or "topic" not in state or not self.system_prompt:
+            raise ValueError("Invalid state or system prompt.")
+        return self._action(DebatePhase.OPENING, state)
+
+    def create_strategy(self, state: DebateState, recall: bool = True) -> str:
+        """
+        The agent will create a strategy based on the current state of the debate.
+        Without `recall` the strategy does not depend on the agent's memory.
+        """
+        if not state or "messages" not in state:
+            raise ValueError("Invalid state.")
+        return self._action(DebatePhase.STRATEGY, state, recall)
 
     def create_argument(self, state: DebateState) -> str:
         """
@@ -84,26 +271,7 @@ class DebateBaseAgent(ABC):
         """
         if not state or "messages" not in state:
             raise ValueError("Invalid state.")
-        if self.use_strategic_prompt:
-            strategy = state.get(self.role.value + "_strategy", "")
-
-            context = StrategicActionPrompts.create_middle_argument_prompt().format(
-                system_prompt=self.system_prompt,
-                role=self.role.value,
-                current_round=state["current_step"],
-                total_rounds=state["max_steps"],
-                strategy=strategy,
-                opponent_last_argument=state["messages"][-1],
-                messages=state["messages"][:-1],
-                rounds_remaining=state.get("max_steps", 3) - state["current_step"],
-            )
-        else:
-            context = ActionPrompts.create_argument_template().format(
-                system_prompt=self.system_prompt,
-                role=self.role.value,
-                messages=state["messages"],
-            )
-        return self.llm.invoke(context).content
+        return self._action(DebatePhase.ARGUMENT, state)
 
     def conclude_debate(self, state: DebateState) -> str:
         """
@@ -111,23 +279,7 @@ class DebateBaseAgent(ABC):
         """
         if not state or "messages" not in state:
             raise ValueError("Invalid state.")
-
-        if self.use_strategic_prompt:
-            strategy = state.get(self.role.value + "_strategy", "")
-
-            context = StrategicActionPrompts.create_conclusion_prompt().format(
-                system_prompt=self.system_prompt,
-                role=self.role.value,
-                messages=state["messages"],
-                strategy=strategy,
-            )
-        else:
-            context = ActionPrompts.create_conclude_prompt().format(
-                system_prompt=self.system_prompt,
-                role=self.role.value,
-                messages=state["messages"],
-            )
-        return self.llm.invoke(context).content
+        return self._action(DebatePhase.CONCLUSION, state)
 
     def get_name(self) -> str:
         return self.name
@@ -20,5 +20,8 @@ class FavorAgent(DebateBaseAgent):
             name="Favor", role=AgentRole.FAVOR, system_prompt=FAVOR_AGENT_SYSTEM_PROMPT
         ),
         use_strategic_prompt: bool = False,
+        **kwargs,
     ):
-        super().__init__(config, llm, use_strategic_prompt=use_strategic_prompt)
+        super().__init__(
+            config, llm, use_strategic_prompt=use_strategic_prompt, **kwargs
+        )
@@ -1,10 +1,16 @@
 from langchain_core.language_models import BaseLanguageModel
 
+from src.chains.debate_chains import render_action
 from src.models.agent_config import AgentConfig
-from src.models.debate_state import AgentRole, DebateState
-from src.prompts.action_prompts import ActionPrompts
+from src.models.debate_state import (
+    AgentRole,
+    DebatePhase,
+    DebateState,
+    PanelDebateState,
+)
+from src.prompts.action_prompts import PanelActionPrompts
 from src.prompts.agent_prompts import JUDGE_AGENT_SYSTEM_PROMPT
-from src.prompts.strategic_action_prompts import StrategicActionPrompts
+from src.prompts.prompt_layout import render_prompt
 
 from .base_agent import DebateBaseAgent
 
@@ -24,46 +30,52 @@ class JudgeAgent(DebateBaseAgent):
             system_prompt=JUDGE_AGENT_SYSTEM_PROMPT,
         ),
         use_strategic_prompt: bool = False,
+        **kwargs,
     ):
-        super().__init__(config, llm, use_strategic_prompt=use_strategic_prompt)
+        super().__init__(
+            config, llm, use_strategic_prompt=use_strategic_prompt, **kwargs
+        )
 
     def judge_and_conclude(self, state: DebateState) -> str:
         """
         The judge agent evaluates the debate and provides a conclusion.
         It uses the messages in the state to form its judgment.
         """
-        if self.use_strategic_prompt:
-            context = StrategicActionPrompts.create_judge_evaluation_prompt().format(
-                system_prompt=self.system_prompt,
-                topic=state["topic"],
-                messages=state["messages"],
-            )
-        else:
-            context = ActionPrompts.judge_and_conclude_prompt().format(
-                system_prompt=self.system_prompt, messages=state["messages"]
-            )
-        return self.llm.invoke(context).content
+        prompt = render_action(
+            DebatePhase.VERDICT,
+            state,
+            self.use_strategic_prompt,
+            system_prompt=self.system_prompt,
+        )
+        return self._invoke(prompt, DebatePhase.VERDICT)
 
     def analyse_the_debate(self, state: DebateState) -> str:
         """
         The judge agent analyzes the debate and provides feedback.
         It uses the messages in the state to form its analysis.
         """
-        if not self.use_strategic_prompt:
-            "No strategic prompt available for judge analysis."
+        prompt = render_action(
+            DebatePhase.META_ANALYSIS,
+            state,
+            strategic=True,
+            system_prompt=self.system_prompt,
+        )
+        return self._invoke(prompt, DebatePhase.META_ANALYSIS)
 
-        context = StrategicActionPrompts.create_meta_analysis_prompt().format(
+    def judge_panel(self, state: PanelDebateState) -> str:
+        """
+        The judge agent evaluates a multi-party panel debate and
+        aggregates its evaluation into a ranking of all panelists.
+        """
+        prompt = render_prompt(
+            PanelActionPrompts.judge_panel_prompt(),
             system_prompt=self.system_prompt,
             topic=state["topic"],
-            messages=state["messages"][:-1],  # Exclude the last message for analysis
-            strategy_1=state["favor_strategy"],
-            strategy_2=state["against_strategy"],
-            judge_verdict=state["messages"][-1]
-                if state["messages"]
-                else "No messages yet",
+            participants=", ".join(state["participants"]),
+            participant_count=len(state["participants"]),
+            messages=self._transcript(state),
         )
-
-        return self.llm.invoke(context).content
+        return self._invoke(prompt, DebatePhase.VERDICT)
 
     def introduce_topic(self, state: DebateState) -> str:
         raise NotImplementedError("Judge agent cannot introduce topics")
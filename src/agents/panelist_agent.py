@@ -0,0 +1,93 @@
+from langchain_core.language_models import BaseLanguageModel
+
+from src.models.agent_config import AgentConfig
+from src.models.debate_state import AgentRole, DebatePhase, PanelTurnState
+from src.prompts.action_prompts import PanelActionPrompts
+from src.prompts.agent_prompts import PANELIST_AGENT_SYSTEM_PROMPT
+from src.prompts.prompt_layout import render_prompt
+
+from .base_agent import DebateBaseAgent
+
+
+class PanelistAgent(DebateBaseAgent):
+    """
+    Panelist agent class that extends the DebateBaseAgent.
+    This agent argues from its own persona in a multi-party panel debate.
+    """
+
+    def __init__(self, llm: BaseLanguageModel, config: AgentConfig, **kwargs):
+        super().__init__(config, llm, **kwargs)
+
+    @staticmethod
+    def create_config(name: str, persona: str) -> AgentConfig:
+        """Build a panelist config with a persona-specific system prompt."""
+        return AgentConfig(
+            name=name,
+            role=AgentRole.PANELIST,
+            system_prompt=PANELIST_AGENT_SYSTEM_PROMPT.format(
+                name=name, persona=persona
+            ),
+        )
+
+    def introduce_topic(self, state: PanelTurnState) -> str:
+        """
+        The panelist gives its opening statement on the debate topic.
+        """
+        if not state or "topic" not in state or not self.system_prompt:
+            raise ValueError("Invalid state or system prompt.")
+
+        prompt = render_prompt(
+            PanelActionPrompts.create_opening_prompt(),
+            system_prompt=self.system_prompt,
+            name=self.name,
+            participants=", ".join(state["participants"]),
+            topic=state["topic"],
+        )
+        return self._invoke(prompt, DebatePhase.OPENING, state)
+
+    def create_argument(self, state: PanelTurnState) -> str:
+        """
+        The panelist rebuts the statements of the other panelists
+        from the previous round.
+        """
+        if not state or "messages" not in state:
+            raise ValueError("Invalid state.")
+
+        round_size = len(state["participants"])
+        previous_speakers = [
+            speaker
+            for speaker, _ in state["messages"][-round_size:]
+            if speaker != self.name
+        ]
+        prompt = render_prompt(
+            PanelActionPrompts.create_rebuttal_prompt(),
+            system_prompt=self.system_prompt,
+            name=self.name,
+            topic=state["topic"],
+            participants=", ".join(state["participants"]),
+            current_round=state["current_step"],
+            total_rounds=state["max_steps"],
+            messages=self._transcript(state),
+            previous_speakers=", ".join(previous_speakers),
+        )
+        return self._invoke(prompt, DebatePhase.ARGUMENT, state)
+
+    def conclude_debate(self, state: PanelTurnState) -> str:
+        """
+        The panelist concludes the debate.
+        """
+        if not state or "messages" not in state:
+            raise ValueError("Invalid state.")
+
+        prompt = render_prompt(
+            PanelActionPrompts.create_conclusion_prompt(),
+            system_prompt=self.system_prompt,
+            name=self.name,
+            participants=", ".join(state["participants"]),
+            topic=state["topic"],
+            messages=self._transcript(state),
+        )
+        return self._invoke(prompt, DebatePhase.CONCLUSION, state)
+
+    def create_strategy(self, state: PanelTurnState) -> str:
+        raise NotImplementedError("Panelist agent does not create strategies")
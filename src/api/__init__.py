@@ -0,0 +1,13 @@
+from .app import DebateApp
+from .engine import DebateEngine, DebateJob, JobStatus, ProfileError, QueueFullError
+from .store import ResultStore
+
+__all__ = [
+    "DebateApp",
+    "DebateEngine",
+    "DebateJob",
+    "JobStatus",
+    "ProfileError",
+    "QueueFullError",
+    "ResultStore",
+]
@@ -0,0 +1,87 @@
+"""
+Run the debate service.
+
+    python -m src.api --port 8000 --concurrency 4 --queue-size 32
+    python -m src.api --stub   # offline, with the deterministic stub model
+    python -m src.api --otlp-endpoint http://localhost:4318/v1/traces
+    python -m src.api --config-profile fast-cheap   # from configs/config.yaml
+    python -m src.api --archive data/debates.sqlite   # deduplicated archive
+
+Requires an ASGI server: `pip install uvicorn`.
+"""
+
+import argparse
+
+from dotenv import load_dotenv
+
+from src.api.app import DebateApp
+from src.api.engine import DebateEngine
+from src.api.store import ResultStore
+from src.graph.debate_profiles import check_budget
+from src.memory.debate_archive import DebateArchive
+from src.models.debate_profile import DEFAULT_CONFIG, load_profiles
+from src.utils.stub_llm import StubChatModel
+from src.utils.tracing import FileSpanExporter, OTLPSpanExporter, Tracer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Debate HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", type=int, help="default 4, or the profile's")
+    parser.add_argument("--queue-size", type=int, help="default 32, or the profile's")
+    parser.add_argument("--results-dir", default=None)
+    parser.add_argument("--archive", help="also archive results to this SQLite file")
+    parser.add_argument("--model", help="debater model, overriding any profile")
+    parser.add_argument(
+        "--config-profile", help="default debate profile; requests may name others"
+    )
+    parser.add_argument("--config", help=f"profiles file (default {DEFAULT_CONFIG})")
+    parser.add_argument("--stub", action="store_true", help="use the offline stub LLM")
+    tracing = parser.add_mutually_exclusive_group()
+    tracing.add_argument("--otlp-endpoint", help="export spans to an OTLP collector")
+    tracing.add_argument("--trace-file", help="write spans to a JSON lines file")
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        parser.error("uvicorn is required to serve the API: pip install uvicorn")
+
+    profiles, concurrency, queue_size = None, 4, 32
+    if args.config_profile or args.config:
+        try:
+            profiles = load_profiles(args.config or DEFAULT_CONFIG)
+            if args.config_profile:
+                profiles.default_profile = args.config_profile
+            profile = profiles.get()
+            check_budget(profile)
+        except (OSError, KeyError, ValueError) as error:
+            message = error.args[0] if isinstance(error, KeyError) else error
+            parser.error(f"invalid debate profile: {message}")
+        concurrency, queue_size = profile.concurrency, profile.queue_size
+
+    load_dotenv()
+    graph_options = {"model_name": args.model} if args.model else {}
+    if args.stub:
+        graph_options["llm"] = StubChatModel(latency=0.2)
+    if args.otlp_endpoint:
+        graph_options["tracer"] = Tracer(OTLPSpanExporter(args.otlp_endpoint))
+    elif args.trace_file:
+        graph_options["tracer"] = Tracer(FileSpanExporter(args.trace_file))
+
+    engine = DebateEngine(
+        concurrency=args.concurrency or concurrency,
+        queue_size=args.queue_size or queue_size,
+        store=ResultStore(
+            directory=args.results_dir,
+            archive=DebateArchive(args.archive) if args.archive else None,
+        ),
+        graph_options=graph_options,
+        profiles=profiles,
+    )
+    uvicorn.run(DebateApp(engine), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
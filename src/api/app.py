@@ -0,0 +1,307 @@
+import asyncio
+import json
+import re
+from typing import Optional
+
+from pydantic import ValidationError
+
+from src.api.engine import DebateEngine, ProfileError, QueueFullError
+from src.models.debate_request import DebateRequest
+
+_JOB_PATH = re.compile(r"^/debates/([0-9a-f]{32})(/events|/result)?$")
+MAX_BODY_BYTES = 64 * 1024
+
+
+class DebateApp:
+    """
+    Dependency-free ASGI application for the debate service.
+
+    POST /debates                 submit a debate job (202, or 429 when full)
+    GET  /debates/{id}            job status and progress
+    DELETE /debates/{id}          cancel a queued or running debate (202)
+    GET  /debates/{id}/events     server-sent events, one per turn as produced
+    GET  /debates/{id}/result     the finished debate from the result store
+    GET  /health                  liveness with in-flight debates and queue depth
+    GET  /metrics                 engine load and per-phase LLM latency
+
+    Run it with any ASGI server, e.g. `uvicorn src.api.app:app`.
+    """
+
+    def __init__(
+        self, engine: Optional[DebateEngine] = None, heartbeat_seconds: float = 15.0
+    ):
+        self.engine = engine or DebateEngine()
+        self.heartbeat_seconds = heartbeat_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._route(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.engine.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _route(self, scope, receive, send):
+        method, path = scope["method"], scope["path"].rstrip("/") or "/"
+
+        if path == "/debates":
+            if method != "POST":
+                await self._error(send, 405, "Method not allowed.")
+                return
+            await self._submit(receive, send)
+            return
+        if path in ("/health", "/metrics"):
+            if method != "GET":
+                await self._error(send, 405, "Method not allowed.")
+                return
+            if path == "/health":
+                await self._health(send)
+                return
+            await self._json(send, 200, self.engine.metrics())
+            return
+
+        match = _JOB_PATH.match(path)
+        if match is None:
+            await self._error(send, 404, "Not found.")
+            return
+        job_id, action = match.groups()
+        if method == "DELETE" and action is None:
+            await self._cancel(job_id, send)
+            return
+        if method != "GET":
+            await self._error(send, 405, "Method not allowed.")
+            return
+        if action == "/events":
+            await self._events(job_id, receive, send)
+            return
+        if action == "/result":
+            await self._result(job_id, send)
+            return
+        await self._status(job_id, send)
+
+    async def _submit(self, receive, send):
+        body = await self._read_body(receive)
+        if body is None:
+            await self._error(send, 413, "Request body too large.")
+            return
+        try:
+            request = DebateRequest.model_validate_json(body or b"{}")
+        except ValidationError as error:
+            await self._json(
+                send,
+                400,
+                {"error": "Invalid debate request.", "details": _details(error)},
+            )
+            return
+
+        try:
+            job = self.engine.submit(request)
+        except QueueFullError as error:
+            await self._error(send, 429, str(error), [(b"retry-after", b"5")])
+            return
+        except ProfileError as error:
+            await self._error(send, 400, str(error))
+            return
+
+        location = f"/debates/{job.id}"
+        payload = job.progress() | {
+            "links": {
+                "self": location,
+                "events": f"{location}/events",
+                "result": f"{location}/result",
+            }
+        }
+        await self._json(send, 202, payload, [(b"location", location.encode())])
+
+    async def _status(self, job_id: str, send):
+        job = self.engine.get(job_id)
+        if job is not None:
+            await self._json(send, 200, job.progress())
+            return
+        result = self.engine.store.get(job_id)
+        if result is None:
+            await self._error(send, 404, "Unknown debate.")
+            return
+        await self._json(
+            send,
+            200,
+            {
+                "id": job_id,
+                "status": "completed",
+                "current_step": result.get("current_step"),
+                "turns": len(result.get("messages", [])),
+            },
+        )
+
+    async def _cancel(self, job_id: str, send):
+        job = self.engine.get(job_id)
+        if job is None and self.engine.store.get(job_id) is None:
+            await self._error(send, 404, "Unknown debate.")
+            return
+        if job is None or not self.engine.cancel(job_id):
+            await self._error(send, 409, "The debate has already finished.")
+            return
+        await self._json(send, 202, job.progress())
+
+    async def _result(self, job_id: str, send):
+        result = self.engine.store.get(job_id)
+        if result is not None:
+            await self._json(send, 200, result)
+            return
+        job = self.engine.get(job_id)
+        if job is None:
+            await self._error(send, 404, "Unknown debate.")
+            return
+        if job.error is not None:
+            await self._json(send, 500, job.progress())
+            return
+        # Not finished yet: report progress and tell the client to come back.
+        await self._json(send, 202, job.progress(), [(b"retry-after", b"2")])
+
+    async def _events(self, job_id: str, receive, send):
+        job = self.engine.get(job_id)
+        result = self.engine.store.get(job_id) if job is None else None
+        if job is None and result is None:
+            await self._error(send, 404, "Unknown debate.")
+            return
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+
+        if job is None:
+            for index, turn in enumerate(result.get("messages", []), start=1):
+                await _send_event(send, "turn", {"index": index, **turn})
+            await _send_event(send, "done", {"id": job_id, "status": "completed"})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        # Replay what has been said so far, then follow the live debate.
+        # Both happen on the loop thread, so no turn is missed or repeated.
+        queue = job.subscribe()
+        turns = list(job.turns)
+        finished = job.progress() if job.finished else None
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+        try:
+            for index, (speaker, message) in enumerate(turns, start=1):
+                turn = {"index": index, "speaker": speaker, "message": message}
+                await _send_event(send, "turn", turn)
+            if finished is not None:
+                await _send_event(send, "done", finished)
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            while True:
+                next_event = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnected},
+                    timeout=self.heartbeat_seconds,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnected in done:
+                    next_event.cancel()
+                    return
+                if not done:
+                    next_event.cancel()
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": b": keep-alive\n\n",
+                            "more_body": True,
+                        }
+                    )
+                    continue
+                event, data = next_event.result()
+                await _send_event(send, event, data)
+                if event == "done":
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+        finally:
+            disconnected.cancel()
+            job.unsubscribe(queue)
+
+    async def _health(self, send):
+        metrics = self.engine.metrics()
+        await self._json(
+            send,
+            200,
+            {
+                "status": "ok",
+                "in_flight": metrics["in_flight"],
+                "queue_depth": metrics["queue_depth"],
+                "queue_size": metrics["queue_size"],
+            },
+        )
+
+    @staticmethod
+    async def _read_body(receive) -> Optional[bytes]:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if len(body) > MAX_BODY_BYTES:
+                return None
+            if not message.get("more_body"):
+                return body
+
+    @staticmethod
+    async def _json(send, status: int, payload: dict, headers: list = ()):
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    *headers,
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def _error(self, send, status: int, message: str, headers: list = ()):
+        await self._json(send, status, {"error": message}, headers)
+
+
+def _details(error: ValidationError) -> list[dict]:
+    return [
+        {"field": ".".join(str(part) for part in item["loc"]), "message": item["msg"]}
+        for item in error.errors()
+    ]
+
+
+async def _send_event(send, event: str, data: dict):
+    payload = json.dumps(data, ensure_ascii=False)
+    await send(
+        {
+            "type": "http.response.body",
+            "body": f"event: {event}\ndata: {payload}\n\n".encode(),
+            "more_body": True,
+        }
+    )
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+app = DebateApp()
@@ -0,0 +1,356 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Optional
+
+from src.api.store import ResultStore, debate_result
+from src.graph.debate_profiles import check_budget, create_graph, profile_options
+from src.memory.transcript_log import discard_transcript, finish_transcript
+from src.models.debate_profile import ProfileConfig
+from src.models.debate_request import DebateRequest, DebateVariant
+from src.utils.cancellation import CancellationToken, DebateCancelledError
+from src.utils.instrumentation import Instrumentation
+
+
+class QueueFullError(RuntimeError):
+    """The engine queue is full; the client should retry later."""
+
+
+class ProfileError(ValueError):
+    """The request names an unknown profile or exceeds the profile budget."""
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class DebateJob:
+    """
+    A submitted debate and its progress.
+    Jobs are only mutated on the event loop thread; the debate itself runs in
+    a worker thread and hands its turns over with `call_soon_threadsafe`.
+    """
+
+    id: str
+    request: DebateRequest
+    status: JobStatus = JobStatus.QUEUED
+    turns: list[tuple[str, str]] = field(default_factory=list)
+    current_step: int = 0
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    subscribers: set[asyncio.Queue] = field(default_factory=set)
+    # Stops the debate on cancel() or at the request's deadline
+    cancellation: CancellationToken = field(default_factory=CancellationToken)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (
+            JobStatus.COMPLETED,
+            JobStatus.FAILED,
+            JobStatus.CANCELLED,
+        )
+
+    def progress(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status.value,
+            "topic": self.request.topic,
+            "variant": self.request.variant.value,
+            "profile": self.request.profile,
+            "max_steps": self.request.max_steps,
+            "current_step": self.current_step,
+            "turns": len(self.turns),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    def subscribe(self) -> asyncio.Queue:
+        """Subscribe to the events of this job that happen from now on."""
+        queue: asyncio.Queue = asyncio.Queue()
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+
+    def _publish(self, event: str, data: dict):
+        for queue in self.subscribers:
+            queue.put_nowait((event, data))
+
+    def advance(
+        self, messages: list[tuple[str, str]], current_step: int, spilled: int = 0
+    ):
+        """Record new turns; `spilled` turns precede `messages` in the debate."""
+        self.current_step = current_step
+        for speaker, message in messages[len(self.turns) - spilled :]:
+            self.turns.append((speaker, message))
+            self._publish(
+                "turn",
+                {"index": len(self.turns), "speaker": speaker, "message": message},
+            )
+
+    def finish(self, status: JobStatus, error: Optional[str] = None):
+        self.status = status
+        self.error = error
+        self.finished_at = time.time()
+        self._publish("done", self.progress())
+
+
+def build_graph(request: DebateRequest, **options):
+    """Create the debate graph for a request's variant."""
+    return create_graph(request.variant, request.panel_size, **options)
+
+
+class DebateEngine:
+    """
+    Shared async engine that runs submitted debates with bounded concurrency.
+
+    Jobs wait in a bounded queue and are picked up by `concurrency` workers,
+    each running one debate at a time in a thread pool. When the queue is full
+    `submit` raises QueueFullError instead of accepting unbounded work.
+    Graphs are built once per variant and shared by all jobs, and so is the
+    Instrumentation that backs the per-phase latency metrics.
+    With `profiles` every request runs with a named profile, the default one
+    if it names none, which fills in the fields the request leaves out and
+    supplies the graph options; `graph_options` are applied on top.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        queue_size: int = 32,
+        store: Optional[ResultStore] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        graph_factory: Callable[..., object] = build_graph,
+        graph_options: Optional[dict] = None,
+        history: int = 1000,
+        profiles: Optional[ProfileConfig] = None,
+    ):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.store = store if store is not None else ResultStore()
+        self.instrumentation = instrumentation or Instrumentation(max_records=10000)
+        self.graph_factory = graph_factory
+        self.graph_options = graph_options or {}
+        self.history = history
+        self.profiles = profiles
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self._jobs: OrderedDict[str, DebateJob] = OrderedDict()
+        self._graphs: dict[tuple, object] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def start(self):
+        """Start the worker tasks on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="debate-job"
+        )
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        """Stop the workers. Debates still running in threads are abandoned."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def _apply_profile(self, request: DebateRequest) -> DebateRequest:
+        """Fill in the request from its profile and check the profile budget."""
+        if self.profiles is None:
+            if request.profile is not None:
+                raise ProfileError("This service has no debate profiles configured.")
+            return request
+        try:
+            profile = self.profiles.get(request.profile)
+        except KeyError as error:
+            raise ProfileError(error.args[0]) from None
+        defaults = {
+            name: getattr(profile, name)
+            for name in ("max_steps", "variant", "panel_size")
+            if name not in request.model_fields_set
+        }
+        defaults["profile"] = request.profile or self.profiles.default_profile
+        request = request.model_copy(update=defaults)
+        try:
+            check_budget(
+                profile,
+                request.variant,
+                request.max_steps,
+                request.panel_size,
+                request.topic,
+            )
+        except ValueError as error:
+            raise ProfileError(str(error)) from None
+        return request
+
+    def submit(self, request: DebateRequest) -> DebateJob:
+        """
+        Queue a debate job, raising QueueFullError when at capacity and
+        ProfileError for an unknown profile or a request over its budget.
+        """
+        if self._queue is None:
+            raise RuntimeError("The engine has not been started.")
+        request = self._apply_profile(request)
+        job = DebateJob(
+            id=uuid.uuid4().hex,
+            request=request,
+            cancellation=CancellationToken(timeout=request.deadline_seconds),
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError(
+                f"Debate queue is full ({self.queue_size} jobs waiting)."
+            ) from None
+        self._jobs[job.id] = job
+        self._evict_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[DebateJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str, reason: str = "cancelled by client") -> bool:
+        """
+        Cancel a queued or running job: its in-flight LLM call is abandoned,
+        no further steps run, and the partial debate is stored. Returns False
+        for unknown or finished jobs.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        return job.cancellation.cancel(reason)
+
+    def _evict_finished(self):
+        """Forget the oldest finished jobs; their results stay in the store."""
+        excess = len(self._jobs) - self.history
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished]:
+            if excess <= 0:
+                break
+            del self._jobs[job_id]
+            excess -= 1
+
+    def _graph_for(self, request: DebateRequest):
+        panel_size = request.panel_size if request.variant == DebateVariant.PANEL else 0
+        key = (request.profile, request.variant, panel_size)
+        if key not in self._graphs:
+            options = self.graph_options
+            if request.profile is not None:
+                profile = self.profiles.get(request.profile)
+                options = (
+                    profile_options(profile, request.variant, options.get("llm"))
+                    | options
+                )
+            self._graphs[key] = self.graph_factory(
+                request, instrumentation=self.instrumentation, **options
+            )
+        return self._graphs[key]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: DebateJob):
+        loop = asyncio.get_running_loop()
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        self.in_flight += 1
+        try:
+            graph = self._graph_for(job.request)
+            await loop.run_in_executor(self._executor, self._execute, graph, job, loop)
+        except DebateCancelledError as error:
+            self.cancelled += 1
+            job.finish(JobStatus.CANCELLED, error.reason)
+        except Exception as error:
+            self.failed += 1
+            job.finish(JobStatus.FAILED, f"{type(error).__name__}: {error}")
+        else:
+            self.completed += 1
+            job.finish(JobStatus.COMPLETED)
+        finally:
+            self.in_flight -= 1
+
+    def _execute(self, graph, job: DebateJob, loop: asyncio.AbstractEventLoop):
+        """
+        Run the debate in a worker thread, handing every step to the loop, and
+        store the result before the job is reported as finished. A cancelled
+        debate stores its partial result, then raises DebateCancelledError.
+        """
+        state: dict = {}
+        cancelled: Optional[DebateCancelledError] = None
+        try:
+            for state in graph.stream_states(
+                job.request.topic, job.request.max_steps, job.cancellation
+            ):
+                messages = list(state.get("messages", []))
+                loop.call_soon_threadsafe(
+                    job.advance,
+                    messages,
+                    state.get("current_step", 0),
+                    state.get("spilled_turns", 0),
+                )
+        except DebateCancelledError as error:
+            cancelled = error
+            state = state | {"cancelled": error.reason}
+        except BaseException:
+            discard_transcript(state, graph.spill)
+            raise
+        # Results are stored and served as JSON, so the transcript is read in full
+        with finish_transcript(state, graph.spill) as transcript:
+            messages = list(transcript)
+        self.store.put(
+            job.id,
+            {"id": job.id, "variant": job.request.variant.value}
+            | debate_result(state | {"messages": messages}),
+            config=job.request.model_dump(
+                mode="json", exclude={"topic", "deadline_seconds"}
+            ),
+            prompts=graph.prompt_versions(),
+        )
+        if cancelled is not None:
+            raise cancelled
+
+    def metrics(self) -> dict:
+        """Engine load and per-phase LLM latency."""
+        summary = self.instrumentation.summary()
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "queue_size": self.queue_size,
+            "concurrency": self.concurrency,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "stored_results": len(self.store),
+            "llm_calls": summary["calls"],
+            "phases": summary["phases"],
+        }
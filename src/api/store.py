@@ -0,0 +1,97 @@
+import json
+import threading
+from collections import OrderedDict
+from enum import Enum
+from pathlib import Path
+from typing import Any, Optional
+
+from src.memory.debate_archive import DebateArchive
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert debate state values (enums, tuples) to JSON-compatible types."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    return value
+
+
+def debate_result(state: dict) -> dict:
+    """Build the JSON result document for a finished debate state."""
+    result = {
+        key: to_jsonable(value)
+        for key, value in state.items()
+        if key not in ("messages", "round_messages", "summaries", "transcript")
+    }
+    result["messages"] = [
+        {"speaker": speaker, "message": message}
+        for speaker, message in state.get("messages", [])
+    ]
+    return result
+
+
+class ResultStore:
+    """
+    Store for finished debate results.
+    Keeps the most recent `capacity` results in memory and, when a directory
+    is given, also writes every result to `<directory>/<job id>.json` so that
+    evicted results can still be served. With an `archive` every result is
+    also archived, deduplicated, with its configuration and the prompt
+    versions it ran with, and served from there once evicted.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        directory: Optional[str] = None,
+        archive: Optional[DebateArchive] = None,
+    ):
+        self.capacity = capacity
+        self.archive = archive
+        self.directory = Path(directory) if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self._results: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, job_id: str) -> Optional[Path]:
+        if self.directory is None or not job_id.isalnum():
+            return None
+        return self.directory / f"{job_id}.json"
+
+    def put(
+        self,
+        job_id: str,
+        result: dict,
+        config: Optional[dict] = None,
+        prompts: Optional[dict[str, str]] = None,
+    ):
+        path = self._path(job_id)
+        if path is not None:
+            path.write_text(json.dumps(result, ensure_ascii=False), encoding="utf-8")
+        if self.archive is not None:
+            self.archive.put(job_id, result, config=config, prompts=prompts)
+        with self._lock:
+            self._results[job_id] = result
+            self._results.move_to_end(job_id)
+            while len(self._results) > self.capacity:
+                self._results.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            result = self._results.get(job_id)
+        if result is not None:
+            return result
+        path = self._path(job_id)
+        if path is not None and path.exists():
+            return json.loads(path.read_text(encoding="utf-8"))
+        if self.archive is not None:
+            return self.archive.get(job_id)
+        return None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
@@ -0,0 +1,205 @@
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import PromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+
+from src.models.debate_state import AgentRole, DebatePhase
+from src.prompts.action_prompts import ActionPrompts
+from src.prompts.agent_prompts import (
+    AGAINST_AGENT_SYSTEM_PROMPT,
+    FAVOR_AGENT_SYSTEM_PROMPT,
+    JUDGE_AGENT_SYSTEM_PROMPT,
+)
+from src.prompts.prompt_layout import CacheablePrompt, format_transcript
+from src.prompts.strategic_action_prompts import StrategicActionPrompts
+
+# (basic, strategic) template factory of every two-party debate action
+_TEMPLATES = {
+    DebatePhase.STRATEGY: (
+        ActionPrompts.create_strategy_prompt,
+        StrategicActionPrompts.create_strategy_formulation_prompt,
+    ),
+    DebatePhase.OPENING: (
+        ActionPrompts.create_introduction_prompt,
+        StrategicActionPrompts.create_opening_prompt,
+    ),
+    DebatePhase.ARGUMENT: (
+        ActionPrompts.create_argument_template,
+        StrategicActionPrompts.create_middle_argument_prompt,
+    ),
+    DebatePhase.CONCLUSION: (
+        ActionPrompts.create_conclude_prompt,
+        StrategicActionPrompts.create_conclusion_prompt,
+    ),
+    DebatePhase.VERDICT: (
+        ActionPrompts.judge_and_conclude_prompt,
+        StrategicActionPrompts.create_judge_evaluation_prompt,
+    ),
+    # There is only the strategic meta-analysis prompt
+    DebatePhase.META_ANALYSIS: (
+        StrategicActionPrompts.create_meta_analysis_prompt,
+        StrategicActionPrompts.create_meta_analysis_prompt,
+    ),
+}
+
+DEFAULT_SYSTEM_PROMPTS = {
+    AgentRole.FAVOR: FAVOR_AGENT_SYSTEM_PROMPT,
+    AgentRole.AGAINST: AGAINST_AGENT_SYSTEM_PROMPT,
+    AgentRole.JUDGE: JUDGE_AGENT_SYSTEM_PROMPT,
+}
+
+
+@lru_cache(maxsize=None)
+def action_template(phase: DebatePhase, strategic: bool = False) -> PromptTemplate:
+    """The prompt template of an action, parsed once per process."""
+    return _TEMPLATES[phase][strategic]()
+
+
+def debate_transcript(state: dict, messages: Optional[list] = None) -> str:
+    """Format the transcript of `state`, including spilled turn summaries."""
+    return format_transcript(
+        state["messages"] if messages is None else messages,
+        state.get("summaries"),
+        state.get("spilled_turns", 0),
+    )
+
+
+def position(role: AgentRole) -> str:
+    return "In favor to topic" if role == AgentRole.FAVOR else "Against the topic"
+
+
+def action_inputs(
+    phase: DebatePhase,
+    state: dict,
+    system_prompt: str,
+    role: AgentRole = AgentRole.JUDGE,
+) -> dict:
+    """
+    Template variables of an action for a debate state, for the basic and
+    the strategic template alike; each uses the variables it names.
+    """
+    if phase == DebatePhase.VERDICT:
+        return {
+            "system_prompt": system_prompt,
+            "topic": state["topic"],
+            "messages": debate_transcript(state),
+        }
+    if phase == DebatePhase.META_ANALYSIS:
+        messages = state["messages"]
+        return {
+            "system_prompt": system_prompt,
+            "topic": state["topic"],
+            # Exclude the last message (the verdict) from the transcript
+            "messages": debate_transcript(state, messages[:-1]),
+            "strategy_1": state["favor_strategy"],
+            "strategy_2": state["against_strategy"],
+            "judge_verdict": messages[-1][1] if messages else "No messages yet",
+        }
+
+    max_steps = state.get("max_steps", 3)
+    inputs = {
+        "system_prompt": system_prompt,
+        "role": role.value,
+        "topic": state.get("topic", "No topic specified"),
+        "position": position(role),
+        "strategy": state.get(role.value + "_strategy", ""),
+        "total_rounds": max_steps,
+    }
+    if phase == DebatePhase.ARGUMENT:
+        inputs["current_round"] = state["current_step"]
+        inputs["rounds_remaining"] = max_steps - state["current_step"]
+    if phase in (DebatePhase.ARGUMENT, DebatePhase.CONCLUSION):
+        inputs["messages"] = debate_transcript(state)
+    return inputs
+
+
+@lru_cache(maxsize=128)
+def action_prompt(
+    phase: DebatePhase,
+    strategic: bool = False,
+    role: AgentRole = AgentRole.JUDGE,
+    system_prompt: Optional[str] = None,
+) -> Runnable:
+    """
+    Runnable from a debate state to the action's prompt. It is built once per
+    action and system prompt, and shared by the action's chains and agents.
+    """
+    system_prompt = system_prompt or DEFAULT_SYSTEM_PROMPTS[role]
+
+    def inputs(state: dict) -> dict:
+        return action_inputs(phase, state, system_prompt, role)
+
+    return RunnableLambda(inputs, name=f"{phase.value}_inputs") | action_template(
+        phase, strategic
+    )
+
+
+def render_action(
+    phase: DebatePhase,
+    state: dict,
+    strategic: bool = False,
+    role: AgentRole = AgentRole.JUDGE,
+    system_prompt: Optional[str] = None,
+) -> CacheablePrompt:
+    """
+    The action's prompt for a debate state, from the same runnable as the
+    action's chain, split into its cacheable parts for an agent call.
+    """
+    prompt = action_prompt(phase, strategic, role, system_prompt).invoke(state)
+    return CacheablePrompt.from_text(prompt.to_string())
+
+
+def action_chain(
+    llm: BaseLanguageModel,
+    phase: DebatePhase,
+    strategic: bool = False,
+    role: AgentRole = AgentRole.JUDGE,
+    system_prompt: Optional[str] = None,
+) -> Runnable:
+    """
+    prompt | model | parser chain of an action, from a debate state to the
+    reply text. Agents render their prompts with the same prompt runnable
+    and send them through their own call path; the chain instead supports
+    `batch` and `abatch`, but has no call policy, context cache, speculation
+    or instrumentation.
+    """
+    return (
+        action_prompt(phase, strategic, role, system_prompt) | llm | StrOutputParser()
+    )
+
+
+def judge_chain(llm: BaseLanguageModel, strategic: bool = False) -> Runnable:
+    """Chain from a finished debate state to the judge's verdict."""
+    return action_chain(llm, DebatePhase.VERDICT, strategic)
+
+
+def judge_debates(
+    llm: BaseLanguageModel,
+    states: Iterable[dict],
+    strategic: bool = False,
+    max_concurrency: int = 8,
+) -> list:
+    """
+    Verdicts of finished debates, judged with at most `max_concurrency` calls
+    in flight. A debate whose call failed gets the exception instead.
+    """
+    config = RunnableConfig(max_concurrency=max_concurrency)
+    return judge_chain(llm, strategic).batch(
+        list(states), config, return_exceptions=True
+    )
+
+
+async def ajudge_debates(
+    llm: BaseLanguageModel,
+    states: Iterable[dict],
+    strategic: bool = False,
+    max_concurrency: int = 8,
+) -> list:
+    """Async judge_debates, for event loops such as the debate service."""
+    config = RunnableConfig(max_concurrency=max_concurrency)
+    return await judge_chain(llm, strategic).abatch(
+        list(states), config, return_exceptions=True
+    )
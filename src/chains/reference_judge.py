@@ -0,0 +1,72 @@
+from functools import lru_cache
+from typing import Iterable, Literal
+
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
+from pydantic import BaseModel, Field
+
+from src.chains.debate_chains import debate_transcript
+from src.prompts.evaluation_prompts import SCORE_CRITERIA, EvaluationPrompts
+
+_Score = Field(ge=1, le=10)
+
+
+class DebateScores(BaseModel):
+    """Structured scores of a finished debate by the reference judge."""
+
+    argument_quality: int = _Score
+    rebuttal: int = _Score
+    evidence: int = _Score
+    coherence: int = _Score
+    verdict: int = _Score
+    winner: Literal["Favor", "Against", "Tie"]
+
+    @property
+    def overall(self) -> float:
+        """Mean score over the criteria."""
+        return sum(getattr(self, name) for name in SCORE_CRITERIA) / len(SCORE_CRITERIA)
+
+
+@lru_cache(maxsize=None)
+def _parser() -> PydanticOutputParser:
+    return PydanticOutputParser(pydantic_object=DebateScores)
+
+
+def scorecard_inputs(state: dict) -> dict:
+    """Template variables of the scorecard prompt for a finished debate."""
+    return {
+        "topic": state["topic"],
+        "messages": debate_transcript(state),
+        "criteria": "\n".join(
+            f"- {name}: {description}" for name, description in SCORE_CRITERIA.items()
+        ),
+        "format_instructions": _parser().get_format_instructions(),
+    }
+
+
+def reference_judge_chain(llm: BaseLanguageModel) -> Runnable:
+    """
+    Chain from a finished debate state to its DebateScores. The judge is only
+    comparable across configurations if `llm` stays the same, ideally a
+    strong model at temperature 0.
+    """
+    return (
+        RunnableLambda(scorecard_inputs, name="scorecard_inputs")
+        | EvaluationPrompts.create_scorecard_prompt()
+        | llm
+        | _parser()
+    )
+
+
+def score_debates(
+    llm: BaseLanguageModel, states: Iterable[dict], max_concurrency: int = 8
+) -> list:
+    """
+    Reference scores of finished debates, with at most `max_concurrency`
+    calls in flight. A debate whose call or parsing failed gets the exception.
+    """
+    config = RunnableConfig(max_concurrency=max_concurrency)
+    return reference_judge_chain(llm).batch(
+        list(states), config, return_exceptions=True
+    )
@@ -0,0 +1,327 @@
+import copy
+import os
+import sys
+from abc import ABC, abstractmethod
+from functools import partial
+from typing import Iterable, Iterator, Optional
+
+from langchain_core.language_models import BaseLanguageModel
+from langchain_google_genai.chat_models import ChatGoogleGenerativeAI
+from langgraph.graph import START
+
+from src.graph.graph_diagram import DiagramFormat, NodeStats, render_diagram
+from src.graph.graph_runtime import (
+    apply_updates,
+    compiled_graph,
+    debate_config,
+    graph_steps,
+    invoke_debate,
+    run_graph_node,
+    runtime_config,
+)
+from src.memory.agent_memory import AgentMemory
+from src.memory.transcript_log import (
+    TranscriptSpill,
+    discard_transcript,
+    finish_transcript,
+)
+from src.utils.call_policy import CallPolicy, CallPolicyRunner
+from src.utils.cancellation import CancellationToken
+from src.utils.context_cache import create_context_cache
+from src.utils.instrumentation import Instrumentation
+from src.utils.load_balancer import LoadBalancerPolicy, create_balanced_llm
+from src.utils.print_debate import print_debate
+from src.utils.profiling import DEFAULT_PROFILE_DIR, profiling_session
+from src.utils.render_debate import RenderFormat, get_renderer
+from src.utils.speculation import SpeculationPolicy, Speculator
+from src.utils.tracing import Tracer
+
+
+class AgentRuntime:
+    """
+    Models and call settings shared by every agent that a debate graph, or
+    a replay of stored debates, creates: one LLM client per model name, an
+    optional separate judge model, and the instrumentation, context cache,
+    call policy, speculation, tracer, agent memory and load balancer that
+    every agent call goes through.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "gemini-1.5-flash",
+        max_output_tokens: int = 1024,
+        temperature: float = 0.5,
+        llm: Optional[BaseLanguageModel] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        use_context_cache: bool = False,
+        call_policy: Optional[CallPolicy] = None,
+        fallback_llm: Optional[BaseLanguageModel] = None,
+        speculation: Optional[SpeculationPolicy] = None,
+        draft_llm: Optional[BaseLanguageModel] = None,
+        tracer: Optional[Tracer] = None,
+        judge_model_name: Optional[str] = None,
+        judge_llm: Optional[BaseLanguageModel] = None,
+        memory: Optional[AgentMemory] = None,
+        load_balancer: Optional[LoadBalancerPolicy] = None,
+    ):
+        self.model_name = model_name
+        self.max_output_tokens = max_output_tokens
+        self.temperature = temperature
+        self.llm = llm
+        self.load_balancer = load_balancer
+        # One client per model name, see _create_llm
+        self._llms: dict = {}
+        self.instrumentation = instrumentation or Instrumentation()
+        self.context_cache = (
+            create_context_cache(llm, model_name) if use_context_cache else None
+        )
+        # Clients for named models are created on first use, so a graph can
+        # be built and drawn without credentials
+        self.call_policy = call_policy
+        self.call_policy_runner = None
+        if call_policy is not None:
+            create_fallback_llm = None
+            if fallback_llm is None and call_policy.fallback_model:
+                create_fallback_llm = partial(
+                    self._create_llm, call_policy.fallback_model
+                )
+            self.call_policy_runner = CallPolicyRunner(
+                call_policy, fallback_llm, create_fallback_llm
+            )
+        self.speculator = None
+        if speculation is not None:
+            self.speculator = Speculator(
+                speculation,
+                draft_llm,
+                partial(self._create_llm, speculation.draft_model),
+            )
+        self.judge_model_name = judge_model_name
+        self.judge_llm = judge_llm
+        self.tracer = tracer
+        self.memory = memory
+
+    def _create_llm(self, model_name: Optional[str] = None):
+        """
+        Return the configured LLM for a model (the runtime's by default). The
+        client is created once per model name and shared by every call, since
+        a client per turn leaks connections and memory. It needs the API key
+        only when it is created, at the first call on the model.
+        """
+        if self.llm is not None and model_name is None:
+            return self.llm
+        model_name = model_name or self.model_name
+        llm = self._llms.get(model_name)
+        if llm is not None:
+            return llm
+        # The call policy owns retries, so the client only makes one attempt.
+        options = {"max_retries": 1} if self.call_policy is not None else {}
+        if self.load_balancer is not None:
+            llm = create_balanced_llm(
+                self.load_balancer,
+                model_name,
+                max_output_tokens=self.max_output_tokens,
+                temperature=self.temperature,
+                **options,
+            )
+        else:
+            api_key = os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                raise ValueError("GOOGLE_API_KEY environment variable not set")
+            llm = ChatGoogleGenerativeAI(
+                model=model_name,
+                max_output_tokens=self.max_output_tokens,
+                temperature=self.temperature,
+                google_api_key=api_key,
+                **options,
+            )
+        return self._llms.setdefault(model_name, llm)
+
+    def _agent_options(self) -> dict:
+        """Options shared by every agent created by this runtime."""
+        return {
+            "instrumentation": self.instrumentation,
+            "context_cache": self.context_cache,
+            "call_policy": self.call_policy_runner,
+            "speculation": self.speculator,
+            "tracer": self.tracer,
+            "memory": self.memory,
+        }
+
+    def _judge_options(self) -> dict:
+        """Model and options for the judge, which may run on its own model."""
+        judge_llm = self.judge_llm
+        if judge_llm is None and self.judge_model_name:
+            judge_llm = self._create_llm(self.judge_model_name)
+        if judge_llm is None:
+            return {"llm": self._create_llm(), **self._agent_options()}
+        # Cache handles are model specific, so a separate judge model gets none.
+        return {"llm": judge_llm, **self._agent_options(), "context_cache": None}
+
+
+class DebateBaseGraph(AgentRuntime, ABC):
+    """
+    Base class for debate graphs.
+    Instances only hold runtime settings (see AgentRuntime for the options);
+    the compiled graph is built once per class and shared by all instances.
+    Subclasses build the graph and the initial state of a debate.
+    """
+
+    # Set by graphs that spill the turns of long debates to disk
+    spill: Optional[TranscriptSpill] = None
+
+    def __init__(self, verbose: bool = False, **options):
+        super().__init__(**options)
+        self.verbose = verbose
+        # Set while runs are profiled, see profiling()
+        self.profiler = None
+        self.app = compiled_graph(type(self))
+
+    @classmethod
+    @abstractmethod
+    def _build_graph(cls):
+        """Build and compile the debate graph."""
+
+    @abstractmethod
+    def _initial_state(self, topic: str, max_steps: int) -> dict:
+        """Create the initial state for a debate."""
+
+    @abstractmethod
+    def prompt_versions(self) -> dict[str, str]:
+        """The system prompts and action templates the graph's debates use."""
+
+    def run_debate(
+        self,
+        topic: str,
+        max_steps: int = 3,
+        cancellation: Optional[CancellationToken] = None,
+    ) -> dict:
+        """
+        Run a debate on the given topic.
+
+        Args:
+            topic: The debate topic
+            max_steps: Maximum number of debate rounds
+            cancellation: Deadline and cancellation token of the run
+
+        Returns:
+            Dictionary containing the debate results. A cancelled run returns
+            the state so far, with the reason under "cancelled". With spilled
+            turns, the full transcript is under "transcript": a TranscriptView
+            that reads spilled turns from their log on demand and deletes the
+            log when it is closed or garbage collected, unless it is kept.
+        """
+        initial_state = self._initial_state(topic, max_steps)
+        try:
+            with debate_config(self, topic, max_steps, cancellation) as config:
+                result = invoke_debate(self.app, initial_state, config)
+        except BaseException:
+            discard_transcript(initial_state, self.spill)
+            raise
+        if "transcript_path" in result:
+            result["transcript"] = finish_transcript(result, self.spill)
+        return result
+
+    def initial_state(self, topic: str, max_steps: int = 3) -> dict:
+        """The state a debate on `topic` starts from, see next_steps."""
+        return self._initial_state(topic, max_steps)
+
+    def next_steps(
+        self, state: dict, finished: Iterable[str] = (START,)
+    ) -> list[tuple[str, dict]]:
+        """
+        The (node, input) steps the graph runs after the `finished` nodes,
+        from the start by default; empty once the debate is over. With
+        run_step and apply_updates, this steps through a debate outside of
+        the compiled graph's own loop, e.g. to batch the calls of many.
+        """
+        return graph_steps(self.app, state, finished)
+
+    def run_step(
+        self,
+        node: str,
+        state: dict,
+        instrumentation: Optional[Instrumentation] = None,
+    ) -> Optional[dict]:
+        """
+        Run one node on its input and return the node's update. The calls of
+        the node are recorded on `instrumentation` if given, and on the
+        graph's own otherwise.
+        """
+        runtime = self
+        if instrumentation is not None:
+            # A shallow copy shares the models and caches but records apart
+            runtime = copy.copy(self)
+            runtime.instrumentation = instrumentation
+        return run_graph_node(self.app, node, state, runtime_config(runtime))
+
+    def apply_updates(self, state: dict, updates: Iterable[Optional[dict]]) -> dict:
+        """The state after the updates of the nodes of one step."""
+        return apply_updates(self.app, state, updates)
+
+    def profiling(self, directory: str = DEFAULT_PROFILE_DIR, **options):
+        """
+        Context manager that profiles the debates run inside it, by graph node
+        and phase, and writes flame graph stacks and a summary to `directory`.
+        """
+        return profiling_session(self, directory, **options)
+
+    def stream_states(
+        self,
+        topic: str,
+        max_steps: int = 3,
+        cancellation: Optional[CancellationToken] = None,
+    ) -> Iterator[dict]:
+        """
+        Run a debate and yield the full debate state after every graph step.
+        A cancelled run raises DebateCancelledError after its last state.
+        The log of spilled turns is left to the caller, see finish_transcript.
+        """
+        with debate_config(self, topic, max_steps, cancellation) as config:
+            yield from self.app.stream(
+                self._initial_state(topic, max_steps), config, stream_mode="values"
+            )
+
+    def stream_debate(
+        self, topic: str, max_steps: int = 3
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Run a debate and yield each (speaker, message) turn as soon as it is produced.
+        """
+        emitted, state = 0, {}
+        try:
+            for state in self.stream_states(topic, max_steps):
+                # Turns spilled to disk have already been yielded before the spill
+                spilled = state.get("spilled_turns", 0)
+                messages = state.get("messages", [])
+                yield from messages[emitted - spilled :]
+                emitted = spilled + len(messages)
+        finally:
+            discard_transcript(state, self.spill)
+
+    def print_debate(
+        self, result: dict, fmt: Optional[RenderFormat | str] = None
+    ):
+        """Print the debate messages in a formatted way with enhanced colors and styling."""  # noqa: E501
+        print_debate(result, fmt=fmt)
+
+    def print_debate_live(
+        self,
+        topic: str,
+        max_steps: int = 3,
+        fmt: Optional[RenderFormat | str] = None,
+    ) -> int:
+        """Run a debate and print each turn as soon as it is produced."""
+        return get_renderer(fmt, sys.stdout).render_stream(
+            self.stream_debate(topic, max_steps), sys.stdout, {"topic": topic}
+        )
+
+    def get_graph(
+        self,
+        fmt: DiagramFormat | str = DiagramFormat.MERMAID,
+        overlay: Optional[dict[str, NodeStats]] = None,
+    ) -> str:
+        """
+        Render the graph locally as Mermaid, Graphviz DOT or ASCII text,
+        optionally annotated with per-node stats of runs, see render_diagram.
+        """
+        return render_diagram(type(self), fmt, overlay)
@@ -0,0 +1,337 @@
+import copy
+import hashlib
+import os
+import pickle
+import time
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple, Optional
+
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from src.graph.debate_graph import DebateGraph
+from src.graph.panel_debate_graph import PanelDebateGraph, default_panel
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.memory.transcript_log import finish_transcript
+from src.models.debate_request import DebateVariant
+from src.utils.instrumentation import Instrumentation
+
+
+class PendingPrompt(BaseException):
+    """
+    Raised for a prompt whose batch result has not arrived yet. It derives
+    from BaseException so agents do not record or retry it as a failed call.
+    """
+
+    def __init__(self, prompt: str):
+        super().__init__("prompt is waiting for a batch result")
+        self.prompt = prompt
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode()).hexdigest()
+
+
+class BatchChatModel(BaseChatModel):
+    """
+    Chat model that answers from the batch results of the debate being
+    advanced, and raises PendingPrompt for any other prompt.
+    """
+
+    model_name: str = "batch"
+    _responses: dict = PrivateAttr(default_factory=dict)
+
+    @property
+    def _llm_type(self) -> str:
+        return "batch"
+
+    def use(self, responses: dict[str, AIMessage]):
+        """Answer from `responses`, keyed by prompt_key."""
+        self._responses = responses
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        message = self._responses.get(prompt_key(prompt))
+        if message is None:
+            raise PendingPrompt(prompt)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class BatchResult(NamedTuple):
+    message: Optional[AIMessage] = None
+    error: Optional[str] = None
+
+
+class BatchEndpoint(ABC):
+    """A batch API: many prompts go out in one submission, results come back later."""
+
+    model_name: str
+
+    @abstractmethod
+    def submit(self, prompts: dict[str, str]) -> str:
+        """Submit prompts keyed by request id and return the batch id."""
+
+    @abstractmethod
+    def wait(self, batch_id: str) -> dict[str, BatchResult]:
+        """
+        Block until a batch is done and return its results by request id.
+        Raises KeyError for a batch the endpoint does not know (any more).
+        """
+
+
+class LocalBatchEndpoint(BatchEndpoint):
+    """
+    In-process stand-in for a provider batch API, backed by any chat model,
+    e.g. the stub. A batch runs in the background with bounded concurrency,
+    and failed prompts are reported per request like a provider would.
+    """
+
+    def __init__(self, llm: BaseLanguageModel, max_concurrency: int = 16):
+        self.llm = llm
+        self.model_name = getattr(llm, "model_name", None) or getattr(
+            llm, "model", type(llm).__name__
+        )
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._batches: dict[str, Future] = {}
+
+    def _run(self, prompts: dict[str, str]) -> dict[str, BatchResult]:
+        responses = self.llm.batch(
+            list(prompts.values()),
+            config={"max_concurrency": self.max_concurrency},
+            return_exceptions=True,
+        )
+        return {
+            request_id: BatchResult(error=f"{type(response).__name__}: {response}")
+            if isinstance(response, Exception)
+            else BatchResult(message=response)
+            for request_id, response in zip(prompts, responses)
+        }
+
+    def submit(self, prompts: dict[str, str]) -> str:
+        batch_id = uuid.uuid4().hex
+        self._batches[batch_id] = self._executor.submit(self._run, dict(prompts))
+        return batch_id
+
+    def wait(self, batch_id: str) -> dict[str, BatchResult]:
+        return self._batches.pop(batch_id).result()
+
+
+@dataclass
+class BatchDebate:
+    """One debate of a batch run and the state held for it between batches."""
+
+    id: str
+    topic: str
+    state: dict
+    # Graph step to run next, as (node, input) pairs; empty once finished
+    steps: list[tuple[str, dict]]
+    # Batch results for the step, by prompt_key
+    responses: dict[str, AIMessage] = field(default_factory=dict)
+    failures: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchStats:
+    requests: int
+    failed: int
+    seconds: float
+
+
+class BatchDebateRunner:
+    """
+    Runs many debates in lock-step, one batch submission per graph step.
+
+    Every debate steps through the nodes of its graph, routed by the graph's
+    own edges and routers, until its next LLM call, and the calls of all
+    debates go out together as one batch: first all strategies, then all
+    openings, then all second-round turns and so on. Panel rounds batch
+    every panelist of every debate. Debate state is held between batches.
+    Failed requests are resubmitted with the next batch, and a debate fails
+    after `max_attempts` failures in a row. With a `checkpoint` path the run
+    is saved after every batch and resumed by running the same topics again.
+    """
+
+    GRAPHS = {
+        DebateVariant.SIMPLE: DebateGraph,
+        DebateVariant.STRATEGIC: StrategicDebateGraph,
+        DebateVariant.PANEL: PanelDebateGraph,
+    }
+
+    def __init__(
+        self,
+        endpoint: BatchEndpoint,
+        variant: DebateVariant = DebateVariant.SIMPLE,
+        panel_size: int = 4,
+        checkpoint: Optional[str] = None,
+        max_attempts: int = 3,
+        **graph_options,
+    ):
+        if graph_options.get("call_policy") or graph_options.get("speculation"):
+            raise ValueError(
+                "Batch runs retry through resubmission and do not support "
+                "call policies or speculation."
+            )
+        self.endpoint = endpoint
+        self.variant = variant
+        self.model = BatchChatModel(model_name=endpoint.model_name)
+        self.instrumentation = graph_options.pop("instrumentation", None)
+        self.instrumentation = self.instrumentation or Instrumentation()
+        if variant == DebateVariant.PANEL:
+            graph_options["panel"] = default_panel(panel_size)
+        self.graph = self.GRAPHS[variant](llm=self.model, **graph_options)
+        self.checkpoint = checkpoint
+        self.max_attempts = max_attempts
+        self.batches: list[BatchStats] = []
+
+    def _run_step(self, debate: BatchDebate) -> list[str]:
+        """
+        Run the nodes of the debate's next graph step, or return the prompts
+        they wait for. A panel round runs every panelist, like the compiled
+        graph, and the step's LLM calls are only recorded once it completes.
+        """
+        trial = Instrumentation()
+        prompts, updates = [], []
+        for node, state in debate.steps:
+            try:
+                updates.append(self.graph.run_step(node, copy.deepcopy(state), trial))
+            except PendingPrompt as pending:
+                prompts.append(pending.prompt)
+        if prompts:
+            return prompts
+
+        debate.state = self.graph.apply_updates(debate.state, updates)
+        debate.steps = self.graph.next_steps(
+            debate.state, [node for node, _ in debate.steps]
+        )
+        for record in trial.records:
+            self.instrumentation.record(record)
+        return []
+
+    def _advance(self, debate: BatchDebate) -> list[str]:
+        """Run graph steps until the debate finishes or waits for batch results."""
+        self.model.use(debate.responses)
+        while debate.steps:
+            prompts = self._run_step(debate)
+            if prompts:
+                return prompts
+            debate.responses.clear()
+        return []
+
+    def _save(self, topics: list[str], debates: list[BatchDebate], batch=None):
+        if self.checkpoint is None:
+            return
+        temporary = self.checkpoint + ".tmp"
+        with open(temporary, "wb") as file:
+            pickle.dump({"topics": topics, "debates": debates, "batch": batch}, file)
+        os.replace(temporary, self.checkpoint)
+
+    def _load(self, topics: list[str]) -> Optional[dict]:
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return None
+        with open(self.checkpoint, "rb") as file:
+            saved = pickle.load(file)
+        if saved["topics"] != topics:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint} belongs to a different set of topics."
+            )
+        return saved
+
+    def _apply(
+        self,
+        requests: dict[str, tuple[BatchDebate, str]],
+        results: dict[str, BatchResult],
+    ) -> int:
+        """Hand batch results to their debates and return the failure count."""
+        errors: dict[str, str] = {}
+        for request_id, (debate, prompt) in requests.items():
+            result = results.get(request_id, BatchResult(error="missing result"))
+            if result.message is None:
+                errors.setdefault(debate.id, result.error)
+            else:
+                debate.responses[prompt_key(prompt)] = result.message
+
+        for debate in {debate.id: debate for debate, _ in requests.values()}.values():
+            if debate.id not in errors:
+                debate.failures = 0
+                continue
+            debate.failures += 1
+            if debate.failures >= self.max_attempts:
+                debate.error = (
+                    f"Batch request failed {debate.failures} times: {errors[debate.id]}"
+                )
+                debate.steps = []
+        return sum(
+            results.get(request_id, BatchResult()).message is None
+            for request_id in requests
+        )
+
+    def run(self, topics: list[str], max_steps: int = 3) -> list[dict]:
+        """
+        Run one debate per topic and return their final states in topic
+        order. A failed debate keeps its partial state plus an "error".
+        """
+        topics = list(topics)
+        saved = self._load(topics)
+        if saved is not None:
+            debates = saved["debates"]
+            batch = saved["batch"]
+        else:
+            debates = []
+            for number, topic in enumerate(topics):
+                state = self.graph.initial_state(topic, max_steps)
+                debates.append(
+                    BatchDebate(str(number), topic, state, self.graph.next_steps(state))
+                )
+            batch = None
+
+        if batch is not None:
+            # Resume: collect the batch that was in flight, if the endpoint still has it
+            batch_id, requests = batch
+            try:
+                self._apply(requests, self.endpoint.wait(batch_id))
+            except KeyError:
+                pass
+
+        while True:
+            requests = {}
+            for debate in debates:
+                for number, prompt in enumerate(self._advance(debate)):
+                    requests[f"{debate.id}/{number}"] = (debate, prompt)
+            if not requests:
+                break
+
+            start = time.perf_counter()
+            batch_id = self.endpoint.submit(
+                {request_id: prompt for request_id, (_, prompt) in requests.items()}
+            )
+            self._save(topics, debates, (batch_id, requests))
+            failed = self._apply(requests, self.endpoint.wait(batch_id))
+            self.batches.append(
+                BatchStats(len(requests), failed, time.perf_counter() - start)
+            )
+            self._save(topics, debates)
+
+        self._save(topics, debates)
+        return [self._result(debate) for debate in debates]
+
+    def _result(self, debate: BatchDebate) -> dict:
+        result = dict(debate.state)
+        if "transcript_path" in result:
+            result["transcript"] = finish_transcript(result, self.graph.spill)
+        if debate.error is not None:
+            result["error"] = debate.error
+        return result
@@ -1,37 +1,52 @@
-from langchain_google_genai.chat_models import ChatGoogleGenerativeAI
+from typing import Optional
+
 from langgraph.graph import END, START, StateGraph
 
 from src.agents import AgainstAgent, DebateBaseAgent, FavorAgent, JudgeAgent
+from src.graph.base_graph import DebateBaseGraph
+from src.graph.graph_runtime import runtime_node
+from src.memory.debate_archive import prompt_versions
+from src.memory.transcript_log import (
+    TranscriptSpill,
+    new_transcript_path,
+    spill_turns,
+    transcript_view,
+)
+from src.models.debate_request import DebateVariant
 from src.models.debate_state import AgentRole, DebateState
-from src.utils.print_debate import print_debate
+from src.tools.evidence_retrieval import EvidencePolicy, EvidenceRetriever
 
 
-class DebateGraph:
+class DebateGraph(DebateBaseGraph):
     def __init__(
         self,
-        model_name: str = "gemini-1.5-flash",
-        max_output_tokens: int = 1024,
-        temperature: float = 0.5,
-        verbose: bool = False,
+        spill: Optional[TranscriptSpill] = None,
+        evidence: Optional[EvidencePolicy] = None,
+        **options,
     ):
         """
-        Initialize the DebateGraph with configurable LLM parameters.
+        Initialize the DebateGraph; `options` configure the LLMs and the agent
+        calls, see AgentRuntime. Turns of long debates are spilled to disk
+        with `spill`, and debaters cite retrieved `evidence`.
         """
-        self.model_name = model_name
-        self.max_output_tokens = max_output_tokens
-        self.temperature = temperature
-        self.app = self._build_graph()
-        self.verbose = verbose
-
-
-    def _create_llm(self):
-        """Create and return a configured LLM instance."""
-        return ChatGoogleGenerativeAI(
-            model=self.model_name,
-            max_output_tokens=self.max_output_tokens,
-            temperature=self.temperature,
+        super().__init__(**options)
+        self.spill = spill
+        # The index is opened (memory-mapped) here, not on the first turn
+        self.evidence_retriever = (
+            EvidenceRetriever(evidence, tracer=self.tracer)
+            if evidence is not None
+            else None
         )
 
+    def prompt_versions(self) -> dict[str, str]:
+        return prompt_versions(DebateVariant.SIMPLE)
+
+    def _evidence(self, state: DebateState, speaker: str) -> Optional[str]:
+        """Evidence block for the speaker's turn, if the graph cites evidence."""
+        if self.evidence_retriever is None:
+            return None
+        return self.evidence_retriever.citations(state, speaker)
+
     def _perform_action(self, state: DebateState, agent: DebateBaseAgent) -> str:
         """Perform the action based on the current turn."""
         if state["current_step"] == 1:
@@ -44,9 +59,21 @@ class DebateGraph:
         """Favor agent's turn."""
         llm = self._create_llm()
         state["messages"].append(
-            ("Favor", self._perform_action(state, FavorAgent(llm=llm)))
+            (
+                "Favor",
+                self._perform_action(
+                    state,
+                    FavorAgent(
+                        llm=llm,
+                        evidence=self._evidence(state, "Favor"),
+                        **self._agent_options(),
+                    ),
+                ),
+            )
         )
         state["current_turn"] = AgentRole.AGAINST
+        if self.spill is not None:
+            spill_turns(state, self.spill)
 
         if self.verbose:
             print(f"\033[92mFavor agent: {state['messages'][-1][1]}\033[0m")
@@ -56,10 +83,22 @@ class DebateGraph:
         """Against agent's turn."""
         llm = self._create_llm()
         state["messages"].append(
-            ("Against", self._perform_action(state, AgainstAgent(llm=llm)))
+            (
+                "Against",
+                self._perform_action(
+                    state,
+                    AgainstAgent(
+                        llm=llm,
+                        evidence=self._evidence(state, "Against"),
+                        **self._agent_options(),
+                    ),
+                ),
+            )
         )
         state["current_turn"] = AgentRole.FAVOR
         state["current_step"] += 1
+        if self.spill is not None:
+            spill_turns(state, self.spill)
 
         if self.verbose:
             print(f"\033[92mAgainst agent: {state['messages'][-1][1]}\033[0m")
@@ -67,31 +106,36 @@ class DebateGraph:
 
     def _judge_agent(self, state: DebateState) -> DebateState:
         """Judge agent's turn."""
-        llm = self._create_llm()
-        state["messages"].append(
-            ("Judge", JudgeAgent(llm=llm).judge_and_conclude(state))
-        )
+        verdict = JudgeAgent(**self._judge_options()).judge_and_conclude(state)
+        if self.memory is not None:
+            # The full transcript, with spilled turns read back from the log
+            with transcript_view(state) as transcript:
+                self.memory.remember_debate(state["topic"], transcript, verdict)
+        state["messages"].append(("Judge", verdict))
 
         if self.verbose:
             print(f"\033[92mJudge agent: {state['messages'][-1][1]}\033[0m")
         return state
 
-    def _is_favor_turn(self, state: DebateState) -> bool:
+    @staticmethod
+    def _is_favor_turn(state: DebateState) -> bool:
         """Check if it's favor agent's turn."""
         return state["current_turn"] == AgentRole.FAVOR
 
-    def _is_complete(self, state: DebateState) -> bool:
+    @staticmethod
+    def _is_complete(state: DebateState) -> bool:
         """Check if debate is complete."""
         return state["current_step"] > state["max_steps"]
 
-    def _build_graph(self):
+    @classmethod
+    def _build_graph(cls):
         """Build and compile the debate graph."""
         graph = StateGraph(DebateState)
 
         # Add nodes
-        graph.add_node("favor_agent", self._favor_agent)
-        graph.add_node("against_agent", self._against_agent)
-        graph.add_node("judge_agent", self._judge_agent)
+        graph.add_node("favor_agent", runtime_node("_favor_agent"))
+        graph.add_node("against_agent", runtime_node("_against_agent"))
+        graph.add_node("judge_agent", runtime_node("_judge_agent"))
         graph.add_node("agent_turn_check", lambda state: state)
         graph.add_node("debate_complete_check", lambda state: state)
 
@@ -99,12 +143,12 @@ class DebateGraph:
         graph.add_edge(START, "agent_turn_check")
         graph.add_conditional_edges(
             "agent_turn_check",
-            self._is_favor_turn,
+            cls._is_favor_turn,
             {True: "favor_agent", False: "against_agent"},
         )
         graph.add_conditional_edges(
             "debate_complete_check",
-            self._is_complete,
+            cls._is_complete,
             {True: "judge_agent", False: "agent_turn_check"},
         )
         graph.add_edge("favor_agent", "debate_complete_check")
@@ -113,18 +157,9 @@ class DebateGraph:
 
         return graph.compile()
 
-    def run_debate(self, topic: str, max_steps: int = 3) -> dict:
-        """
-        Run a debate on the given topic.
-
-        Args:
-            topic: The debate topic
-            max_steps: Maximum number of debate rounds
-
-        Returns:
-            Dictionary containing the debate results
-        """
-        initial_state = {
+    def _initial_state(self, topic: str, max_steps: int) -> DebateState:
+        """Create the initial state for a debate."""
+        state: DebateState = {
             "topic": topic,
             "favor_strategy": "",
             "against_strategy": "",
@@ -133,15 +168,11 @@ class DebateGraph:
             "current_step": 1,
             "max_steps": max_steps,
         }
-        return self.app.invoke(initial_state)
-
-    def print_debate(self, result: dict):
-        """Print the debate messages in a formatted way with enhanced colors and styling.""" # noqa: E501
-        print_debate(result)
-
-    def get_graph(self):
-        """Get the underlying graph for visualization or further manipulation."""
-        return self.app.get_graph().draw_mermaid_png()
+        if self.spill is not None:
+            state["transcript_path"] = new_transcript_path(self.spill.directory)
+            state["summaries"] = []
+            state["spilled_turns"] = 0
+        return state
 
 
 # Usage example
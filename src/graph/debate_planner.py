@@ -0,0 +1,464 @@
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from langchain_core.prompts import PromptTemplate
+from pydantic import BaseModel
+
+from src.graph.panel_debate_graph import default_panel
+from src.models.agent_config import AgentConfig
+from src.models.debate_request import DebateVariant
+from src.models.debate_state import AgentRole, DebatePhase
+from src.prompts.action_prompts import ActionPrompts, PanelActionPrompts
+from src.prompts.agent_prompts import (
+    AGAINST_AGENT_SYSTEM_PROMPT,
+    FAVOR_AGENT_SYSTEM_PROMPT,
+    JUDGE_AGENT_SYSTEM_PROMPT,
+    PANEL_JUDGE_SYSTEM_PROMPT,
+)
+from src.prompts.prompt_layout import format_transcript, render_prompt
+from src.prompts.strategic_action_prompts import StrategicActionPrompts
+from src.utils.tokens import estimate_tokens, word_limit, words_to_tokens
+
+
+class ModelProfile(BaseModel):
+    """Context window, prices and latency of a model, for planning."""
+
+    context_window: int
+    # USD per million tokens
+    input_price: float
+    output_price: float
+    # Fixed time to first token plus prompt processing and generation time
+    call_overhead: float = 0.4
+    prompt_tokens_per_second: float = 20_000
+    completion_tokens_per_second: float = 150
+
+    def call_latency(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (
+            self.call_overhead
+            + prompt_tokens / self.prompt_tokens_per_second
+            + completion_tokens / self.completion_tokens_per_second
+        )
+
+
+MODEL_PROFILES = {
+    "gemini-1.5-flash": ModelProfile(
+        context_window=1_048_576, input_price=0.075, output_price=0.3
+    ),
+    "gemini-1.5-flash-8b": ModelProfile(
+        context_window=1_048_576,
+        input_price=0.0375,
+        output_price=0.15,
+        completion_tokens_per_second=250,
+    ),
+    "gemini-1.5-pro": ModelProfile(
+        context_window=2_097_152,
+        input_price=1.25,
+        output_price=5.0,
+        completion_tokens_per_second=60,
+    ),
+}
+
+
+@dataclass
+class PlannedCall:
+    """One LLM call of a planned debate. Calls of the same stage run in parallel."""
+
+    stage: int
+    round: int
+    phase: DebatePhase
+    speaker: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency: float
+    # The reply's word limit does not fit in max_output_tokens
+    truncated: bool = False
+
+
+@dataclass
+class DebatePlan:
+    """Estimated calls, tokens, cost and latency of one debate."""
+
+    topic: str
+    variant: DebateVariant
+    max_steps: int
+    model_name: str
+    context_window: int
+    calls: list[PlannedCall]
+    cost: float
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(call.prompt_tokens for call in self.calls)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(call.completion_tokens for call in self.calls)
+
+    @property
+    def max_prompt_tokens(self) -> int:
+        return max(call.prompt_tokens for call in self.calls)
+
+    @property
+    def critical_path_latency(self) -> float:
+        """Sum over sequential stages of the slowest call in the stage."""
+        stages: dict[int, float] = {}
+        for call in self.calls:
+            stages[call.stage] = max(stages.get(call.stage, 0.0), call.latency)
+        return sum(stages.values())
+
+    def phase_totals(self) -> dict[str, dict]:
+        """Calls and tokens per debate phase."""
+        totals: dict[str, dict] = {}
+        for call in self.calls:
+            phase = totals.setdefault(
+                call.phase.value,
+                {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0},
+            )
+            phase["calls"] += 1
+            phase["prompt_tokens"] += call.prompt_tokens
+            phase["completion_tokens"] += call.completion_tokens
+        return totals
+
+
+class _Transcript:
+    """Token count of a transcript, grown turn by turn without its text."""
+
+    EMPTY_TOKENS = estimate_tokens(format_transcript([]))
+
+    def __init__(self):
+        self.tokens = 0
+
+    def append(self, speaker: str, completion_tokens: int):
+        self.tokens += estimate_tokens(f"{speaker}:") + completion_tokens
+
+    def prompt_tokens(self) -> int:
+        return self.tokens or self.EMPTY_TOKENS
+
+
+class DebatePlanner:
+    """
+    Estimates a debate before running it, without any LLM calls.
+
+    The planner walks the same turn sequence as the debate graphs and renders
+    the real prompt templates and system prompts. Text the models have not
+    written yet (transcripts, strategies, verdicts) is counted from the word
+    limit of the prompt that produces it, capped at `max_output_tokens`.
+    Prompt caching, speculation and transcript spilling are not modelled, so
+    the estimate is an upper bound for debates that use them.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "gemini-1.5-flash",
+        max_output_tokens: int = 1024,
+        use_strategic_prompt: bool = True,
+        profile: Optional[ModelProfile] = None,
+        panel: Optional[list[AgentConfig]] = None,
+        judge_model_name: Optional[str] = None,
+    ):
+        if profile is None and model_name not in MODEL_PROFILES:
+            raise ValueError(
+                f"No profile for model {model_name!r}; pass a ModelProfile."
+            )
+        if judge_model_name and judge_model_name not in MODEL_PROFILES:
+            raise ValueError(f"No profile for judge model {judge_model_name!r}.")
+        self.model_name = model_name
+        self.max_output_tokens = max_output_tokens
+        self.use_strategic_prompt = use_strategic_prompt
+        self.profile = profile or MODEL_PROFILES[model_name]
+        # Verdicts and analyses run on the judge model, if it has its own
+        self.judge_profile = (
+            MODEL_PROFILES[judge_model_name] if judge_model_name else self.profile
+        )
+        self.panel = panel
+
+    def _profile_for(self, phase: DebatePhase) -> ModelProfile:
+        if phase in (DebatePhase.VERDICT, DebatePhase.META_ANALYSIS):
+            return self.judge_profile
+        return self.profile
+
+    def plan(
+        self,
+        topic: str,
+        max_steps: int = 3,
+        variant: DebateVariant = DebateVariant.SIMPLE,
+        panel_size: int = 4,
+    ) -> DebatePlan:
+        # Accept variant names, e.g. from a CLI or a request body
+        variant = DebateVariant(variant)
+        calls: list[PlannedCall] = []
+        if variant == DebateVariant.PANEL:
+            self._plan_panel(calls, topic, max_steps, panel_size)
+        else:
+            self._plan_two_party(
+                calls, topic, max_steps, variant == DebateVariant.STRATEGIC
+            )
+
+        profile = self.profile
+        plan = DebatePlan(
+            topic=topic,
+            variant=variant,
+            max_steps=max_steps,
+            model_name=self.model_name,
+            context_window=profile.context_window,
+            calls=calls,
+            cost=sum(
+                call.prompt_tokens * self._profile_for(call.phase).input_price
+                + call.completion_tokens * self._profile_for(call.phase).output_price
+                for call in calls
+            )
+            / 1_000_000,
+        )
+        plan.warnings = self._warnings(plan)
+        return plan
+
+    def plan_many(
+        self,
+        topics: Iterable[str],
+        max_steps: int = 3,
+        variant: DebateVariant = DebateVariant.SIMPLE,
+        panel_size: int = 4,
+    ) -> list[DebatePlan]:
+        return [self.plan(topic, max_steps, variant, panel_size) for topic in topics]
+
+    def _call(
+        self,
+        calls: list[PlannedCall],
+        stage: int,
+        round_number: int,
+        phase: DebatePhase,
+        speaker: str,
+        template: PromptTemplate,
+        fields: dict,
+        unwritten: Optional[dict[str, int]] = None,
+    ) -> int:
+        """
+        Plan one call and return its completion tokens. `unwritten` maps the
+        template fields holding model output to their estimated token counts.
+        """
+        unwritten = unwritten or {}
+        prompt = render_prompt(template, **fields, **dict.fromkeys(unwritten, ""))
+        prompt_tokens = estimate_tokens(prompt.text) + sum(unwritten.values())
+        limit = word_limit(prompt.text)
+        wanted = words_to_tokens(limit) if limit else self.max_output_tokens
+        completion_tokens = min(wanted, self.max_output_tokens)
+        calls.append(
+            PlannedCall(
+                stage=stage,
+                round=round_number,
+                phase=phase,
+                speaker=speaker,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                latency=self._profile_for(phase).call_latency(
+                    prompt_tokens, completion_tokens
+                ),
+                truncated=wanted > self.max_output_tokens,
+            )
+        )
+        return completion_tokens
+
+    def _plan_two_party(
+        self, calls: list[PlannedCall], topic: str, max_steps: int, strategic: bool
+    ):
+        """Mirror DebateGraph, or StrategicDebateGraph when `strategic`."""
+        use_strategic = strategic and self.use_strategic_prompt
+        debaters = (
+            ("Favor", AgentRole.FAVOR, FAVOR_AGENT_SYSTEM_PROMPT),
+            ("Against", AgentRole.AGAINST, AGAINST_AGENT_SYSTEM_PROMPT),
+        )
+        transcript = _Transcript()
+        strategies = {}
+        stage = 0
+
+        for round_number in range(1, max_steps + 1):
+            for name, role, system_prompt in debaters:
+                fields = {
+                    "system_prompt": system_prompt,
+                    "role": role.value,
+                    "topic": topic,
+                }
+                # Same as DebateBaseAgent._position
+                strategic_fields = {
+                    "position": "In favor to topic"
+                    if role == AgentRole.FAVOR
+                    else "Against the topic",
+                    "total_rounds": max_steps,
+                }
+                if round_number == 1 and strategic:
+                    strategies[role] = self._call(
+                        calls,
+                        stage,
+                        round_number,
+                        DebatePhase.STRATEGY,
+                        name,
+                        StrategicActionPrompts.create_strategy_formulation_prompt()
+                        if use_strategic
+                        else ActionPrompts.create_strategy_prompt(),
+                        fields | (strategic_fields if use_strategic else {}),
+                    )
+                    stage += 1
+
+                if not use_strategic:
+                    if round_number == 1:
+                        phase = DebatePhase.OPENING
+                        template = ActionPrompts.create_introduction_prompt()
+                        unwritten = {}
+                    else:
+                        if round_number < max_steps:
+                            phase = DebatePhase.ARGUMENT
+                            template = ActionPrompts.create_argument_template()
+                        else:
+                            phase = DebatePhase.CONCLUSION
+                            template = ActionPrompts.create_conclude_prompt()
+                        unwritten = {"messages": transcript.prompt_tokens()}
+                else:
+                    fields |= strategic_fields
+                    unwritten = {"strategy": strategies[role]}
+                    if round_number == 1:
+                        phase = DebatePhase.OPENING
+                        template = StrategicActionPrompts.create_opening_prompt()
+                    elif round_number < max_steps:
+                        phase = DebatePhase.ARGUMENT
+                        template = (
+                            StrategicActionPrompts.create_middle_argument_prompt()
+                        )
+                        fields |= {
+                            "current_round": round_number,
+                            "rounds_remaining": max_steps - round_number,
+                        }
+                        unwritten["messages"] = transcript.prompt_tokens()
+                    else:
+                        phase = DebatePhase.CONCLUSION
+                        template = StrategicActionPrompts.create_conclusion_prompt()
+                        unwritten["messages"] = transcript.prompt_tokens()
+
+                completion_tokens = self._call(
+                    calls, stage, round_number, phase, name, template, fields, unwritten
+                )
+                transcript.append(name, completion_tokens)
+                stage += 1
+
+        judge_fields = {"system_prompt": JUDGE_AGENT_SYSTEM_PROMPT, "topic": topic}
+        verdict = self._call(
+            calls,
+            stage,
+            max_steps,
+            DebatePhase.VERDICT,
+            "Judge",
+            StrategicActionPrompts.create_judge_evaluation_prompt()
+            if use_strategic
+            else ActionPrompts.judge_and_conclude_prompt(),
+            judge_fields,
+            {"messages": transcript.prompt_tokens()},
+        )
+        if strategic:
+            self._call(
+                calls,
+                stage + 1,
+                max_steps,
+                DebatePhase.META_ANALYSIS,
+                "Judge Analysis",
+                StrategicActionPrompts.create_meta_analysis_prompt(),
+                judge_fields,
+                {
+                    "messages": transcript.prompt_tokens(),
+                    "strategy_1": strategies.get(AgentRole.FAVOR, 0),
+                    "strategy_2": strategies.get(AgentRole.AGAINST, 0),
+                    "judge_verdict": verdict,
+                },
+            )
+
+    def _plan_panel(
+        self, calls: list[PlannedCall], topic: str, max_steps: int, panel_size: int
+    ):
+        """Mirror PanelDebateGraph: every round is one parallel stage."""
+        panel = self.panel or default_panel(panel_size)
+        participants = ", ".join(config.name for config in panel)
+        transcript = _Transcript()
+
+        for round_number in range(1, max_steps + 1):
+            round_tokens = []
+            for config in panel:
+                fields = {
+                    "system_prompt": config.system_prompt,
+                    "name": config.name,
+                    "participants": participants,
+                    "topic": topic,
+                }
+                unwritten = {"messages": transcript.prompt_tokens()}
+                if round_number == 1:
+                    phase = DebatePhase.OPENING
+                    template = PanelActionPrompts.create_opening_prompt()
+                    unwritten = {}
+                elif round_number < max_steps:
+                    phase = DebatePhase.ARGUMENT
+                    template = PanelActionPrompts.create_rebuttal_prompt()
+                    fields |= {
+                        "current_round": round_number,
+                        "total_rounds": max_steps,
+                        "previous_speakers": ", ".join(
+                            other.name for other in panel if other is not config
+                        ),
+                    }
+                else:
+                    phase = DebatePhase.CONCLUSION
+                    template = PanelActionPrompts.create_conclusion_prompt()
+                round_tokens.append(
+                    (
+                        config.name,
+                        self._call(
+                            calls,
+                            round_number - 1,
+                            round_number,
+                            phase,
+                            config.name,
+                            template,
+                            fields,
+                            unwritten,
+                        ),
+                    )
+                )
+            for name, completion_tokens in round_tokens:
+                transcript.append(name, completion_tokens)
+
+        self._call(
+            calls,
+            max_steps,
+            max_steps,
+            DebatePhase.VERDICT,
+            "Judge",
+            PanelActionPrompts.judge_panel_prompt(),
+            {
+                "system_prompt": PANEL_JUDGE_SYSTEM_PROMPT,
+                "topic": topic,
+                "participants": participants,
+                "participant_count": len(panel),
+            },
+            {"messages": transcript.prompt_tokens()},
+        )
+
+    def _warnings(self, plan: DebatePlan) -> list[str]:
+        warnings = []
+        window = plan.context_window
+        over = [
+            call
+            for call in plan.calls
+            if call.prompt_tokens + call.completion_tokens > window
+        ]
+        if over:
+            first = over[0]
+            warnings.append(
+                f"{len(over)} calls exceed the {window}-token context window of "
+                f"{plan.model_name}, from round {first.round} "
+                f"({first.phase.value}, ~{first.prompt_tokens} prompt tokens); "
+                "use fewer rounds or spill the transcript"
+            )
+        truncated = {call.phase.value for call in plan.calls if call.truncated}
+        if truncated:
+            warnings.append(
+                f"{', '.join(sorted(truncated))} replies may be cut off at "
+                f"max_output_tokens={self.max_output_tokens}"
+            )
+        return warnings
@@ -0,0 +1,97 @@
+from typing import Optional
+
+from langchain_core.language_models import BaseLanguageModel
+
+from src.graph.debate_graph import DebateGraph
+from src.graph.debate_planner import MODEL_PROFILES, DebatePlanner
+from src.graph.panel_debate_graph import PanelDebateGraph, default_panel
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.memory.agent_memory import open_agent_memory
+from src.memory.strategy_store import StrategyStore
+from src.models.debate_profile import DebateProfile
+from src.models.debate_request import DebateVariant
+
+# Stand-in topic for checking budgets before any topic is known
+BUDGET_TOPIC = "Should governments regulate the development of artificial intelligence?"
+
+
+def create_graph(variant: DebateVariant, panel_size: int = 4, **options):
+    """Create the debate graph for a variant."""
+    if variant == DebateVariant.STRATEGIC:
+        return StrategicDebateGraph(**options)
+    if variant == DebateVariant.PANEL:
+        return PanelDebateGraph(panel=default_panel(panel_size), **options)
+    return DebateGraph(**options)
+
+
+def profile_options(
+    profile: DebateProfile,
+    variant: Optional[DebateVariant] = None,
+    llm: Optional[BaseLanguageModel] = None,
+) -> dict:
+    """
+    Graph options for a profile and variant (the profile's by default).
+    With `llm` every role runs on it, e.g. on the offline stub.
+    """
+    variant = variant or profile.variant
+    options = {
+        "model_name": profile.models.debater,
+        "judge_model_name": profile.models.judge,
+        "temperature": profile.temperature,
+        "max_output_tokens": profile.max_output_tokens,
+        "use_context_cache": profile.context.use_context_cache,
+        "call_policy": profile.call_policy,
+        "load_balancer": profile.load_balancer,
+        "speculation": profile.speculation,
+    }
+    if variant != DebateVariant.PANEL:
+        options["spill"] = profile.context.spill
+        options["evidence"] = profile.context.evidence
+    if variant == DebateVariant.STRATEGIC:
+        options["use_strategic_prompt"] = profile.use_strategic_prompt
+        if profile.strategy_store:
+            options["strategy_store"] = StrategyStore(profile.strategy_store)
+    if profile.agent_memory:
+        options["memory"] = open_agent_memory(
+            profile.agent_memory, profile.agent_memory_max_entries
+        )
+    if llm is not None:
+        options |= {"llm": llm, "judge_llm": llm, "fallback_llm": llm, "draft_llm": llm}
+    return options
+
+
+def check_budget(
+    profile: DebateProfile,
+    variant: Optional[DebateVariant] = None,
+    max_steps: Optional[int] = None,
+    panel_size: Optional[int] = None,
+    topic: str = BUDGET_TOPIC,
+):
+    """
+    Raise ValueError if a debate with the profile would exceed its budget.
+    The cost is planned without LLM calls; it is only checked for models the
+    planner has a profile for.
+    """
+    budget = profile.budget
+    max_steps = max_steps or profile.max_steps
+    if budget.max_steps is not None and max_steps > budget.max_steps:
+        raise ValueError(
+            f"{max_steps} steps exceed the profile budget of {budget.max_steps}"
+        )
+    models = [profile.models.debater, profile.models.judge or profile.models.debater]
+    if budget.max_cost_per_debate is None or not set(models) <= set(MODEL_PROFILES):
+        return
+    planner = DebatePlanner(
+        model_name=profile.models.debater,
+        judge_model_name=profile.models.judge,
+        max_output_tokens=profile.max_output_tokens,
+        use_strategic_prompt=profile.use_strategic_prompt,
+    )
+    plan = planner.plan(
+        topic, max_steps, variant or profile.variant, panel_size or profile.panel_size
+    )
+    if plan.cost > budget.max_cost_per_debate:
+        raise ValueError(
+            f"Planned cost ${plan.cost:.4f} exceeds the profile budget of "
+            f"${budget.max_cost_per_debate:.4f} per debate"
+        )
@@ -0,0 +1,258 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Callable, Iterable, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_google_genai.chat_models import ChatGoogleGenerativeAI
+from pydantic import BaseModel, ConfigDict
+
+from src.chains.reference_judge import DebateScores, score_debates
+from src.graph.debate_planner import MODEL_PROFILES
+from src.graph.debate_profiles import create_graph
+from src.memory.response_cache import CachedChatModel, ResponseCache
+from src.models.debate_request import DebateVariant
+from src.utils.instrumentation import Instrumentation
+
+DEFAULT_REFERENCE_MODEL = "gemini-1.5-pro"
+
+
+class EvaluationConfig(BaseModel):
+    """One point of an evaluation grid: the settings a debate runs with."""
+
+    model_config = ConfigDict(frozen=True)
+
+    variant: DebateVariant = DebateVariant.SIMPLE
+    max_steps: int = 3
+    model_name: str = "gemini-1.5-flash"
+    max_output_tokens: int = 1024
+
+    @property
+    def label(self) -> str:
+        return (
+            f"{self.variant.value} {self.max_steps}r {self.model_name} "
+            f"{self.max_output_tokens}t"
+        )
+
+
+def config_grid(
+    variants: Iterable[DebateVariant] = (
+        DebateVariant.SIMPLE,
+        DebateVariant.STRATEGIC,
+    ),
+    steps: Iterable[int] = (3,),
+    models: Iterable[str] = ("gemini-1.5-flash",),
+    max_output_tokens: Iterable[int] = (1024,),
+) -> list[EvaluationConfig]:
+    """Every combination of the given settings."""
+    return [
+        EvaluationConfig(
+            variant=variant,
+            max_steps=max_steps,
+            model_name=model_name,
+            max_output_tokens=tokens,
+        )
+        for variant, max_steps, model_name, tokens in product(
+            variants, steps, models, max_output_tokens
+        )
+    ]
+
+
+@dataclass
+class DebateEvaluation:
+    """Latency, tokens, cost and reference scores of one evaluated debate."""
+
+    config: EvaluationConfig
+    topic: str
+    # Seconds the debate would take without the response cache
+    latency: float = 0.0
+    calls: int = 0
+    cached_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Cost of all calls, as if the debate ran alone, and of the calls made
+    cost: float = 0.0
+    spent: float = 0.0
+    scores: Optional[DebateScores] = None
+    error: Optional[str] = None
+    judge_error: Optional[str] = None
+
+
+def _mean(values: list[float]) -> Optional[float]:
+    return sum(values) / len(values) if values else None
+
+
+@dataclass
+class ConfigResult:
+    """Evaluated debates of a configuration, averaged over the topic set."""
+
+    config: EvaluationConfig
+    debates: list[DebateEvaluation] = field(default_factory=list)
+    # Not dominated in quality, latency and cost by another configuration
+    pareto: bool = False
+
+    @property
+    def quality(self) -> Optional[float]:
+        return _mean([d.scores.overall for d in self.debates if d.scores])
+
+    @property
+    def latency(self) -> Optional[float]:
+        return _mean([d.latency for d in self.debates if d.error is None])
+
+    @property
+    def tokens(self) -> Optional[float]:
+        return _mean(
+            [
+                d.prompt_tokens + d.completion_tokens
+                for d in self.debates
+                if d.error is None
+            ]
+        )
+
+    @property
+    def cost(self) -> Optional[float]:
+        return _mean([d.cost for d in self.debates if d.error is None])
+
+    @property
+    def failed(self) -> int:
+        return sum(d.scores is None for d in self.debates)
+
+    def dominates(self, other: "ConfigResult") -> bool:
+        ours = (-self.quality, self.latency, self.cost)
+        theirs = (-other.quality, other.latency, other.cost)
+        return ours != theirs and all(a <= b for a, b in zip(ours, theirs))
+
+
+def pareto_front(results: list[ConfigResult]) -> list[ConfigResult]:
+    """
+    Mark and return the configurations no other one beats on quality,
+    latency and cost at once, cheapest first. Configurations without any
+    scored debate are left out.
+    """
+    scored = [result for result in results if result.quality is not None]
+    for result in results:
+        result.pareto = result in scored and not any(
+            other.dominates(result) for other in scored
+        )
+    return sorted((r for r in results if r.pareto), key=lambda r: (r.cost, r.latency))
+
+
+def default_llm(config: EvaluationConfig) -> BaseChatModel:
+    return ChatGoogleGenerativeAI(
+        model=config.model_name,
+        max_output_tokens=config.max_output_tokens,
+        temperature=0.5,
+    )
+
+
+class EvaluationHarness:
+    """
+    Quality-vs-latency evaluation of debate configurations over a fixed
+    topic set.
+
+    Every debate runs on a model from `create_llm(config)` behind a shared
+    ResponseCache, so a call whose prompt was already sent by another
+    configuration is answered from the cache. Calls are keyed without the
+    output limit (see CachedChatModel), and configurations with higher
+    limits run first, so a lower-limit configuration gets the same turns cut
+    at its limit for as long as its prompts match; simple debates also share
+    their openings across round counts. Strategic prompts name the number of
+    rounds, so their turns are only shared between configurations with the
+    same round count. Configurations that share a prefix thus also share its
+    sampled turns, which makes their comparison paired. With a cache `path`
+    a rerun of the sweep only makes the calls it has not made before.
+    Latency and cost count cached calls as if they were made, so every
+    configuration is measured as if it ran alone.
+
+    Finished debates are scored by the reference judge on
+    `reference_llm`, which should stay fixed (and at temperature 0) across
+    sweeps that are compared.
+    """
+
+    def __init__(
+        self,
+        topics: list[str],
+        reference_llm: BaseChatModel,
+        create_llm: Callable[[EvaluationConfig], BaseChatModel] = default_llm,
+        responses: Optional[ResponseCache] = None,
+        max_workers: int = 4,
+        prices: Optional[dict[str, tuple[float, float]]] = None,
+    ):
+        self.topics = topics
+        self.create_llm = create_llm
+        self.responses = responses if responses is not None else ResponseCache()
+        self.reference_llm = CachedChatModel(
+            llm=reference_llm, responses=self.responses
+        )
+        self.max_workers = max_workers
+        self.prices = prices or {
+            name: (profile.input_price, profile.output_price)
+            for name, profile in MODEL_PROFILES.items()
+        }
+
+    def _run_debate(
+        self, config: EvaluationConfig, llm: BaseChatModel, topic: str
+    ) -> tuple[DebateEvaluation, Optional[dict]]:
+        # A cached model per debate, so its cache hits are the debate's own
+        llm = CachedChatModel(llm=llm, responses=self.responses)
+        instrumentation = Instrumentation()
+        graph = create_graph(
+            config.variant,
+            model_name=config.model_name,
+            max_output_tokens=config.max_output_tokens,
+            llm=llm,
+            instrumentation=instrumentation,
+        )
+        evaluation = DebateEvaluation(config, topic)
+        start = time.perf_counter()
+        try:
+            state = graph.run_debate(topic, config.max_steps)
+        except Exception as error:
+            evaluation.error = f"{type(error).__name__}: {error}"
+            return evaluation, None
+        summary = instrumentation.summary()
+        evaluation.latency = time.perf_counter() - start + llm.saved_latency
+        evaluation.calls = llm.calls
+        evaluation.cached_calls = llm.hits
+        evaluation.prompt_tokens = summary["prompt_tokens"]
+        evaluation.completion_tokens = summary["completion_tokens"]
+        evaluation.cost = instrumentation.cost(self.prices)
+        input_price, output_price = self.prices.get(config.model_name, (0.0, 0.0))
+        made = llm.made_usage
+        evaluation.spent = (
+            made.prompt_tokens * input_price + made.completion_tokens * output_price
+        ) / 1_000_000
+        return evaluation, state
+
+    def run(self, configs: list[EvaluationConfig]) -> list[ConfigResult]:
+        """Evaluate the configurations and mark their Pareto frontier."""
+        llms = {config: self.create_llm(config) for config in configs}
+        # Replies made under higher output limits serve the lower ones, cut
+        debates = sorted(
+            product(configs, self.topics), key=lambda pair: -pair[0].max_output_tokens
+        )
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            runs = list(
+                executor.map(
+                    lambda pair: self._run_debate(pair[0], llms[pair[0]], pair[1]),
+                    debates,
+                )
+            )
+        finished = [(evaluation, state) for evaluation, state in runs if state]
+        scores = score_debates(
+            self.reference_llm,
+            [state for _, state in finished],
+            max_concurrency=self.max_workers,
+        )
+        for (evaluation, _), score in zip(finished, scores):
+            if isinstance(score, Exception):
+                evaluation.judge_error = f"{type(score).__name__}: {score}"
+            else:
+                evaluation.scores = score
+
+        results = {config: ConfigResult(config) for config in configs}
+        for evaluation, _ in runs:
+            results[evaluation.config].debates.append(evaluation)
+        pareto_front(list(results.values()))
+        return list(results.values())
@@ -0,0 +1,213 @@
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from src.graph.graph_runtime import compiled_graph
+from src.utils.profiling import GRAPH_PHASE, DebateProfiler
+from src.utils.tracing import Span
+
+# Span names that are not graph nodes
+_RUN_SPAN = "run_debate"
+_CALL_SPAN = "llm_call"
+
+
+class DiagramFormat(Enum):
+    MERMAID = "mermaid"
+    DOT = "dot"
+    ASCII = "ascii"
+
+
+@dataclass
+class NodeStats:
+    """Runs, wall time and LLM calls of a graph node over one or more runs."""
+
+    runs: int = 0
+    seconds: float = 0.0
+    llm_calls: int = 0
+    errors: int = 0
+
+    @property
+    def mean(self) -> float:
+        return self.seconds / self.runs if self.runs else 0.0
+
+
+@dataclass(frozen=True)
+class GraphShape:
+    """Nodes and edges of a compiled graph; conditional edges have a label."""
+
+    name: str
+    nodes: tuple[str, ...]
+    # (source, target, conditional, label)
+    edges: tuple[tuple[str, str, bool, Optional[str]], ...]
+
+
+@lru_cache(maxsize=None)
+def graph_shape(graph_class: type) -> GraphShape:
+    """The topology of a debate graph class, read once per process."""
+    drawable = compiled_graph(graph_class).get_graph()
+    return GraphShape(
+        name=graph_class.__name__,
+        nodes=tuple(drawable.nodes),
+        edges=tuple(
+            (
+                edge.source,
+                edge.target,
+                edge.conditional,
+                None if edge.data is None else str(edge.data),
+            )
+            for edge in drawable.edges
+        ),
+    )
+
+
+def node_stats_from_spans(spans: Iterable[Span]) -> dict[str, NodeStats]:
+    """Per node stats from the spans of traced runs, see src.utils.tracing."""
+    spans = list(spans)
+    runs = {span.span_id for span in spans if span.name == _RUN_SPAN}
+    nodes = {
+        span.span_id: span
+        for span in spans
+        if span.parent_id in runs and span.name != _CALL_SPAN
+    }
+    stats: dict[str, NodeStats] = {}
+    for span in nodes.values():
+        entry = stats.setdefault(span.name, NodeStats())
+        entry.runs += 1
+        entry.seconds += span.duration
+        entry.errors += span.error is not None
+    for span in spans:
+        if span.name == _CALL_SPAN and span.parent_id in nodes:
+            stats[nodes[span.parent_id].name].llm_calls += 1
+    return stats
+
+
+def node_stats_from_profile(profiler: DebateProfiler) -> dict[str, NodeStats]:
+    """Per node stats from a profiled session, see src.utils.profiling."""
+    stats: dict[str, NodeStats] = {}
+    for entry in profiler.entries.values():
+        if entry.phase == "-":
+            continue
+        node = stats.setdefault(entry.node, NodeStats())
+        node.seconds += entry.wall
+        if entry.phase == GRAPH_PHASE:
+            node.runs += entry.calls
+        else:
+            node.llm_calls += entry.calls
+    return stats
+
+
+def _annotation(stats: Optional[NodeStats], total: float) -> Optional[str]:
+    if stats is None or not stats.runs:
+        return None
+    share = f" ({stats.seconds / total:.0%})" if total else ""
+    text = (
+        f"{stats.runs} runs, {stats.seconds:.2f}s{share}, "
+        f"mean {stats.mean * 1000:.0f} ms, {stats.llm_calls} LLM calls"
+    )
+    return text + (f", {stats.errors} errors" if stats.errors else "")
+
+
+def _heat(stats: Optional[NodeStats], total: float) -> str:
+    """Fill colour from pale to red with the node's share of the time."""
+    share = stats.seconds / total if stats and total else 0.0
+    green_blue = round(242 - 150 * share)
+    return f"#f2{green_blue:02x}{green_blue:02x}"
+
+
+def _mermaid(
+    shape: GraphShape, overlay: Optional[dict[str, NodeStats]], total: float
+) -> str:
+    lines = ["graph TD;"]
+    for node in shape.nodes:
+        if node.startswith("__"):
+            lines.append(f"\t{node}([{node.strip('_')}])")
+            continue
+        note = _annotation(overlay.get(node), total) if overlay else None
+        label = f"{node}<br/><small>{note}</small>" if note else node
+        lines.append(f'\t{node}("{label}")')
+    for source, target, conditional, label in shape.edges:
+        if conditional:
+            arrow = f"-. {label} .->" if label else "-.->"
+        else:
+            arrow = f"-- {label} -->" if label else "-->"
+        lines.append(f"\t{source} {arrow} {target};")
+    if overlay:
+        lines += [
+            f"\tstyle {node} fill:{_heat(overlay.get(node), total)}"
+            for node in shape.nodes
+            if not node.startswith("__")
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def _dot(
+    shape: GraphShape, overlay: Optional[dict[str, NodeStats]], total: float
+) -> str:
+    lines = [
+        f"digraph {shape.name} {{",
+        "\trankdir=TB;",
+        '\tnode [shape=box, style="rounded,filled", fillcolor="#f2f0ff", '
+        'fontname="Helvetica"];',
+    ]
+    for node in shape.nodes:
+        if node.startswith("__"):
+            lines.append(f'\t"{node}" [label="{node.strip("_")}", shape=oval];')
+            continue
+        note = _annotation(overlay.get(node), total) if overlay else None
+        attributes = f'label="{node}\\n{note}"' if note else f'label="{node}"'
+        if overlay:
+            attributes += f', fillcolor="{_heat(overlay.get(node), total)}"'
+        lines.append(f'\t"{node}" [{attributes}];')
+    for source, target, conditional, label in shape.edges:
+        attributes = ["style=dashed"] if conditional else []
+        if label:
+            attributes.append(f'label="{label}"')
+        suffix = f" [{', '.join(attributes)}]" if attributes else ""
+        lines.append(f'\t"{source}" -> "{target}"{suffix};')
+    return "\n".join(lines + ["}"]) + "\n"
+
+
+def _ascii(
+    shape: GraphShape, overlay: Optional[dict[str, NodeStats]], total: float
+) -> str:
+    lines = [shape.name]
+    for node in shape.nodes:
+        note = _annotation(overlay.get(node), total) if overlay else None
+        lines.append(f"[{node}]" + (f"  {note}" if note else ""))
+        for source, target, conditional, label in shape.edges:
+            if source == node:
+                arrow = f"--{label}-->" if label else "-->"
+                lines.append(f"  {'?' if conditional else ' '}{arrow} {target}")
+    return "\n".join(lines) + "\n"
+
+
+_RENDERERS = {
+    DiagramFormat.MERMAID: _mermaid,
+    DiagramFormat.DOT: _dot,
+    DiagramFormat.ASCII: _ascii,
+}
+
+
+@lru_cache(maxsize=None)
+def _cached_diagram(graph_class: type, fmt: DiagramFormat) -> str:
+    return _RENDERERS[fmt](graph_shape(graph_class), None, 0.0)
+
+
+def render_diagram(
+    graph_class: type,
+    fmt: DiagramFormat | str = DiagramFormat.MERMAID,
+    overlay: Optional[dict[str, NodeStats]] = None,
+) -> str:
+    """
+    Render a debate graph class locally as Mermaid, Graphviz DOT or ASCII.
+    Plain diagrams are rendered once per graph class and format. With an
+    `overlay`, e.g. from node_stats_from_spans, every node is annotated with
+    its runs, time, share of the total time and LLM calls, and filled by
+    that share.
+    """
+    fmt = DiagramFormat(fmt)
+    if not overlay:
+        return _cached_diagram(graph_class, fmt)
+    total = sum(stats.seconds for stats in overlay.values())
+    return _RENDERERS[fmt](graph_shape(graph_class), overlay, total)
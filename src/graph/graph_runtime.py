@@ -0,0 +1,181 @@
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, START
+from langgraph.types import Send
+
+from src.utils.cancellation import (
+    CancellationToken,
+    DebateCancelledError,
+    cancellation_scope,
+)
+from src.utils.profiling import profiled_node
+
+RUNTIME_KEY = "debate_runtime"
+# Root span of the debate run, the parent of every node span
+SPAN_KEY = "debate_span"
+# Cancellation token of the debate run, checked before every node
+CANCELLATION_KEY = "debate_cancellation"
+
+_compiled_graphs: dict[type, Any] = {}
+_lock = threading.Lock()
+
+
+def compiled_graph(graph_class: type) -> Any:
+    """
+    Return the compiled graph for a debate graph class, compiling it once per
+    process. The topology does not depend on any instance, so every instance
+    of the class shares it.
+    """
+    compiled = _compiled_graphs.get(graph_class)
+    if compiled is None:
+        with _lock:
+            compiled = _compiled_graphs.get(graph_class)
+            if compiled is None:
+                compiled = graph_class._build_graph()
+                _compiled_graphs[graph_class] = compiled
+    return compiled
+
+
+def runtime_node(method: str) -> Callable[[dict, RunnableConfig], Any]:
+    """
+    Graph node that calls `method` on the debate graph instance passed in the
+    runnable config, so that compiled graphs do not close over an instance.
+    A cancelled run raises DebateCancelledError instead of running the node;
+    otherwise the run's token is current for the agent calls of the node.
+    While the graph is being profiled, the node is profiled as well.
+    """
+
+    name = method.lstrip("_")
+
+    def node(state: dict, config: RunnableConfig):
+        runtime = config["configurable"][RUNTIME_KEY]
+        cancellation = config["configurable"].get(CANCELLATION_KEY)
+        if cancellation is not None:
+            cancellation.raise_if_cancelled()
+        with cancellation_scope(cancellation), profiled_node(runtime.profiler, name):
+            if runtime.tracer is None:
+                return getattr(runtime, method)(state)
+            with runtime.tracer.span(
+                name,
+                parent=config["configurable"].get(SPAN_KEY),
+                **{"debate.round": state.get("current_step", 0)},
+            ):
+                return getattr(runtime, method)(state)
+
+    node.__name__ = name
+    return node
+
+
+def recursion_limit(max_steps: int) -> int:
+    """Graph step limit that lets a debate of `max_steps` rounds finish."""
+    return max(100, 10 * max_steps)
+
+
+def runtime_config(runtime: Any, **config) -> RunnableConfig:
+    """Runnable config that carries the runtime settings of a debate graph."""
+    return {**config, "configurable": {RUNTIME_KEY: runtime}}
+
+
+@contextmanager
+def debate_config(
+    runtime: Any,
+    topic: str,
+    max_steps: int,
+    cancellation: Optional[CancellationToken] = None,
+) -> Iterator[RunnableConfig]:
+    """
+    Runnable config for one debate run. With a tracer the run is wrapped in
+    a root span that the node spans are attached to.
+    """
+    config = runtime_config(runtime, recursion_limit=recursion_limit(max_steps))
+    if cancellation is not None:
+        config["configurable"][CANCELLATION_KEY] = cancellation
+    if runtime.tracer is None:
+        yield config
+        return
+    with runtime.tracer.span(
+        "run_debate",
+        **{
+            "debate.graph": type(runtime).__name__,
+            "debate.topic": topic,
+            "debate.max_steps": max_steps,
+        },
+    ) as span:
+        config["configurable"][SPAN_KEY] = span
+        yield config
+
+
+def invoke_debate(app: Any, state: dict, config: RunnableConfig) -> dict:
+    """
+    Run a compiled debate graph to the end. If the run's token is cancelled,
+    return the state after the last finished step, with the reason under
+    "cancelled", instead of raising.
+    """
+    if CANCELLATION_KEY not in config["configurable"]:
+        return app.invoke(state, config)
+    result = state
+    try:
+        for result in app.stream(state, config, stream_mode="values"):
+            pass
+    except DebateCancelledError as error:
+        result = {**result, "cancelled": error.reason}
+    return result
+
+
+def graph_steps(
+    app: Any, state: dict, finished: Iterable[str] = (START,)
+) -> list[tuple[str, dict]]:
+    """
+    The nodes a compiled graph runs after the `finished` nodes, each with its
+    input: the state, or the payload of a Send. They are read from the graph's
+    own edges and routers, so a debate stepped through node by node follows
+    the same path as a run. A node reached from several finished nodes runs
+    once, like a fan-in; no steps are left once the graph ends.
+    """
+    builder = app.builder
+    steps: list[tuple[str, dict]] = []
+    triggered: set[str] = set()
+
+    def trigger(node: str):
+        if node != END and node not in triggered:
+            triggered.add(node)
+            steps.append((node, state))
+
+    for node in dict.fromkeys(finished):
+        for start, end in builder.edges:
+            if start == node:
+                trigger(end)
+        for branch in builder.branches.get(node, {}).values():
+            routed = branch.path.invoke(state)
+            for target in routed if isinstance(routed, list) else [routed]:
+                if isinstance(target, Send):
+                    steps.append((target.node, target.arg))
+                else:
+                    trigger(branch.ends[target] if branch.ends else target)
+    return steps
+
+
+def run_graph_node(app: Any, node: str, state: dict, config: RunnableConfig) -> Any:
+    """Run a single node of a compiled graph and return its update."""
+    return app.builder.nodes[node].runnable.invoke(state, config)
+
+
+def apply_updates(app: Any, state: dict, updates: Iterable[Optional[dict]]) -> dict:
+    """
+    State after the node updates of one graph step, merged like the graph
+    does: through the reducer of a key if it has one, otherwise replaced.
+    """
+    channels = app.builder.channels
+    state = dict(state)
+    for update in updates:
+        for key, value in (update or {}).items():
+            reducer = getattr(channels.get(key), "operator", None)
+            state[key] = (
+                reducer(state[key], value)
+                if reducer is not None and key in state
+                else value
+            )
+    return state
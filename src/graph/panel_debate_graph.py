@@ -0,0 +1,169 @@
+from typing import Optional
+
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
+
+from src.agents import JudgeAgent, PanelistAgent
+from src.graph.base_graph import DebateBaseGraph
+from src.graph.graph_runtime import runtime_node
+from src.memory.debate_archive import prompt_versions
+from src.models.agent_config import AgentConfig
+from src.models.debate_request import DebateVariant
+from src.models.debate_state import AgentRole, PanelDebateState, PanelTurnState
+from src.prompts.agent_prompts import DEFAULT_PANEL_PERSONAS, PANEL_JUDGE_SYSTEM_PROMPT
+
+MIN_PANEL_SIZE = 2
+MAX_PANEL_SIZE = len(DEFAULT_PANEL_PERSONAS)
+
+
+def default_panel(size: int = 4) -> list[AgentConfig]:
+    """Build a panel of `size` debaters with distinct default personas."""
+    if not MIN_PANEL_SIZE <= size <= MAX_PANEL_SIZE:
+        raise ValueError(
+            f"Panel size must be between {MIN_PANEL_SIZE} and {MAX_PANEL_SIZE}."
+        )
+    return [
+        PanelistAgent.create_config(name, persona)
+        for name, persona in DEFAULT_PANEL_PERSONAS[:size]
+    ]
+
+
+class PanelDebateGraph(DebateBaseGraph):
+    """
+    Multi-party debate between N panelists.
+    Every round fans out to all panelists in parallel graph branches, so the
+    latency of a round is bound by the slowest panelist rather than the sum
+    of all of them. The judge aggregates its verdict across all panelists.
+    """
+
+    def __init__(self, panel: Optional[list[AgentConfig]] = None, **options):
+        """
+        Initialize the PanelDebateGraph with a panel (the default personas by
+        default); `options` configure the LLMs and the agent calls, see
+        AgentRuntime.
+        """
+        self.panel = panel if panel is not None else default_panel()
+        names = [config.name for config in self.panel]
+        if len(names) < MIN_PANEL_SIZE:
+            raise ValueError(f"A panel needs at least {MIN_PANEL_SIZE} debaters.")
+        if len(set(names)) != len(names):
+            raise ValueError("Panelist names must be unique.")
+        super().__init__(**options)
+
+    def prompt_versions(self) -> dict[str, str]:
+        panel = tuple((config.name, config.system_prompt) for config in self.panel)
+        return prompt_versions(DebateVariant.PANEL, panel=panel)
+
+    def _perform_action(self, state: PanelTurnState, agent: PanelistAgent) -> str:
+        """Perform the action based on the current round."""
+        if state["current_step"] == 1:
+            return agent.introduce_topic(state)
+        if state["current_step"] < state["max_steps"]:
+            return agent.create_argument(state)
+        return agent.conclude_debate(state)
+
+    @staticmethod
+    def _fan_out(state: PanelDebateState) -> list[Send]:
+        """Send the current round to every panelist in parallel."""
+        return [
+            Send(
+                "panelist_turn",
+                {
+                    "topic": state["topic"],
+                    "participants": state["participants"],
+                    "messages": state["messages"],
+                    "current_step": state["current_step"],
+                    "max_steps": state["max_steps"],
+                    "speaker_index": index,
+                },
+            )
+            for index in range(len(state["participants"]))
+        ]
+
+    def _panelist_turn(self, state: PanelTurnState) -> dict:
+        """A single panelist's turn, run in its own parallel branch."""
+        config = self.panel[state["speaker_index"]]
+        agent = PanelistAgent(
+            llm=self._create_llm(), config=config, **self._agent_options()
+        )
+        message = self._perform_action(state, agent)
+
+        if self.verbose:
+            print(f"\033[92m{config.name}: {message}\033[0m")
+        return {"round_messages": [(state["speaker_index"], config.name, message)]}
+
+    @staticmethod
+    def _collect_round(state: PanelDebateState) -> dict:
+        """Append the round to the transcript in panel order."""
+        round_messages = sorted(state["round_messages"])
+        return {
+            "messages": state["messages"]
+            + [(name, message) for _, name, message in round_messages],
+            "round_messages": None,
+            "current_step": state["current_step"] + 1,
+        }
+
+    def _judge_agent(self, state: PanelDebateState) -> dict:
+        """Judge agent's turn."""
+        judge = JudgeAgent(
+            config=AgentConfig(
+                name="Judge",
+                role=AgentRole.JUDGE,
+                system_prompt=PANEL_JUDGE_SYSTEM_PROMPT,
+            ),
+            **self._judge_options(),
+        )
+        verdict = judge.judge_panel(state)
+        if self.memory is not None:
+            self.memory.remember_debate(state["topic"], state["messages"], verdict)
+
+        if self.verbose:
+            print(f"\033[92mJudge agent: {verdict}\033[0m")
+        return {"messages": state["messages"] + [("Judge", verdict)]}
+
+    @staticmethod
+    def _is_complete(state: PanelDebateState) -> bool:
+        """Check if debate is complete."""
+        return state["current_step"] > state["max_steps"]
+
+    @classmethod
+    def _build_graph(cls):
+        """Build and compile the panel debate graph."""
+        graph = StateGraph(PanelDebateState)
+
+        # Add nodes
+        graph.add_node("panel_round", lambda state: {})
+        graph.add_node("panelist_turn", runtime_node("_panelist_turn"))
+        graph.add_node("collect_round", cls._collect_round)
+        graph.add_node("judge_agent", runtime_node("_judge_agent"))
+
+        # Add edges
+        graph.add_edge(START, "panel_round")
+        graph.add_conditional_edges("panel_round", cls._fan_out, ["panelist_turn"])
+        graph.add_edge("panelist_turn", "collect_round")
+        graph.add_conditional_edges(
+            "collect_round",
+            cls._is_complete,
+            {True: "judge_agent", False: "panel_round"},
+        )
+        graph.add_edge("judge_agent", END)
+
+        return graph.compile()
+
+    def _initial_state(self, topic: str, max_steps: int) -> PanelDebateState:
+        """Create the initial state for a debate."""
+        return {
+            "topic": topic,
+            "participants": [config.name for config in self.panel],
+            "messages": [],
+            "round_messages": [],
+            "current_step": 1,
+            "max_steps": max_steps,
+        }
+
+
+# Usage example
+if __name__ == "__main__":
+    debate_graph = PanelDebateGraph(verbose=True)
+    result = debate_graph.run_debate("Is AI beneficial for society?")
+    debate_graph.print_debate(result)
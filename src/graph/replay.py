@@ -0,0 +1,213 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from src.agents import AgainstAgent, DebateBaseAgent, FavorAgent, JudgeAgent
+from src.graph.base_graph import AgentRuntime
+from src.models.agent_config import AgentConfig
+from src.models.debate_state import AgentRole
+from src.prompts.agent_prompts import (
+    JUDGE_AGENT_SYSTEM_PROMPT,
+    PANEL_JUDGE_SYSTEM_PROMPT,
+)
+
+JUDGE_SPEAKERS = ("Judge", "Judge Analysis")
+
+
+def iter_stored_debates(paths: Iterable[str]) -> Iterator[dict]:
+    """
+    Read stored debates from JSON files, JSONL files or directories of them,
+    such as the debate service's result directory or `--format json` output.
+    Each document gets a "source" key naming where it came from.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(
+                name for name in os.listdir(path) if name.endswith((".json", ".jsonl"))
+            )
+            yield from iter_stored_debates(os.path.join(path, name) for name in names)
+        elif path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as file:
+                for number, line in enumerate(file, start=1):
+                    if line.strip():
+                        yield {"source": f"{path}:{number}"} | json.loads(line)
+        else:
+            with open(path, encoding="utf-8") as file:
+                yield {"source": path} | json.load(file)
+
+
+def stored_state(document: dict) -> dict:
+    """
+    Rebuild a debate state from a stored debate. Judge turns are split off
+    the transcript and kept as "stored_verdict" and "stored_analysis".
+    """
+    messages = [
+        (turn["speaker"], turn["message"]) if isinstance(turn, dict) else tuple(turn)
+        for turn in document.get("messages", [])
+    ]
+    judged = {}
+    while messages and messages[-1][0] in JUDGE_SPEAKERS:
+        speaker, message = messages.pop()
+        judged[speaker] = message
+
+    speakers = list(dict.fromkeys(speaker for speaker, _ in messages))
+    participants = document.get("participants")
+    if participants is None and not set(speakers) <= {"Favor", "Against"}:
+        participants = speakers
+    turns_per_round = len(participants) if participants else 2
+
+    state = {
+        "topic": document["topic"],
+        "favor_strategy": document.get("favor_strategy", ""),
+        "against_strategy": document.get("against_strategy", ""),
+        "messages": messages,
+        "max_steps": document.get("max_steps")
+        or max(1, -(-len(messages) // turns_per_round)),
+        "stored_verdict": judged.get("Judge"),
+        "stored_analysis": judged.get("Judge Analysis"),
+    }
+    if participants:
+        state["participants"] = participants
+    return state
+
+
+class ReplayEngine(AgentRuntime):
+    """
+    Re-runs selected nodes of stored debates without repeating the debate.
+
+    Only the judge verdict, the strategic meta-analysis or single rounds are
+    replayed, with the engine's own models (the judge's own model if one is
+    set, see AgentRuntime), prompts and judge system prompt,
+    so re-judging N stored debates costs N judge calls. Debates are processed
+    in batches of `batch_size`, with up to `max_workers` debates in flight.
+    Replays default to temperature 0 so reruns are as repeatable as the
+    provider allows.
+    """
+
+    def __init__(
+        self,
+        temperature: float = 0.0,
+        use_strategic_prompt: bool = False,
+        judge_system_prompt: Optional[str] = None,
+        max_workers: int = 8,
+        batch_size: int = 64,
+        **options,
+    ):
+        """`options` configure the LLMs and the agent calls, see AgentRuntime."""
+        super().__init__(temperature=temperature, **options)
+        self.use_strategic_prompt = use_strategic_prompt
+        self.judge_system_prompt = judge_system_prompt
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+
+    def _agent_options(self) -> dict:
+        return super()._agent_options() | {
+            "use_strategic_prompt": self.use_strategic_prompt
+        }
+
+    def _judge(self, panel: bool) -> JudgeAgent:
+        default_prompt = (
+            PANEL_JUDGE_SYSTEM_PROMPT if panel else JUDGE_AGENT_SYSTEM_PROMPT
+        )
+        return JudgeAgent(
+            config=AgentConfig(
+                name="Judge",
+                role=AgentRole.JUDGE,
+                system_prompt=self.judge_system_prompt or default_prompt,
+            ),
+            **self._judge_options(),
+        )
+
+    def _replay_round(self, state: dict, round_number: int) -> list[tuple[str, str]]:
+        """Re-run both debater turns of one round on the stored transcript."""
+        if "participants" in state:
+            raise ValueError("Round replay supports two-party debates only.")
+        if not 1 <= round_number <= state["max_steps"]:
+            raise ValueError(f"Round {round_number} is not part of the debate.")
+
+        round_state = state | {
+            "messages": state["messages"][: 2 * (round_number - 1)],
+            "current_step": round_number,
+        }
+        turns = []
+        for name, agent_class in (("Favor", FavorAgent), ("Against", AgainstAgent)):
+            agent = agent_class(llm=self._create_llm(), **self._agent_options())
+            message = self._perform_action(round_state, agent)
+            round_state["messages"] = round_state["messages"] + [(name, message)]
+            turns.append((name, message))
+        return turns
+
+    @staticmethod
+    def _perform_action(state: dict, agent: DebateBaseAgent) -> str:
+        if state["current_step"] == 1:
+            return agent.introduce_topic(state)
+        if state["current_step"] < state["max_steps"]:
+            return agent.create_argument(state)
+        return agent.conclude_debate(state)
+
+    def replay(
+        self,
+        document: dict,
+        judge: bool = True,
+        meta_analysis: bool = False,
+        rounds: Iterable[int] = (),
+    ) -> dict:
+        """
+        Replay the selected nodes of one stored debate. The meta-analysis
+        reviews the replayed verdict, or the stored one if the judge is not
+        replayed.
+        """
+        state = stored_state(document)
+        panel = "participants" in state
+        result = {"source": document.get("source"), "topic": state["topic"]}
+
+        for round_number in rounds:
+            result[f"round_{round_number}"] = self._replay_round(state, round_number)
+
+        verdict = state["stored_verdict"]
+        if judge:
+            judge_agent = self._judge(panel)
+            if panel:
+                verdict = judge_agent.judge_panel(state)
+            else:
+                verdict = judge_agent.judge_and_conclude(state)
+            result["stored_verdict"] = state["stored_verdict"]
+            result["verdict"] = verdict
+
+        if meta_analysis:
+            if panel or verdict is None:
+                raise ValueError("Meta-analysis needs a two-party debate verdict.")
+            result["meta_analysis"] = self._judge(panel).analyse_the_debate(
+                state | {"messages": state["messages"] + [("Judge", verdict)]}
+            )
+        return result
+
+    def replay_all(
+        self,
+        documents: Iterable[dict],
+        judge: bool = True,
+        meta_analysis: bool = False,
+        rounds: Iterable[int] = (),
+    ) -> Iterator[dict]:
+        """
+        Replay many stored debates concurrently, in input order. A debate that
+        fails is reported with an "error" key instead of stopping the batch.
+        """
+        rounds = tuple(rounds)
+
+        def replay_one(document: dict) -> dict:
+            try:
+                return self.replay(document, judge, meta_analysis, rounds)
+            except Exception as error:
+                return {
+                    "source": document.get("source"),
+                    "topic": document.get("topic"),
+                    "error": f"{type(error).__name__}: {error}",
+                }
+
+        documents = iter(documents)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while batch := list(islice(documents, self.batch_size)):
+                yield from executor.map(replay_one, batch)
@@ -1,48 +1,65 @@
-import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import Optional
 
 from dotenv import load_dotenv
-from langchain_google_genai.chat_models import ChatGoogleGenerativeAI
 from langgraph.graph import END, START, StateGraph
 
 from src.agents import AgainstAgent, DebateBaseAgent, FavorAgent, JudgeAgent
+from src.graph.base_graph import DebateBaseGraph
+from src.graph.graph_runtime import runtime_node
+from src.memory.debate_archive import prompt_versions
+from src.memory.strategy_store import StrategyStore, strategy_prompt_version
+from src.memory.transcript_log import (
+    TranscriptSpill,
+    new_transcript_path,
+    spill_turns,
+    transcript_view,
+)
+from src.models.debate_request import DebateVariant
 from src.models.debate_state import AgentRole, DebateState
-from src.utils.print_debate import print_debate
+from src.tools.evidence_retrieval import EvidencePolicy, EvidenceRetriever
+from src.utils.cancellation import start_call
 
 load_dotenv()  # Load environment variables from .env file
 
 
-class StrategicDebateGraph:
+class StrategicDebateGraph(DebateBaseGraph):
     def __init__(
         self,
-        model_name: str = "gemini-1.5-flash",
-        max_output_tokens: int = 1024,
-        temperature: float = 0.5,
-        verbose: bool = False,
         use_strategic_prompt: bool = True,
+        strategy_store: Optional[StrategyStore] = None,
+        spill: Optional[TranscriptSpill] = None,
+        evidence: Optional[EvidencePolicy] = None,
+        **options,
     ):
         """
-        Initialize the DebateGraph with configurable LLM parameters.
+        Initialize the StrategicDebateGraph; `options` configure the LLMs and
+        the agent calls, see AgentRuntime. Strategies are reused from the
+        `strategy_store`, turns of long debates are spilled to disk with
+        `spill`, and debaters cite retrieved `evidence`.
         """
-        self.model_name = model_name
-        self.max_output_tokens = max_output_tokens
-        self.temperature = temperature
-        self.app = self._build_graph()
-        self.verbose = verbose
+        super().__init__(**options)
         self.use_strategic_prompt = use_strategic_prompt
-
-    def _create_llm(self):
-        """Create and return a configured LLM instance."""
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY environment variable not set")
-
-        return ChatGoogleGenerativeAI(
-            model=self.model_name,
-            max_output_tokens=self.max_output_tokens,
-            temperature=self.temperature,
-            google_api_key=api_key,
+        self.strategy_store = strategy_store
+        self.spill = spill
+        # The index is opened (memory-mapped) here, not on the first turn
+        self.evidence_retriever = (
+            EvidenceRetriever(evidence, tracer=self.tracer)
+            if evidence is not None
+            else None
         )
 
+    def prompt_versions(self) -> dict[str, str]:
+        return prompt_versions(DebateVariant.STRATEGIC, self.use_strategic_prompt)
+
+    def _evidence(self, state: DebateState, speaker: str) -> Optional[str]:
+        """Evidence block for the speaker's turn, if the graph cites evidence."""
+        if self.evidence_retriever is None:
+            return None
+        return self.evidence_retriever.citations(state, speaker)
+
     def _perform_action(self, state: DebateState, agent: DebateBaseAgent) -> str:
         """Perform the action based on the current turn."""
         if self.verbose:
@@ -55,13 +72,83 @@ class StrategicDebateGraph:
             if agent.role == AgentRole.JUDGE:
                 raise ValueError("Judge agent cannot introduce topics.")
 
+            # Strategies get no evidence, so the opening's evidence is
+            # retrieved while the strategy is formulated
+            evidence = None
+            if self.evidence_retriever is not None:
+                evidence = start_call(
+                    partial(copy_context().run, self._evidence, state, agent.name)
+                )
             # create the strategy and introduce the topic
-            state[agent.role.value + "_strategy"] = agent.create_strategy(state)
+            state[agent.role.value + "_strategy"] = self._get_strategy(state, agent)
+            if evidence is not None:
+                agent.evidence = evidence.result()
             return agent.introduce_topic(state)
+        agent.evidence = self._evidence(state, agent.name)
         if state["current_step"] < state["max_steps"]:
             return agent.create_argument(state)
         return agent.conclude_debate(state)
 
+    def _strategy_model(self) -> str:
+        if self.llm is None:
+            return self.model_name
+        return getattr(self.llm, "model_name", None) or getattr(
+            self.llm, "model", self.model_name
+        )
+
+    def _get_strategy(self, state: DebateState, agent: DebateBaseAgent) -> str:
+        """
+        Take the stored strategy for this debate, or create and store one.
+        Stored strategies are created without recalling from agent memory,
+        which changes between debates and is not part of the store key.
+        """
+        if self.strategy_store is None:
+            return agent.create_strategy(state)
+
+        key = (
+            self._strategy_model(),
+            agent.role.value,
+            state["topic"],
+            state["max_steps"],
+            strategy_prompt_version(agent.system_prompt, self.use_strategic_prompt),
+        )
+        strategy = self.strategy_store.get(*key)
+        if strategy is None:
+            strategy = agent.create_strategy(state, recall=False)
+            self.strategy_store.put(*key, strategy)
+        elif self.verbose:
+            print(f"\033[94mUsing stored {agent.role.value} strategy\033[0m")
+        return strategy
+
+    def precompute_strategies(
+        self, topics: list[str], max_steps: int = 3, max_workers: int = 4
+    ) -> int:
+        """
+        Generate and store both strategies for every topic that does not have
+        them yet. Returns the number of strategies that were generated.
+        """
+        if self.strategy_store is None:
+            raise ValueError("Precomputing strategies requires a strategy store.")
+
+        def precompute(topic: str, agent_class: type[DebateBaseAgent]):
+            agent = agent_class(
+                llm=self._create_llm(),
+                use_strategic_prompt=self.use_strategic_prompt,
+                **self._agent_options(),
+            )
+            self._get_strategy(self._initial_state(topic, max_steps), agent)
+
+        stored = len(self.strategy_store)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(precompute, topic, agent_class)
+                for topic in topics
+                for agent_class in (FavorAgent, AgainstAgent)
+            ]
+            for future in futures:
+                future.result()
+        return len(self.strategy_store) - stored
+
     def _favor_agent(self, state: DebateState) -> DebateState:
         """Favor agent's turn."""
         llm = self._create_llm()
@@ -70,11 +157,17 @@ class StrategicDebateGraph:
                 "Favor",
                 self._perform_action(
                     state,
-                    FavorAgent(llm=llm, use_strategic_prompt=self.use_strategic_prompt),
+                    FavorAgent(
+                        llm=llm,
+                        use_strategic_prompt=self.use_strategic_prompt,
+                        **self._agent_options(),
+                    ),
                 ),
             )
         )
         state["current_turn"] = AgentRole.AGAINST
+        if self.spill is not None:
+            spill_turns(state, self.spill)
 
         # if self.verbose:
         #     print(f"\033[92mFavor agent: {state['messages'][-1][1]}\033[0m")
@@ -90,13 +183,17 @@ class StrategicDebateGraph:
                 self._perform_action(
                     state,
                     AgainstAgent(
-                        llm=llm, use_strategic_prompt=self.use_strategic_prompt
+                        llm=llm,
+                        use_strategic_prompt=self.use_strategic_prompt,
+                        **self._agent_options(),
                     ),
                 ),
             )
         )
         state["current_turn"] = AgentRole.FAVOR
         state["current_step"] += 1
+        if self.spill is not None:
+            spill_turns(state, self.spill)
 
         # if self.verbose:
         #     print(f"\033[92mAgainst agent: {state['messages'][-1][1]}\033[0m")
@@ -107,15 +204,15 @@ class StrategicDebateGraph:
         if self.verbose:
             print("\033[94m Judge giving final verdict: \033[0m")
 
-        llm = self._create_llm()
-        state["messages"].append(
-            (
-                "Judge",
-                JudgeAgent(
-                    llm=llm, use_strategic_prompt=self.use_strategic_prompt
-                ).judge_and_conclude(state),
-            )
-        )
+        verdict = JudgeAgent(
+            use_strategic_prompt=self.use_strategic_prompt,
+            **self._judge_options(),
+        ).judge_and_conclude(state)
+        if self.memory is not None:
+            # The full transcript, with spilled turns read back from the log
+            with transcript_view(state) as transcript:
+                self.memory.remember_debate(state["topic"], transcript, verdict)
+        state["messages"].append(("Judge", verdict))
 
         # if self.verbose:
         #     print(f"\033[92mJudge agent: {state['messages'][-1][1]}\033[0m")
@@ -126,12 +223,12 @@ class StrategicDebateGraph:
         if self.verbose:
             print("\033[94m Judge analyzing the debate: \033[0m")
         
-        llm = self._create_llm()
         state["messages"].append(
             (
                 "Judge Analysis",
                 JudgeAgent(
-                    llm=llm, use_strategic_prompt=self.use_strategic_prompt
+                    use_strategic_prompt=self.use_strategic_prompt,
+                    **self._judge_options(),
                 ).analyse_the_debate(state),
             )
         )
@@ -140,36 +237,39 @@ class StrategicDebateGraph:
         #     print(f"\033[92mJudge Analysis: {state['messages'][-1][1]}\033[0m")
         return state
 
-    def _is_favor_turn(self, state: DebateState) -> bool:
+    @staticmethod
+    def _is_favor_turn(state: DebateState) -> bool:
         """Check if it's favor agent's turn."""
         return state["current_turn"] == AgentRole.FAVOR
 
-    def _is_complete(self, state: DebateState) -> bool:
+    @staticmethod
+    def _is_complete(state: DebateState) -> bool:
         """Check if debate is complete."""
         return state["current_step"] > state["max_steps"]
 
-    def _build_graph(self):
+    @classmethod
+    def _build_graph(cls):
         """Build and compile the debate graph."""
         graph = StateGraph(DebateState)
 
         # Add nodes
-        graph.add_node("favor_agent", self._favor_agent)
-        graph.add_node("against_agent", self._against_agent)
-        graph.add_node("judge_agent", self._judge_agent)
+        graph.add_node("favor_agent", runtime_node("_favor_agent"))
+        graph.add_node("against_agent", runtime_node("_against_agent"))
+        graph.add_node("judge_agent", runtime_node("_judge_agent"))
         graph.add_node("agent_turn_check", lambda state: state)
         graph.add_node("debate_complete_check", lambda state: state)
-        graph.add_node("strategy_analysis", self._strategy_analysis)
+        graph.add_node("strategy_analysis", runtime_node("_strategy_analysis"))
 
         # Add edges
         graph.add_edge(START, "agent_turn_check")
         graph.add_conditional_edges(
             "agent_turn_check",
-            self._is_favor_turn,
+            cls._is_favor_turn,
             {True: "favor_agent", False: "against_agent"},
         )
         graph.add_conditional_edges(
             "debate_complete_check",
-            self._is_complete,
+            cls._is_complete,
             {True: "judge_agent", False: "agent_turn_check"},
         )
         graph.add_edge("favor_agent", "debate_complete_check")
@@ -179,18 +279,9 @@ class StrategicDebateGraph:
 
         return graph.compile()
 
-    def run_debate(self, topic: str, max_steps: int = 3) -> dict:
-        """
-        Run a debate on the given topic.
-
-        Args:
-            topic: The debate topic
-            max_steps: Maximum number of debate rounds
-
-        Returns:
-            Dictionary containing the debate results
-        """
-        initial_state = {
+    def _initial_state(self, topic: str, max_steps: int) -> DebateState:
+        """Create the initial state for a debate."""
+        state: DebateState = {
             "topic": topic,
             "favor_strategy": "",
             "against_strategy": "",
@@ -199,15 +290,11 @@ class StrategicDebateGraph:
             "current_step": 1,
             "max_steps": max_steps,
         }
-        return self.app.invoke(initial_state, {"recursion_limit": 100})
-
-    def print_debate(self, result: dict):
-        """Print the debate messages in a formatted way with enhanced colors and styling."""  # noqa: E501
-        print_debate(result)
-
-    def get_graph(self):
-        """Get the underlying graph for visualization or further manipulation."""
-        return self.app.get_graph().draw_mermaid_png()
+        if self.spill is not None:
+            state["transcript_path"] = new_transcript_path(self.spill.directory)
+            state["summaries"] = []
+            state["spilled_turns"] = 0
+        return state
 
 
 # Usage example
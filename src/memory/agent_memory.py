@@ -0,0 +1,328 @@
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from src.memory.transcript_log import summarize_turn
+from src.memory.vector_index import VectorIndex, embed_texts
+from src.utils.tokens import estimate_tokens
+
+DEFAULT_MEMORY_DB = "data/agent_memory.sqlite"
+# Items a persona keeps before the least recently recalled are evicted
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Kinds of memory items
+ARGUMENT = "argument"
+REBUTTAL = "rebuttal"
+FEEDBACK = "feedback"
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_VERDICT = re.compile(r"\b(winner|wins|won|prevails?|victor|stronger case)\b", re.I)
+# Judge turns of the debate graphs, which are not debater arguments
+_JUDGE_SPEAKERS = ("Judge", "Judge Analysis")
+
+
+def verdict_winner(verdict: str, speakers: Iterable[str]) -> Optional[str]:
+    """
+    The speaker the verdict declares the winner: the only speaker named in
+    the last sentence that talks about winning. None if that is unclear.
+    """
+    for sentence in reversed(_SENTENCE.split(verdict)):
+        if _VERDICT.search(sentence):
+            named = [
+                speaker
+                for speaker in speakers
+                if re.search(rf"\b{re.escape(speaker)}\b", sentence, re.I)
+            ]
+            return named[0] if len(named) == 1 else None
+    return None
+
+
+@dataclass(frozen=True)
+class MemoryItem:
+    """A remembered argument, rebuttal or piece of judge feedback."""
+
+    id: int
+    persona: str
+    kind: str
+    topic: str
+    text: str
+    score: float = 0.0
+
+
+class AgentMemory:
+    """
+    Persistent cross-debate memory of each persona (debater name): condensed
+    arguments, rebuttals from debates the persona won, and the judge's
+    feedback on it.
+
+    Items live in SQLite; their embeddings are also kept in an in-memory
+    VectorIndex per persona, rebuilt from the database when it is opened.
+    A persona keeps at most `max_entries` items: beyond that the least
+    recently recalled items are evicted, and items older than `max_age`
+    seconds are evicted as well. `prompt_block` recalls the `top_k` items
+    closest to a turn, within `token_allowance` prompt tokens.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_MEMORY_DB,
+        dim: int = 128,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age: Optional[float] = None,
+        top_k: int = 4,
+        token_allowance: int = 200,
+        nprobe: int = 16,
+    ):
+        self.path = path
+        self.dim = dim
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.top_k = top_k
+        self.token_allowance = token_allowance
+        self.nprobe = nprobe
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._indexes: dict[str, VectorIndex] = {}
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS memories (
+                    id INTEGER PRIMARY KEY,
+                    persona TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS memories_lru"
+                " ON memories (persona, last_used)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS memories_age ON memories (created_at)"
+            )
+            self._load()
+
+    def _index(self, persona: str) -> VectorIndex:
+        index = self._indexes.get(persona)
+        if index is None:
+            index = self._indexes[persona] = VectorIndex(self.dim, self.nprobe)
+        return index
+
+    def _load(self):
+        rows = self._connection.execute(
+            "SELECT persona, id, vector FROM memories ORDER BY persona, id"
+        ).fetchall()
+        start = 0
+        while start < len(rows):
+            persona = rows[start][0]
+            end = start
+            while end < len(rows) and rows[end][0] == persona:
+                end += 1
+            ids = np.array([row[1] for row in rows[start:end]], dtype=np.int64)
+            vectors = np.frombuffer(
+                b"".join(row[2] for row in rows[start:end]), dtype=np.float32
+            ).reshape(-1, self.dim)
+            self._index(persona).add(ids, vectors)
+            start = end
+
+    def add_many(self, items: Iterable[tuple[str, str, str, str]]) -> list[int]:
+        """
+        Store (persona, kind, topic, text) items, then evict over the size cap.
+        Returns the ids of the new items.
+        """
+        items = list(items)
+        if not items:
+            return []
+        # The topic is embedded with the text, so items of related debates
+        # are found even when the turn itself words things differently.
+        vectors = embed_texts(
+            [f"{topic} {text}" for _, _, topic, text in items], self.dim
+        )
+        now = time.time()
+        with self._lock, self._connection:
+            first = self._connection.execute(
+                "SELECT COALESCE(MAX(id), 0) + 1 FROM memories"
+            ).fetchone()[0]
+            ids = list(range(first, first + len(items)))
+            self._connection.executemany(
+                "INSERT INTO memories VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (id_, persona, kind, topic, text, vector.tobytes(), now, now)
+                    for id_, (persona, kind, topic, text), vector in zip(
+                        ids, items, vectors
+                    )
+                ),
+            )
+            personas = [persona for persona, *_ in items]
+            of_item = np.array(personas)
+            for persona in dict.fromkeys(personas):
+                mask = of_item == persona
+                self._index(persona).add(np.array(ids)[mask], vectors[mask])
+            self._evict(set(personas))
+        return ids
+
+    def add(self, persona: str, kind: str, topic: str, text: str) -> int:
+        return self.add_many([(persona, kind, topic, text)])[0]
+
+    def _delete(self, rows: list[tuple[str, int]]):
+        self._connection.executemany(
+            "DELETE FROM memories WHERE id = ?", ((id_,) for _, id_ in rows)
+        )
+        for persona, id_ in rows:
+            self._index(persona).remove([id_])
+
+    def _evict(self, personas: set[str]) -> int:
+        """Evict aged items, and the least recently used items over the cap."""
+        evicted = 0
+        if self.max_age is not None:
+            rows = self._connection.execute(
+                "SELECT persona, id FROM memories WHERE created_at < ?",
+                (time.time() - self.max_age,),
+            ).fetchall()
+            self._delete(rows)
+            evicted += len(rows)
+        for persona in personas:
+            excess = len(self._index(persona)) - self.max_entries
+            if excess <= 0:
+                continue
+            # Evicting a little more than needed keeps evictions infrequent
+            excess += self.max_entries // 100
+            rows = self._connection.execute(
+                "SELECT persona, id FROM memories WHERE persona = ?"
+                " ORDER BY last_used LIMIT ?",
+                (persona, excess),
+            ).fetchall()
+            self._delete(rows)
+            evicted += len(rows)
+        return evicted
+
+    def evict(self) -> int:
+        """Run eviction for every persona; returns the number of evicted items."""
+        with self._lock, self._connection:
+            return self._evict(set(self._indexes))
+
+    def recall(
+        self, persona: str, query: str, k: Optional[int] = None
+    ) -> list[MemoryItem]:
+        """
+        The persona's items most similar to `query`, best first. Recalled
+        items count as used for LRU eviction.
+        """
+        k = k or self.top_k
+        vector = embed_texts([query], self.dim)[0]
+        with self._lock, self._connection:
+            index = self._indexes.get(persona)
+            if index is None or not len(index) or not vector.any():
+                return []
+            ids, scores = index.search(vector, k)
+            placeholders = ", ".join("?" for _ in ids)
+            rows = self._connection.execute(
+                "SELECT id, persona, kind, topic, text FROM memories"
+                f" WHERE id IN ({placeholders})",
+                [int(id_) for id_ in ids],
+            ).fetchall()
+            self._connection.execute(
+                f"UPDATE memories SET last_used = ? WHERE id IN ({placeholders})",
+                [time.time(), *(int(id_) for id_ in ids)],
+            )
+        by_id = {row[0]: row for row in rows}
+        return [
+            MemoryItem(*by_id[id_], score=float(score))
+            for id_, score in zip(ids.tolist(), scores)
+            if id_ in by_id
+        ]
+
+    def prompt_block(
+        self, persona: str, topic: str, messages: list[tuple[str, str]]
+    ) -> Optional[str]:
+        """
+        Memory block for a turn of `persona`: recalled items for the topic and
+        the last turn of another speaker, as many as fit the token allowance.
+        """
+        replies = [turn for turn in messages if turn[0] != persona]
+        query = topic + (" " + replies[-1][1] if replies else "")
+        lines, tokens = [], 0
+        for item in self.recall(persona, query):
+            line = f"- [{item.kind}] ({item.topic}) {item.text}"
+            tokens += estimate_tokens(line)
+            if tokens > self.token_allowance:
+                break
+            lines.append(line)
+        if not lines:
+            return None
+        return (
+            "\nYOUR NOTES FROM EARLIER DEBATES (use them only where they fit "
+            "this debate):\n" + "\n".join(lines) + "\n"
+        )
+
+    def remember_debate(
+        self,
+        topic: str,
+        messages: Sequence[tuple[str, str]],
+        verdict: str,
+        summary_words: int = 40,
+    ) -> list[int]:
+        """
+        Store what each debater of a finished debate should remember: its
+        condensed turns, as rebuttals if it won and after its opening, and the
+        verdict sentences that name it. `messages` is read twice and may be a
+        TranscriptView of a spilled debate.
+        """
+        speakers = list(
+            dict.fromkeys(
+                speaker for speaker, _ in messages if speaker not in _JUDGE_SPEAKERS
+            )
+        )
+        winner = verdict_winner(verdict, speakers)
+        items, seen = [], set()
+        for speaker, message in messages:
+            if speaker in _JUDGE_SPEAKERS:
+                continue
+            kind = REBUTTAL if speaker == winner and speaker in seen else ARGUMENT
+            seen.add(speaker)
+            items.append((speaker, kind, topic, summarize_turn(message, summary_words)))
+        for sentence in _SENTENCE.split(verdict):
+            for speaker in speakers:
+                if re.search(rf"\b{re.escape(speaker)}\b", sentence, re.I):
+                    text = summarize_turn(sentence, summary_words)
+                    items.append((speaker, FEEDBACK, topic, text))
+        return self.add_many(items)
+
+    def count(self, persona: Optional[str] = None) -> int:
+        with self._lock:
+            if persona is not None:
+                index = self._indexes.get(persona)
+                return len(index) if index is not None else 0
+            return sum(len(index) for index in self._indexes.values())
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+@lru_cache(maxsize=None)
+def open_agent_memory(
+    path: str = DEFAULT_MEMORY_DB, max_entries: int = DEFAULT_MAX_ENTRIES
+) -> AgentMemory:
+    """
+    Open a memory once per process and cap, so every graph shares its
+    indexes. Each persona keeps at most `max_entries` items.
+    """
+    return AgentMemory(path, max_entries=max_entries)
@@ -0,0 +1,382 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from src.chains.debate_chains import DEFAULT_SYSTEM_PROMPTS, action_template
+from src.models.debate_request import DebateVariant
+from src.models.debate_state import DebatePhase
+from src.prompts.action_prompts import PanelActionPrompts
+from src.prompts.agent_prompts import (
+    DEFAULT_PANEL_PERSONAS,
+    PANEL_JUDGE_SYSTEM_PROMPT,
+    PANELIST_AGENT_SYSTEM_PROMPT,
+)
+
+DEFAULT_ARCHIVE_DB = "data/debates.sqlite"
+MANIFEST_VERSION = 1
+
+# Blob codecs
+RAW = 0
+ZLIB = 1
+
+# Top-level text fields at least this long are stored as blobs, not inline
+_MIN_BLOB_CHARS = 64
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def config_hash(config: dict) -> str:
+    """Hash of a debate configuration, independent of key order."""
+    return content_hash(_canonical(config))
+
+
+def _canonical(value) -> bytes:
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    ).encode()
+
+
+@lru_cache(maxsize=None)
+def prompt_versions(
+    variant: DebateVariant = DebateVariant.SIMPLE,
+    strategic: Optional[bool] = None,
+    panel: Optional[tuple[tuple[str, str], ...]] = None,
+) -> dict[str, str]:
+    """
+    System prompts and action templates a debate of the variant is run
+    with, by name, built once per process; do not modify the result.
+    `strategic` selects the strategic action templates (the default for the
+    strategic variant) and `panel` gives the (name, system prompt) of each
+    panelist (the default personas by default). Archived with a debate, each
+    distinct version is stored once.
+    """
+    if variant == DebateVariant.PANEL:
+        if panel is None:
+            panel = tuple(
+                (name, PANELIST_AGENT_SYSTEM_PROMPT.format(name=name, persona=persona))
+                for name, persona in DEFAULT_PANEL_PERSONAS
+            )
+        prompts = {"system/judge": PANEL_JUDGE_SYSTEM_PROMPT}
+        prompts |= {f"system/{name}": text for name, text in panel}
+        for name in (
+            "create_opening_prompt",
+            "create_rebuttal_prompt",
+            "create_conclusion_prompt",
+            "judge_panel_prompt",
+        ):
+            prompts[f"template/{name}"] = getattr(PanelActionPrompts, name)().template
+        return prompts
+
+    if strategic is None:
+        strategic = variant == DebateVariant.STRATEGIC
+    prompts = {
+        f"system/{role.value}": text for role, text in DEFAULT_SYSTEM_PROMPTS.items()
+    }
+    phases = [
+        DebatePhase.STRATEGY,
+        DebatePhase.OPENING,
+        DebatePhase.ARGUMENT,
+        DebatePhase.CONCLUSION,
+        DebatePhase.VERDICT,
+    ]
+    if variant == DebateVariant.STRATEGIC:
+        phases.append(DebatePhase.META_ANALYSIS)
+    for phase in phases:
+        prompts[f"template/{phase.value}"] = action_template(phase, strategic).template
+    return prompts
+
+
+@dataclass(frozen=True)
+class ArchivedDebate:
+    """Index entry of an archived debate."""
+
+    id: str
+    topic: str
+    created_at: float
+    variant: Optional[str]
+    config_hash: Optional[str]
+    turns: int
+
+
+class DebateArchive:
+    """
+    Content-addressed, deduplicated SQLite archive of finished debates.
+
+    Every turn, long text field (such as a strategy), prompt version and
+    configuration is stored once as a blob under its SHA-256, compressed on
+    its own with zlib. Debates that repeat a system prompt, a cached strategy
+    or an opening only add references. Each debate is a small compressed
+    manifest of references plus its other result fields. The manifest is
+    indexed by topic, date, variant and configuration. Reading a debate
+    decompresses its manifest and the blobs it references, and nothing else.
+    The database runs in WAL mode with relaxed syncing, so a write costs a
+    few tens of microseconds per turn. A crash can lose the last
+    transactions but does not corrupt the archive.
+    """
+
+    def __init__(self, path: str = DEFAULT_ARCHIVE_DB, level: int = 6):
+        self.path = path
+        self.level = level
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    hash TEXT PRIMARY KEY,
+                    codec INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    data BLOB NOT NULL
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS debates (
+                    id TEXT PRIMARY KEY,
+                    topic TEXT NOT NULL,
+                    topic_hash TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    variant TEXT,
+                    config_hash TEXT,
+                    turns INTEGER NOT NULL,
+                    raw_size INTEGER NOT NULL,
+                    manifest BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS debates_by_topic
+                    ON debates (topic_hash, created_at);
+                CREATE INDEX IF NOT EXISTS debates_by_date ON debates (created_at);
+                CREATE INDEX IF NOT EXISTS debates_by_config
+                    ON debates (config_hash, created_at);
+                """
+            )
+
+    @staticmethod
+    def topic_hash(topic: str) -> str:
+        """Hash of a topic, insensitive to case and whitespace."""
+        return content_hash(" ".join(topic.split()).casefold().encode())
+
+    def _compress(self, data: bytes) -> tuple[int, bytes]:
+        packed = zlib.compress(data, self.level)
+        return (ZLIB, packed) if len(packed) < len(data) else (RAW, data)
+
+    @staticmethod
+    def _decompress(codec: int, data: bytes) -> bytes:
+        return zlib.decompress(data) if codec == ZLIB else data
+
+    def _put_blob(self, data: bytes) -> str:
+        """Store `data` unless it is already archived; returns its hash."""
+        key = content_hash(data)
+        known = self._connection.execute(
+            "SELECT 1 FROM blobs WHERE hash = ?", (key,)
+        ).fetchone()
+        if known is None:
+            codec, packed = self._compress(data)
+            self._connection.execute(
+                "INSERT INTO blobs VALUES (?, ?, ?, ?)", (key, codec, len(data), packed)
+            )
+        return key
+
+    def _blob(self, key: str) -> bytes:
+        row = self._connection.execute(
+            "SELECT codec, data FROM blobs WHERE hash = ?", (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(f"missing archive blob {key}")
+        return self._decompress(*row)
+
+    def put(
+        self,
+        debate_id: str,
+        result: dict,
+        config: Optional[dict] = None,
+        prompts: Optional[dict[str, str]] = None,
+        created_at: Optional[float] = None,
+    ):
+        """
+        Archive a debate result document (see src.api.store.debate_result),
+        with the configuration and prompt versions it ran with. Archiving an
+        existing id replaces its manifest; blobs only the old manifest
+        referenced stay until the next gc().
+        """
+        messages = result.get("messages", [])
+        fields, refs = {}, {}
+        for key, value in result.items():
+            if key == "messages":
+                continue
+            if isinstance(value, str) and len(value) >= _MIN_BLOB_CHARS:
+                refs[key] = value
+            else:
+                fields[key] = value
+        variant = result.get("variant")
+        if config is not None:
+            variant = config.get("variant", variant)
+
+        with self._lock, self._connection:
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "fields": fields,
+                "refs": {
+                    key: self._put_blob(text.encode()) for key, text in refs.items()
+                },
+                "messages": [
+                    [turn["speaker"], self._put_blob(turn["message"].encode())]
+                    for turn in messages
+                ],
+                "prompts": {
+                    name: self._put_blob(text.encode())
+                    for name, text in (prompts or {}).items()
+                },
+            }
+            if config is not None:
+                manifest["config"] = self._put_blob(_canonical(config))
+            codec, packed = self._compress(_canonical(manifest))
+            self._connection.execute(
+                "INSERT OR REPLACE INTO debates VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    debate_id,
+                    result.get("topic", ""),
+                    self.topic_hash(result.get("topic", "")),
+                    created_at if created_at is not None else time.time(),
+                    variant,
+                    manifest.get("config"),
+                    len(messages),
+                    len(_canonical(result)),
+                    bytes([codec]) + packed,
+                ),
+            )
+
+    def gc(self) -> int:
+        """
+        Delete the blobs no manifest references, e.g. those of replaced
+        manifests; returns how many were deleted. Reads every manifest, so it
+        is run as an occasional maintenance pass, not after every put.
+        """
+        with self._lock, self._connection:
+            referenced = set()
+            for (data,) in self._connection.execute("SELECT manifest FROM debates"):
+                manifest = json.loads(self._decompress(data[0], data[1:]))
+                referenced.update(manifest["refs"].values())
+                referenced.update(ref for _, ref in manifest["messages"])
+                referenced.update(manifest["prompts"].values())
+                if "config" in manifest:
+                    referenced.add(manifest["config"])
+            orphans = [
+                (key,)
+                for (key,) in self._connection.execute("SELECT hash FROM blobs")
+                if key not in referenced
+            ]
+            self._connection.executemany("DELETE FROM blobs WHERE hash = ?", orphans)
+        return len(orphans)
+
+    def _manifest(self, debate_id: str) -> Optional[dict]:
+        row = self._connection.execute(
+            "SELECT manifest FROM debates WHERE id = ?", (debate_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        data = row[0]
+        return json.loads(self._decompress(data[0], data[1:]))
+
+    def get(self, debate_id: str, prompts: bool = False) -> Optional[dict]:
+        """
+        The archived result document of a debate, None if it is unknown.
+        With `prompts` it includes the prompt versions under "prompts".
+        """
+        with self._lock:
+            manifest = self._manifest(debate_id)
+            if manifest is None:
+                return None
+            result = dict(manifest["fields"])
+            for key, ref in manifest["refs"].items():
+                result[key] = self._blob(ref).decode()
+            result["messages"] = [
+                {"speaker": speaker, "message": self._blob(ref).decode()}
+                for speaker, ref in manifest["messages"]
+            ]
+            if prompts:
+                result["prompts"] = {
+                    name: self._blob(ref).decode()
+                    for name, ref in manifest["prompts"].items()
+                }
+        return result
+
+    def config(self, debate_id: str) -> Optional[dict]:
+        """The configuration a debate was archived with, if any."""
+        with self._lock:
+            manifest = self._manifest(debate_id)
+            if manifest is None or "config" not in manifest:
+                return None
+            return json.loads(self._blob(manifest["config"]))
+
+    def find(
+        self,
+        topic: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        config: Optional[dict] = None,
+        variant: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[ArchivedDebate]:
+        """Index entries of matching debates, newest first."""
+        conditions, parameters = [], []
+        if topic is not None:
+            conditions.append("topic_hash = ?")
+            parameters.append(self.topic_hash(topic))
+        if since is not None:
+            conditions.append("created_at >= ?")
+            parameters.append(since)
+        if until is not None:
+            conditions.append("created_at < ?")
+            parameters.append(until)
+        if config is not None:
+            conditions.append("config_hash = ?")
+            parameters.append(config_hash(config))
+        if variant is not None:
+            conditions.append("variant = ?")
+            parameters.append(variant)
+        query = "SELECT id, topic, created_at, variant, config_hash, turns FROM debates"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        return [ArchivedDebate(*row) for row in rows]
+
+    def stats(self) -> dict:
+        """Debates and blobs, and the bytes of the documents against stored."""
+        with self._lock:
+            debates, raw, manifests = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0),"
+                " COALESCE(SUM(LENGTH(manifest)), 0) FROM debates"
+            ).fetchone()
+            blobs, unique, packed = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0),"
+                " COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+            ).fetchone()
+        stored = manifests + packed
+        return {
+            "debates": debates,
+            "blobs": blobs,
+            "document_bytes": raw,
+            "unique_bytes": unique,
+            "stored_bytes": stored,
+            "ratio": raw / stored if stored else 0.0,
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM debates").fetchone()
+        return row[0]
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    message_to_dict,
+    messages_from_dict,
+)
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import ConfigDict, PrivateAttr
+
+from src.utils.instrumentation import TokenUsage, usage_from_response
+from src.utils.tokens import estimate_tokens
+
+DEFAULT_RESPONSE_DB = "data/responses.sqlite"
+# Setting that only cuts replies short, see CachedChatModel
+OUTPUT_LIMIT = "max_output_tokens"
+# Finish reasons of a reply cut at the output limit (Gemini, OpenAI)
+CUT_FINISH_REASONS = ("MAX_TOKENS", "length")
+
+
+def response_key(llm: BaseChatModel, messages: list[BaseMessage], **kwargs) -> str:
+    """
+    Key of a call: the model type and the settings its replies depend on,
+    the prompt and the call arguments. The output limit is left out: it
+    does not change what is generated, only where the reply is cut.
+    """
+    params = {
+        name: value
+        for name, value in llm._identifying_params.items()
+        if name != OUTPUT_LIMIT
+    }
+    content = json.dumps(
+        [
+            llm._llm_type,
+            params,
+            [(message.type, message.content) for message in messages],
+            kwargs,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def cut_reply(llm: BaseChatModel, text: str, max_tokens: int) -> str:
+    """
+    `text` cut at an output limit of `max_tokens`, the way `llm` cuts its
+    replies if it says how (see StubChatModel.cut_reply), at whole words
+    within the estimated token count otherwise.
+    """
+    cut = getattr(llm, "cut_reply", None)
+    if cut is not None:
+        return cut(text, max_tokens)
+    words, tokens = [], 0
+    for word in text.split():
+        tokens += estimate_tokens(word)
+        if tokens > max_tokens:
+            break
+        words.append(word)
+    return " ".join(words)
+
+
+class ResponseCache:
+    """
+    LLM responses by call key, in memory and optionally in SQLite, so that
+    a sweep makes every distinct call once, and a rerun of the sweep only
+    pays for the calls it has not made before. The latency of the original
+    call is kept with each response. Concurrent misses of the same key make
+    a single call, and an entry that is not usable for a caller is replaced
+    by the one its own call makes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: dict[str, dict] = {}
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        if path is not None:
+            if path != ":memory:":
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            with self._lock, self._connection:
+                self._connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        entry TEXT NOT NULL,
+                        created_at REAL NOT NULL
+                    )
+                    """
+                )
+
+    def _load(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None and self._connection is not None:
+            row = self._connection.execute(
+                "SELECT entry FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                entry = self._entries[key] = json.loads(row[0])
+        return entry
+
+    def _store(self, key: str, entry: dict):
+        self._entries[key] = entry
+        if self._connection is not None:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                    (key, json.dumps(entry), time.time()),
+                )
+
+    def fetch(
+        self,
+        key: str,
+        call: Callable[[], dict],
+        usable: Optional[Callable[[dict], bool]] = None,
+    ) -> tuple[dict, bool]:
+        """
+        The entry for `key` and whether it was cached, making it with `call`
+        on a miss, or when the cached entry is not `usable`. An entry that is
+        being made by another thread is waited for. Failed calls are not
+        cached.
+        """
+        while True:
+            with self._lock:
+                entry = self._load(key)
+                if entry is not None and (usable is None or usable(entry)):
+                    self.hits += 1
+                    return entry, True
+                pending = self._pending.get(key)
+                if pending is None:
+                    self.misses += 1
+                    future = self._pending[key] = Future()
+                    break
+            entry = pending.result()
+            if usable is None or usable(entry):
+                with self._lock:
+                    self.hits += 1
+                return entry, True
+        try:
+            entry = call()
+        except BaseException as error:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(error)
+            raise
+        with self._lock:
+            self._store(key, entry)
+            del self._pending[key]
+        future.set_result(entry)
+        return entry, False
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._connection is None:
+                return len(self._entries)
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM responses"
+            ).fetchone()[0]
+
+
+class CachedChatModel(BaseChatModel):
+    """
+    Chat model that answers from a ResponseCache and calls `llm` on a miss.
+
+    Calls are keyed without the model's output limit, so one reply serves
+    every limit it covers: a reply that ended on its own serves any limit,
+    cut at it where it is longer, and a reply cut at its own limit serves
+    lower ones. This is how a provider cuts the same generation. Replies keep
+    the token usage of the original call, scaled to the cut, so cost
+    accounting is unchanged. The model tracks its own hits, the time they saved, which
+    is how long the original calls took minus the lookups, and the tokens
+    of the calls it actually made.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    llm: BaseChatModel
+    responses: ResponseCache
+
+    _stats_lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _hits: int = PrivateAttr(default=0)
+    _calls: int = PrivateAttr(default=0)
+    _saved: float = PrivateAttr(default=0.0)
+    _made: TokenUsage = PrivateAttr(default_factory=TokenUsage)
+
+    @property
+    def _llm_type(self) -> str:
+        return f"cached-{self.llm._llm_type}"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return self.llm._identifying_params
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.llm, "model_name", None) or getattr(
+            self.llm, "model", self.llm._llm_type
+        )
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def saved_latency(self) -> float:
+        """Seconds of model latency that cache hits did not wait for."""
+        return self._saved
+
+    @property
+    def made_usage(self) -> TokenUsage:
+        """Tokens of the calls that missed the cache."""
+        return self._made
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        limit = self.llm._identifying_params.get(OUTPUT_LIMIT)
+
+        def call() -> dict:
+            start = time.perf_counter()
+            message = self.llm.invoke(messages, stop=stop, **kwargs)
+            finish_reason = message.response_metadata.get("finish_reason")
+            return {
+                "message": message_to_dict(message),
+                "latency": time.perf_counter() - start,
+                OUTPUT_LIMIT: limit,
+                "cut": finish_reason in CUT_FINISH_REASONS,
+            }
+
+        def usable(entry: dict) -> bool:
+            made_with = entry.get(OUTPUT_LIMIT)
+            return not entry.get("cut") or (
+                limit is not None and made_with is not None and limit <= made_with
+            )
+
+        start = time.perf_counter()
+        key = response_key(self.llm, messages, stop=stop, **kwargs)
+        entry, hit = self.responses.fetch(key, call, usable)
+        message = messages_from_dict([entry["message"]])[0]
+        if hit:
+            message, entry = self._fit(message, entry, limit)
+        with self._stats_lock:
+            self._calls += 1
+            if hit:
+                self._hits += 1
+                self._saved += max(
+                    0.0, entry["latency"] - (time.perf_counter() - start)
+                )
+            else:
+                usage = usage_from_response(message)
+                self._made = TokenUsage(*(a + b for a, b in zip(self._made, usage)))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _fit(
+        self, message: AIMessage, entry: dict, limit: Optional[int]
+    ) -> tuple[AIMessage, dict]:
+        """A cached reply and its entry as they would be under `limit`."""
+        tokens = usage_from_response(message).completion_tokens
+        if limit is None or limit == entry.get(OUTPUT_LIMIT):
+            return message, entry
+        if not entry.get("cut") and tokens <= limit:
+            return message, entry
+        text = cut_reply(self.llm, message.content, limit)
+        cut_tokens = estimate_tokens(text)
+        usage = dict(message.usage_metadata or {})
+        if usage:
+            usage["output_tokens"] = cut_tokens
+            usage["total_tokens"] = usage.get("input_tokens", 0) + cut_tokens
+        message = message.model_copy(
+            update={
+                "content": text,
+                "usage_metadata": usage or None,
+                "response_metadata": message.response_metadata
+                | {"finish_reason": CUT_FINISH_REASONS[0]},
+            }
+        )
+        # Generation time shrinks with the reply
+        latency = entry["latency"] * cut_tokens / tokens if tokens else entry["latency"]
+        return message, entry | {"latency": latency}
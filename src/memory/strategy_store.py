@@ -0,0 +1,125 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from src.prompts.action_prompts import ActionPrompts
+from src.prompts.strategic_action_prompts import StrategicActionPrompts
+
+DEFAULT_STRATEGY_DB = "data/strategies.sqlite"
+
+
+def topic_hash(topic: str) -> str:
+    """Hash of a topic, insensitive to case and whitespace."""
+    normalized = " ".join(topic.split()).casefold()
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def strategy_prompt_version(system_prompt: str, strategic: bool = True) -> str:
+    """
+    Version of the prompt a strategy is generated from.
+    Any change to the strategy template or to the agent's system prompt gives
+    a new version, so strategies made with the old prompt are no longer used.
+    """
+    prompt = (
+        StrategicActionPrompts.create_strategy_formulation_prompt()
+        if strategic
+        else ActionPrompts.create_strategy_prompt()
+    )
+    content = prompt.template + "\0" + system_prompt
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+class StrategyStore:
+    """
+    SQLite store of generated debate strategies.
+
+    A strategy only depends on the model, the agent role and system prompt,
+    the topic and the number of rounds, so it can be generated once and reused
+    by every debate with the same key. Entries are keyed by
+    (model, role, topic hash, rounds, prompt version). Stored strategies are
+    generated without the debaters' AgentMemory, which is not in the key.
+    """
+
+    def __init__(self, path: str = DEFAULT_STRATEGY_DB):
+        self.path = path
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS strategies (
+                    model TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    topic_hash TEXT NOT NULL,
+                    rounds INTEGER NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    strategy TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (model, role, topic_hash, rounds, prompt_version)
+                )
+                """
+            )
+
+    def get(
+        self, model: str, role: str, topic: str, rounds: int, prompt_version: str
+    ) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT strategy FROM strategies WHERE model = ? AND role = ?"
+                " AND topic_hash = ? AND rounds = ? AND prompt_version = ?",
+                (model, role, topic_hash(topic), rounds, prompt_version),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(
+        self,
+        model: str,
+        role: str,
+        topic: str,
+        rounds: int,
+        prompt_version: str,
+        strategy: str,
+    ):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO strategies VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    model,
+                    role,
+                    topic_hash(topic),
+                    rounds,
+                    prompt_version,
+                    topic,
+                    strategy,
+                    time.time(),
+                ),
+            )
+
+    def invalidate(self, keep_versions: Optional[list[str]] = None) -> int:
+        """
+        Delete stored strategies whose prompt version is not in `keep_versions`
+        (all of them when it is None). Returns the number of deleted entries.
+        """
+        keep_versions = keep_versions or []
+        placeholders = ", ".join("?" for _ in keep_versions)
+        query = "DELETE FROM strategies"
+        if keep_versions:
+            query += f" WHERE prompt_version NOT IN ({placeholders})"
+        with self._lock, self._connection:
+            return self._connection.execute(query, keep_versions).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM strategies"
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,204 @@
+import contextlib
+import json
+import mmap
+import os
+import re
+import struct
+import uuid
+import weakref
+from array import array
+from collections.abc import Sequence
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+_LENGTH = struct.Struct("<I")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+class TranscriptSpill(BaseModel):
+    """
+    Settings for keeping long debates memory-bounded.
+    Once the state holds 2 * `recent_turns` turns, all but the last
+    `recent_turns` are appended to a log in `directory` and replaced by
+    short extractive summaries, of which at most `max_summaries` are kept.
+    The log is deleted with the run's transcript view, unless `keep` is set.
+    """
+
+    directory: str = "logs/transcripts"
+    recent_turns: int = Field(default=8, ge=1)
+    max_summaries: int = Field(default=32, ge=0)
+    summary_words: int = Field(default=40, ge=1)
+    keep: bool = False
+
+
+def summarize_turn(message: str, max_words: int = 40) -> str:
+    """Extractive summary of a turn: its first sentence, cut at `max_words`."""
+    first_sentence = _SENTENCE_END.split(message.strip(), maxsplit=1)[0]
+    words = first_sentence.split()
+    if len(words) <= max_words:
+        return " ".join(words)
+    return " ".join(words[:max_words]) + " ..."
+
+
+def new_transcript_path(directory: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{uuid.uuid4().hex}.log")
+
+
+class TranscriptLog:
+    """
+    Append-only on-disk log of debate turns.
+    Each turn is a length-prefixed JSON [speaker, message] record, so the log
+    can be appended to without reading it and scanned without parsing it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def extend(self, turns: list[tuple[str, str]]):
+        records = []
+        for speaker, message in turns:
+            payload = json.dumps([speaker, message], ensure_ascii=False).encode()
+            records.append(_LENGTH.pack(len(payload)) + payload)
+        with open(self.path, "ab") as file:
+            file.write(b"".join(records))
+
+
+def _release(maps: list[mmap.mmap], path: Optional[str]):
+    while maps:
+        maps.pop().close()
+    if path is not None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+
+class TranscriptView(Sequence):
+    """
+    Read-only view of a full debate transcript: spilled turns are read from
+    the memory-mapped log on demand, recent turns come from the state.
+    A view that owns its log (`delete`) deletes it when it is closed or
+    garbage collected; otherwise closing only unmaps the log.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        recent: list[tuple[str, str]],
+        spilled_turns: int,
+        delete: bool = False,
+    ):
+        self.path = path
+        self.recent = list(recent)
+        self.spilled_turns = spilled_turns
+        self.delete = delete
+        # Held in a list the finalizer shares, so it can unmap without the view
+        self._maps: list[mmap.mmap] = []
+        self._offsets: Optional[array] = None
+        self._finalizer = weakref.finalize(
+            self, _release, self._maps, path if delete else None
+        )
+
+    def _open(self):
+        if self._offsets is not None:
+            return
+        if not self._finalizer.alive:
+            raise ValueError("transcript view is closed and its log deleted")
+        self._offsets = array("Q")
+        if not self.spilled_turns:
+            return
+        with open(self.path, "rb") as file:
+            self._maps.append(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        position = 0
+        while len(self._offsets) < self.spilled_turns:
+            self._offsets.append(position)
+            (length,) = _LENGTH.unpack_from(self._maps[0], position)
+            position += _LENGTH.size + length
+
+    def _read(self, index: int) -> tuple[str, str]:
+        self._open()
+        offset = self._offsets[index]
+        (length,) = _LENGTH.unpack_from(self._maps[0], offset)
+        start = offset + _LENGTH.size
+        speaker, message = json.loads(self._maps[0][start : start + length])
+        return speaker, message
+
+    def __len__(self) -> int:
+        return self.spilled_turns + len(self.recent)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transcript index out of range")
+        if index >= self.spilled_turns:
+            return self.recent[index - self.spilled_turns]
+        return self._read(index)
+
+    def close(self):
+        """Unmap the log, and delete it if the view owns it."""
+        if self.delete:
+            self._finalizer()
+        else:
+            _release(self._maps, None)
+        self._offsets = None
+
+    def __enter__(self) -> "TranscriptView":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def spill_turns(state: dict, spill: TranscriptSpill):
+    """
+    Move all but the most recent turns from `state["messages"]` to the log of
+    the debate once the state holds twice as many as it keeps. Spilling in
+    batches keeps the transcript prefix stable for prompt caching between
+    spills.
+    """
+    messages = state["messages"]
+    if len(messages) < 2 * spill.recent_turns:
+        return
+    count = len(messages) - spill.recent_turns
+    spilled = messages[:count]
+    TranscriptLog(state["transcript_path"]).extend(spilled)
+    summaries = state.get("summaries", []) + [
+        (speaker, summarize_turn(message, spill.summary_words))
+        for speaker, message in spilled
+    ]
+    state["summaries"] = summaries[max(0, len(summaries) - spill.max_summaries) :]
+    state["spilled_turns"] = state.get("spilled_turns", 0) + count
+    del messages[:count]
+
+
+def transcript_view(state: dict, delete: bool = False) -> TranscriptView:
+    """
+    Full transcript of a debate state, whether or not turns were spilled.
+    With `delete` the view owns the log of spilled turns, see TranscriptView.
+    """
+    return TranscriptView(
+        state.get("transcript_path"),
+        state.get("messages", []),
+        state.get("spilled_turns", 0),
+        delete=delete,
+    )
+
+
+def discard_transcript(state: dict, spill: Optional[TranscriptSpill]):
+    """Delete the log of a debate state, unless `spill` keeps logs."""
+    path = state.get("transcript_path")
+    if path and not (spill is not None and spill.keep):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+
+
+def finish_transcript(state: dict, spill: Optional[TranscriptSpill]) -> TranscriptView:
+    """
+    Full transcript of a debate whose run returned. Spilled turns stay on disk
+    and are read on demand; the view owns their log and deletes it when it is
+    closed or garbage collected, unless `spill` keeps logs.
+    """
+    return transcript_view(state, delete=not (spill is not None and spill.keep))
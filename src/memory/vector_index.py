@@ -0,0 +1,187 @@
+import zlib
+
+import numpy as np
+
+from src.tools.evidence_retrieval import tokenize
+
+
+def embed_texts(texts: list[str], dim: int = 128) -> np.ndarray:
+    """
+    Unit vectors for `texts` by signed feature hashing of their words and
+    word pairs. Needs no model, and the same text always gets the same
+    vector, so stored vectors stay valid across processes.
+    """
+    rows, features = [], []
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        pairs = map(" ".join, zip(tokens, tokens[1:]))
+        rows.append(np.full(2 * len(tokens) - bool(tokens), row, dtype=np.int64))
+        features += tokens
+        features += pairs
+    hashes = np.fromiter(
+        map(zlib.crc32, map(str.encode, features)), np.uint32, len(features)
+    )
+    cells = np.concatenate(rows) * dim + hashes % dim if features else hashes
+    signs = np.where(hashes >> 31, 1.0, -1.0)
+    vectors = np.bincount(cells, signs, minlength=len(texts) * dim)
+    vectors = vectors.reshape(len(texts), dim).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+class VectorIndex:
+    """
+    Inverted-file (IVF) index for approximate nearest neighbours by cosine
+    similarity of unit vectors.
+
+    Vectors are kept in float32 in one list per k-means centroid; a query
+    scans only the lists of its `nprobe` nearest centroids. Until
+    `train_size` vectors have been added there is a single list and search
+    is exact. Centroids are retrained when the index has grown 4-fold
+    since they were trained. Removal swaps the last entry of a list into the
+    removed slot, so lists stay dense.
+    """
+
+    def __init__(self, dim: int = 128, nprobe: int = 16, train_size: int = 4096):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.train_size = train_size
+        self._centroids = np.zeros((1, dim), dtype=np.float32)
+        self._trained_at = 0
+        self._ids = [np.zeros(16, dtype=np.int64)]
+        self._vectors = [np.zeros((16, dim), dtype=np.float32)]
+        self._sizes = np.zeros(1, dtype=np.int64)
+        # List and slot of every id, indexed by id
+        self._list_of = np.full(16, -1, dtype=np.int32)
+        self._slot_of = np.zeros(16, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return int(self._sizes.sum())
+
+    def __contains__(self, id_: int) -> bool:
+        return 0 <= id_ < self._list_of.size and self._list_of[id_] >= 0
+
+    def _grow_locations(self, max_id: int):
+        if max_id < self._list_of.size:
+            return
+        size = max(2 * self._list_of.size, max_id + 1)
+        self._list_of = np.concatenate(
+            (self._list_of, np.full(size - self._list_of.size, -1, np.int32))
+        )
+        self._slot_of = np.resize(self._slot_of, size)
+
+    def _append(self, number: int, ids: np.ndarray, vectors: np.ndarray):
+        start = int(self._sizes[number])
+        end = start + ids.size
+        if end > self._ids[number].size:
+            capacity = max(2 * self._ids[number].size, end)
+            self._ids[number] = np.resize(self._ids[number], capacity)
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:start] = self._vectors[number][:start]
+            self._vectors[number] = grown
+        self._ids[number][start:end] = ids
+        self._vectors[number][start:end] = vectors
+        self._sizes[number] = end
+        self._list_of[ids] = number
+        self._slot_of[ids] = np.arange(start, end)
+
+    def _assign(self, vectors: np.ndarray, chunk: int = 65_536) -> np.ndarray:
+        """Nearest centroid of each vector."""
+        if self._centroids.shape[0] == 1:
+            return np.zeros(len(vectors), dtype=np.int64)
+        return np.concatenate(
+            [
+                np.argmax(vectors[start : start + chunk] @ self._centroids.T, axis=1)
+                for start in range(0, len(vectors), chunk)
+            ]
+        )
+
+    def add(self, ids: np.ndarray, vectors: np.ndarray):
+        """Add unit `vectors` under new integer `ids`."""
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not ids.size:
+            return
+        self._grow_locations(int(ids.max()))
+        lists = self._assign(vectors)
+        order = np.argsort(lists, kind="stable")
+        numbers, starts = np.unique(lists[order], return_index=True)
+        for number, part in zip(numbers, np.split(order, starts[1:])):
+            self._append(int(number), ids[part], vectors[part])
+        size = len(self)
+        if size >= self.train_size and size >= 4 * self._trained_at:
+            self.train()
+
+    def remove(self, ids) -> int:
+        """Remove `ids`; unknown ids are ignored. Returns how many were removed."""
+        removed = 0
+        for id_ in np.asarray(ids, dtype=np.int64):
+            if id_ not in self:
+                continue
+            number, slot = int(self._list_of[id_]), int(self._slot_of[id_])
+            last = int(self._sizes[number]) - 1
+            moved = self._ids[number][last]
+            self._ids[number][slot] = moved
+            self._vectors[number][slot] = self._vectors[number][last]
+            self._slot_of[moved] = slot
+            self._list_of[id_] = -1
+            self._sizes[number] = last
+            removed += 1
+        return removed
+
+    def _all(self) -> tuple[np.ndarray, np.ndarray]:
+        sizes = [int(size) for size in self._sizes]
+        ids = np.concatenate([i[:n] for i, n in zip(self._ids, sizes)])
+        vectors = np.concatenate([v[:n] for v, n in zip(self._vectors, sizes)])
+        return ids, vectors
+
+    def train(self, iterations: int = 8, seed: int = 0):
+        """
+        Train about 2 * sqrt(n) centroids with spherical k-means on a sample, then
+        reassign every vector to its nearest centroid.
+        """
+        ids, vectors = self._all()
+        count = int(np.clip(2 * np.sqrt(ids.size), 1, 4096))
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(ids.size, min(ids.size, 64 * count), False)]
+        centroids = sample[rng.choice(len(sample), count, replace=False)]
+        for _ in range(iterations):
+            nearest = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, nearest, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their old centroid
+            centroids = np.where(
+                norms > 0, sums / np.where(norms > 0, norms, 1), centroids
+            )
+
+        self._centroids = centroids.astype(np.float32)
+        self._trained_at = ids.size
+        self._ids = [np.zeros(16, dtype=np.int64) for _ in range(count)]
+        self._vectors = [
+            np.zeros((16, self.dim), dtype=np.float32) for _ in range(count)
+        ]
+        self._sizes = np.zeros(count, dtype=np.int64)
+        self._list_of[:] = -1
+        self.add(ids, vectors)
+
+    def search(self, query: np.ndarray, k: int = 5) -> tuple[np.ndarray, np.ndarray]:
+        """Ids and cosine similarities of about the `k` nearest vectors, best first."""
+        query = np.asarray(query, dtype=np.float32)
+        numbers = np.arange(self._centroids.shape[0])
+        if numbers.size > self.nprobe:
+            numbers = np.argpartition(-(self._centroids @ query), self.nprobe)
+            numbers = numbers[: self.nprobe]
+        sizes = [int(self._sizes[number]) for number in numbers]
+        ids = np.concatenate([self._ids[n][:s] for n, s in zip(numbers, sizes)])
+        if not ids.size:
+            return ids, np.zeros(0, dtype=np.float32)
+        vectors = np.concatenate([self._vectors[n][:s] for n, s in zip(numbers, sizes)])
+        scores = vectors @ query
+        best = (
+            np.argpartition(-scores, k)[:k]
+            if k < scores.size
+            else np.arange(scores.size)
+        )
+        best = best[np.argsort(-scores[best])]
+        return ids[best], scores[best]
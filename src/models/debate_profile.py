@@ -0,0 +1,119 @@
+from pathlib import Path
+from typing import Optional
+
+import yaml
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from src.memory.agent_memory import DEFAULT_MAX_ENTRIES
+from src.memory.transcript_log import TranscriptSpill
+from src.models.debate_request import DebateVariant
+from src.tools.evidence_retrieval import EvidencePolicy
+from src.utils.call_policy import CallPolicy
+from src.utils.load_balancer import LoadBalancerPolicy
+from src.utils.speculation import SpeculationPolicy
+
+DEFAULT_CONFIG = "configs/config.yaml"
+
+
+class RoleModels(BaseModel):
+    """Model per role. The judge runs on the debater model unless set."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    debater: str = "gemini-1.5-flash"
+    judge: Optional[str] = None
+
+
+class ContextPolicy(BaseModel):
+    """
+    How debate context is sent: explicit prompt caching, spilling, and
+    evidence cited from a local index.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    use_context_cache: bool = False
+    spill: Optional[TranscriptSpill] = None
+    evidence: Optional[EvidencePolicy] = None
+
+
+class Budget(BaseModel):
+    """Limits a debate run with the profile must plan within."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    max_steps: Optional[int] = Field(default=None, ge=1)
+    # Planned USD cost of one debate, see src.graph.debate_planner
+    max_cost_per_debate: Optional[float] = Field(default=None, gt=0)
+
+
+class DebateProfile(BaseModel):
+    """
+    A named bundle of debate settings: models per role, context policy, call
+    policy, caches, service concurrency and budgets.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    description: str = ""
+    variant: DebateVariant = DebateVariant.SIMPLE
+    max_steps: int = Field(default=3, ge=1)
+    panel_size: int = Field(default=4, ge=2, le=6)
+    models: RoleModels = Field(default_factory=RoleModels)
+    temperature: float = Field(default=0.5, ge=0.0, le=2.0)
+    max_output_tokens: int = Field(default=1024, ge=1)
+    use_strategic_prompt: bool = True
+    context: ContextPolicy = Field(default_factory=ContextPolicy)
+    call_policy: Optional[CallPolicy] = None
+    # Spread calls over several API keys or endpoints
+    load_balancer: Optional[LoadBalancerPolicy] = None
+    speculation: Optional[SpeculationPolicy] = None
+    # SQLite strategy cache for the strategic variant
+    strategy_store: Optional[str] = None
+    # SQLite cross-debate memory of the debaters, see AgentMemory
+    agent_memory: Optional[str] = None
+    # Memory items kept per debater before the least recently recalled are evicted
+    agent_memory_max_entries: int = Field(default=DEFAULT_MAX_ENTRIES, ge=1)
+    # Debate service settings
+    concurrency: int = Field(default=4, ge=1)
+    queue_size: int = Field(default=32, ge=1)
+    budget: Budget = Field(default_factory=Budget)
+
+    @model_validator(mode="after")
+    def _within_budget(self) -> "DebateProfile":
+        if self.budget.max_steps is not None and self.max_steps > self.budget.max_steps:
+            raise ValueError(
+                f"max_steps {self.max_steps} exceeds the budget of "
+                f"{self.budget.max_steps}"
+            )
+        return self
+
+
+class ProfileConfig(BaseModel):
+    """The profiles of a config file and the one used when none is named."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    default_profile: str
+    profiles: dict[str, DebateProfile] = Field(min_length=1)
+
+    @model_validator(mode="after")
+    def _default_exists(self) -> "ProfileConfig":
+        if self.default_profile not in self.profiles:
+            raise ValueError(f"Unknown default_profile {self.default_profile!r}")
+        return self
+
+    def get(self, name: Optional[str] = None) -> DebateProfile:
+        """The named profile, or the default one. Raises KeyError if unknown."""
+        name = name or self.default_profile
+        if name not in self.profiles:
+            raise KeyError(
+                f"Unknown profile {name!r}; choose from {', '.join(self.profiles)}"
+            )
+        return self.profiles[name]
+
+
+def load_profiles(path: str = DEFAULT_CONFIG) -> ProfileConfig:
+    """Load and validate the profiles of a YAML config file."""
+    with open(Path(path), encoding="utf-8") as file:
+        return ProfileConfig.model_validate(yaml.safe_load(file) or {})
@@ -0,0 +1,24 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class DebateVariant(Enum):
+    SIMPLE = "simple"
+    STRATEGIC = "strategic"
+    PANEL = "panel"
+
+
+class DebateRequest(BaseModel):
+    """A debate job submitted to the debate service."""
+
+    topic: str = Field(min_length=1, max_length=500)
+    max_steps: int = Field(default=3, ge=1, le=10)
+    variant: DebateVariant = DebateVariant.SIMPLE
+    panel_size: int = Field(default=4, ge=2, le=6)
+    # Named profile from the service config; it fills in the fields not given
+    profile: Optional[str] = Field(default=None, max_length=64)
+    # Seconds from submission after which the debate is stopped and its
+    # partial result stored
+    deadline_seconds: Optional[float] = Field(default=None, gt=0, le=3600)
@@ -1,12 +1,22 @@
 # debate/debate_state.py
 from enum import Enum
-from typing import Annotated, TypedDict
+from typing import Annotated, NotRequired, Optional, TypedDict
 
 
 class AgentRole(Enum):
     FAVOR = "favor"
     AGAINST = "against"
     JUDGE = "judge"
+    PANELIST = "panelist"
+
+
+class DebatePhase(Enum):
+    STRATEGY = "strategy"
+    OPENING = "opening"
+    ARGUMENT = "argument"
+    CONCLUSION = "conclusion"
+    VERDICT = "verdict"
+    META_ANALYSIS = "meta_analysis"
 
 
 class DebateState(TypedDict):
@@ -17,3 +27,47 @@ class DebateState(TypedDict):
     current_turn: AgentRole
     current_step: int
     max_steps: int
+    # Only set when older turns are spilled to disk, see TranscriptSpill
+    transcript_path: NotRequired[str]
+    summaries: NotRequired[list[tuple[str, str]]]
+    spilled_turns: NotRequired[int]
+    # Only set with an EvidencePolicy: (passage, source, text) prefetched for
+    # the topic, and every retrieval with its latency
+    evidence: NotRequired[list[tuple[int, str, str]]]
+    retrievals: NotRequired[list[dict]]
+    # Only set on the partial result of a cancelled run: why it stopped
+    cancelled: NotRequired[str]
+
+
+def merge_round_messages(
+    left: list[tuple[int, str, str]], right: Optional[list[tuple[int, str, str]]]
+) -> list[tuple[int, str, str]]:
+    """
+    Reducer for turns produced by parallel panelist branches.
+    Returning None from a node clears the round once it has been collected.
+    """
+    if right is None:
+        return []
+    return (left or []) + right
+
+
+class PanelDebateState(TypedDict):
+    topic: str
+    participants: list[str]
+    messages: Annotated[list[tuple[str, str]], "List of messages in the debate"]
+    round_messages: Annotated[list[tuple[int, str, str]], merge_round_messages]
+    current_step: int
+    max_steps: int
+    # Only set on the partial result of a cancelled run: why it stopped
+    cancelled: NotRequired[str]
+
+
+class PanelTurnState(TypedDict):
+    """Input sent to each parallel panelist branch."""
+
+    topic: str
+    participants: list[str]
+    messages: list[tuple[str, str]]
+    current_step: int
+    max_steps: int
+    speaker_index: int
@@ -4,6 +4,8 @@ from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 class ActionPrompts:
     """
     Class to define action prompts for debate agents.
+    Templates are laid out as a stable prefix (system prompt, role, topic,
+    transcript) followed by a short CURRENT TURN suffix, see prompt_layout.
     """
 
     @staticmethod
@@ -13,9 +15,12 @@ class ActionPrompts:
             """{system_prompt}
 
         You are the {role} agent in a debate.
-        Given the following state of conversation:
+        TOPIC: {topic}
+
+        DEBATE TRANSCRIPT:
         {messages}
 
+        CURRENT TURN:
         Create your next argument within 200 words."""
         )
 
@@ -23,43 +28,120 @@ class ActionPrompts:
     def create_strategy_prompt() -> PromptTemplate:
         return PromptTemplate.from_template(
             """{system_prompt}
-            You are the {role} agent in a debate.
-            Given the following topic:
-            {topic}
 
-            Create your next strategy that you will follow to defend your position and refute the opponent's argument within 500 words.""" # noqa: E501
+        You are the {role} agent in a debate.
+        TOPIC: {topic}
+
+        CURRENT TURN:
+        Create your next strategy that you will follow to defend your position and refute the opponent's argument within 500 words.""" # noqa: E501
         )
 
     @staticmethod
     def create_introduction_prompt() -> PromptTemplate:
         return PromptTemplate.from_template(
             """{system_prompt}
-            You are the {role} agent in a debate.
-            Given the following topic:
-            {topic}
-            Create your introduction argument within 100 words.
-            """
+
+        You are the {role} agent in a debate.
+        TOPIC: {topic}
+
+        CURRENT TURN:
+        Create your introduction argument within 100 words."""
         )
 
     @staticmethod
     def create_conclude_prompt() -> PromptTemplate:
         return PromptTemplate.from_template(
             """{system_prompt}
-            You are the {role} agent in a debate.
-            Given the following state of conversation:
-            {messages}
 
-            Create your conclusion within 200 words."""
+        You are the {role} agent in a debate.
+        TOPIC: {topic}
+
+        DEBATE TRANSCRIPT:
+        {messages}
+
+        CURRENT TURN:
+        Create your conclusion within 200 words."""
         )
-           
 
     @staticmethod
     def judge_and_conclude_prompt() -> PromptTemplate:
         return PromptTemplate.from_template(
             """{system_prompt}
-            You are the judge in a debate.
-            Given the following state of conversation:
-            {messages}
 
-            Analyze the arguments and strategies presented by both agents and provide a conclusion on the debate topic within 300 words."""  # noqa: E501
-        )
\ No newline at end of file
+        You are the judge in a debate.
+        TOPIC: {topic}
+
+        DEBATE TRANSCRIPT:
+        {messages}
+
+        CURRENT TURN:
+        Analyze the arguments and strategies presented by both agents and provide a conclusion on the debate topic within 300 words."""  # noqa: E501
+        )
+
+
+class PanelActionPrompts:
+    """
+    Action prompts for multi-party panel debates.
+    """
+
+    @staticmethod
+    def create_opening_prompt() -> PromptTemplate:
+        return PromptTemplate.from_template(
+            """{system_prompt}
+
+        You are {name}, one of the panelists in a debate.
+        The panel consists of: {participants}
+        TOPIC: {topic}
+
+        CURRENT TURN:
+        Create your opening statement from your perspective within 100 words."""
+        )
+
+    @staticmethod
+    def create_rebuttal_prompt() -> PromptTemplate:
+        return PromptTemplate.from_template(
+            """{system_prompt}
+
+        You are {name}, one of the panelists in a debate.
+        The panel consists of: {participants}
+        TOPIC: {topic}
+
+        DEBATE TRANSCRIPT:
+        {messages}
+
+        CURRENT TURN:
+        This is round {current_round} of {total_rounds}.
+        Respond to the previous round's statements by {previous_speakers}: rebut the points you disagree with, build on the ones you agree with, and advance your own perspective within 200 words."""  # noqa: E501
+        )
+
+    @staticmethod
+    def create_conclusion_prompt() -> PromptTemplate:
+        return PromptTemplate.from_template(
+            """{system_prompt}
+
+        You are {name}, one of the panelists in a debate.
+        The panel consists of: {participants}
+        TOPIC: {topic}
+
+        DEBATE TRANSCRIPT:
+        {messages}
+
+        CURRENT TURN:
+        Create your conclusion within 200 words."""
+        )
+
+    @staticmethod
+    def judge_panel_prompt() -> PromptTemplate:
+        return PromptTemplate.from_template(
+            """{system_prompt}
+
+        You are the judge in a panel debate.
+        The panelists are: {participants}
+        TOPIC: {topic}
+
+        DEBATE TRANSCRIPT:
+        {messages}
+
+        CURRENT TURN:
+        Evaluate every panelist individually, then aggregate your evaluation into a final ranking of all {participant_count} panelists with a short justification for each position, within 400 words."""  # noqa: E501
+        )
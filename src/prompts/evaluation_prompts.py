@@ -0,0 +1,36 @@
+from langchain_core.prompts import PromptTemplate
+
+# Marks reference scoring requests, e.g. for the offline stub model
+SCORECARD_HEADER = "REFERENCE SCORECARD"
+
+# Criteria the reference judge scores from 1 to 10
+SCORE_CRITERIA = {
+    "argument_quality": "strength and relevance of the arguments on both sides",
+    "rebuttal": "how directly each side engages and refutes the other's points",
+    "evidence": "use of concrete facts, examples and sources",
+    "coherence": "structure and clarity, with no repetition or truncated turns",
+    "verdict": "how well the final verdict is justified by the transcript",
+}
+
+
+class EvaluationPrompts:
+    """Prompts of the fixed reference judge that scores finished debates."""
+
+    @staticmethod
+    def create_scorecard_prompt() -> PromptTemplate:
+        return PromptTemplate.from_template(
+            """You are an impartial reference judge scoring the quality of a finished debate, including its verdict. You do not take a side on the topic.
+
+TOPIC: {topic}
+
+DEBATE TRANSCRIPT:
+{messages}
+
+REFERENCE SCORECARD:
+Score the debate from 1 (poor) to 10 (excellent) on each criterion:
+{criteria}
+
+Name the side that argued better as the winner: Favor, Against or Tie.
+
+{format_instructions}"""  # noqa: E501
+        )
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from langchain_core.prompts import PromptTemplate
+
+# Every action prompt is laid out as
+#   static head (system prompt, role, topic, strategy, instructions)
+#   TRANSCRIPT_HEADER + transcript so far (append-only)
+#   VOLATILE_HEADER + per-turn fields (round counters, word limit, task)
+# so consecutive prompts of an agent share the longest possible prefix and
+# provider-side prefix/context caching can apply.
+TRANSCRIPT_HEADER = "DEBATE TRANSCRIPT:"
+VOLATILE_HEADER = "CURRENT TURN:"
+
+
+def format_transcript(
+    messages: list[tuple[str, str]],
+    summaries: Optional[list[tuple[str, str]]] = None,
+    spilled_turns: int = 0,
+) -> str:
+    """
+    Render messages so that appending a turn only appends text.
+    Turns spilled out of a long debate are rendered from their summaries.
+    """
+    if not messages and not summaries:
+        return "(no statements yet)"
+    recent = "\n\n".join(f"{speaker}: {message}" for speaker, message in messages)
+    if not spilled_turns:
+        return recent
+
+    earlier = []
+    omitted = spilled_turns - len(summaries or [])
+    if omitted > 0:
+        earlier.append(f"[{omitted} earlier turns omitted]")
+    earlier += [f"{speaker}: {summary}" for speaker, summary in summaries or []]
+    return (
+        "EARLIER TURNS (summarized):\n"
+        + "\n".join(earlier)
+        + "\n\nRECENT TURNS:\n\n"
+        + recent
+    )
+
+
+@dataclass(frozen=True)
+class CacheablePrompt:
+    """A rendered prompt split into its stable prefix and volatile suffix."""
+
+    static: str
+    transcript: str
+    volatile: str
+
+    @property
+    def prefix(self) -> str:
+        """Stable, cacheable part of the prompt."""
+        return self.static + self.transcript
+
+    @property
+    def text(self) -> str:
+        return self.static + self.transcript + self.volatile
+
+    @classmethod
+    def from_text(cls, text: str) -> "CacheablePrompt":
+        volatile_at = text.rfind(VOLATILE_HEADER)
+        if volatile_at == -1:
+            volatile_at = len(text)
+        transcript_at = text.find(TRANSCRIPT_HEADER, 0, volatile_at)
+        if transcript_at == -1:
+            transcript_at = volatile_at
+        return cls(
+            static=text[:transcript_at],
+            transcript=text[transcript_at:volatile_at],
+            volatile=text[volatile_at:],
+        )
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def render_prompt(template: PromptTemplate, **fields) -> CacheablePrompt:
+    """Format `template` and split it into its cacheable parts."""
+    return CacheablePrompt.from_text(template.format(**fields))
@@ -0,0 +1,29 @@
+from langchain_core.prompts import PromptTemplate
+
+# Appended to the volatile suffix of the drafted prompt, so the strong model
+# reviews the draft with the same cacheable prefix it would answer from.
+REVIEW_HEADER = "DRAFT REVIEW:"
+REVIEW_ACCEPT = "ACCEPT"
+
+
+class SpeculationPrompts:
+    """Prompts for reviewing turns drafted by a faster model."""
+
+    @staticmethod
+    def create_review_prompt() -> PromptTemplate:
+        """Review a drafted turn: accept it as is, or return a light edit."""
+        return PromptTemplate.from_template(
+            """
+
+DRAFT REVIEW:
+A faster assistant drafted the response to the turn above:
+
+<draft>
+{draft}
+</draft>
+
+Check the draft against the instructions of the turn, your position and the transcript. It must be factually sound, on topic, respond to the latest arguments and respect the word limit.
+- If it needs no changes, reply with exactly ACCEPT and nothing else.
+- Otherwise reply with the improved response only, editing the draft as lightly as possible.
+"""
+        )
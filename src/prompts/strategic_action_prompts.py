@@ -4,6 +4,9 @@ from langchain_core.prompts import PromptTemplate
 class StrategicActionPrompts:
     """
     Complete debate prompt system with strategic manipulation capabilities.
+    Debater prompts share one head (system prompt, role, topic, position,
+    rounds, strategy) and keep the transcript and per-round fields at the
+    end, so successive turns extend a cacheable prefix, see prompt_layout.
     """
     
     @staticmethod
@@ -12,7 +15,7 @@ class StrategicActionPrompts:
         return PromptTemplate.from_template(
             """{system_prompt}
             
-            You are the {role} agent preparing for a strategic debate.
+            You are the {role} agent in a strategic debate.
             
             DEBATE TOPIC: {topic}
             YOUR POSITION: {position}
@@ -33,6 +36,7 @@ class StrategicActionPrompts:
             
             CRITICAL RULE: All arguments must be factually accurate. No false information allowed.
             
+            CURRENT TURN:
             CREATE YOUR STRATEGY (400-500 words):
             1. Your core factual arguments and evidence
             2. Anticipated opponent arguments and your factual responses
@@ -48,11 +52,12 @@ class StrategicActionPrompts:
         return PromptTemplate.from_template(
             """{system_prompt}
             
-            You are the {role} agent delivering your opening statement.
+            You are the {role} agent in a strategic debate.
             
-            TOPIC: {topic}
-            YOUR STRATEGY: {strategy}
+            DEBATE TOPIC: {topic}
+            YOUR POSITION: {position}
             TOTAL ROUNDS: {total_rounds}
+            YOUR HIDDEN STRATEGY: {strategy}
             
             OPENING OBJECTIVES:
             - Establish your position clearly
@@ -63,10 +68,10 @@ class StrategicActionPrompts:
             
             CONSTRAINTS:
             - Must be factually accurate
-            - 100 words maximum
             - Professional and credible tone
             
-            Create your opening statement that establishes your position with strong factual grounding.
+            CURRENT TURN:
+            Create your opening statement (100 words maximum) that establishes your position with strong factual grounding.
             """
         )
     
@@ -76,20 +81,19 @@ class StrategicActionPrompts:
         return PromptTemplate.from_template(
             """{system_prompt}
             
-            You are the {role} agent in round {current_round} of {total_rounds}.
+            You are the {role} agent in a strategic debate.
             
+            DEBATE TOPIC: {topic}
+            YOUR POSITION: {position}
+            TOTAL ROUNDS: {total_rounds}
             YOUR HIDDEN STRATEGY: {strategy}
             
-            OPPONENT'S LAST ARGUMENT: {opponent_last_argument}
-            
-            FULL DEBATE HISTORY: {messages}
-            
             STRATEGIC ANALYSIS REQUIRED:
             1. FACT-CHECK OPPONENT: Identify any factual errors, weak logic, or unsupported claims
             2. DEFENSIVE ASSESSMENT: Which of your points need defending?
             3. OFFENSIVE OPPORTUNITIES: What new factual angles can advance your position?
             4. PSYCHOLOGICAL POSITIONING: How can you frame facts to maximize impact?
-            5. ROUND MANAGEMENT: {rounds_remaining} rounds left - pace accordingly
+            5. ROUND MANAGEMENT: Pace your arguments to the rounds remaining
             
             MULTI-LAYERED RESPONSE STRATEGY:
             
@@ -143,6 +147,12 @@ class StrategicActionPrompts:
             - Am I presenting this fairly?
             - What would happen if opponent fact-checks this?
             
+            DEBATE TRANSCRIPT:
+            {messages}
+            
+            CURRENT TURN:
+            This is round {current_round} of {total_rounds} - {rounds_remaining} rounds left.
+            Your opponent's last argument is the final statement in the transcript above.
             Create your strategic response (150 words maximum) that simultaneously defends against opponent's points, advances your position with new factual arguments, and employs psychological tactics - all while maintaining complete factual accuracy.
             """
         )
@@ -153,10 +163,12 @@ class StrategicActionPrompts:
         return PromptTemplate.from_template(
             """{system_prompt}
             
-            You are the {role} agent delivering your FINAL CONCLUSION.
+            You are the {role} agent in a strategic debate.
             
-            YOUR STRATEGY: {strategy}
-            COMPLETE DEBATE HISTORY: {messages}
+            DEBATE TOPIC: {topic}
+            YOUR POSITION: {position}
+            TOTAL ROUNDS: {total_rounds}
+            YOUR HIDDEN STRATEGY: {strategy}
             
             CONCLUSION OBJECTIVES:
             This is NOT the time for new arguments. Instead:
@@ -178,6 +190,11 @@ class StrategicActionPrompts:
             - Making unsupported claims
             - Personal attacks or unfair characterizations
             
+            DEBATE TRANSCRIPT:
+            {messages}
+            
+            CURRENT TURN:
+            You are delivering your FINAL CONCLUSION.
             Create your conclusion (100 words maximum) that provides satisfying closure while reinforcing why your position should prevail based on the facts and logic presented.
             """
         )
@@ -191,7 +208,6 @@ class StrategicActionPrompts:
             You are an EXPERT JUDGE evaluating this debate with complete objectivity.
             
             DEBATE TOPIC: {topic}
-            COMPLETE TRANSCRIPT: {messages}
             
             EVALUATION FRAMEWORK:
             Judge each agent on these criteria:
@@ -224,6 +240,10 @@ class StrategicActionPrompts:
             - Evaluate evidence quality, not just persuasiveness
             - Consider how well each agent adapted to challenges
             
+            DEBATE TRANSCRIPT:
+            {messages}
+            
+            CURRENT TURN:
             PROVIDE YOUR VERDICT (150 words):
             1. Analysis of each agent's performance across all criteria
             2. Key strengths and weaknesses identified
@@ -244,8 +264,6 @@ class StrategicActionPrompts:
             TOPIC: {topic}
             AGENT 1 STRATEGY: {strategy_1}
             AGENT 2 STRATEGY: {strategy_2}
-            COMPLETE DEBATE: {messages}
-            JUDGE VERDICT: {judge_verdict}
             
             META-ANALYSIS OBJECTIVES:
             
@@ -274,6 +292,12 @@ class StrategicActionPrompts:
                - Would the outcome have been different with different strategies?
                - What does this reveal about effective debate tactics?
             
+            DEBATE TRANSCRIPT:
+            {messages}
+            
+            CURRENT TURN:
+            JUDGE VERDICT: {judge_verdict}
+            
             Provide comprehensive meta-analysis (150 words) examining the strategic, psychological, and factual dimensions of this debate.
             """
         )
\ No newline at end of file
@@ -0,0 +1,341 @@
+import json
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from src.utils.tracing import Tracer
+
+DEFAULT_EVIDENCE_INDEX = "data/evidence"
+INDEX_VERSION = 1
+
+_TOKEN = re.compile(r"\w+")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+# Words that say nothing about a passage, dropped from passages and queries
+_STOPWORDS = frozenset(
+    "a an and are as at be been but by can do does for from has have how if in "
+    "into is it its may more not of on or should so than that the their there "
+    "these they this to was we were what when which who will with would you".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens of `text`, without stopwords and single letters."""
+    return [
+        token
+        for token in _TOKEN.findall(text.lower())
+        if len(token) > 1 and token not in _STOPWORDS
+    ]
+
+
+class EvidencePolicy(BaseModel):
+    """
+    Settings for citing evidence from a local corpus in debater prompts.
+    The `prefetch` best passages for the topic are retrieved once per debate
+    and shared by both sides through the state; each turn cites the
+    `per_turn` of them that best match the opponent's last turn.
+    """
+
+    index: str = DEFAULT_EVIDENCE_INDEX
+    prefetch: int = Field(default=12, ge=1)
+    per_turn: int = Field(default=3, ge=1)
+    # Longer passages are cut at a word boundary in the prompt
+    max_chars: int = Field(default=400, ge=40)
+
+
+@dataclass(frozen=True)
+class Evidence:
+    """A retrieved passage and its BM25 score for the query."""
+
+    passage: int
+    source: str
+    text: str
+    score: float
+
+
+def _split_passages(text: str, passage_words: int) -> Iterator[str]:
+    """Group paragraphs into passages of about `passage_words` words."""
+    words: list[str] = []
+    for paragraph in _PARAGRAPH.split(text):
+        paragraph_words = paragraph.split()
+        if words and len(words) + len(paragraph_words) > passage_words:
+            yield " ".join(words)
+            words = []
+        words += paragraph_words
+        while len(words) >= 2 * passage_words:
+            yield " ".join(words[:passage_words])
+            words = words[passage_words:]
+    if words:
+        yield " ".join(words)
+
+
+def iter_corpus(paths: Iterable[str]) -> Iterator[tuple[str, str]]:
+    """
+    Read (source, text) documents from text and Markdown files, from JSONL
+    files of {"text", "source"} objects, and from directories of them.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(
+                str(child)
+                for child in Path(path).rglob("*")
+                if child.suffix in (".txt", ".md", ".jsonl")
+            )
+            yield from iter_corpus(names)
+        elif path.endswith(".jsonl"):
+            with open(path, encoding="utf-8") as file:
+                for number, line in enumerate(file, start=1):
+                    if line.strip():
+                        document = json.loads(line)
+                        source = document.get("source") or f"{path}:{number}"
+                        yield source, document["text"]
+        else:
+            with open(path, encoding="utf-8") as file:
+                yield path, file.read()
+
+
+def build_evidence_index(
+    documents: Iterable[tuple[str, str]],
+    directory: str = DEFAULT_EVIDENCE_INDEX,
+    passage_words: int = 120,
+    k1: float = 1.2,
+    b: float = 0.75,
+) -> int:
+    """
+    Split (source, text) documents into passages and write a BM25 index of
+    them to `directory`. Postings hold precomputed BM25 weights, so a query
+    only sums the weights of its terms. Returns the number of passages.
+    """
+    terms: dict[str, int] = {}
+    sources: dict[str, int] = {}
+    texts: list[bytes] = []
+    passage_sources: list[int] = []
+    lengths: list[int] = []
+    posting_terms: list[int] = []
+    posting_passages: list[int] = []
+    frequencies: list[int] = []
+    for source, text in documents:
+        source_id = sources.setdefault(source, len(sources))
+        for passage in _split_passages(text, passage_words):
+            tokens = tokenize(passage)
+            if not tokens:
+                continue
+            counts = Counter(terms.setdefault(token, len(terms)) for token in tokens)
+            posting_terms += counts.keys()
+            posting_passages += [len(texts)] * len(counts)
+            frequencies += counts.values()
+            texts.append(passage.encode())
+            passage_sources.append(source_id)
+            lengths.append(len(tokens))
+
+    passages = len(texts)
+    term_ids = np.array(posting_terms, dtype=np.int64)
+    passage_ids = np.array(posting_passages, dtype=np.int32)
+    tf = np.array(frequencies, dtype=np.float64)
+    # Postings of a term are contiguous and sorted by passage
+    order = np.lexsort((passage_ids, term_ids))
+    term_ids, passage_ids, tf = term_ids[order], passage_ids[order], tf[order]
+    df = np.bincount(term_ids, minlength=len(terms))
+    indptr = np.concatenate(([0], np.cumsum(df)))
+    idf = np.log1p((passages - df + 0.5) / (df + 0.5))
+    length = np.array(lengths, dtype=np.float64)
+    norm = k1 * (1 - b + b * length / (length.mean() if passages else 1.0))
+    weights = idf[term_ids] * tf * (k1 + 1) / (tf + norm[passage_ids])
+    offsets = np.concatenate(([0], np.cumsum([len(text) for text in texts])))
+
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+    np.save(target / "indptr.npy", indptr.astype(np.int64))
+    np.save(target / "postings.npy", passage_ids)
+    np.save(target / "weights.npy", weights.astype(np.float32))
+    np.save(target / "offsets.npy", offsets.astype(np.int64))
+    np.save(target / "sources.npy", np.array(passage_sources, dtype=np.int32))
+    (target / "passages.bin").write_bytes(b"".join(texts))
+    meta = {
+        "version": INDEX_VERSION,
+        "passages": passages,
+        "k1": k1,
+        "b": b,
+        "passage_words": passage_words,
+        "terms": list(terms),
+        "sources": list(sources),
+    }
+    (target / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+    return passages
+
+
+class EvidenceIndex:
+    """
+    Read-only BM25 index written by build_evidence_index. Postings and
+    passage texts are memory-mapped, so opening the index is cheap and the
+    pages are shared by every process that reads it.
+    """
+
+    def __init__(self, directory: str = DEFAULT_EVIDENCE_INDEX):
+        path = Path(directory)
+        meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+        if meta.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported evidence index version in {directory}")
+        self.directory = directory
+        self.terms = {term: number for number, term in enumerate(meta["terms"])}
+        self.source_names: list[str] = meta["sources"]
+        self._indptr = np.load(path / "indptr.npy", mmap_mode="r")
+        self._postings = np.load(path / "postings.npy", mmap_mode="r")
+        self._weights = np.load(path / "weights.npy", mmap_mode="r")
+        self._offsets = np.load(path / "offsets.npy", mmap_mode="r")
+        self._sources = np.load(path / "sources.npy", mmap_mode="r")
+        # np.memmap cannot map an empty file
+        self._text = (
+            np.memmap(path / "passages.bin", dtype=np.uint8, mode="r")
+            if self._offsets[-1]
+            else np.zeros(0, dtype=np.uint8)
+        )
+
+    def __len__(self) -> int:
+        return self._offsets.size - 1
+
+    def passage(self, number: int) -> tuple[str, str]:
+        """Source and text of a passage."""
+        start, end = self._offsets[number], self._offsets[number + 1]
+        source = self.source_names[self._sources[number]]
+        return source, self._text[start:end].tobytes().decode()
+
+    def _postings_for(self, query: str) -> tuple[np.ndarray, np.ndarray]:
+        numbers = sorted({self.terms[t] for t in tokenize(query) if t in self.terms})
+        slices = [slice(self._indptr[n], self._indptr[n + 1]) for n in numbers]
+        if not slices:
+            return np.zeros(0, np.int32), np.zeros(0, np.float32)
+        return (
+            np.concatenate([self._postings[part] for part in slices]),
+            np.concatenate([self._weights[part] for part in slices]),
+        )
+
+    def search(
+        self, query: str, k: int = 5, within: Optional[Iterable[int]] = None
+    ) -> list[Evidence]:
+        """
+        The `k` best passages for `query` by BM25, best first, optionally
+        only among the passages numbered `within`. Passages that share no
+        term with the query are not returned.
+        """
+        passages, weights = self._postings_for(query)
+        if within is None:
+            candidates = np.arange(len(self))
+            scores = np.bincount(passages, weights, minlength=len(self))
+        else:
+            candidates = np.unique(np.fromiter(within, dtype=np.int64))
+            if not candidates.size:
+                return []
+            slots = np.searchsorted(candidates, passages)
+            slots[slots == candidates.size] = 0
+            hit = candidates[slots] == passages
+            scores = np.bincount(slots[hit], weights[hit], minlength=candidates.size)
+        if k < scores.size:
+            best = np.argpartition(-scores, k)[:k]
+        else:
+            best = np.arange(scores.size)
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [
+            Evidence(int(candidates[slot]), *self.passage(candidates[slot]), score)
+            for slot in best
+            if (score := float(scores[slot])) > 0
+        ]
+
+
+@lru_cache(maxsize=None)
+def load_evidence_index(directory: str = DEFAULT_EVIDENCE_INDEX) -> EvidenceIndex:
+    """Open an index once per process; every graph using it shares the maps."""
+    return EvidenceIndex(directory)
+
+
+def _shorten(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+
+class EvidenceRetriever:
+    """
+    Puts evidence from a local index into a debate. The first debater turn
+    prefetches the topic's passages into state["evidence"]; every turn then
+    picks its citations from that shared pool without another index lookup
+    over the whole corpus. Each retrieval is recorded in state["retrievals"]
+    with its latency, and on the node span when tracing.
+    """
+
+    def __init__(
+        self,
+        policy: EvidencePolicy,
+        index: Optional[EvidenceIndex] = None,
+        tracer: Optional[Tracer] = None,
+    ):
+        self.policy = policy
+        self.index = index or load_evidence_index(policy.index)
+        self.tracer = tracer
+
+    def _record(self, state: dict, speaker: str, kind: str, start: float, hits):
+        latency = time.perf_counter() - start
+        state.setdefault("retrievals", []).append(
+            {
+                "round": state["current_step"],
+                "speaker": speaker,
+                "kind": kind,
+                "latency": latency,
+                "passages": [passage for passage, *_ in hits],
+            }
+        )
+        if self.tracer is not None and (span := self.tracer.current_span()):
+            span.set_attributes(
+                {f"evidence.{kind}_latency": latency, f"evidence.{kind}": len(hits)}
+            )
+
+    def prefetch(self, state: dict, speaker: str = ""):
+        """Retrieve the topic's evidence pool, unless the state already has it."""
+        if "evidence" in state:
+            return
+        start = time.perf_counter()
+        hits = self.index.search(state["topic"], self.policy.prefetch)
+        state["evidence"] = [(hit.passage, hit.source, hit.text) for hit in hits]
+        self._record(state, speaker, "prefetch", start, state["evidence"])
+
+    def citations(self, state: dict, speaker: str) -> Optional[str]:
+        """
+        Evidence block for `speaker`'s turn: the pooled passages that best
+        match the topic and the opponent's last turn, preferring passages the
+        speaker has not cited yet. None if the pool is empty.
+        """
+        self.prefetch(state, speaker)
+        pool = {passage: (source, text) for passage, source, text in state["evidence"]}
+        if not pool:
+            return None
+        start = time.perf_counter()
+        replies = [turn for turn in state["messages"] if turn[0] != speaker]
+        query = state["topic"] + (" " + replies[-1][1] if replies else "")
+        ranked = [hit.passage for hit in self.index.search(query, len(pool), pool)]
+        ranked += [passage for passage in pool if passage not in ranked]
+        cited = {
+            passage
+            for record in state.get("retrievals", [])
+            if record["speaker"] == speaker and record["kind"] == "turn"
+            for passage in record["passages"]
+        }
+        ranked.sort(key=lambda passage: passage in cited)
+        chosen = [
+            (passage, *pool[passage]) for passage in ranked[: self.policy.per_turn]
+        ]
+        self._record(state, speaker, "turn", start, chosen)
+        lines = [
+            f"[{number}] ({source}) {_shorten(text, self.policy.max_chars)}"
+            for number, (_, source, text) in enumerate(chosen, start=1)
+        ]
+        return (
+            "\nEVIDENCE (from the reference corpus; cite as [n] where it supports "
+            "your point, and do not invent other sources):\n" + "\n".join(lines) + "\n"
+        )
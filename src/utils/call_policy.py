@@ -0,0 +1,214 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Optional
+
+from langchain_core.language_models import BaseLanguageModel
+from pydantic import BaseModel, Field
+
+from src.models.debate_state import DebatePhase
+from src.utils.cancellation import (
+    CancellationToken,
+    DebateCancelledError,
+    start_call,
+)
+
+
+class CallTimeoutError(TimeoutError):
+    """An LLM call did not finish within its phase timeout."""
+
+
+class CallPolicyError(RuntimeError):
+    """All attempts, hedges and fallbacks for an LLM call failed."""
+
+    def __init__(self, message: str, events: list[str]):
+        super().__init__(message)
+        self.events = events
+
+
+class CallPolicy(BaseModel):
+    """
+    Timeout, retry, hedging and fallback settings for agent LLM calls.
+    Timeouts are per attempt and per phase; strategy and judge calls produce
+    longer outputs than debater turns and get more time by default.
+    """
+
+    timeouts: dict[DebatePhase, float] = Field(
+        default_factory=lambda: {
+            DebatePhase.STRATEGY: 60.0,
+            DebatePhase.VERDICT: 60.0,
+            DebatePhase.META_ANALYSIS: 60.0,
+        }
+    )
+    default_timeout: float = 30.0
+    max_retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    hedge: bool = True
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+    latency_window: int = 200
+    fallback_model: Optional[str] = None
+    non_retryable: tuple[type[BaseException], ...] = (
+        TypeError,
+        KeyError,
+        NotImplementedError,
+    )
+
+    def timeout_for(self, phase: DebatePhase) -> float:
+        return self.timeouts.get(phase, self.default_timeout)
+
+    def backoff(self, retry: int) -> float:
+        """Exponential backoff with full jitter for the given retry number."""
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (retry - 1))
+        return random.uniform(0, ceiling)
+
+
+class CallPolicyRunner:
+    """
+    Applies a CallPolicy to LLM calls and keeps the per-phase latency history
+    used to decide when to hedge. One runner is shared by all agents of a graph.
+
+    Every attempt runs on a daemon thread, so a hung request is abandoned at
+    its timeout instead of stalling the debate. Without a `fallback_llm`,
+    `create_fallback_llm` creates the fallback model on the first fallback.
+    """
+
+    def __init__(
+        self,
+        policy: CallPolicy,
+        fallback_llm: Optional[BaseLanguageModel] = None,
+        create_fallback_llm: Optional[Callable[[], BaseLanguageModel]] = None,
+    ):
+        self.policy = policy
+        self.fallback_llm = fallback_llm
+        self.create_fallback_llm = create_fallback_llm
+        self._latencies: dict[DebatePhase, deque] = {}
+        self._lock = threading.Lock()
+
+    def _fallback(self) -> BaseLanguageModel:
+        if self.fallback_llm is None:
+            self.fallback_llm = self.create_fallback_llm()
+        return self.fallback_llm
+
+    def _observe(self, phase: DebatePhase, latency: float):
+        with self._lock:
+            window = self._latencies.setdefault(
+                phase, deque(maxlen=self.policy.latency_window)
+            )
+            window.append(latency)
+
+    def hedge_delay(self, phase: DebatePhase) -> Optional[float]:
+        """Latency quantile after which a hedged request is sent, if known."""
+        if not self.policy.hedge:
+            return None
+        with self._lock:
+            samples = sorted(self._latencies.get(phase, ()))
+        if len(samples) < self.policy.hedge_min_samples:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * self.policy.hedge_quantile))
+        return samples[index]
+
+    def _attempt(
+        self,
+        fn: Callable[[], Any],
+        phase: DebatePhase,
+        events: list[str],
+        cancellation: Optional[CancellationToken] = None,
+    ) -> Any:
+        """
+        Run one attempt, hedging it once if it is slower than usual. With a
+        cancellation token the attempt is abandoned as soon as it is cancelled.
+        """
+        if cancellation is not None:
+            cancellation.raise_if_cancelled()
+        timeout = self.policy.timeout_for(phase)
+        start = time.perf_counter()
+        pending = {start_call(fn, cancellation)}
+        watched = {cancellation.future} if cancellation is not None else set()
+
+        hedge_delay = self.hedge_delay(phase)
+        if hedge_delay is not None and hedge_delay < timeout:
+            done, _ = wait(
+                pending | watched, timeout=hedge_delay, return_when=FIRST_COMPLETED
+            )
+            if cancellation is not None:
+                cancellation.raise_if_cancelled()
+            # Hedge only if the original call is still running
+            if not done & pending:
+                events.append(f"hedge after {hedge_delay:.2f}s")
+                pending.add(start_call(fn, cancellation))
+
+        error: Optional[BaseException] = None
+        while pending:
+            remaining = max(0.0, timeout - (time.perf_counter() - start))
+            if cancellation is not None and cancellation.remaining() is not None:
+                remaining = min(remaining, cancellation.remaining())
+            done, _ = wait(
+                pending | watched, timeout=remaining, return_when=FIRST_COMPLETED
+            )
+            if cancellation is not None:
+                cancellation.raise_if_cancelled()
+            pending -= done
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    self._observe(phase, time.perf_counter() - start)
+                    return future.result()
+                error = future.exception()
+
+        if error is not None and not pending:
+            raise error
+        raise CallTimeoutError(f"{phase.value} call timed out after {timeout:.1f}s")
+
+    def invoke(
+        self,
+        send: Callable[[BaseLanguageModel], Any],
+        llm: BaseLanguageModel,
+        phase: DebatePhase,
+        events: list[str],
+        cancellation: Optional[CancellationToken] = None,
+    ) -> Any:
+        """
+        Call `send(model)` under the policy, retrying with backoff and then
+        falling back to the alternate model. Retries, hedges and fallbacks are
+        appended to `events`. A cancelled token stops the call, its backoff
+        and any further attempts with DebateCancelledError.
+        """
+        has_fallback = (
+            self.fallback_llm is not None or self.create_fallback_llm is not None
+        )
+        last_error: Optional[BaseException] = None
+
+        for model_index in range(1 + has_fallback):
+            model = llm
+            if model_index:
+                events.append("fallback model")
+                model = self._fallback()
+            for retry in range(self.policy.max_retries + 1):
+                if retry:
+                    delay = self.policy.backoff(retry)
+                    events.append(
+                        f"retry {retry} after {type(last_error).__name__}"
+                        f" (backoff {delay:.2f}s)"
+                    )
+                    if cancellation is None:
+                        time.sleep(delay)
+                    elif cancellation.wait(delay):
+                        cancellation.raise_if_cancelled()
+                try:
+                    return self._attempt(
+                        lambda: send(model), phase, events, cancellation
+                    )
+                except (DebateCancelledError, *self.policy.non_retryable):
+                    raise
+                except Exception as error:
+                    last_error = error
+
+        raise CallPolicyError(
+            f"{phase.value} call failed after retries and fallback: {last_error}",
+            events,
+        ) from last_error
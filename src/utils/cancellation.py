@@ -0,0 +1,154 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+# Cancellation reasons
+CANCELLED = "cancelled"
+DEADLINE_EXCEEDED = "deadline exceeded"
+
+_current_token: contextvars.ContextVar[Optional["CancellationToken"]] = (
+    contextvars.ContextVar("debate_cancellation", default=None)
+)
+
+
+class DebateCancelledError(RuntimeError):
+    """The debate was cancelled or ran past its deadline."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Debate stopped: {reason}")
+        self.reason = reason
+
+
+def start_call(
+    fn: Callable[[], Any], cancellation: Optional["CancellationToken"] = None
+) -> Future:
+    """
+    Run `fn` on a daemon thread and return its future, so that a caller can
+    stop waiting for a hung or no longer wanted request and abandon it.
+    With a cancellation token the call only starts if the token admits it.
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            if cancellation is not None:
+                cancellation.admit()
+            future.set_result(fn())
+        except BaseException as error:
+            future.set_exception(error)
+
+    threading.Thread(target=run, daemon=True, name="debate-llm-call").start()
+    return future
+
+
+class CancellationToken:
+    """
+    Deadline and cancellation signal of one debate run.
+
+    A token is cancelled by `cancel` (e.g. when the client goes away) or
+    once `deadline` (a `time.monotonic()` value) passes. The graph checks it
+    before every node, and agent calls wait on it next to the LLM response,
+    so a cancelled debate abandons its in-flight call and schedules nothing
+    after it. Every LLM call is admitted by the token right before it starts,
+    on the thread that makes it; admissions and `cancel` take the same lock,
+    so no call starts once `cancel` has returned. `calls` counts the admitted
+    calls and `calls_at_cancel` those admitted before the cancellation.
+    `future` completes with the reason when the token is cancelled, so it can
+    be waited on together with request futures.
+    """
+
+    def __init__(
+        self, timeout: Optional[float] = None, deadline: Optional[float] = None
+    ):
+        if deadline is None and timeout is not None:
+            deadline = time.monotonic() + timeout
+        self.deadline = deadline
+        self.future: Future = Future()
+        self.cancelled_at: Optional[float] = None
+        self.calls = 0
+        self.calls_at_cancel: Optional[int] = None
+        # Reentrant, since an admission may find the deadline passed and cancel
+        self._lock = threading.RLock()
+
+    def cancel(self, reason: str = CANCELLED) -> bool:
+        """Cancel the token; returns False if it already was."""
+        with self._lock:
+            # The first reason wins
+            if self.future.done():
+                return False
+            self.future.set_result(reason)
+            self.cancelled_at = time.perf_counter()
+            self.calls_at_cancel = self.calls
+        return True
+
+    @property
+    def cancelled(self) -> bool:
+        if not self.future.done() and self.remaining() == 0:
+            self.cancel(DEADLINE_EXCEEDED)
+        return self.future.done()
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self.future.result() if self.cancelled else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline, None without a deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise DebateCancelledError(self.reason)
+
+    def admit(self):
+        """Count an LLM call that starts now, or raise if the token is cancelled."""
+        with self._lock:
+            self.raise_if_cancelled()
+            self.calls += 1
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sleep up to `timeout` seconds, or until the token is cancelled or its
+        deadline passes. Returns whether it is cancelled.
+        """
+        remaining = self.remaining()
+        if remaining is not None:
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        wait([self.future], timeout=timeout)
+        return self.cancelled
+
+    def run(self, fn: Callable[[], Any]) -> Any:
+        """
+        Call `fn` on a daemon thread and return its result, raising
+        DebateCancelledError as soon as the token is cancelled instead.
+        """
+        self.raise_if_cancelled()
+        call = start_call(fn, self)
+        while not call.done():
+            wait([call, self.future], self.remaining(), return_when=FIRST_COMPLETED)
+            if not call.done():
+                self.raise_if_cancelled()
+        return call.result()
+
+
+def current_cancellation() -> Optional[CancellationToken]:
+    """The token of the debate running in this context, if it has one."""
+    return _current_token.get()
+
+
+@contextmanager
+def cancellation_scope(
+    token: Optional[CancellationToken],
+) -> Iterator[Optional[CancellationToken]]:
+    """Make `token` the current token of the calls made inside the block."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
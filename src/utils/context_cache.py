@@ -0,0 +1,155 @@
+import hashlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from src.utils.tokens import estimate_tokens
+
+# Smallest content Gemini caches explicitly, by model name prefix; longest
+# prefix wins. Smaller content is rejected by caches.create.
+GEMINI_MIN_CACHE_TOKENS = {
+    "gemini-1.5": 32_768,
+    "gemini-2.0": 4_096,
+    "gemini-2.5-flash": 1_024,
+    "gemini-2.5-pro": 4_096,
+}
+DEFAULT_MIN_CACHE_TOKENS = 4_096
+
+
+def min_cache_tokens(model_name: str) -> int:
+    """Explicit cache minimum of a Gemini model, see GEMINI_MIN_CACHE_TOKENS."""
+    prefixes = [p for p in GEMINI_MIN_CACHE_TOKENS if model_name.startswith(p)]
+    if not prefixes:
+        return DEFAULT_MIN_CACHE_TOKENS
+    return GEMINI_MIN_CACHE_TOKENS[max(prefixes, key=len)]
+
+
+class ContextCache(ABC):
+    """
+    Explicit provider-side context cache.
+    Maps the static head of a prompt to a provider cache handle so that only
+    the transcript and the volatile suffix are sent with each call.
+    """
+
+    @abstractmethod
+    def handle_for(self, content: str) -> Optional[str]:
+        """Return a cache handle for `content`, or None to send it uncached."""
+
+
+class GeminiContextCache(ContextCache):
+    """
+    Gemini explicit context caching through the google-genai client.
+    Content below the model's minimum cacheable size (`min_tokens`, see
+    min_cache_tokens) is not cached, and neither is content seen fewer than
+    `min_uses` times, such as an opening's head, which is sent only once.
+    Any provider error falls back to sending the full prompt, and the content
+    is not tried again for `ttl_seconds`.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        ttl_seconds: int = 600,
+        min_tokens: Optional[int] = None,
+        min_uses: int = 2,
+        client=None,
+        max_tracked: int = 4096,
+    ):
+        self.model_name = model_name
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = (
+            min_tokens if min_tokens is not None else min_cache_tokens(model_name)
+        )
+        self.min_uses = min_uses
+        self.max_tracked = max_tracked
+        self._client = client
+        self._handles: dict[str, tuple[str, float]] = {}
+        # Uses of content not cached yet, and when creating its cache failed
+        self._uses: OrderedDict[str, int] = OrderedDict()
+        self._failed: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        if self._client is None:
+            from google import genai
+
+            self._client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+        return self._client
+
+    def handle_for(self, content: str) -> Optional[str]:
+        if estimate_tokens(content) < self.min_tokens:
+            return None
+
+        key = hashlib.sha256(content.encode()).hexdigest()
+        now = time.monotonic()
+        with self._lock:
+            cached = self._handles.get(key)
+            # Refresh a little before the provider expires the cache.
+            if cached and now - cached[1] < self.ttl_seconds * 0.9:
+                return cached[0]
+            failed_at = self._failed.get(key)
+            if failed_at is not None:
+                if now - failed_at < self.ttl_seconds:
+                    return None
+            elif cached is None:
+                uses = self._uses.pop(key, 0) + 1
+                if uses < self.min_uses:
+                    self._track(self._uses, key, uses)
+                    return None
+
+        try:
+            from google.genai import types
+
+            cache = self._get_client().caches.create(
+                model=self.model_name,
+                config=types.CreateCachedContentConfig(
+                    contents=[content], ttl=f"{self.ttl_seconds}s"
+                ),
+            )
+        except Exception:
+            with self._lock:
+                self._track(self._failed, key, now)
+            return None
+
+        with self._lock:
+            self._failed.pop(key, None)
+            self._handles[key] = (cache.name, now)
+        return cache.name
+
+    def _track(self, entries: OrderedDict, key: str, value):
+        """Set an entry, dropping the oldest beyond `max_tracked`."""
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_tracked:
+            entries.popitem(last=False)
+
+
+class StubContextCache(ContextCache):
+    """Explicit context cache backed by a StubChatModel, for offline runs."""
+
+    def __init__(self, llm, min_tokens: int = 0):
+        self.llm = llm
+        self.min_tokens = min_tokens
+
+    def handle_for(self, content: str) -> Optional[str]:
+        if estimate_tokens(content) < self.min_tokens:
+            return None
+        return self.llm.create_cache(content)
+
+
+def create_context_cache(llm, model_name: str) -> Optional[ContextCache]:
+    """
+    Create an explicit context cache for the given model, if its provider
+    supports one. Providers without explicit caching still benefit from the
+    cache-friendly prompt layout through implicit prefix caching.
+    """
+    from src.utils.stub_llm import StubChatModel
+
+    if isinstance(llm, StubChatModel):
+        return StubContextCache(llm)
+    if llm is None or type(llm).__name__ == "ChatGoogleGenerativeAI":
+        return GeminiContextCache(model_name)
+    return None
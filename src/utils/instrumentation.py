@@ -0,0 +1,131 @@
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import NamedTuple, Optional
+
+
+@dataclass
+class CallRecord:
+    """A single LLM call made by an agent."""
+
+    phase: str
+    role: str
+    model: str
+    latency: float
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    # Retries, hedged requests and model fallbacks made for this call
+    events: list[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class Instrumentation:
+    """
+    Thread-safe collector of per-call LLM metrics for one or more debates.
+    Long-running processes should set `max_records` to keep a sliding window.
+    """
+
+    def __init__(self, max_records: Optional[int] = None):
+        self._records: deque[CallRecord] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, record: CallRecord):
+        with self._lock:
+            self._records.append(record)
+
+    @property
+    def records(self) -> list[CallRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def reset(self):
+        with self._lock:
+            self._records.clear()
+
+    def cached_token_ratio(self) -> float:
+        """Share of prompt tokens that were served from a provider cache."""
+        records = self.records
+        prompt_tokens = sum(r.prompt_tokens for r in records)
+        if not prompt_tokens:
+            return 0.0
+        return sum(r.cached_tokens for r in records) / prompt_tokens
+
+    def summary(self) -> dict:
+        """Aggregate totals and per-phase latency for the recorded calls."""
+        records = self.records
+        by_phase: dict[str, list[CallRecord]] = {}
+        for r in records:
+            by_phase.setdefault(r.phase, []).append(r)
+
+        phases = {}
+        for name, phase_records in by_phase.items():
+            latencies = [r.latency for r in phase_records]
+            events = [event for r in phase_records for event in r.events]
+            phases[name] = {
+                "calls": len(phase_records),
+                "total_latency": sum(latencies),
+                "mean_latency": sum(latencies) / len(latencies),
+                "p50_latency": _quantile(latencies, 0.5),
+                "p95_latency": _quantile(latencies, 0.95),
+                "max_latency": max(latencies),
+                "retries": sum(event.startswith("retry") for event in events),
+                "hedges": sum(event.startswith("hedge") for event in events),
+                "fallbacks": sum(event.startswith("fallback") for event in events),
+                "errors": sum(r.error is not None for r in phase_records),
+            }
+            drafts = events.count("draft")
+            if drafts:
+                edited = events.count("draft edited")
+                rejected = sum(event.startswith("draft rejected") for event in events)
+                phases[name] |= {
+                    "drafts": drafts,
+                    "drafts_accepted": drafts - edited - rejected,
+                    "drafts_edited": edited,
+                    "drafts_rejected": rejected,
+                }
+
+        return {
+            "calls": len(records),
+            "prompt_tokens": sum(r.prompt_tokens for r in records),
+            "completion_tokens": sum(r.completion_tokens for r in records),
+            "cached_tokens": sum(r.cached_tokens for r in records),
+            "cached_token_ratio": self.cached_token_ratio(),
+            "phases": phases,
+        }
+
+    def cost(self, prices: dict[str, tuple[float, float]]) -> float:
+        """
+        Cost of the recorded calls, given (input, output) prices per million
+        tokens for each model name. Models without a price are not counted.
+        """
+        total = 0.0
+        for r in self.records:
+            input_price, output_price = prices.get(r.model, (0.0, 0.0))
+            total += r.prompt_tokens * input_price + r.completion_tokens * output_price
+        return total / 1_000_000
+
+    def to_dicts(self) -> list[dict]:
+        return [asdict(r) for r in self.records]
+
+
+class TokenUsage(NamedTuple):
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+
+def usage_from_response(response) -> TokenUsage:
+    """Read token usage from a LangChain AIMessage, if the provider reported it."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    details = usage.get("input_token_details") or {}
+    return TokenUsage(
+        prompt_tokens=usage.get("input_tokens", 0),
+        completion_tokens=usage.get("output_tokens", 0),
+        cached_tokens=details.get("cache_read", 0),
+    )
@@ -0,0 +1,311 @@
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Literal, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import BaseModel, Field, PrivateAttr
+
+
+class NoHealthyEndpointError(RuntimeError):
+    """Every endpoint of the pool is circuit-broken or at its request cap."""
+
+
+class EndpointConfig(BaseModel):
+    """One API key or endpoint of a load-balanced pool."""
+
+    name: str
+    # Environment variable holding the API key, never the key itself
+    api_key_env: str = "GOOGLE_API_KEY"
+    base_url: Optional[str] = None
+    # Relative capacity, e.g. 2 for a key with twice the quota
+    weight: float = Field(default=1.0, gt=0)
+
+
+class LoadBalancerPolicy(BaseModel):
+    """
+    Routing and circuit-breaking settings for a pool of LLM endpoints.
+
+    Calls go to the healthy endpoint with the least outstanding requests per
+    unit of weight, or with `routing: latency`, the lowest expected wait:
+    the EWMA latency times its outstanding requests plus one. No endpoint
+    takes more than `max_outstanding` concurrent calls; when every healthy
+    endpoint is at the cap, a call waits up to `queue_timeout` seconds for
+    a slot. After
+    `failure_threshold` consecutive failures an endpoint's circuit opens for
+    `cooldown` seconds; then a single probe call (or health check) decides
+    whether it closes again. A failed call fails over to another endpoint.
+    """
+
+    endpoints: list[EndpointConfig] = Field(default_factory=list)
+    routing: Literal["least_outstanding", "latency"] = "least_outstanding"
+    max_outstanding: Optional[int] = Field(default=None, ge=1)
+    queue_timeout: float = Field(default=30.0, ge=0)
+    failure_threshold: int = Field(default=3, ge=1)
+    cooldown: float = Field(default=30.0, ge=0)
+    # Weight of the newest latency in the moving average
+    latency_smoothing: float = Field(default=0.3, gt=0, le=1)
+    max_failovers: int = Field(default=2, ge=0)
+    health_interval: Optional[float] = Field(default=None, gt=0)
+    health_prompt: str = "Reply with OK."
+
+
+@dataclass
+class EndpointStats:
+    """Live routing state of one endpoint."""
+
+    name: str
+    weight: float = 1.0
+    outstanding: int = 0
+    latency: Optional[float] = None
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    circuit_opens: int = 0
+    opened_at: Optional[float] = None
+    probing: bool = False
+
+    def state(self, now: float, cooldown: float) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open" if now - self.opened_at < cooldown else "half_open"
+
+
+class LoadBalancedChatModel(BaseChatModel):
+    """
+    Chat model that spreads calls over a pool of chat models, one per API key
+    or endpoint, following a LoadBalancerPolicy. It can stand in for the
+    model of any graph or agent; one instance should be shared by all of
+    them, since it holds the routing state.
+    """
+
+    endpoints: list[BaseChatModel]
+    endpoint_names: list[str] = Field(default_factory=list)
+    policy: LoadBalancerPolicy = Field(default_factory=LoadBalancerPolicy)
+    model_name: str = "load-balanced"
+
+    _stats: list = PrivateAttr(default_factory=list)
+    # Also signalled when a call finishes, for calls waiting on the cap
+    _lock: Any = PrivateAttr(default_factory=threading.Condition)
+    _health_thread: Any = PrivateAttr(default=None)
+    _stop: Any = PrivateAttr(default_factory=threading.Event)
+
+    def model_post_init(self, context: Any):
+        if not self.endpoints:
+            raise ValueError("A load-balanced model needs at least one endpoint.")
+        names = self.endpoint_names or [
+            f"endpoint-{number}" for number in range(len(self.endpoints))
+        ]
+        weights = {config.name: config.weight for config in self.policy.endpoints}
+        self._stats = [EndpointStats(name, weights.get(name, 1.0)) for name in names]
+        if self.policy.health_interval is not None:
+            self.start_health_checks()
+
+    @property
+    def _llm_type(self) -> str:
+        return "load-balanced"
+
+    def _load(self, stats: EndpointStats, fastest: float) -> float:
+        if self.policy.routing == "latency":
+            # Endpoints without samples yet are assumed as fast as the fastest
+            latency = stats.latency if stats.latency is not None else fastest
+            return latency * (stats.outstanding + 1) / stats.weight
+        return stats.outstanding / stats.weight
+
+    def _candidates(self, excluded: set[int], now: float) -> tuple[list[int], bool]:
+        """Endpoints a call may go to now, and whether any is only at its cap."""
+        cap = self.policy.max_outstanding
+        candidates, capped = [], False
+        for number, stats in enumerate(self._stats):
+            state = stats.state(now, self.policy.cooldown)
+            if number in excluded or state == "open":
+                continue
+            if state == "half_open" and stats.probing:
+                continue
+            if cap is not None and stats.outstanding >= cap:
+                capped = True
+                continue
+            candidates.append(number)
+        return candidates, capped
+
+    def _acquire(self, excluded: set[int]) -> int:
+        """Pick an endpoint and count the call as outstanding on it."""
+        deadline = time.monotonic() + self.policy.queue_timeout
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                candidates, capped = self._candidates(excluded, now)
+                if candidates or not capped or now >= deadline:
+                    break
+                self._lock.wait(deadline - now)
+            if not candidates:
+                raise NoHealthyEndpointError(
+                    "No endpoint available: all are excluded, circuit-broken "
+                    "or at their request cap"
+                )
+            latencies = [self._stats[n].latency for n in candidates]
+            fastest = min(
+                (value for value in latencies if value is not None), default=0
+            )
+            loads = {n: self._load(self._stats[n], fastest) for n in candidates}
+            lowest = min(loads.values())
+            # Ties go to a random endpoint, so idle pools do not favour the first
+            number = random.choice([n for n, load in loads.items() if load == lowest])
+            stats = self._stats[number]
+            if stats.state(now, self.policy.cooldown) == "half_open":
+                stats.probing = True
+            stats.outstanding += 1
+            stats.requests += 1
+        return number
+
+    def _release(self, number: int, latency: float, failed: bool):
+        smoothing = self.policy.latency_smoothing
+        with self._lock:
+            stats = self._stats[number]
+            stats.outstanding -= 1
+            self._lock.notify()
+            probe, stats.probing = stats.probing, False
+            if not failed:
+                stats.consecutive_failures = 0
+                stats.opened_at = None
+                stats.latency = (
+                    latency
+                    if stats.latency is None
+                    else smoothing * latency + (1 - smoothing) * stats.latency
+                )
+                return
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if probe or (
+                stats.opened_at is None
+                and stats.consecutive_failures >= self.policy.failure_threshold
+            ):
+                stats.opened_at = time.monotonic()
+                stats.circuit_opens += 1
+
+    def _call(self, number: int, messages: Any, **kwargs: Any):
+        start = time.perf_counter()
+        try:
+            response = self.endpoints[number].invoke(messages, **kwargs)
+        except Exception:
+            self._release(number, time.perf_counter() - start, failed=True)
+            raise
+        self._release(number, time.perf_counter() - start, failed=False)
+        response.response_metadata["endpoint"] = self._stats[number].name
+        return response
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        tried: set[int] = set()
+        error: Optional[Exception] = None
+        for _ in range(self.policy.max_failovers + 1):
+            try:
+                number = self._acquire(tried)
+            except NoHealthyEndpointError:
+                if error is None:
+                    raise
+                break
+            tried.add(number)
+            try:
+                response = self._call(number, messages, stop=stop, **kwargs)
+            except Exception as failure:
+                error = failure
+                continue
+            return ChatResult(generations=[ChatGeneration(message=response)])
+        raise error
+
+    def check_health(self) -> dict[str, str]:
+        """
+        Probe every endpoint whose circuit is half-open with the health
+        prompt, and return the circuit state of every endpoint.
+        """
+        now = time.monotonic()
+        with self._lock:
+            due = [
+                number
+                for number, stats in enumerate(self._stats)
+                if stats.state(now, self.policy.cooldown) == "half_open"
+                and not stats.probing
+            ]
+            for number in due:
+                self._stats[number].probing = True
+                self._stats[number].outstanding += 1
+        for number in due:
+            try:
+                self._call(number, self.policy.health_prompt)
+            except Exception:
+                pass
+        now = time.monotonic()
+        with self._lock:
+            return {
+                stats.name: stats.state(now, self.policy.cooldown)
+                for stats in self._stats
+            }
+
+    def start_health_checks(self):
+        """Run check_health every `health_interval` seconds on a daemon thread."""
+        if self._health_thread is not None:
+            return
+        interval = self.policy.health_interval or self.policy.cooldown or 30.0
+
+        def run():
+            while not self._stop.wait(interval):
+                self.check_health()
+
+        self._health_thread = threading.Thread(
+            target=run, daemon=True, name="llm-health-checks"
+        )
+        self._health_thread.start()
+
+    def stop_health_checks(self):
+        self._stop.set()
+
+    def stats(self) -> list[dict]:
+        """Routing state of every endpoint, e.g. for metrics."""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                asdict(stats) | {"state": stats.state(now, self.policy.cooldown)}
+                for stats in self._stats
+            ]
+
+
+def create_balanced_llm(
+    policy: LoadBalancerPolicy, model_name: str, **options: Any
+) -> LoadBalancedChatModel:
+    """
+    Gemini chat model per configured endpoint, each with the API key from
+    its environment variable, behind one load-balanced model.
+    """
+    from langchain_google_genai.chat_models import ChatGoogleGenerativeAI
+
+    if not policy.endpoints:
+        raise ValueError("The load balancer policy has no endpoints.")
+    endpoints = []
+    for config in policy.endpoints:
+        api_key = os.getenv(config.api_key_env)
+        if not api_key:
+            raise ValueError(f"{config.api_key_env} environment variable not set")
+        endpoint_options = options | (
+            {"base_url": config.base_url} if config.base_url else {}
+        )
+        endpoints.append(
+            ChatGoogleGenerativeAI(
+                model=model_name, google_api_key=api_key, **endpoint_options
+            )
+        )
+    return LoadBalancedChatModel(
+        endpoints=endpoints,
+        endpoint_names=[config.name for config in policy.endpoints],
+        policy=policy,
+        model_name=model_name,
+    )
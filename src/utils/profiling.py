@@ -0,0 +1,352 @@
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from src.models.debate_state import DebatePhase
+
+DEFAULT_PROFILE_DIR = "logs"
+# Phase of the code of a node outside its agents' LLM calls
+GRAPH_PHASE = "graph"
+
+_current_region: contextvars.ContextVar[Optional["_Region"]] = contextvars.ContextVar(
+    "debate_profile_region", default=None
+)
+
+
+@dataclass
+class ProfileEntry:
+    """Totals of one (node, phase) of a profiled run."""
+
+    node: str
+    phase: str
+    calls: int = 0
+    wall: float = 0.0
+    # Net bytes still allocated at the end of the region, and the peak above
+    # its start; concurrent nodes make both approximate.
+    allocated: int = 0
+    peak: int = 0
+
+
+@dataclass
+class _Region:
+    profiler: "DebateProfiler"
+    node: str
+    profile: cProfile.Profile
+    # Wall time spent in phases inside the node
+    phases: float = 0.0
+
+
+def _frame_label(function: tuple[str, int, str]) -> str:
+    filename, line, name = function
+    if filename == "~":
+        label = name
+    else:
+        path = (
+            os.path.relpath(filename)
+            if filename.startswith(os.getcwd())
+            else ("/".join(Path(filename).parts[-2:]))
+        )
+        label = f"{name} ({path}:{line})"
+    return label.replace(";", ",")
+
+
+def collapsed_stacks(
+    stats: pstats.Stats, prefix: str, min_seconds: float = 1e-6, max_depth: int = 96
+) -> Counter:
+    """
+    Collapsed stacks ("root;...;leaf" -> self seconds) from cProfile stats.
+
+    cProfile keeps caller/callee pairs rather than whole stacks, so time is
+    split over call paths in proportion to each caller's share of a
+    function's cumulative time, as flameprof does. Recursive calls are
+    folded into their first frame.
+    """
+    table = stats.stats
+    callees: dict[tuple, list[tuple[tuple, float]]] = {}
+    for function, (_, _, _, _, callers) in table.items():
+        for caller, caller_stats in callers.items():
+            callees.setdefault(caller, []).append((function, caller_stats[3]))
+    stacks: Counter = Counter()
+
+    def walk(function: tuple, path: list[str], seen: set, share: float):
+        _, _, own, cumulative, _ = table[function]
+        path = path + [_frame_label(function)]
+        if own * share > 0:
+            stacks[";".join(path)] += own * share
+        if len(path) >= max_depth:
+            return
+        for callee, via in callees.get(function, ()):
+            total = table[callee][3]
+            if callee in seen or not total:
+                continue
+            callee_share = share * min(1.0, via / total)
+            if total * callee_share >= min_seconds:
+                walk(callee, path, seen | {callee}, callee_share)
+
+    for function, (_, _, _, _, callers) in table.items():
+        if not callers:
+            walk(function, [prefix], {function}, 1.0)
+    return stacks
+
+
+class DebateProfiler:
+    """
+    CPU and allocation profiler of debate runs, split by graph node and phase.
+
+    Every graph node runs under its own cProfile profile, and so does every
+    agent LLM call phase inside it (opening, argument, verdict, ...); the rest
+    of the node counts as the `graph` phase. `section` profiles work outside
+    the graph, such as rendering. With `allocations`, tracemalloc records
+    each region's net and peak memory, and a snapshot at `stop` gives the
+    stacks of the memory allocated during the session and still held. (A
+    snapshot per node would cost about a second each.)
+
+    `write` saves collapsed-stack flame graph input for CPU time (µs) and for
+    allocated bytes, the merged cProfile stats, and a top-N summary. Run it
+    with the stub LLM so that the profile shows our code rather than waiting
+    on the network.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_PROFILE_DIR,
+        top: int = 20,
+        allocations: bool = True,
+        frames: int = 16,
+    ):
+        self.directory = directory
+        self.top = top
+        self.allocations = allocations
+        self.frames = frames
+        self.entries: dict[tuple[str, str], ProfileEntry] = {}
+        self._profiles: dict[tuple[str, str], list[cProfile.Profile]] = {}
+        self._allocation_stacks: Counter = Counter()
+        self._lock = threading.Lock()
+        self._started_tracing = False
+        self._started_at: Optional[float] = None
+        self.wall = 0.0
+        # Report directory, once written
+        self.output: Optional[Path] = None
+
+    def start(self):
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._started_at = time.perf_counter()
+
+    def stop(self):
+        if self._started_at is not None:
+            self.wall += time.perf_counter() - self._started_at
+            self._started_at = None
+        if self._started_tracing:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self._started_tracing = False
+            self._add_allocations(snapshot)
+
+    def _new_profile(self, node: str, phase: str) -> cProfile.Profile:
+        # One profile per region: a profile must not be active in two threads
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.setdefault((node, phase), []).append(profile)
+        return profile
+
+    def _record(self, node: str, phase: str, wall: float, allocated: int, peak: int):
+        with self._lock:
+            entry = self.entries.get((node, phase))
+            if entry is None:
+                entry = self.entries[(node, phase)] = ProfileEntry(node, phase)
+            entry.calls += 1
+            entry.wall += wall
+            entry.allocated += allocated
+            entry.peak = max(entry.peak, peak)
+
+    def _memory(self) -> int:
+        return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+    def _add_allocations(self, snapshot: tracemalloc.Snapshot):
+        """Stacks of the memory allocated since `start` and still held."""
+        snapshot = snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+        labels: dict[tuple[str, int], str] = {}
+        for statistic in snapshot.statistics("traceback"):
+            frames = []
+            for frame in statistic.traceback:
+                key = (frame.filename, frame.lineno)
+                if key not in labels:
+                    name = os.path.basename(frame.filename).replace(";", ",")
+                    labels[key] = f"{name}:{frame.lineno}"
+                frames.append(labels[key])
+            self._allocation_stacks["held;" + ";".join(frames)] += statistic.size
+
+    @contextmanager
+    def node(self, name: str, phase: str = GRAPH_PHASE) -> Iterator[None]:
+        """Profile a graph node, or other top-level work, on this thread."""
+        region = _Region(self, name, self._new_profile(name, phase))
+        if self.allocations:
+            tracemalloc.reset_peak()
+        memory = self._memory()
+        reset = _current_region.set(region)
+        start = time.perf_counter()
+        region.profile.enable()
+        try:
+            yield
+        finally:
+            region.profile.disable()
+            wall = time.perf_counter() - start
+            _current_region.reset(reset)
+            peak = tracemalloc.get_traced_memory()[1] if self.allocations else 0
+            self._record(
+                name,
+                phase,
+                wall - region.phases,
+                self._memory() - memory,
+                max(0, peak - memory),
+            )
+
+    def section(self, name: str):
+        """Profile work outside the graph, e.g. rendering or post-processing."""
+        return self.node(name, phase="-")
+
+    @contextmanager
+    def _phase(self, region: _Region, phase: str) -> Iterator[None]:
+        profile = self._new_profile(region.node, phase)
+        memory = self._memory()
+        region.profile.disable()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            wall = time.perf_counter() - start
+            region.profile.enable()
+            region.phases += wall
+            peak = tracemalloc.get_traced_memory()[1] if self.allocations else 0
+            self._record(
+                region.node, phase, wall, self._memory() - memory, max(0, peak - memory)
+            )
+
+    def _stats(self, profiles: list[cProfile.Profile]) -> Optional[pstats.Stats]:
+        profiles = [profile for profile in profiles if profile.getstats()]
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def cpu_stacks(self) -> Counter:
+        """Collapsed CPU stacks, each rooted at `node;phase`, in seconds."""
+        stacks: Counter = Counter()
+        for (node, phase), profiles in self._profiles.items():
+            stats = self._stats(profiles)
+            if stats is not None:
+                stacks.update(collapsed_stacks(stats, f"{node};{phase}"))
+        return stacks
+
+    def summary(self) -> str:
+        """Per node and phase totals, then the top functions and allocations."""
+        lines = [
+            f"Debate profile: {self.wall:.3f}s profiled",
+            "",
+            f"{'node':<22} {'phase':<14} {'calls':>6} {'wall ms':>10} "
+            f"{'net KiB':>9} {'peak KiB':>9}",
+        ]
+        for entry in sorted(self.entries.values(), key=lambda e: -e.wall):
+            lines.append(
+                f"{entry.node:<22} {entry.phase:<14} {entry.calls:>6} "
+                f"{entry.wall * 1000:>10.2f} {entry.allocated / 1024:>9.1f} "
+                f"{entry.peak / 1024:>9.1f}"
+            )
+        stats = self._stats([p for ps in self._profiles.values() for p in ps])
+        if stats is not None:
+            for order, label in (("cumulative", "cumulative"), ("tottime", "own")):
+                out = io.StringIO()
+                stats.stream = out
+                stats.sort_stats(order).print_stats(self.top)
+                body = out.getvalue()
+                lines += ["", f"Top {self.top} functions by {label} time:"]
+                lines.append(body[body.find("   ncalls") :].rstrip())
+        if self._allocation_stacks:
+            sites: Counter = Counter()
+            for stack, size in self._allocation_stacks.items():
+                sites[stack.rsplit(";", 1)[-1]] += size
+            lines += ["", f"Top {self.top} allocation sites (bytes still held):"]
+            lines += [
+                f"{size:>12,}  {site}" for site, size in sites.most_common(self.top)
+            ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Optional[str] = None) -> Path:
+        """
+        Write cpu.collapsed, alloc.collapsed, cpu.prof and summary.txt to a
+        new timestamped directory under `directory`, and return it.
+        """
+        base = Path(directory or self.directory) / time.strftime(
+            "profile-%Y%m%d-%H%M%S"
+        )
+        out, number = base, 1
+        while out.exists():
+            number += 1
+            out = base.with_name(f"{base.name}-{number}")
+        out.mkdir(parents=True)
+        with open(out / "cpu.collapsed", "w") as file:
+            for stack, seconds in sorted(self.cpu_stacks().items()):
+                if (micros := round(seconds * 1e6)) > 0:
+                    file.write(f"{stack} {micros}\n")
+        with open(out / "alloc.collapsed", "w") as file:
+            for stack, size in sorted(self._allocation_stacks.items()):
+                file.write(f"{stack} {size}\n")
+        stats = self._stats([p for ps in self._profiles.values() for p in ps])
+        if stats is not None:
+            stats.dump_stats(out / "cpu.prof")
+        (out / "summary.txt").write_text(self.summary())
+        self.output = out
+        return out
+
+
+def profiled_node(profiler: Optional[DebateProfiler], name: str):
+    """Profile a graph node if the run is profiled."""
+    return profiler.node(name) if profiler is not None else nullcontext()
+
+
+def profiled_phase(phase: DebatePhase):
+    """Profile an agent call phase inside the current profiled node, if any."""
+    region = _current_region.get()
+    if region is None:
+        return nullcontext()
+    return region.profiler._phase(region, phase.value)
+
+
+@contextmanager
+def profiling_session(
+    graph: Any, directory: str = DEFAULT_PROFILE_DIR, **options
+) -> Iterator[DebateProfiler]:
+    """
+    Profile every debate `graph` runs inside the block, and write the
+    reports under `directory` when it ends, see `profiler.output`.
+    """
+    profiler = DebateProfiler(directory, **options)
+    graph.profiler = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        graph.profiler = None
+        profiler.stop()
+        profiler.write()
@@ -0,0 +1,281 @@
+import html
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from enum import Enum
+from io import StringIO
+from textwrap import TextWrapper
+from typing import Iterable, NamedTuple, Optional, TextIO
+
+
+class RenderFormat(Enum):
+    ANSI = "ansi"
+    PLAIN = "plain"
+    MARKDOWN = "markdown"
+    HTML = "html"
+    JSON = "json"
+
+
+class SpeakerStyle(NamedTuple):
+    color: str
+    icon: str
+    border: str
+
+
+SPEAKER_STYLES = {
+    "Favor": SpeakerStyle("\033[1;94m", "👍", "▶"),  # Bold Blue
+    "Against": SpeakerStyle("\033[1;93m", "👎", "◀"),  # Bold Yellow
+    "Judge": SpeakerStyle("\033[1;92m", "⚖️", "●"),  # Bold Green
+    "Judge Analysis": SpeakerStyle("\033[1;95m", "🔍", "◆"),  # Bold Magenta
+}
+DEFAULT_STYLE = SpeakerStyle("\033[97m", "💬", "■")  # White
+
+BOLD = "\033[1m"
+ITALIC = "\033[3m"
+UNDERLINE = "\033[4m"
+RESET = "\033[0m"
+BG_DARK = "\033[40m"
+
+WIDTH = 80
+
+
+class TranscriptRenderer(ABC):
+    """
+    Base class for transcript renderers.
+    Every renderer is split into header, turn and footer chunks so the same
+    renderer can produce a whole document in one buffer or stream turns
+    incrementally as they are produced.
+    """
+
+    @abstractmethod
+    def header(self, result: dict) -> str:
+        """Render everything that comes before the first turn."""
+
+    @abstractmethod
+    def turn(self, index: int, speaker: str, message: str) -> str:
+        """Render a single turn; `index` starts at 1."""
+
+    @abstractmethod
+    def footer(self, result: dict, total_messages: int) -> str:
+        """Render everything that comes after the last turn."""
+
+    def render(self, result: dict) -> str:
+        """Render a complete debate result into a single string."""
+        buffer = StringIO()
+        self.write(result, buffer)
+        return buffer.getvalue()
+
+    def write(self, result: dict, out: TextIO) -> int:
+        """Render a complete debate result with a single write to `out`."""
+        # Long debates expose their full, partly spilled transcript lazily
+        messages = result.get("transcript", result.get("messages", []))
+        parts = [self.header(result)]
+        parts.extend(
+            self.turn(i, speaker, message)
+            for i, (speaker, message) in enumerate(messages, 1)
+        )
+        parts.append(self.footer(result, len(messages)))
+        return out.write("".join(parts))
+
+    def render_stream(
+        self,
+        turns: Iterable[tuple[str, str]],
+        out: TextIO,
+        result: Optional[dict] = None,
+    ) -> int:
+        """
+        Render turns as they arrive, writing and flushing once per turn.
+
+        Args:
+            turns: Iterable of (speaker, message) tuples, e.g. a live debate stream
+            out: Text stream to write to
+            result: Debate metadata (topic, strategies, current_step) if known
+
+        Returns:
+            Number of turns rendered
+        """
+        result = result or {}
+        out.write(self.header(result))
+        count = 0
+        for count, (speaker, message) in enumerate(turns, 1):
+            out.write(self.turn(count, speaker, message))
+            out.flush()
+        out.write(self.footer(result, count))
+        out.flush()
+        return count
+
+
+class TerminalRenderer(TranscriptRenderer):
+    """Boxed terminal layout, with or without ANSI colour escapes."""
+
+    def __init__(self, color: bool = True, width: int = WIDTH):
+        self.color = color
+        self.width = width
+        self._wrapper = TextWrapper(width=width - 6)
+
+    def _style(self, *codes: str) -> str:
+        return "".join(codes) if self.color else ""
+
+    def _wrap(self, message: str) -> list[str]:
+        lines = []
+        for paragraph in message.splitlines() or [""]:
+            lines.extend(self._wrapper.wrap(paragraph) or [""])
+        return lines
+
+    def header(self, result: dict) -> str:
+        rule = f"{self._style(BOLD, BG_DARK)}{'=' * self.width}{self._style(RESET)}"
+        topic = result.get("topic", "Unknown Topic")
+        lines = [
+            "",
+            rule,
+            f"{self._style(BOLD, UNDERLINE)}🏛️  DEBATE RESULTS: {topic} 🏛️"
+            f"{self._style(RESET)}",
+            rule,
+            "",
+        ]
+        for speaker in ("Favor", "Against"):
+            strategy = result.get(speaker.lower() + "_strategy")
+            if strategy:
+                color = self._style(BOLD, SPEAKER_STYLES[speaker].color)
+                lines.append(
+                    f"{color}{speaker} Strategy: {strategy}{self._style(RESET)}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def turn(self, index: int, speaker: str, message: str) -> str:
+        style = SPEAKER_STYLES.get(speaker, DEFAULT_STYLE)
+        color = self._style(style.color)
+        reset = self._style(RESET)
+        inner = self.width - 4
+        lines = [
+            f"{color}{self._style(BOLD)}{style.border * 3} {style.icon} "
+            f"{speaker.upper()} AGENT #{index} {style.border * 3}{reset}",
+            f"{color}┌{'─' * (inner + 2)}┐{reset}",
+        ]
+        lines.extend(
+            f"{color}│ {line:<{inner}} │{reset}" for line in self._wrap(message)
+        )
+        lines.append(f"{color}└{'─' * (inner + 2)}┘{reset}")
+        return "\n".join(lines) + "\n\n"
+
+    def footer(self, result: dict, total_messages: int) -> str:
+        rule = f"{self._style(BOLD, BG_DARK)}{'=' * self.width}{self._style(RESET)}"
+        return (
+            f"{rule}\n"
+            f"{self._style(ITALIC)}💭 Total messages: {total_messages} | "
+            f"Steps completed: {result.get('current_step', 0)}{self._style(RESET)}\n"
+            f"{rule}\n\n"
+        )
+
+
+class MarkdownRenderer(TranscriptRenderer):
+    def header(self, result: dict) -> str:
+        parts = [f"# Debate: {result.get('topic', 'Unknown Topic')}\n\n"]
+        for speaker in ("Favor", "Against"):
+            strategy = result.get(speaker.lower() + "_strategy")
+            if strategy:
+                parts.append(f"## {speaker} Strategy\n\n{strategy}\n\n")
+        return "".join(parts)
+
+    def turn(self, index: int, speaker: str, message: str) -> str:
+        icon = SPEAKER_STYLES.get(speaker, DEFAULT_STYLE).icon
+        return f"### {icon} {speaker} #{index}\n\n{message}\n\n"
+
+    def footer(self, result: dict, total_messages: int) -> str:
+        return (
+            f"---\n\n_Total messages: {total_messages} | "
+            f"Steps completed: {result.get('current_step', 0)}_\n"
+        )
+
+
+class HtmlRenderer(TranscriptRenderer):
+    def header(self, result: dict) -> str:
+        topic = html.escape(str(result.get("topic", "Unknown Topic")))
+        parts = [
+            '<article class="debate">\n',
+            f"<h1>Debate: {topic}</h1>\n",
+        ]
+        for speaker in ("Favor", "Against"):
+            strategy = result.get(speaker.lower() + "_strategy")
+            if strategy:
+                parts.append(
+                    f'<section class="strategy {speaker.lower()}">'
+                    f"<h2>{speaker} Strategy</h2>"
+                    f"<p>{html.escape(strategy)}</p></section>\n"
+                )
+        return "".join(parts)
+
+    def turn(self, index: int, speaker: str, message: str) -> str:
+        css = speaker.lower().replace(" ", "-")
+        icon = SPEAKER_STYLES.get(speaker, DEFAULT_STYLE).icon
+        body = html.escape(message).replace("\n", "<br>\n")
+        return (
+            f'<section class="turn {css}" id="turn-{index}">'
+            f"<h3>{icon} {html.escape(speaker)} #{index}</h3>"
+            f"<p>{body}</p></section>\n"
+        )
+
+    def footer(self, result: dict, total_messages: int) -> str:
+        return (
+            f"<footer>Total messages: {total_messages} | "
+            f"Steps completed: {result.get('current_step', 0)}</footer>\n"
+            "</article>\n"
+        )
+
+
+class JsonRenderer(TranscriptRenderer):
+    """
+    Renders a single JSON document. Turns are emitted as array elements so the
+    streamed output is byte-for-byte identical to the buffered output.
+    """
+
+    def header(self, result: dict) -> str:
+        head = {
+            "topic": result.get("topic", ""),
+            "favor_strategy": result.get("favor_strategy", ""),
+            "against_strategy": result.get("against_strategy", ""),
+        }
+        return json.dumps(head, ensure_ascii=False)[:-1] + ', "messages": ['
+
+    def turn(self, index: int, speaker: str, message: str) -> str:
+        item = json.dumps({"speaker": speaker, "message": message}, ensure_ascii=False)
+        return item if index == 1 else ", " + item
+
+    def footer(self, result: dict, total_messages: int) -> str:
+        return (
+            f'], "total_messages": {total_messages}, '
+            f'"current_step": {json.dumps(result.get("current_step", 0))}}}\n'
+        )
+
+
+def supports_color(stream: Optional[TextIO] = None) -> bool:
+    """Check whether ANSI colour escapes should be written to `stream`."""
+    stream = stream if stream is not None else sys.stdout
+    if os.getenv("NO_COLOR"):
+        return False
+    isatty = getattr(stream, "isatty", None)
+    return bool(isatty and isatty())
+
+
+def get_renderer(
+    fmt: Optional[RenderFormat | str] = None, stream: Optional[TextIO] = None
+) -> TranscriptRenderer:
+    """
+    Get a renderer for the given format.
+    When no format is given the terminal layout is used, with colour only if
+    `stream` (stdout by default) is a TTY.
+    """
+    if fmt is None:
+        fmt = RenderFormat.ANSI if supports_color(stream) else RenderFormat.PLAIN
+    fmt = RenderFormat(fmt)
+
+    if fmt == RenderFormat.ANSI:
+        return TerminalRenderer(color=True)
+    if fmt == RenderFormat.PLAIN:
+        return TerminalRenderer(color=False)
+    if fmt == RenderFormat.MARKDOWN:
+        return MarkdownRenderer()
+    if fmt == RenderFormat.HTML:
+        return HtmlRenderer()
+    return JsonRenderer()
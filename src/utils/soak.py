@@ -0,0 +1,156 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+# Sampled resources, in the units of their growth limits
+METRICS = ("rss", "traced", "fds", "threads")
+
+
+def rss_bytes() -> int:
+    """Resident set size of this process, or its peak where that is unknown."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def open_fds() -> int:
+    """Open file descriptors of this process, -1 if they cannot be listed."""
+    for directory in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(directory))
+        except OSError:
+            continue
+    return -1
+
+
+@dataclass
+class ResourceSample:
+    debates: int
+    elapsed: float
+    rss: int
+    # Bytes allocated by Python and still traced by tracemalloc
+    traced: int
+    fds: int
+    threads: int
+
+
+class SoakLimits(BaseModel):
+    """Largest acceptable growth per debate, fitted over the soak run."""
+
+    rss: float = 4096.0
+    traced: float = 1024.0
+    fds: float = 0.01
+    threads: float = 0.01
+
+
+class SoakMonitor:
+    """
+    Resource sampler for soak runs of many debates in one process.
+
+    `record` is called after each debate. Every `interval` debates it samples
+    RSS, tracemalloc's traced memory, open file descriptors and threads.
+    Growth per debate is the least-squares slope over the samples taken after
+    `warmup` debates, when caches, compiled graphs and pools are built. A
+    tracemalloc snapshot at the end of the warmup, compared with one at the
+    end, gives the allocation sites that kept growing.
+    """
+
+    def __init__(
+        self, interval: int = 100, warmup: int = 200, frames: int = 1, top: int = 10
+    ):
+        self.interval = interval
+        self.warmup = warmup
+        self.frames = frames
+        self.top = top
+        self.samples: list[ResourceSample] = []
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._final: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+        self._started_tracing = False
+        self._start = 0.0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._start = time.perf_counter()
+        self.sample(0)
+
+    def sample(self, debates: int) -> ResourceSample:
+        sample = ResourceSample(
+            debates=debates,
+            elapsed=time.perf_counter() - self._start,
+            rss=rss_bytes(),
+            traced=tracemalloc.get_traced_memory()[0],
+            fds=open_fds(),
+            threads=threading.active_count(),
+        )
+        self.samples.append(sample)
+        return sample
+
+    def record(self, debates: int) -> Optional[ResourceSample]:
+        """Note that `debates` debates have finished; sample if one is due."""
+        with self._lock:
+            if debates == self.warmup:
+                self._baseline = tracemalloc.take_snapshot()
+            if debates % self.interval:
+                return None
+            return self.sample(debates)
+
+    def stop(self, debates: int):
+        with self._lock:
+            if not self.samples or self.samples[-1].debates != debates:
+                self.sample(debates)
+            if self._baseline is not None:
+                self._final = tracemalloc.take_snapshot()
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def growth(self) -> dict[str, float]:
+        """Growth per debate of every metric after the warmup, 0 if unknown."""
+        samples = [s for s in self.samples if s.debates >= self.warmup]
+        if len(samples) < 2:
+            return {metric: 0.0 for metric in METRICS}
+        debates = np.array([s.debates for s in samples], dtype=float)
+        return {
+            metric: float(
+                np.polyfit(debates, [getattr(s, metric) for s in samples], 1)[0]
+            )
+            for metric in METRICS
+        }
+
+    def failures(self, limits: SoakLimits) -> list[str]:
+        """The metrics whose growth per debate exceeds their limit."""
+        return [
+            f"{metric} grows {slope:.4g}/debate, limit {getattr(limits, metric):.4g}"
+            for metric, slope in self.growth().items()
+            if slope > getattr(limits, metric)
+        ]
+
+    def growing_sites(self) -> list[tracemalloc.StatisticDiff]:
+        """Allocation sites that grew most between the warmup and the end."""
+        if self._baseline is None or self._final is None:
+            return []
+        ignored = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        )
+        differences = self._final.filter_traces(ignored).compare_to(
+            self._baseline.filter_traces(ignored),
+            "traceback" if self.frames > 1 else "lineno",
+        )
+        return [diff for diff in differences if diff.size_diff > 0][: self.top]
@@ -0,0 +1,97 @@
+import re
+from typing import Callable, Optional
+
+from langchain_core.language_models import BaseLanguageModel
+from pydantic import BaseModel, Field
+
+from src.models.debate_state import DebatePhase
+from src.prompts.prompt_layout import CacheablePrompt
+from src.prompts.speculation_prompts import REVIEW_ACCEPT, SpeculationPrompts
+from src.utils.tokens import word_limit
+
+_WORD = re.compile(r"\w+")
+
+
+class SpeculationPolicy(BaseModel):
+    """
+    Draft-and-review settings for agent turns.
+    In the listed phases a fast draft model writes the turn and the strong
+    model only reviews it: it accepts the draft or edits it lightly. Drafts
+    that fail a local quality check are rewritten by the strong model. All
+    other phases, by default openings and conclusions, use the strong model.
+    """
+
+    draft_model: str = "gemini-1.5-flash-8b"
+    phases: set[DebatePhase] = Field(default_factory=lambda: {DebatePhase.ARGUMENT})
+    review: bool = True
+    min_words_ratio: float = 0.5
+    max_words_ratio: float = 1.25
+    # Largest share of the draft's 8-word sequences that may repeat the transcript
+    max_repeated_ratio: float = 0.3
+
+
+def _shingles(text: str, size: int = 8) -> set[tuple[str, ...]]:
+    words = _WORD.findall(text.lower())
+    return {tuple(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+class Speculator:
+    """
+    Applies a SpeculationPolicy; one speculator is shared by all agents.
+    Without a `draft_llm`, `create_draft_llm` creates the draft model on the
+    first draft.
+    """
+
+    def __init__(
+        self,
+        policy: SpeculationPolicy,
+        draft_llm: Optional[BaseLanguageModel] = None,
+        create_draft_llm: Optional[Callable[[], BaseLanguageModel]] = None,
+    ):
+        if draft_llm is None and create_draft_llm is None:
+            raise ValueError("Speculation needs a draft model.")
+        self.policy = policy
+        self._draft_llm = draft_llm
+        self.create_draft_llm = create_draft_llm
+
+    @property
+    def draft_llm(self) -> BaseLanguageModel:
+        if self._draft_llm is None:
+            self._draft_llm = self.create_draft_llm()
+        return self._draft_llm
+
+    def applies(self, phase: DebatePhase) -> bool:
+        return phase in self.policy.phases
+
+    def check(self, draft: str, prompt: CacheablePrompt) -> Optional[str]:
+        """Return why a draft fails the local quality check, or None."""
+        words = draft.split()
+        if not words:
+            return "empty"
+        limit = word_limit(prompt.volatile)
+        if limit and len(words) > limit * self.policy.max_words_ratio:
+            return "too long"
+        if limit and len(words) < limit * self.policy.min_words_ratio:
+            return "too short"
+        shingles = _shingles(draft)
+        if shingles:
+            repeated = len(shingles & _shingles(prompt.transcript)) / len(shingles)
+            if repeated > self.policy.max_repeated_ratio:
+                return "repeats transcript"
+        return None
+
+    @staticmethod
+    def review_prompt(prompt: CacheablePrompt, draft: str) -> CacheablePrompt:
+        """The drafted prompt with a review request appended to its suffix."""
+        review = SpeculationPrompts.create_review_prompt().format(draft=draft)
+        return CacheablePrompt(
+            prompt.static, prompt.transcript, prompt.volatile + review
+        )
+
+    @staticmethod
+    def is_accepted(review: str) -> bool:
+        return review.strip().strip("\"'.").upper() == REVIEW_ACCEPT
+
+    def review_event(self, review: str) -> Optional[str]:
+        """Event recorded on a review call; accepted drafts need none."""
+        return None if self.is_accepted(review) else "draft edited"
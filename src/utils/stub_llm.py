@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from os.path import commonprefix
+from typing import Any, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import PrivateAttr
+
+from src.prompts.evaluation_prompts import SCORE_CRITERIA, SCORECARD_HEADER
+from src.prompts.prompt_layout import VOLATILE_HEADER
+from src.prompts.speculation_prompts import REVIEW_ACCEPT, REVIEW_HEADER
+from src.utils.tokens import estimate_tokens, word_limit
+
+_VOCABULARY = (
+    "evidence shows that the policy improves outcomes for society while "
+    "critics argue the risks outweigh benefits because data from several "
+    "studies suggests costs rise over time and regulation must adapt to "
+    "protect workers consumers and communities from harm yet innovation "
+    "creates opportunity growth and new jobs in every sector of the economy"
+).split()
+
+
+class StubLLMError(RuntimeError):
+    """Simulated transient provider error."""
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Deterministic, offline chat model for benchmarks, profiling and soak runs.
+
+    Replies are generated locally up to the word limit requested in the prompt.
+    The model simulates a provider-side prefix cache: the longest prefix shared
+    with one of the recent prompts is reported as cached input tokens, and
+    explicit cache handles created with `create_cache` are honoured through the
+    `cached_content` invoke argument, like Gemini context caching.
+
+    `error_rate` and `slow_rate`/`slow_latency` inject transient failures and
+    tail latency for exercising call policies and load balancing.
+    `latency_per_token` adds generation time per completion token, and
+    `review_accept_rate` is how often a draft review request is accepted.
+    `max_output_tokens` truncates replies like a provider's output limit, and
+    reference scorecard requests get JSON scores that grow with the length of
+    the transcript and drop with truncated turns.
+    """
+
+    model_name: str = "stub"
+    latency: float = 0.0
+    latency_per_token: float = 0.0
+    slow_rate: float = 0.0
+    slow_latency: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+    default_words: int = 150
+    min_cache_tokens: int = 0
+    cache_window: int = 64
+    review_accept_rate: float = 0.0
+    max_output_tokens: Optional[int] = None
+
+    _recent_prompts: deque = PrivateAttr(default_factory=deque)
+    _explicit_caches: dict = PrivateAttr(default_factory=dict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _faults: Any = PrivateAttr(default=None)
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        # The settings replies depend on, e.g. for response caches
+        return {
+            "model_name": self.model_name,
+            "seed": self.seed,
+            "default_words": self.default_words,
+            "max_output_tokens": self.max_output_tokens,
+        }
+
+    def create_cache(self, content: str) -> str:
+        """Register `content` as an explicit context cache and return its handle."""
+        digest = hashlib.sha1(content.encode()).hexdigest()[:16]
+        handle = f"cachedContents/stub-{digest}"
+        with self._lock:
+            self._explicit_caches[handle] = content
+        return handle
+
+    def reset_cache(self):
+        """Forget all cached prefixes, e.g. between independent debates."""
+        with self._lock:
+            self._recent_prompts.clear()
+            self._explicit_caches.clear()
+
+    def _cached_prefix_tokens(self, prompt: str) -> int:
+        with self._lock:
+            shared = max(
+                (len(commonprefix((prompt, seen))) for seen in self._recent_prompts),
+                default=0,
+            )
+            self._recent_prompts.append(prompt)
+            if len(self._recent_prompts) > self.cache_window:
+                self._recent_prompts.popleft()
+        tokens = estimate_tokens(prompt[:shared])
+        return tokens if tokens >= self.min_cache_tokens else 0
+
+    def _network(self) -> tuple[float, bool]:
+        """Simulated delay of the next call and whether it fails."""
+        with self._lock:
+            if self._faults is None:
+                self._faults = random.Random(self.seed)
+            slow = self._faults.random() < self.slow_rate
+            failed = self._faults.random() < self.error_rate
+        return (self.slow_latency if slow else self.latency), failed
+
+    def _fail(self):
+        raise StubLLMError(f"{self.model_name}: simulated transient error")
+
+    def _reply(self, prompt: str) -> tuple[str, str]:
+        """The reply to a prompt and its finish reason, named like Gemini's."""
+        rng = random.Random(zlib.crc32(prompt.encode()) ^ self.seed)
+        if REVIEW_HEADER in prompt[prompt.rfind(VOLATILE_HEADER) :]:
+            if rng.random() < self.review_accept_rate:
+                return REVIEW_ACCEPT, "STOP"
+        if SCORECARD_HEADER in prompt:
+            return self._scorecard(prompt, rng), "STOP"
+        limit = word_limit(prompt) or self.default_words
+        words = rng.choices(_VOCABULARY, k=max(1, limit))
+        text = " ".join(words).capitalize() + "."
+        if self.max_output_tokens and estimate_tokens(text) > self.max_output_tokens:
+            return self.cut_reply(text, self.max_output_tokens), "MAX_TOKENS"
+        return text, "STOP"
+
+    @staticmethod
+    def cut_reply(text: str, max_output_tokens: int) -> str:
+        """A longer reply cut at an output limit, as replies are cut on generation."""
+        # Every vocabulary word is at most three tokens
+        words = text.rstrip(".").split()
+        return " ".join(words[: max_output_tokens // 3]).capitalize()
+
+    def _scorecard(self, prompt: str, rng: random.Random) -> str:
+        transcript = prompt[
+            prompt.find("DEBATE TRANSCRIPT:") : prompt.find(SCORECARD_HEADER)
+        ]
+        turns = [turn for turn in transcript.strip().split("\n\n")[1:] if turn]
+        truncated = sum(not turn.rstrip().endswith(".") for turn in turns)
+        base = 1 + 8 * (1 - math.exp(-len(transcript.split()) / 1500))
+        base -= 4 * truncated / max(1, len(turns))
+        scores = {
+            name: min(10, max(1, round(base + rng.uniform(-1, 1))))
+            for name in SCORE_CRITERIA
+        }
+        scores["winner"] = rng.choice(["Favor", "Against"])
+        return json.dumps(scores)
+
+    def _prompt(
+        self, messages: list[BaseMessage], cached_content: Optional[str]
+    ) -> tuple[str, int]:
+        """The full prompt of a call and its cached input tokens."""
+        prompt = "\n".join(str(message.content) for message in messages)
+        explicit_tokens = 0
+        if cached_content:
+            with self._lock:
+                cached_text = self._explicit_caches[cached_content]
+            prompt = cached_text + prompt
+            explicit_tokens = estimate_tokens(cached_text)
+        # Implicit prefix caching still applies on top of an explicit cache.
+        return prompt, max(explicit_tokens, self._cached_prefix_tokens(prompt))
+
+    def _result(
+        self, prompt: str, text: str, finish_reason: str, cached_tokens: int
+    ) -> ChatResult:
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(text)
+        message = AIMessage(
+            content=text,
+            response_metadata={
+                "model_name": self.model_name,
+                "finish_reason": finish_reason,
+            },
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "input_token_details": {"cache_read": cached_tokens},
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        cached_content: Optional[str] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        prompt, cached_tokens = self._prompt(messages, cached_content)
+        delay, failed = self._network()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            self._fail()
+        text, finish_reason = self._reply(prompt)
+        if self.latency_per_token:
+            time.sleep(self.latency_per_token * estimate_tokens(text))
+        return self._result(prompt, text, finish_reason, cached_tokens)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager=None,
+        cached_content: Optional[str] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """Like _generate, but waits without a thread, like an async client."""
+        prompt, cached_tokens = self._prompt(messages, cached_content)
+        delay, failed = self._network()
+        if delay:
+            await asyncio.sleep(delay)
+        if failed:
+            self._fail()
+        text, finish_reason = self._reply(prompt)
+        if self.latency_per_token:
+            await asyncio.sleep(self.latency_per_token * estimate_tokens(text))
+        return self._result(prompt, text, finish_reason, cached_tokens)
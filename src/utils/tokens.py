@@ -0,0 +1,43 @@
+import math
+import re
+from typing import Optional
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_WORD_LIMIT_PATTERN = re.compile(r"(\d+)(?:\s*-\s*(\d+))?\s+words", re.IGNORECASE)
+
+# Average characters per token for sub-word tokenizers on English prose.
+CHARS_PER_TOKEN = 4
+# Average tokens per word of English prose, for text that is not written yet.
+TOKENS_PER_WORD = 1.3
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the number of tokens in `text` without a model tokenizer.
+    Every word or punctuation mark counts as at least one token and long
+    words are split into chunks of CHARS_PER_TOKEN characters, which tracks
+    SentencePiece/BPE counts closely enough for budgeting and cache metrics.
+    """
+    if not text:
+        return 0
+    return sum(
+        math.ceil(len(piece) / CHARS_PER_TOKEN)
+        for piece in _TOKEN_PATTERN.findall(text)
+    )
+
+
+def word_limit(prompt: str) -> Optional[int]:
+    """
+    Upper word limit requested by a prompt, taken from its last "N words" or
+    "N-M words" instruction, which for action prompts is the current turn's.
+    """
+    matches = _WORD_LIMIT_PATTERN.findall(prompt)
+    if not matches:
+        return None
+    low, high = matches[-1]
+    return int(high or low)
+
+
+def words_to_tokens(words: int) -> int:
+    """Approximate the number of tokens in `words` words of English prose."""
+    return math.ceil(words * TOKENS_PER_WORD)
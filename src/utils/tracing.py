@@ -0,0 +1,221 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import urllib.request
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterator, Optional
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "debate_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """A finished or running span, with OpenTelemetry ids and timestamps."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set_attributes(self, attributes: dict[str, Any]):
+        self.attributes.update(attributes)
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds, 0 while the span is running."""
+        return (self.end_ns - self.start_ns) / 1e9 if self.end_ns else 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SpanExporter(ABC):
+    """Receives the spans of every finished trace."""
+
+    @abstractmethod
+    def export(self, spans: list[Span]):
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps exported spans in memory, for tests and notebooks."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]):
+        with self._lock:
+            self.spans.extend(spans)
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+
+
+class FileSpanExporter(SpanExporter):
+    """Appends spans to a JSON lines file, one span per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def export(self, spans: list[Span]):
+        lines = "".join(json.dumps(span.to_dict()) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict]:
+    return [
+        {"key": key, "value": _otlp_value(value)} for key, value in attributes.items()
+    ]
+
+
+class OTLPSpanExporter(SpanExporter):
+    """
+    Posts spans as OTLP/JSON to a collector, by default a local OpenTelemetry
+    collector. Export failures never fail a debate; they are counted in
+    `failures`, with the last one in `last_error`.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = "http://localhost:4318/v1/traces",
+        service_name: str = "debate-agents",
+        timeout: float = 5.0,
+    ):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def payload(self, spans: list[Span]) -> dict:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _otlp_attributes(
+                            {"service.name": self.service_name}
+                        )
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "src.utils.tracing"},
+                            "spans": [self._span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    @staticmethod
+    def _span(span: Span) -> dict:
+        otlp = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 3 if span.name == "llm_call" else 1,  # CLIENT or INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": _otlp_attributes(span.attributes),
+            "status": {"code": 2, "message": span.error} if span.error else {},
+        }
+        if span.parent_id:
+            otlp["parentSpanId"] = span.parent_id
+        return otlp
+
+    def export(self, spans: list[Span]):
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(self.payload(spans)).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except OSError as error:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+
+
+class Tracer:
+    """
+    Creates spans for debates, graph nodes and LLM calls.
+
+    The current span is tracked per thread of execution with a context
+    variable; graph nodes, which LangGraph may run on other threads, get
+    their parent passed explicitly. Spans are handed to the exporter once
+    their whole trace has finished.
+    """
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+        self._traces: dict[str, list[Span]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    @contextmanager
+    def span(
+        self, name: str, parent: Optional[Span] = None, **attributes
+    ) -> Iterator[Span]:
+        """
+        Run the block in a new span, a child of `parent` or of the current
+        span. An exception escaping the block is recorded on the span.
+        """
+        parent = parent or _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.error = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self._finish(span)
+
+    def _finish(self, span: Span):
+        with self._lock:
+            trace = self._traces.setdefault(span.trace_id, [])
+            trace.append(span)
+            if span.parent_id is not None:
+                return
+            del self._traces[span.trace_id]
+        self.exporter.export(trace)
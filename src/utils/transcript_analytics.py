@@ -0,0 +1,380 @@
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Bytes that belong to words: digits, lowercase letters, "_" and UTF-8 sequences
+_WORD_BYTES = np.zeros(256, dtype=bool)
+_WORD_BYTES[list(b"0123456789_abcdefghijklmnopqrstuvwxyz")] = True
+_WORD_BYTES[128:] = True
+
+_BASE = 0x100000001B3
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+# _BASE ** i and _BASE ** -i modulo 2**64, grown on demand
+_powers = np.ones(1, dtype=np.uint64)
+_inverse_powers = np.ones(1, dtype=np.uint64)
+
+
+def _power_tables(count: int) -> tuple[np.ndarray, np.ndarray]:
+    global _powers, _inverse_powers
+    if _powers.size < count:
+        factors = np.full(count, _BASE, dtype=np.uint64)
+        factors[0] = 1
+        _powers = np.cumprod(factors, dtype=np.uint64)
+        factors[1:] = pow(_BASE, -1, 1 << 64)
+        _inverse_powers = np.cumprod(factors, dtype=np.uint64)
+    return _powers[:count], _inverse_powers[:count]
+
+
+def hash_words(texts: Sequence[str], chunk_size: int = 2048):
+    """
+    Tokenize and hash every word of `texts` without a Python loop per word.
+    Returns the text index and the 64-bit hash of each word, in text order.
+    """
+    turns, hashes = [], []
+    for first in range(0, len(texts), chunk_size):
+        chunk = texts[first : first + chunk_size]
+        joined = "\x00".join(chunk)
+        if joined.count("\x00") != len(chunk) - 1:
+            joined = "\x00".join(text.replace("\x00", " ") for text in chunk)
+        data = np.frombuffer(joined.lower().encode(), dtype=np.uint8)
+        in_word = _WORD_BYTES[data]
+        edges = np.diff(in_word.view(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        # Polynomial hash of each word from prefix sums of byte * _BASE ** i,
+        # shifted back to the word start
+        powers, inverse_powers = _power_tables(data.size)
+        prefix = np.zeros(data.size + 1, dtype=np.uint64)
+        np.cumsum((data + np.uint64(1)) * in_word * powers, out=prefix[1:])
+        hashes.append((prefix[ends] - prefix[starts]) * inverse_powers[starts])
+        turns.append(np.searchsorted(np.flatnonzero(data == 0), starts) + first)
+    if not hashes:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint64)
+    return np.concatenate(turns), np.concatenate(hashes)
+
+
+def ngram_buckets(
+    turns: np.ndarray, hashes: np.ndarray, size: int, bits: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bucket, out of 2 ** `bits`, of every word n-gram that lies within one
+    turn, with its turn.
+    """
+    count = hashes.size - size + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    grams = hashes[:count]
+    for offset in range(1, size):
+        grams = grams * _GOLDEN + hashes[offset : offset + count]
+    within = turns[:count] == turns[size - 1 :]
+    # Fold the high half in, then keep the top bits of a multiplicative hash
+    grams = grams[within]
+    bucket = ((grams ^ (grams >> np.uint64(32))) * _GOLDEN) >> np.uint64(64 - bits)
+    return turns[:count][within], bucket.astype(np.int64)
+
+
+def _run_starts(ordered: np.ndarray) -> np.ndarray:
+    """Mask of the first entry of every run of equal values."""
+    starts = np.ones(ordered.size, dtype=bool)
+    starts[1:] = ordered[1:] != ordered[:-1]
+    return starts
+
+
+def _distinct(values: np.ndarray) -> np.ndarray:
+    """Sorted distinct values; a plain sort beats np.unique's hash table here."""
+    ordered = np.sort(values)
+    return ordered[_run_starts(ordered)]
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def _score(value) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def _group_mean(groups: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    """Mean of the non-NaN values per group, NaN for groups without any."""
+    valid = ~np.isnan(values)
+    totals = np.bincount(groups[valid], weights=values[valid], minlength=count)
+    return _ratio(totals, np.bincount(groups[valid], minlength=count))
+
+
+@dataclass
+class TurnScores:
+    """
+    Scores of every turn of an archive, one array entry per turn. Scores are
+    NaN where they are undefined, e.g. coverage for an opening turn.
+    """
+
+    # Index of the debate in the input and of the turn within the debate
+    debate: np.ndarray
+    position: np.ndarray
+    # Debate round of the turn, from 1
+    round: np.ndarray
+    speaker: np.ndarray
+    speaker_names: list[str]
+    words: np.ndarray
+    # Share of the turn's n-grams not used earlier in the debate
+    novelty: np.ndarray
+    # Share of the turn's n-grams its speaker already used in the debate
+    self_repetition: np.ndarray
+    # Share of the turn's n-grams that occur in many debates of the archive
+    boilerplate: np.ndarray
+    # IDF-weighted share of the previous turn's words, by another speaker,
+    # that the turn takes up
+    rebuttal_coverage: np.ndarray
+
+    def __len__(self) -> int:
+        return self.debate.size
+
+    @property
+    def debates(self) -> int:
+        return int(self.debate.max()) + 1 if self.debate.size else 0
+
+    def round_summary(self) -> list[dict]:
+        """Turn count and mean scores per round, over the whole archive."""
+        rounds = int(self.round.max()) if self.round.size else 0
+        means = {
+            name: _group_mean(self.round - 1, getattr(self, name), rounds)
+            for name in (
+                "novelty",
+                "self_repetition",
+                "boilerplate",
+                "rebuttal_coverage",
+            )
+        }
+        turns = np.bincount(self.round - 1, minlength=rounds)
+        return [
+            {"round": number + 1, "turns": int(turns[number])}
+            | {name: float(values[number]) for name, values in means.items()}
+            for number in range(rounds)
+        ]
+
+    def debate_round_novelty(self) -> np.ndarray:
+        """Mean novelty per debate and round, NaN for rounds a debate lacks."""
+        rounds = int(self.round.max()) if self.round.size else 0
+        cells = self.debate * rounds + self.round - 1
+        means = _group_mean(cells, self.novelty, self.debates * rounds)
+        return means.reshape(self.debates, rounds)
+
+    def useful_rounds(self, threshold: float = 0.3) -> np.ndarray:
+        """
+        Rounds per debate before the first round, from round 2 on, whose mean
+        novelty falls below `threshold`; a novelty-based stop would end the
+        debate there. Debates that never fall below it keep all their rounds.
+        """
+        novelty = self.debate_round_novelty()
+        played = (~np.isnan(novelty)).sum(axis=1)
+        if not novelty.size:
+            return played
+        stale = novelty < threshold
+        stale[:, 0] = False
+        return np.where(stale.any(axis=1), stale.argmax(axis=1), played)
+
+    def suggest_max_steps(self, threshold: float = 0.3, share: float = 0.9) -> int:
+        """Smallest max_steps that covers the useful rounds of `share` of debates."""
+        useful = self.useful_rounds(threshold)
+        if not useful.size:
+            return 1
+        return max(1, int(np.quantile(useful, share, method="higher")))
+
+    def records(self) -> list[dict]:
+        """One dict per turn, e.g. for writing JSON lines; NaN scores are None."""
+        return [
+            {
+                "debate": int(debate),
+                "position": int(position),
+                "round": int(round_number),
+                "speaker": self.speaker_names[speaker],
+                "words": int(words),
+                "novelty": _score(novelty),
+                "self_repetition": _score(self_repetition),
+                "boilerplate": _score(boilerplate),
+                "rebuttal_coverage": _score(coverage),
+            }
+            for debate, position, round_number, speaker, words, novelty,
+            self_repetition, boilerplate, coverage in zip(
+                self.debate, self.position, self.round, self.speaker, self.words,
+                self.novelty, self.self_repetition, self.boilerplate,
+                self.rebuttal_coverage,
+            )
+        ]  # fmt: skip
+
+
+class TranscriptAnalyzer:
+    """
+    Scores turn novelty, repetition and rebuttal coverage across a whole
+    archive of transcripts at once.
+
+    Every turn becomes a set of hashed word n-grams (`ngram_size` words,
+    2 ** `bucket_bits` dimensions) for novelty and repetition, and a set of
+    hashed words with IDF weights for rebuttal coverage. All comparisons are
+    sorts and bincounts over the whole archive, with no loop over turn pairs.
+    N-grams found in at least `common_share` of the debates count as
+    boilerplate.
+    """
+
+    def __init__(
+        self, ngram_size: int = 2, bucket_bits: int = 22, common_share: float = 0.2
+    ):
+        if ngram_size < 1:
+            raise ValueError("ngram_size must be at least 1.")
+        if not 8 <= bucket_bits <= 28:
+            raise ValueError("bucket_bits must be between 8 and 28.")
+        self.ngram_size = ngram_size
+        self.bucket_bits = bucket_bits
+        self.common_share = common_share
+
+    def score(
+        self,
+        transcripts: Sequence[Sequence[tuple[str, str]]],
+        turns_per_round: Optional[Sequence[int]] = None,
+    ) -> TurnScores:
+        """
+        Score `transcripts`, each a list of (speaker, message) turns without
+        judge turns. `turns_per_round` gives the turns of a round per debate,
+        2 for two-party debates by default.
+        """
+        lengths = np.array([len(transcript) for transcript in transcripts], np.int64)
+        count = int(lengths.sum())
+        debate = np.repeat(np.arange(lengths.size), lengths)
+        debate_start = np.cumsum(lengths) - lengths
+        position = np.arange(count) - debate_start[debate]
+        per_round = np.asarray(
+            turns_per_round if turns_per_round is not None else [2] * lengths.size,
+            dtype=np.int64,
+        )
+        speaker_codes: dict[str, int] = {}
+        speaker = np.array(
+            [
+                speaker_codes.setdefault(name, len(speaker_codes))
+                for transcript in transcripts
+                for name, _ in transcript
+            ],
+            dtype=np.int64,
+        )
+        texts = [message for transcript in transcripts for _, message in transcript]
+
+        # Keys pack (debate, speaker, bucket, position) into one int64
+        key_bits = sum(
+            int(size).bit_length()
+            for size in (lengths.size, len(speaker_codes), lengths.max(initial=0))
+        )
+        if key_bits + self.bucket_bits > 63:
+            raise ValueError("Archive too large for one pass; score it in parts.")
+
+        word_turns, hashes = hash_words(texts)
+        novelty, self_repetition, boilerplate = self._repetition(
+            *ngram_buckets(word_turns, hashes, self.ngram_size, self.bucket_bits),
+            debate,
+            debate_start,
+            position,
+            speaker,
+            len(speaker_codes),
+        )
+        coverage = self._coverage(
+            *ngram_buckets(word_turns, hashes, 1, self.bucket_bits),
+            debate,
+            debate_start,
+            position,
+            speaker,
+        )
+        return TurnScores(
+            debate=debate,
+            position=position,
+            round=position // per_round[debate] + 1,
+            speaker=speaker,
+            speaker_names=list(speaker_codes),
+            words=np.bincount(word_turns, minlength=count),
+            novelty=novelty,
+            self_repetition=self_repetition,
+            boilerplate=boilerplate,
+            rebuttal_coverage=coverage,
+        )
+
+    def _repetition(
+        self,
+        turns: np.ndarray,
+        buckets: np.ndarray,
+        debate: np.ndarray,
+        debate_start: np.ndarray,
+        position: np.ndarray,
+        speaker: np.ndarray,
+        speakers: int,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        count, bits = debate.size, self.bucket_bits
+        position_bits = int(position.max(initial=0)).bit_length()
+        speaker_bits = max(speakers - 1, 0).bit_length()
+
+        # One sort orders the distinct n-grams of every turn by debate,
+        # n-gram, speaker and position
+        keys = (debate[turns] << bits) | buckets
+        keys = (keys << speaker_bits) | speaker[turns]
+        keys = _distinct((keys << position_bits) | position[turns])
+        positions = keys & ((1 << position_bits) - 1)
+        grams = keys >> (position_bits + speaker_bits)
+        debates = grams >> bits
+        uses = debate_start[debates] + positions
+        distinct = np.bincount(uses, minlength=count)
+
+        # First use of each n-gram by each speaker, and in the whole debate
+        by_speaker = _run_starts(keys >> position_bits)
+        in_debate = np.flatnonzero(_run_starts(grams))
+        first = np.minimum.reduceat(positions, in_debate) if in_debate.size else 0
+        new = np.bincount(debate_start[debates[in_debate]] + first, minlength=count)
+        own = np.bincount(uses[by_speaker], minlength=count)
+
+        # Debates per n-gram
+        mask = (1 << bits) - 1
+        used_in = np.bincount(grams[in_debate] & mask, minlength=1 << bits)
+        common = used_in >= max(2, self.common_share * len(debate_start))
+        return (
+            _ratio(new, distinct),
+            _ratio(distinct - own, distinct),
+            _ratio(
+                np.bincount(uses, weights=common[grams & mask], minlength=count),
+                distinct,
+            ),
+        )
+
+    def _coverage(
+        self,
+        turns: np.ndarray,
+        buckets: np.ndarray,
+        debate: np.ndarray,
+        debate_start: np.ndarray,
+        position: np.ndarray,
+        speaker: np.ndarray,
+    ) -> np.ndarray:
+        count, bits = debate.size, self.bucket_bits
+        position_bits = int(position.max(initial=0)).bit_length()
+
+        # Distinct words of every turn, ordered by debate, word and position
+        keys = _distinct(
+            (((debate[turns] << bits) | buckets) << position_bits) | position[turns]
+        )
+        positions = keys & ((1 << position_bits) - 1)
+        words = keys >> position_bits
+        uses = debate_start[words >> bits] + positions
+
+        # IDF over turns, so words every turn uses weigh (almost) nothing
+        frequency = np.bincount(words & ((1 << bits) - 1), minlength=1 << bits)
+        idf = np.log(max(count, 1) / np.maximum(frequency, 1))
+        weights = idf[words & ((1 << bits) - 1)]
+        total = np.bincount(uses, weights=weights, minlength=count)
+
+        # Words of a turn that the next turn uses as well, counted for the next
+        taken_up = (words[1:] == words[:-1]) & (positions[1:] == positions[:-1] + 1)
+        covered = np.bincount(
+            uses[1:][taken_up], weights=weights[1:][taken_up], minlength=count
+        )
+        previous = np.concatenate(([0.0], total[:-1])) if count else total
+
+        answers = np.zeros(count, dtype=bool)
+        answers[1:] = (debate[1:] == debate[:-1]) & (speaker[1:] != speaker[:-1])
+        return np.where(answers, _ratio(covered, previous), np.nan)
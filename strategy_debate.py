@@ -1,12 +1,37 @@
+import argparse
+from contextlib import nullcontext
+
 from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.utils.stub_llm import StubChatModel
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a strategic debate")
+    parser.add_argument("topic", nargs="?", default="Is AI beneficial for society?")
+    parser.add_argument("--stub", action="store_true", help="use the offline stub LLM")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="logs",
+        metavar="DIR",
+        help="write CPU and allocation profiles per node and phase (default: logs)",
+    )
+    args = parser.parse_args()
+
     # Initialize the StrategicDebateGraph with verbose output
-    debate_graph = StrategicDebateGraph(verbose=True, use_strategic_prompt=True)
+    debate_graph = StrategicDebateGraph(
+        verbose=True,
+        use_strategic_prompt=True,
+        llm=StubChatModel() if args.stub else None,
+    )
     print("Starting the strategic debate...")
 
-    # Run a debate on a specific topic
-    result = debate_graph.run_debate("Is AI beneficial for society?", max_steps=3,)
+    profiling = debate_graph.profiling(args.profile) if args.profile else nullcontext()
+    with profiling as profiler:
+        # Run a debate on a specific topic
+        result = debate_graph.run_debate(args.topic, max_steps=3)
 
-    # Print the results of the debate
-    debate_graph.print_debate(result)
+        # Print the results of the debate
+        with profiler.section("print_debate") if profiler else nullcontext():
+            debate_graph.print_debate(result)
+    if args.profile:
+        print(f"Profile written to {profiler.output}")
@@ -0,0 +1,81 @@
+from typing import Optional
+
+import pytest
+
+from src.graph.debate_profiles import profile_options
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.memory.agent_memory import DEFAULT_MAX_ENTRIES, AgentMemory, open_agent_memory
+from src.memory.strategy_store import StrategyStore
+from src.models.debate_profile import DebateProfile
+from src.utils.stub_llm import StubChatModel
+from tests.test_debate_chains import RecordingStub
+
+TOPIC = "Is AI beneficial for society?"
+NOTES_HEADER = "YOUR NOTES FROM EARLIER DEBATES"
+
+
+def remembering_memory() -> AgentMemory:
+    """Memory holding the notes of one finished debate on the topic."""
+    memory = AgentMemory(":memory:")
+    StrategicDebateGraph(llm=StubChatModel(), memory=memory).run_debate(TOPIC, 2)
+    assert len(memory) > 0
+    return memory
+
+
+def strategy_prompt(
+    memory: Optional[AgentMemory], store: Optional[StrategyStore]
+) -> str:
+    llm = RecordingStub()
+    StrategicDebateGraph(llm=llm, memory=memory, strategy_store=store).run_debate(
+        TOPIC, 2
+    )
+    # The favor agent's strategy is the first call of the debate
+    return llm.prompts[0]
+
+
+def test_open_agent_memory_takes_the_cap(tmp_path):
+    path = str(tmp_path / "memory.sqlite")
+
+    memory = open_agent_memory(path, 10)
+
+    assert memory.max_entries == 10
+    assert open_agent_memory(path, 10) is memory
+    assert open_agent_memory(path).max_entries == DEFAULT_MAX_ENTRIES
+
+
+def test_profile_sets_the_memory_cap(tmp_path):
+    profile = DebateProfile(
+        agent_memory=str(tmp_path / "memory.sqlite"), agent_memory_max_entries=50
+    )
+
+    assert profile_options(profile)["memory"].max_entries == 50
+
+
+def test_strategy_recalls_memory_without_a_store():
+    assert NOTES_HEADER in strategy_prompt(remembering_memory(), None)
+
+
+def test_stored_strategy_does_not_recall_memory():
+    with_memory = strategy_prompt(remembering_memory(), StrategyStore(":memory:"))
+
+    assert NOTES_HEADER not in with_memory
+    assert with_memory == strategy_prompt(None, StrategyStore(":memory:"))
+
+
+def test_stored_strategy_is_reused_as_memory_grows():
+    store, memory = StrategyStore(":memory:"), remembering_memory()
+    graph = StrategicDebateGraph(
+        llm=StubChatModel(), memory=memory, strategy_store=store
+    )
+
+    first = graph.run_debate(TOPIC, 2)
+    second = graph.run_debate(TOPIC, 2)
+
+    assert len(store) == 2
+    assert second["favor_strategy"] == first["favor_strategy"]
+
+
+@pytest.mark.parametrize("max_entries", [0, -1])
+def test_profile_rejects_a_cap_below_one(max_entries):
+    with pytest.raises(ValueError):
+        DebateProfile(agent_memory_max_entries=max_entries)
@@ -0,0 +1,50 @@
+import pytest
+
+from src.graph.debate_graph import DebateGraph
+from src.graph.panel_debate_graph import PanelDebateGraph
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.utils.call_policy import CallPolicy
+from src.utils.speculation import SpeculationPolicy
+from src.utils.stub_llm import StubChatModel
+
+TOPIC = "Is AI beneficial for society?"
+# Every option that names a model of its own
+NAMED_MODELS = {
+    "judge_model_name": "gemini-1.5-pro",
+    "call_policy": CallPolicy(fallback_model="gemini-1.5-flash-8b"),
+    "speculation": SpeculationPolicy(draft_model="gemini-1.5-flash-8b"),
+}
+
+
+@pytest.fixture
+def no_credentials(monkeypatch):
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+
+
+@pytest.mark.parametrize(
+    "graph_class", [DebateGraph, StrategicDebateGraph, PanelDebateGraph]
+)
+def test_graphs_are_built_and_drawn_without_credentials(no_credentials, graph_class):
+    graph = graph_class(**NAMED_MODELS)
+
+    assert "judge" in graph.get_graph("mermaid")
+    assert graph._llms == {}
+
+
+def test_missing_credentials_fail_the_first_call(no_credentials):
+    graph = DebateGraph()
+
+    with pytest.raises(ValueError, match="GOOGLE_API_KEY"):
+        graph.run_debate(TOPIC, 1)
+
+
+def test_named_models_are_created_once_on_first_use(no_credentials, monkeypatch):
+    graph = DebateGraph(llm=StubChatModel(), **NAMED_MODELS)
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+
+    judge = graph._judge_options()["llm"]
+
+    assert judge.model.endswith("gemini-1.5-pro")
+    assert graph._judge_options()["llm"] is judge
+    assert list(graph._llms) == ["gemini-1.5-pro"]
+    assert graph.speculator.draft_llm is graph._create_llm("gemini-1.5-flash-8b")
@@ -0,0 +1,140 @@
+from typing import Optional
+
+import pytest
+
+from src.graph.batch_runner import (
+    BatchDebateRunner,
+    BatchResult,
+    LocalBatchEndpoint,
+)
+from src.graph.debate_profiles import create_graph
+from src.models.debate_request import DebateVariant
+from src.utils.stub_llm import StubChatModel
+
+TOPICS = ["Is AI beneficial for society?", "Should cities ban cars?"]
+PANEL_SIZE = 3
+# LLM calls of a two-round debate per variant, see the planner tests
+CALLS = {
+    DebateVariant.SIMPLE: 5,
+    DebateVariant.STRATEGIC: 8,
+    DebateVariant.PANEL: 7,
+}
+
+
+class CrashingEndpoint(LocalBatchEndpoint):
+    """Endpoint whose client dies while waiting on its `crash_at`-th batch."""
+
+    def __init__(self, llm, crash_at: Optional[int] = None):
+        super().__init__(llm)
+        self.crash_at = crash_at
+        self.submitted: list[dict[str, str]] = []
+
+    def submit(self, prompts: dict[str, str]) -> str:
+        self.submitted.append(prompts)
+        return super().submit(prompts)
+
+    def wait(self, batch_id: str) -> dict[str, BatchResult]:
+        if len(self.submitted) == self.crash_at:
+            raise ConnectionError("client went away")
+        return super().wait(batch_id)
+
+
+def test_local_endpoint_returns_results_by_request_id():
+    endpoint = LocalBatchEndpoint(StubChatModel())
+    batch_id = endpoint.submit({"a": "Reply in 5 words.", "b": "Reply in 3 words."})
+
+    results = endpoint.wait(batch_id)
+
+    assert set(results) == {"a", "b"}
+    assert all(
+        result.error is None and result.message.content for result in results.values()
+    )
+    # A batch is collected once, then the endpoint no longer knows it
+    with pytest.raises(KeyError):
+        endpoint.wait(batch_id)
+
+
+def test_local_endpoint_reports_failures_per_request():
+    endpoint = LocalBatchEndpoint(StubChatModel(error_rate=1.0))
+
+    results = endpoint.wait(endpoint.submit({"a": "Reply in 5 words."}))
+
+    assert results["a"].message is None
+    assert results["a"].error.startswith("StubLLMError")
+
+
+@pytest.mark.parametrize("variant", list(DebateVariant))
+def test_results_match_run_debate(variant):
+    runner = BatchDebateRunner(
+        LocalBatchEndpoint(StubChatModel()), variant, panel_size=PANEL_SIZE
+    )
+    results = runner.run(TOPICS, max_steps=2)
+
+    graph = create_graph(variant, PANEL_SIZE, llm=StubChatModel())
+    for topic, result in zip(TOPICS, results):
+        expected = graph.run_debate(topic, 2)
+        assert "error" not in result
+        assert result["messages"] == expected["messages"]
+        if variant == DebateVariant.STRATEGIC:
+            assert result["favor_strategy"] == expected["favor_strategy"]
+
+    records = runner.instrumentation.records
+    assert len(records) == CALLS[variant] * len(TOPICS)
+    assert sum(batch.requests for batch in runner.batches) == len(records)
+
+
+def test_calls_are_recorded_on_the_runner_not_the_graph():
+    runner = BatchDebateRunner(LocalBatchEndpoint(StubChatModel()))
+    graph_instrumentation = runner.graph.instrumentation
+
+    runner.run(TOPICS, max_steps=2)
+
+    assert runner.graph.instrumentation is graph_instrumentation
+    assert graph_instrumentation.records == []
+    assert len(runner.instrumentation.records) == CALLS[DebateVariant.SIMPLE] * 2
+
+
+def test_resumes_from_checkpoint(tmp_path):
+    checkpoint = str(tmp_path / "run.pkl")
+    crashing = CrashingEndpoint(StubChatModel(), crash_at=3)
+    with pytest.raises(ConnectionError):
+        BatchDebateRunner(crashing, checkpoint=checkpoint).run(TOPICS, max_steps=2)
+
+    # A new endpoint does not know the batch in flight, so it is resubmitted
+    resumed = CrashingEndpoint(StubChatModel())
+    results = BatchDebateRunner(resumed, checkpoint=checkpoint).run(TOPICS, max_steps=2)
+
+    uninterrupted = BatchDebateRunner(LocalBatchEndpoint(StubChatModel())).run(
+        TOPICS, max_steps=2
+    )
+    assert [result["messages"] for result in results] == [
+        result["messages"] for result in uninterrupted
+    ]
+    # The batch in flight is sent again, the two before it are not
+    assert resumed.submitted[0] == crashing.submitted[2]
+    assert len(resumed.submitted) == CALLS[DebateVariant.SIMPLE] - 2
+
+
+def test_checkpoint_of_other_topics_is_rejected(tmp_path):
+    checkpoint = str(tmp_path / "run.pkl")
+    BatchDebateRunner(LocalBatchEndpoint(StubChatModel()), checkpoint=checkpoint).run(
+        TOPICS, max_steps=1
+    )
+
+    with pytest.raises(ValueError, match="different set of topics"):
+        BatchDebateRunner(
+            LocalBatchEndpoint(StubChatModel()), checkpoint=checkpoint
+        ).run(TOPICS[:1], max_steps=1)
+
+
+def test_debate_fails_after_max_attempts():
+    runner = BatchDebateRunner(
+        LocalBatchEndpoint(StubChatModel(error_rate=1.0)), max_attempts=2
+    )
+
+    results = runner.run(TOPICS, max_steps=2)
+
+    assert [batch.failed for batch in runner.batches] == [2, 2]
+    for result in results:
+        assert result["error"].startswith("Batch request failed 2 times")
+        assert result["messages"] == []
@@ -0,0 +1,170 @@
+import threading
+import time
+
+import pytest
+
+from src.graph.debate_graph import DebateGraph
+from src.models.debate_state import DebatePhase
+from src.utils.call_policy import (
+    CallPolicy,
+    CallPolicyError,
+    CallPolicyRunner,
+    CallTimeoutError,
+)
+from src.utils.stub_llm import StubChatModel, StubLLMError
+
+PHASE = DebatePhase.ARGUMENT
+
+
+def quick_policy(**settings) -> CallPolicy:
+    """A policy without backoff delays or phase-specific timeouts."""
+    return CallPolicy(
+        **{"timeouts": {}, "backoff_base": 0.0, "hedge": False} | settings
+    )
+
+
+class FlakySend:
+    """`send` that fails its first calls, then replies with the model's name."""
+
+    def __init__(self, failures: int, error: type[Exception] = StubLLMError):
+        self.failures = failures
+        self.error = error
+        self.models: list[str] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, model: str) -> str:
+        with self._lock:
+            self.models.append(model)
+            if len(self.models) <= self.failures:
+                raise self.error(f"call {len(self.models)} failed")
+        return model
+
+
+def test_retries_until_a_call_succeeds():
+    runner = CallPolicyRunner(quick_policy(max_retries=2))
+    send = FlakySend(failures=2)
+    events: list[str] = []
+
+    assert runner.invoke(send, "primary", PHASE, events) == "primary"
+    assert send.models == ["primary"] * 3
+    assert [event.split(" (")[0] for event in events] == [
+        "retry 1 after StubLLMError",
+        "retry 2 after StubLLMError",
+    ]
+
+
+def test_non_retryable_errors_are_raised_at_once():
+    runner = CallPolicyRunner(quick_policy(max_retries=2), fallback_llm="fallback")
+    send = FlakySend(failures=1, error=KeyError)
+
+    with pytest.raises(KeyError):
+        runner.invoke(send, "primary", PHASE, [])
+    assert send.models == ["primary"]
+
+
+def test_falls_back_after_the_retries():
+    runner = CallPolicyRunner(quick_policy(max_retries=1), fallback_llm="fallback")
+    send = FlakySend(failures=2)
+    events: list[str] = []
+
+    assert runner.invoke(send, "primary", PHASE, events) == "fallback"
+    assert send.models == ["primary", "primary", "fallback"]
+    assert "fallback model" in events
+
+
+def test_fallback_model_is_created_on_the_first_fallback():
+    created = []
+
+    def create_fallback_llm():
+        created.append("fallback")
+        return "fallback"
+
+    runner = CallPolicyRunner(
+        quick_policy(max_retries=0), create_fallback_llm=create_fallback_llm
+    )
+
+    assert runner.invoke(FlakySend(failures=0), "primary", PHASE, []) == "primary"
+    assert created == []
+    assert runner.invoke(FlakySend(failures=1), "primary", PHASE, []) == "fallback"
+    assert runner.invoke(FlakySend(failures=1), "primary", PHASE, []) == "fallback"
+    assert created == ["fallback"]
+
+
+def test_error_lists_every_event_once_all_models_fail():
+    runner = CallPolicyRunner(quick_policy(max_retries=1), fallback_llm="fallback")
+    events: list[str] = []
+
+    with pytest.raises(CallPolicyError) as raised:
+        runner.invoke(FlakySend(failures=10), "primary", PHASE, events)
+    assert raised.value.events is events
+    assert len(events) == 3
+    assert isinstance(raised.value.__cause__, StubLLMError)
+
+
+def test_slow_attempt_times_out_and_is_retried():
+    runner = CallPolicyRunner(quick_policy(max_retries=1, default_timeout=0.05))
+    calls = []
+
+    def send(model):
+        calls.append(model)
+        if len(calls) == 1:
+            time.sleep(1.0)
+        return model
+
+    start = time.perf_counter()
+    assert runner.invoke(send, "primary", PHASE, []) == "primary"
+    assert time.perf_counter() - start < 0.5
+    assert len(calls) == 2
+
+    with pytest.raises(CallPolicyError) as raised:
+        runner.invoke(lambda model: time.sleep(1.0), "primary", PHASE, [])
+    assert isinstance(raised.value.__cause__, CallTimeoutError)
+
+
+def test_hedges_a_call_slower_than_usual():
+    runner = CallPolicyRunner(
+        quick_policy(hedge=True, hedge_min_samples=3, default_timeout=5.0)
+    )
+    assert runner.hedge_delay(PHASE) is None
+    for latency in (0.01, 0.02, 0.03):
+        runner._observe(PHASE, latency)
+    assert runner.hedge_delay(PHASE) == 0.03
+    calls = []
+
+    def send(model):
+        calls.append(model)
+        # The first request hangs; its hedge replies at once
+        if len(calls) == 1:
+            time.sleep(1.0)
+        return f"reply {len(calls)}"
+
+    events: list[str] = []
+    start = time.perf_counter()
+    assert runner.invoke(send, "primary", PHASE, events) == "reply 2"
+    assert time.perf_counter() - start < 0.5
+    assert events == ["hedge after 0.03s"]
+
+
+def test_backoff_is_capped():
+    policy = CallPolicy(backoff_base=1.0, backoff_max=2.0)
+
+    assert all(0 <= policy.backoff(retry) <= 2.0 for retry in range(1, 10))
+    assert all(policy.backoff(1) <= 1.0 for _ in range(20))
+
+
+def test_debate_finishes_on_the_fallback_model():
+    graph = DebateGraph(
+        llm=StubChatModel(error_rate=1.0),
+        fallback_llm=StubChatModel(),
+        call_policy=quick_policy(max_retries=0),
+    )
+
+    result = graph.run_debate("Is AI beneficial for society?", 2)
+
+    assert [speaker for speaker, _ in result["messages"]] == [
+        "Favor",
+        "Against",
+        "Favor",
+        "Against",
+        "Judge",
+    ]
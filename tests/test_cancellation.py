@@ -0,0 +1,129 @@
+import threading
+import time
+from typing import Any
+
+import pytest
+from pydantic import PrivateAttr
+
+from src.graph.debate_graph import DebateGraph
+from src.graph.panel_debate_graph import PanelDebateGraph
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.models.debate_state import DebatePhase
+from src.utils.call_policy import CallPolicy, CallPolicyRunner
+from src.utils.cancellation import (
+    CANCELLED,
+    DEADLINE_EXCEEDED,
+    CancellationToken,
+    DebateCancelledError,
+)
+from src.utils.stub_llm import StubChatModel
+
+TOPIC = "Is AI beneficial for society?"
+LATENCY = 0.05
+# Generous for a loaded CI machine; stops take about a millisecond
+STOP_BOUND = 0.05
+GRAPHS = [DebateGraph, StrategicDebateGraph, PanelDebateGraph]
+POLICIES = {
+    "no policy": None,
+    "call policy": CallPolicy(default_timeout=5.0, timeouts={}, hedge=False),
+}
+
+
+class CountingStub(StubChatModel):
+    """Stub that counts the calls it receives."""
+
+    _calls: int = PrivateAttr(default=0)
+    _calls_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def _generate(self, *args, **kwargs):
+        with self._calls_lock:
+            self._calls += 1
+        return super()._generate(*args, **kwargs)
+
+    @property
+    def calls(self) -> int:
+        with self._calls_lock:
+            return self._calls
+
+
+def settled_calls(llm: CountingStub) -> int:
+    """Calls of the model once abandoned calls have reached it."""
+    time.sleep(0.05)
+    return llm.calls
+
+
+@pytest.mark.parametrize("policy", POLICIES.values(), ids=POLICIES.keys())
+@pytest.mark.parametrize("graph_class", GRAPHS)
+@pytest.mark.parametrize("after", [0.03, 0.08, 0.13, 0.18])
+def test_cancel_mid_debate(graph_class, policy, after):
+    llm = CountingStub(latency=LATENCY)
+    graph = graph_class(llm=llm, call_policy=policy)
+    token = CancellationToken()
+    threading.Timer(after, token.cancel).start()
+
+    result = graph.run_debate(TOPIC, 3, token)
+    stopped = time.perf_counter()
+
+    assert result["cancelled"] == CANCELLED
+    assert stopped - token.cancelled_at < STOP_BOUND
+    # Every model call was admitted by the token, none after the cancel
+    assert settled_calls(llm) == token.calls == token.calls_at_cancel
+
+
+@pytest.mark.parametrize("graph_class", GRAPHS)
+def test_deadline_mid_debate(graph_class):
+    llm = CountingStub(latency=LATENCY)
+    graph = graph_class(llm=llm, call_policy=POLICIES["call policy"])
+    token = CancellationToken(timeout=0.12)
+
+    result = graph.run_debate(TOPIC, 3, token)
+    stopped = time.perf_counter()
+
+    assert result["cancelled"] == DEADLINE_EXCEEDED
+    assert stopped - token.cancelled_at < STOP_BOUND
+    assert settled_calls(llm) == token.calls == token.calls_at_cancel
+
+
+def test_cancelled_before_start_makes_no_calls():
+    llm = CountingStub(latency=LATENCY)
+    token = CancellationToken()
+    token.cancel()
+
+    result = PanelDebateGraph(llm=llm).run_debate(TOPIC, 3, token)
+
+    assert result["cancelled"] == CANCELLED
+    assert settled_calls(llm) == 0
+
+
+def test_admit_after_cancel_raises():
+    token = CancellationToken()
+    token.admit()
+    assert token.cancel()
+    assert not token.cancel("again")
+
+    with pytest.raises(DebateCancelledError, match=CANCELLED):
+        token.admit()
+    assert token.calls == token.calls_at_cancel == 1
+    assert token.reason == CANCELLED
+
+
+@pytest.mark.parametrize("with_token", [False, True])
+def test_hedge_wait_returns_with_the_reply(with_token):
+    runner = CallPolicyRunner(CallPolicy(hedge_min_samples=1, timeouts={}))
+    # A one-second p95 from earlier calls, far above this call's latency
+    runner._observe(DebatePhase.ARGUMENT, 1.0)
+    token = CancellationToken() if with_token else None
+    events: list[str] = []
+
+    start = time.perf_counter()
+    reply = runner.invoke(
+        lambda model: model.invoke("Reply in 5 words."),
+        CountingStub(latency=0.01),
+        DebatePhase.ARGUMENT,
+        events,
+        token,
+    )
+
+    assert reply.content
+    assert time.perf_counter() - start < 0.5
+    assert events == []
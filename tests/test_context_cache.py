@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.context_cache import GeminiContextCache, min_cache_tokens
+
+LONG_HEAD = "evidence " * 5000
+SHORT_HEAD = "evidence " * 1500
+
+
+class FakeCaches:
+    """Stands in for `client.caches`, recording every create call."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.created: list[str] = []
+
+    def create(self, model: str, config):
+        self.created.append(model)
+        if self.fail:
+            raise RuntimeError("Cached content is too small")
+        return SimpleNamespace(name=f"cachedContents/{len(self.created)}")
+
+
+def gemini_cache(model_name: str = "gemini-2.0-flash", **options):
+    caches = FakeCaches(**options)
+    cache = GeminiContextCache(model_name, client=SimpleNamespace(caches=caches))
+    return cache, caches
+
+
+@pytest.mark.parametrize(
+    ("model_name", "minimum"),
+    [
+        ("gemini-1.5-flash", 32_768),
+        ("gemini-1.5-pro-002", 32_768),
+        ("gemini-2.5-flash-lite", 1_024),
+        ("gemini-2.5-pro", 4_096),
+        ("some-other-model", 4_096),
+    ],
+)
+def test_minimum_is_per_model(model_name, minimum):
+    assert min_cache_tokens(model_name) == minimum
+    assert GeminiContextCache(model_name).min_tokens == minimum
+
+
+def test_head_below_the_model_minimum_is_not_cached():
+    cache, caches = gemini_cache("gemini-1.5-flash")
+
+    for _ in range(3):
+        assert cache.handle_for(LONG_HEAD) is None
+    assert caches.created == []
+
+
+def test_head_is_cached_once_it_is_seen_again():
+    cache, caches = gemini_cache()
+
+    assert cache.handle_for(LONG_HEAD) is None
+    handle = cache.handle_for(LONG_HEAD)
+
+    assert handle == "cachedContents/1"
+    assert cache.handle_for(LONG_HEAD) == handle
+    assert caches.created == ["gemini-2.0-flash"]
+    # A head sent once, like an opening's, never gets a cache
+    assert cache.handle_for(SHORT_HEAD * 3) is None
+    assert len(caches.created) == 1
+
+
+def test_failed_head_is_not_tried_again():
+    cache, caches = gemini_cache(fail=True)
+
+    for _ in range(5):
+        assert cache.handle_for(LONG_HEAD) is None
+
+    assert len(caches.created) == 1
+
+
+def test_failed_head_is_tried_again_after_the_ttl(monkeypatch):
+    cache, caches = gemini_cache(fail=True)
+    now = [100.0]
+    monkeypatch.setattr("src.utils.context_cache.time.monotonic", lambda: now[0])
+    cache.handle_for(LONG_HEAD)
+    cache.handle_for(LONG_HEAD)
+
+    now[0] += cache.ttl_seconds + 1
+    caches.fail = False
+
+    assert cache.handle_for(LONG_HEAD) == "cachedContents/2"
@@ -0,0 +1,98 @@
+import pytest
+
+from src.api.store import ResultStore, debate_result
+from src.graph.debate_graph import DebateGraph
+from src.graph.panel_debate_graph import PanelDebateGraph, default_panel
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.memory.debate_archive import DebateArchive, prompt_versions
+from src.models.debate_request import DebateVariant
+from src.utils.stub_llm import StubChatModel
+
+TOPIC = "Is AI beneficial for society?"
+
+
+@pytest.fixture(scope="module")
+def result() -> dict:
+    state = DebateGraph(llm=StubChatModel()).run_debate(TOPIC, 2)
+    return {"id": "debate", "variant": "simple"} | debate_result(state)
+
+
+def blob_count(archive: DebateArchive) -> int:
+    return archive.stats()["blobs"]
+
+
+def test_archived_debate_round_trips(result):
+    archive = DebateArchive(":memory:")
+    config = {"variant": "simple", "max_steps": 2}
+
+    archive.put("debate", result, config=config, prompts={"system/x": "prompt"})
+
+    assert archive.get("debate") == result
+    assert archive.get("debate", prompts=True)["prompts"] == {"system/x": "prompt"}
+    assert archive.config("debate") == config
+    assert [entry.id for entry in archive.find(topic=f"  {TOPIC.upper()}")] == [
+        "debate"
+    ]
+    assert archive.get("unknown") is None
+
+
+def test_repeated_debates_only_add_a_manifest(result):
+    archive = DebateArchive(":memory:")
+    archive.put("first", result, prompts=prompt_versions())
+    blobs = blob_count(archive)
+
+    archive.put("second", result, prompts=prompt_versions())
+
+    assert len(archive) == 2
+    assert blob_count(archive) == blobs
+
+
+def test_gc_deletes_the_blobs_of_replaced_manifests(result):
+    archive = DebateArchive(":memory:")
+    archive.put("kept", result)
+    archive.put("replaced", result | {"verdict": "An old verdict. " * 8})
+    blobs = blob_count(archive)
+
+    archive.put("replaced", result | {"verdict": "A new verdict. " * 8})
+
+    assert blob_count(archive) == blobs + 1
+    assert archive.gc() == 1
+    assert blob_count(archive) == blobs
+    assert archive.get("replaced")["verdict"] == "A new verdict. " * 8
+    assert archive.get("kept") == result
+    assert archive.gc() == 0
+
+
+def test_graphs_report_the_prompts_they_run_with():
+    panel = PanelDebateGraph(panel=default_panel(2), llm=StubChatModel())
+    plain = StrategicDebateGraph(use_strategic_prompt=False, llm=StubChatModel())
+    strategic = StrategicDebateGraph(llm=StubChatModel())
+
+    prompts = panel.prompt_versions()
+    assert {name for name in prompts if name.startswith("system/")} == {
+        "system/judge",
+        *(f"system/{config.name}" for config in panel.panel),
+    }
+    assert prompts[f"system/{panel.panel[0].name}"] == panel.panel[0].system_prompt
+
+    assert strategic.prompt_versions() == prompt_versions(DebateVariant.STRATEGIC)
+    assert (
+        plain.prompt_versions()["template/opening"]
+        == prompt_versions(DebateVariant.SIMPLE)["template/opening"]
+        != strategic.prompt_versions()["template/opening"]
+    )
+    assert "template/meta_analysis" in plain.prompt_versions()
+
+
+def test_result_store_archives_the_given_prompts(result):
+    archive = DebateArchive(":memory:")
+    store = ResultStore(capacity=1, archive=archive)
+    graph = PanelDebateGraph(panel=default_panel(2), llm=StubChatModel())
+    prompts = graph.prompt_versions()
+
+    store.put("debate", result, prompts=prompts)
+    store.put("other", result | {"id": "other"})
+
+    assert store.get("debate") == result
+    assert archive.get("debate", prompts=True)["prompts"] == prompts
+    assert archive.get("other", prompts=True)["prompts"] == {}
@@ -0,0 +1,110 @@
+import threading
+from typing import Any
+
+import pytest
+from pydantic import PrivateAttr
+
+from src.agents import AgainstAgent, FavorAgent, JudgeAgent
+from src.chains.debate_chains import (
+    action_chain,
+    action_prompt,
+    judge_debates,
+    render_action,
+)
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.models.debate_state import AgentRole, DebatePhase
+from src.prompts.agent_prompts import FAVOR_AGENT_SYSTEM_PROMPT
+from src.utils.stub_llm import StubChatModel
+
+TOPIC = "Is AI beneficial for society?"
+
+
+class RecordingStub(StubChatModel):
+    """Stub that keeps the text of every prompt it receives."""
+
+    _prompts: list = PrivateAttr(default_factory=list)
+    _prompts_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def _generate(self, messages, *args, **kwargs):
+        with self._prompts_lock:
+            self._prompts.append("\n".join(str(m.content) for m in messages))
+        return super()._generate(messages, *args, **kwargs)
+
+    @property
+    def prompts(self) -> list[str]:
+        with self._prompts_lock:
+            return list(self._prompts)
+
+
+@pytest.fixture(scope="module")
+def finished_debate() -> dict:
+    return StrategicDebateGraph(llm=StubChatModel()).run_debate(TOPIC, 2)
+
+
+def test_prompt_runnable_is_built_once_per_action():
+    assert action_prompt(DebatePhase.OPENING, True, AgentRole.FAVOR) is action_prompt(
+        DebatePhase.OPENING, True, AgentRole.FAVOR
+    )
+    assert action_prompt(DebatePhase.OPENING) is not action_prompt(
+        DebatePhase.OPENING, True
+    )
+
+
+@pytest.mark.parametrize("strategic", [False, True])
+@pytest.mark.parametrize(
+    ("agent_class", "role"),
+    [(FavorAgent, AgentRole.FAVOR), (AgainstAgent, AgentRole.AGAINST)],
+)
+@pytest.mark.parametrize(
+    ("phase", "action"),
+    [
+        (DebatePhase.STRATEGY, "create_strategy"),
+        (DebatePhase.OPENING, "introduce_topic"),
+        (DebatePhase.ARGUMENT, "create_argument"),
+        (DebatePhase.CONCLUSION, "conclude_debate"),
+    ],
+)
+def test_agents_send_the_prompt_of_the_chain(
+    finished_debate, agent_class, role, strategic, phase, action
+):
+    state = finished_debate | {"current_step": 2}
+    agent_llm, chain_llm = RecordingStub(), RecordingStub()
+    agent = agent_class(llm=agent_llm, use_strategic_prompt=strategic)
+
+    reply = getattr(agent, action)(state)
+    chain_reply = action_chain(
+        chain_llm, phase, strategic, role, agent.system_prompt
+    ).invoke(state)
+
+    assert agent_llm.prompts == chain_llm.prompts
+    assert reply == chain_reply
+
+
+def test_render_action_splits_the_chain_prompt(finished_debate):
+    prompt = render_action(
+        DebatePhase.ARGUMENT,
+        finished_debate | {"current_step": 2},
+        role=AgentRole.FAVOR,
+        system_prompt=FAVOR_AGENT_SYSTEM_PROMPT,
+    )
+
+    assert prompt.static.startswith(FAVOR_AGENT_SYSTEM_PROMPT)
+    assert prompt.transcript
+    assert prompt.text == prompt.static + prompt.transcript + prompt.volatile
+
+
+@pytest.mark.parametrize("strategic", [False, True])
+def test_batched_verdicts_match_the_judge_agent(finished_debate, strategic):
+    states = [finished_debate, finished_debate | {"topic": "Should cities ban cars?"}]
+    llm = StubChatModel()
+
+    verdicts = judge_debates(llm, states, strategic)
+
+    judge = JudgeAgent(llm=llm, use_strategic_prompt=strategic)
+    assert verdicts == [judge.judge_and_conclude(state) for state in states]
+
+
+def test_failed_verdict_does_not_fail_the_batch(finished_debate):
+    verdicts = judge_debates(StubChatModel(error_rate=1.0), [finished_debate] * 2)
+
+    assert [type(verdict).__name__ for verdict in verdicts] == ["StubLLMError"] * 2
@@ -0,0 +1,70 @@
+from collections import Counter
+
+import pytest
+
+from src.graph.debate_planner import DebatePlanner
+from src.graph.debate_profiles import create_graph
+from src.models.debate_request import DebateVariant
+from src.models.debate_state import DebatePhase
+from src.utils.instrumentation import Instrumentation
+from src.utils.stub_llm import StubChatModel
+
+TOPIC = "Is AI beneficial for society?"
+
+# (variant, max_steps, panel_size): expected calls
+CALL_COUNTS = {
+    (DebateVariant.SIMPLE, 1, 4): 3,
+    (DebateVariant.SIMPLE, 3, 4): 7,
+    (DebateVariant.STRATEGIC, 1, 4): 6,
+    (DebateVariant.STRATEGIC, 3, 4): 10,
+    (DebateVariant.PANEL, 1, 4): 5,
+    (DebateVariant.PANEL, 3, 4): 13,
+    (DebateVariant.PANEL, 3, 2): 7,
+}
+
+
+@pytest.mark.parametrize(("case", "calls"), CALL_COUNTS.items(), ids=str)
+def test_call_counts_per_variant(case, calls):
+    variant, max_steps, panel_size = case
+    planner = DebatePlanner()
+
+    assert len(planner.plan(TOPIC, max_steps, variant, panel_size).calls) == calls
+
+
+@pytest.mark.parametrize("variant", list(DebateVariant))
+def test_variant_names_plan_like_the_variant(variant):
+    planner = DebatePlanner()
+    by_name = planner.plan(TOPIC, 3, variant.value)
+
+    assert by_name.variant is variant
+    assert by_name.calls == planner.plan(TOPIC, 3, variant).calls
+
+
+def test_unknown_variant_is_rejected():
+    with pytest.raises(ValueError):
+        DebatePlanner().plan(TOPIC, 3, "round-robin")
+
+
+def test_strategic_plan_has_strategies_and_meta_analysis():
+    phases = Counter(
+        call.phase for call in DebatePlanner().plan(TOPIC, 3, "strategic").calls
+    )
+
+    assert phases[DebatePhase.STRATEGY] == 2
+    assert phases[DebatePhase.VERDICT] == 1
+    assert phases[DebatePhase.META_ANALYSIS] == 1
+
+
+@pytest.mark.parametrize("variant", list(DebateVariant))
+def test_plan_matches_the_calls_of_a_run(variant):
+    instrumentation = Instrumentation()
+    graph = create_graph(
+        variant, 3, llm=StubChatModel(), instrumentation=instrumentation
+    )
+    graph.run_debate(TOPIC, 2)
+
+    plan = DebatePlanner().plan(TOPIC, 2, variant, panel_size=3)
+    assert len(instrumentation.records) == len(plan.calls)
+    assert Counter(record.phase for record in instrumentation.records) == Counter(
+        call.phase.value for call in plan.calls
+    )
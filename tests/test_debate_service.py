@@ -0,0 +1,222 @@
+import asyncio
+import json
+
+import pytest
+
+from src.api import DebateApp, DebateEngine, JobStatus, QueueFullError, ResultStore
+from src.models.debate_request import DebateRequest
+from src.utils.stub_llm import StubChatModel
+
+TOPIC = "Is AI beneficial for society?"
+
+
+def service(latency: float = 0.0, **options) -> DebateApp:
+    engine = DebateEngine(
+        graph_options={"llm": StubChatModel(latency=latency)}, **options
+    )
+    return DebateApp(engine, heartbeat_seconds=0.05)
+
+
+async def call(app: DebateApp, method: str, path: str, body: bytes = b""):
+    """Send one request to the ASGI app; returns (status, headers, body)."""
+    messages = [{"type": "http.request", "body": body}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # The client stays connected until the response is complete
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path}
+    await app(scope, receive, send)
+    headers = dict(sent[0]["headers"])
+    return sent[0]["status"], headers, b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def events(body: bytes) -> list[tuple[str, dict]]:
+    """The (event, data) of a server-sent event stream, without comments."""
+    parsed = []
+    for block in body.decode().split("\n\n"):
+        lines = dict(
+            line.split(": ", 1) for line in block.splitlines() if line[:1] != ":"
+        )
+        if lines:
+            parsed.append((lines["event"], json.loads(lines["data"])))
+    return parsed
+
+
+async def submit(app: DebateApp, **request) -> dict:
+    status, headers, body = await call(
+        app, "POST", "/debates", json.dumps({"topic": TOPIC} | request).encode()
+    )
+    assert status == 202
+    job = json.loads(body)
+    assert headers[b"location"] == f"/debates/{job['id']}".encode()
+    return job
+
+
+async def finished(app: DebateApp, job_id: str):
+    job = app.engine.get(job_id)
+    while not job.finished:
+        await asyncio.sleep(0.01)
+    return job
+
+
+def run(app: DebateApp, scenario):
+    async def main():
+        await app.engine.start()
+        try:
+            return await scenario()
+        finally:
+            await app.engine.stop()
+
+    return asyncio.run(main())
+
+
+def test_streams_every_turn_and_serves_the_result():
+    app = service(latency=0.01)
+
+    async def scenario():
+        job = await submit(app, max_steps=2)
+        status, headers, body = await call(app, "GET", job["links"]["events"])
+        _, _, result = await call(app, "GET", job["links"]["result"])
+        _, _, progress = await call(app, "GET", job["links"]["self"])
+        return status, headers, events(body), json.loads(result), json.loads(progress)
+
+    status, headers, stream, result, progress = run(app, scenario)
+
+    assert status == 200
+    assert headers[b"content-type"] == b"text/event-stream"
+    *turns, (event, done) = stream
+    assert event == "done" and done["status"] == "completed"
+    assert [data for _, data in turns] == [
+        {"index": index, **turn}
+        for index, turn in enumerate(result["messages"], start=1)
+    ]
+    assert [turn["speaker"] for turn in result["messages"]] == [
+        "Favor",
+        "Against",
+        "Favor",
+        "Against",
+        "Judge",
+    ]
+    assert progress["status"] == "completed"
+    assert progress["turns"] == len(turns)
+
+
+def test_late_subscriber_gets_the_turns_so_far_then_the_rest():
+    app = service(latency=0.02)
+
+    async def scenario():
+        job = await submit(app, max_steps=3)
+        running = app.engine.get(job["id"])
+        while len(running.turns) < 2:
+            await asyncio.sleep(0.005)
+        _, _, body = await call(app, "GET", f"/debates/{job['id']}/events")
+        return events(body), running
+
+    stream, job = run(app, scenario)
+
+    turns = [data for event, data in stream if event == "turn"]
+    assert [turn["index"] for turn in turns] == list(range(1, len(job.turns) + 1))
+    assert [(turn["speaker"], turn["message"]) for turn in turns] == job.turns
+    assert stream[-1][0] == "done"
+
+
+def test_evicted_results_are_streamed_from_the_store():
+    store = ResultStore()
+    job_id = "0" * 32
+    messages = [{"speaker": "Favor", "message": "Yes."}]
+    store.put(job_id, {"id": job_id, "messages": messages})
+    app = service(store=store)
+
+    async def scenario():
+        return await call(app, "GET", f"/debates/{job_id}/events")
+
+    status, _, body = run(app, scenario)
+
+    assert status == 200
+    assert events(body) == [
+        ("turn", {"index": 1, **messages[0]}),
+        ("done", {"id": job_id, "status": "completed"}),
+    ]
+
+
+def test_cancel_stores_the_partial_debate():
+    app = service(latency=0.05)
+
+    async def scenario():
+        job = await submit(app, max_steps=5)
+        while not app.engine.get(job["id"]).turns:
+            await asyncio.sleep(0.005)
+        cancel, _, _ = await call(app, "DELETE", job["links"]["self"])
+        await finished(app, job["id"])
+        again, _, _ = await call(app, "DELETE", job["links"]["self"])
+        _, _, result = await call(app, "GET", job["links"]["result"])
+        return cancel, again, app.engine.get(job["id"]), json.loads(result)
+
+    cancel, again, job, result = run(app, scenario)
+
+    assert (cancel, again) == (202, 409)
+    assert job.status == JobStatus.CANCELLED
+    assert result["cancelled"] == job.error
+    assert 0 < len(result["messages"]) < 11
+
+
+def test_rejects_invalid_and_unknown_requests():
+    app = service()
+
+    async def scenario():
+        return [
+            (await call(app, "POST", "/debates", b'{"topic": ""}'))[0],
+            (await call(app, "POST", "/debates", b"{" + b" " * 70000))[0],
+            (await call(app, "GET", "/debates"))[0],
+            (await call(app, "GET", f"/debates/{'0' * 32}"))[0],
+            (await call(app, "GET", f"/debates/{'0' * 32}/events"))[0],
+            (await call(app, "GET", "/nowhere"))[0],
+        ]
+
+    assert run(app, scenario) == [400, 413, 405, 404, 404, 404]
+
+
+def test_full_queue_rejects_submissions():
+    app = service(concurrency=1, queue_size=1)
+
+    async def scenario():
+        # Submitted without yielding, so no worker has taken the job yet
+        app.engine.submit(DebateRequest(topic=TOPIC))
+        with pytest.raises(QueueFullError):
+            app.engine.submit(DebateRequest(topic=TOPIC))
+        status, headers, _ = await call(
+            app, "POST", "/debates", json.dumps({"topic": TOPIC}).encode()
+        )
+        _, _, health = await call(app, "GET", "/health")
+        return status, headers, json.loads(health)
+
+    status, headers, health = run(app, scenario)
+
+    assert status == 429
+    assert headers[b"retry-after"] == b"5"
+    assert health == {"status": "ok", "in_flight": 0, "queue_depth": 1, "queue_size": 1}
+
+
+def test_metrics_count_finished_debates():
+    app = service()
+
+    async def scenario():
+        for _ in range(2):
+            job = await submit(app, max_steps=1)
+            await finished(app, job["id"])
+        _, _, body = await call(app, "GET", "/metrics")
+        return json.loads(body)
+
+    metrics = run(app, scenario)
+
+    assert metrics["completed"] == 2
+    assert metrics["stored_results"] == 2
+    assert metrics["llm_calls"] == 6
@@ -0,0 +1,102 @@
+import threading
+import time
+from typing import Any
+
+import pytest
+from pydantic import PrivateAttr
+
+from src.graph.debate_graph import DebateGraph
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.tools.evidence_retrieval import EvidencePolicy, build_evidence_index
+from src.utils.stub_llm import StubChatModel
+from src.utils.tracing import InMemorySpanExporter, Tracer
+
+TOPIC = "Is AI beneficial for society?"
+DOCUMENTS = [
+    ("economy.md", "AI raises productivity and lowers costs for society. " * 10),
+    ("ethics.md", "AI can be unfair and harm society through biased decisions. " * 10),
+    ("energy.md", "Nuclear power produces little carbon and runs all day. " * 10),
+]
+# Seconds the topic prefetch and every LLM call take
+DELAY = 0.1
+
+
+class TimedStub(StubChatModel):
+    """Stub that records the (start, end) of every call."""
+
+    _calls: list = PrivateAttr(default_factory=list)
+    _calls_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def _generate(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = super()._generate(*args, **kwargs)
+        with self._calls_lock:
+            self._calls.append((start, time.perf_counter()))
+        return result
+
+    @property
+    def calls(self) -> list[tuple[float, float]]:
+        with self._calls_lock:
+            return sorted(self._calls)
+
+
+class SlowIndex:
+    """Index whose topic searches take DELAY and record their (start, end)."""
+
+    def __init__(self, index):
+        self.index = index
+        self.prefetches: list[tuple[float, float]] = []
+
+    def search(self, query, k=5, within=None):
+        if within is not None:
+            return self.index.search(query, k, within)
+        start = time.perf_counter()
+        time.sleep(DELAY)
+        hits = self.index.search(query, k)
+        self.prefetches.append((start, time.perf_counter()))
+        return hits
+
+
+@pytest.fixture(scope="module")
+def policy(tmp_path_factory) -> EvidencePolicy:
+    directory = str(tmp_path_factory.mktemp("evidence"))
+    build_evidence_index(DOCUMENTS, directory, passage_words=20)
+    return EvidencePolicy(index=directory, prefetch=4, per_turn=2)
+
+
+@pytest.mark.parametrize("graph_class", [DebateGraph, StrategicDebateGraph])
+def test_both_sides_cite_one_prefetched_pool(policy, graph_class):
+    graph = graph_class(llm=StubChatModel(), evidence=policy)
+
+    result = graph.run_debate(TOPIC, 2)
+
+    kinds = [(record["speaker"], record["kind"]) for record in result["retrievals"]]
+    assert kinds == [
+        ("Favor", "prefetch"),
+        ("Favor", "turn"),
+        ("Against", "turn"),
+        ("Favor", "turn"),
+        ("Against", "turn"),
+    ]
+    pool = {passage for passage, *_ in result["evidence"]}
+    assert all(
+        set(record["passages"]) <= pool and len(record["passages"]) <= 2
+        for record in result["retrievals"][1:]
+    )
+
+
+def test_prefetch_runs_while_the_strategy_is_formulated(policy):
+    llm = TimedStub(latency=DELAY)
+    exporter = InMemorySpanExporter()
+    graph = StrategicDebateGraph(llm=llm, evidence=policy, tracer=Tracer(exporter))
+    index = graph.evidence_retriever.index = SlowIndex(graph.evidence_retriever.index)
+
+    graph.run_debate(TOPIC, 1)
+
+    [(prefetch_start, prefetch_end)] = index.prefetches
+    # The first call of the debate formulates the favor strategy
+    strategy_start, strategy_end = llm.calls[0]
+    assert prefetch_start < strategy_end and strategy_start < prefetch_end
+    # The prefetch is still recorded on the node span of the turn
+    [favor_opening] = [span for span in exporter.spans if span.name == "favor_agent"]
+    assert favor_opening.attributes["evidence.prefetch"] == 4
@@ -0,0 +1,199 @@
+import threading
+import time
+
+import pytest
+
+from src.utils.load_balancer import (
+    EndpointConfig,
+    LoadBalancedChatModel,
+    LoadBalancerPolicy,
+    NoHealthyEndpointError,
+    create_balanced_llm,
+)
+from src.utils.stub_llm import StubChatModel, StubLLMError
+
+PROMPT = "Reply in at most 5 words."
+
+
+def balanced(*endpoints: StubChatModel, **policy) -> LoadBalancedChatModel:
+    return LoadBalancedChatModel(
+        endpoints=list(endpoints),
+        endpoint_names=[f"e{number}" for number in range(len(endpoints))],
+        policy=LoadBalancerPolicy(**policy),
+    )
+
+
+def endpoint_of(llm: LoadBalancedChatModel) -> str:
+    return llm.invoke(PROMPT).response_metadata["endpoint"]
+
+
+def states(llm: LoadBalancedChatModel) -> dict[str, str]:
+    return {stats["name"]: stats["state"] for stats in llm.stats()}
+
+
+def test_routes_to_least_outstanding():
+    llm = balanced(StubChatModel(), StubChatModel(), StubChatModel())
+    llm._stats[0].outstanding = 2
+    llm._stats[2].outstanding = 1
+
+    assert endpoint_of(llm) == "e1"
+    # The finished call is no longer outstanding
+    assert [stats["outstanding"] for stats in llm.stats()] == [2, 0, 1]
+
+
+def test_least_outstanding_is_per_unit_of_weight():
+    llm = LoadBalancedChatModel(
+        endpoints=[StubChatModel(), StubChatModel()],
+        endpoint_names=["small", "large"],
+        policy=LoadBalancerPolicy(
+            endpoints=[
+                EndpointConfig(name="small"),
+                EndpointConfig(name="large", weight=4),
+            ]
+        ),
+    )
+    llm._stats[0].outstanding = 1
+    llm._stats[1].outstanding = 3
+
+    assert endpoint_of(llm) == "large"
+
+
+def test_concurrent_calls_spread_over_the_pool():
+    llm = balanced(*(StubChatModel(latency=0.05) for _ in range(3)))
+    threads = [threading.Thread(target=llm.invoke, args=(PROMPT,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [stats["requests"] for stats in llm.stats()] == [2, 2, 2]
+
+
+def test_fails_over_to_a_healthy_endpoint():
+    llm = balanced(
+        StubChatModel(error_rate=1.0), StubChatModel(), failure_threshold=100
+    )
+
+    assert {endpoint_of(llm) for _ in range(20)} == {"e1"}
+    stats = llm.stats()
+    assert stats[0]["failures"] == stats[0]["requests"] > 0
+    assert stats[1]["failures"] == 0
+
+
+def test_failover_gives_up_after_max_failovers():
+    llm = balanced(
+        *(StubChatModel(error_rate=1.0) for _ in range(3)),
+        failure_threshold=100,
+        max_failovers=1,
+    )
+
+    with pytest.raises(StubLLMError):
+        llm.invoke(PROMPT)
+    assert sum(stats["requests"] for stats in llm.stats()) == 2
+
+
+def test_circuit_opens_and_half_open_probe_closes_it():
+    failing = StubChatModel(error_rate=1.0)
+    llm = balanced(failing, failure_threshold=2, cooldown=0.1, max_failovers=0)
+
+    for _ in range(2):
+        with pytest.raises(StubLLMError):
+            llm.invoke(PROMPT)
+    assert states(llm) == {"e0": "open"}
+    with pytest.raises(NoHealthyEndpointError):
+        llm.invoke(PROMPT)
+
+    time.sleep(0.1)
+    assert states(llm) == {"e0": "half_open"}
+    # A failed probe opens the circuit again at once
+    with pytest.raises(StubLLMError):
+        llm.invoke(PROMPT)
+    assert states(llm) == {"e0": "open"}
+    assert llm.stats()[0]["circuit_opens"] == 2
+
+    time.sleep(0.1)
+    failing.error_rate = 0.0
+    assert endpoint_of(llm) == "e0"
+    assert states(llm) == {"e0": "closed"}
+
+
+def test_half_open_endpoint_takes_a_single_probe():
+    llm = balanced(
+        StubChatModel(error_rate=1.0),
+        StubChatModel(),
+        failure_threshold=1,
+        cooldown=0.05,
+        max_failovers=0,
+    )
+    llm._stats[0].consecutive_failures = 1
+    llm._stats[0].opened_at = time.monotonic() - 0.05
+    llm._stats[0].probing = True
+
+    # While the probe is in flight, calls go elsewhere
+    assert {endpoint_of(llm) for _ in range(10)} == {"e1"}
+
+
+def test_health_check_probes_half_open_endpoints():
+    endpoint = StubChatModel(error_rate=1.0)
+    llm = balanced(endpoint, failure_threshold=1, cooldown=0.05, max_failovers=0)
+    with pytest.raises(StubLLMError):
+        llm.invoke(PROMPT)
+    time.sleep(0.05)
+
+    assert llm.check_health() == {"e0": "open"}
+    time.sleep(0.05)
+    endpoint.error_rate = 0.0
+    assert llm.check_health() == {"e0": "closed"}
+
+
+def test_max_outstanding_queues_calls():
+    llm = balanced(StubChatModel(latency=0.05), max_outstanding=1, queue_timeout=5)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=llm.invoke, args=(PROMPT,)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # The calls ran one after another, not together
+    assert time.perf_counter() - start >= 0.15
+    assert llm.stats()[0]["requests"] == 3
+
+
+def test_max_outstanding_queue_times_out():
+    llm = balanced(StubChatModel(latency=0.2), max_outstanding=1, queue_timeout=0.02)
+    first = threading.Thread(target=llm.invoke, args=(PROMPT,))
+    first.start()
+    time.sleep(0.05)
+
+    with pytest.raises(NoHealthyEndpointError):
+        llm.invoke(PROMPT)
+    first.join()
+
+
+def test_create_balanced_llm_sets_base_url_per_endpoint(monkeypatch):
+    monkeypatch.setenv("KEY_A", "a")
+    monkeypatch.setenv("KEY_B", "b")
+    policy = LoadBalancerPolicy(
+        endpoints=[
+            EndpointConfig(name="a", api_key_env="KEY_A", base_url="http://a.test"),
+            EndpointConfig(name="b", api_key_env="KEY_B"),
+        ]
+    )
+
+    llm = create_balanced_llm(policy, "gemini-1.5-flash", temperature=0.1)
+
+    assert [endpoint.base_url for endpoint in llm.endpoints] == ["http://a.test", None]
+    assert [endpoint.temperature for endpoint in llm.endpoints] == [0.1, 0.1]
+    assert llm.endpoint_names == ["a", "b"]
+
+
+def test_create_balanced_llm_requires_api_keys(monkeypatch):
+    monkeypatch.delenv("MISSING_KEY", raising=False)
+    policy = LoadBalancerPolicy(
+        endpoints=[EndpointConfig(name="a", api_key_env="MISSING_KEY")]
+    )
+
+    with pytest.raises(ValueError, match="MISSING_KEY"):
+        create_balanced_llm(policy, "gemini-1.5-flash")
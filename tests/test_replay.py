@@ -0,0 +1,95 @@
+import pytest
+
+from src.graph.debate_graph import DebateGraph
+from src.graph.panel_debate_graph import PanelDebateGraph, default_panel
+from src.graph.replay import ReplayEngine, stored_state
+from src.utils.instrumentation import Instrumentation
+from src.utils.stub_llm import StubChatModel
+
+TOPIC = "Is AI beneficial for society?"
+
+
+@pytest.fixture(scope="module")
+def stored_debate() -> dict:
+    result = DebateGraph(llm=StubChatModel()).run_debate(TOPIC, 2)
+    return {"topic": TOPIC, "messages": result["messages"]}
+
+
+def replay_engine(**options) -> tuple[ReplayEngine, Instrumentation]:
+    instrumentation = Instrumentation()
+    engine = ReplayEngine(
+        llm=StubChatModel(model_name="debater"),
+        instrumentation=instrumentation,
+        **options,
+    )
+    return engine, instrumentation
+
+
+def test_stored_state_splits_off_the_verdict(stored_debate):
+    state = stored_state(stored_debate)
+
+    assert state["stored_verdict"] == stored_debate["messages"][-1][1]
+    assert state["messages"] == stored_debate["messages"][:-1]
+    assert state["max_steps"] == 2
+
+
+@pytest.mark.parametrize("meta_analysis", [False, True])
+def test_judge_runs_on_the_judge_model(stored_debate, meta_analysis):
+    engine, instrumentation = replay_engine(judge_llm=StubChatModel(model_name="judge"))
+
+    result = engine.replay(stored_debate, meta_analysis=meta_analysis)
+
+    assert result["verdict"]
+    assert [record.model for record in instrumentation.records] == ["judge"] * (
+        1 + meta_analysis
+    )
+
+
+def test_rounds_run_on_the_debater_model(stored_debate):
+    engine, instrumentation = replay_engine(judge_llm=StubChatModel(model_name="judge"))
+
+    result = engine.replay(stored_debate, rounds=[2])
+
+    assert [speaker for speaker, _ in result["round_2"]] == ["Favor", "Against"]
+    assert [record.model for record in instrumentation.records] == [
+        "debater",
+        "debater",
+        "judge",
+    ]
+
+
+def test_judge_defaults_to_the_debater_model(stored_debate):
+    engine, instrumentation = replay_engine()
+
+    engine.replay(stored_debate)
+
+    assert [record.model for record in instrumentation.records] == ["debater"]
+
+
+def test_panel_debate_is_rejudged_on_the_judge_model():
+    result = PanelDebateGraph(llm=StubChatModel(), panel=default_panel(3)).run_debate(
+        TOPIC, 1
+    )
+    document = {
+        "topic": TOPIC,
+        "messages": result["messages"],
+        "participants": [name for name, _ in result["messages"][:3]],
+    }
+    engine, instrumentation = replay_engine(judge_llm=StubChatModel(model_name="judge"))
+
+    replayed = engine.replay(document)
+
+    assert replayed["verdict"]
+    assert [record.model for record in instrumentation.records] == ["judge"]
+
+
+def test_failed_replay_is_reported_in_order(stored_debate):
+    engine, _ = replay_engine()
+    # Without a transcript the debate has one round, so round 2 fails
+    documents = [stored_debate, {"topic": "No transcript"}, stored_debate]
+
+    results = list(engine.replay_all(documents, judge=False, rounds=[2]))
+
+    assert [result["topic"] for result in results] == [TOPIC, "No transcript", TOPIC]
+    assert "round_2" in results[0] and "round_2" in results[2]
+    assert results[1]["error"].startswith("ValueError: Round 2")
@@ -0,0 +1,90 @@
+import pytest
+
+from src.graph.evaluation import EvaluationHarness, config_grid
+from src.memory.response_cache import CachedChatModel, ResponseCache
+from src.models.debate_request import DebateVariant
+from src.utils.stub_llm import StubChatModel
+
+TOPICS = ["Is AI beneficial for society?", "Should cities ban cars?"]
+PROMPTS = ["Reply in 100 words.", "Reply in 5 words."]
+
+
+def cached(responses: ResponseCache, max_output_tokens: int) -> CachedChatModel:
+    return CachedChatModel(
+        llm=StubChatModel(max_output_tokens=max_output_tokens), responses=responses
+    )
+
+
+def stub_llm(config) -> StubChatModel:
+    return StubChatModel(
+        model_name=config.model_name, max_output_tokens=config.max_output_tokens
+    )
+
+
+def sweep(configs, responses: ResponseCache) -> dict:
+    harness = EvaluationHarness(
+        TOPICS,
+        StubChatModel(model_name="reference"),
+        create_llm=stub_llm,
+        responses=responses,
+    )
+    return {result.config: result for result in harness.run(configs)}
+
+
+@pytest.mark.parametrize("prompt", PROMPTS)
+def test_lower_limit_is_served_the_cut_reply(prompt):
+    responses = ResponseCache()
+    cached(responses, 1024).invoke(prompt)
+
+    reply = cached(responses, 20).invoke(prompt)
+
+    direct = StubChatModel(max_output_tokens=20).invoke(prompt)
+    assert responses.stats()["hits"] == 1
+    assert reply.content == direct.content
+    assert (
+        reply.usage_metadata["output_tokens"]
+        == (direct.usage_metadata["output_tokens"])
+    )
+    assert (
+        reply.response_metadata["finish_reason"]
+        == (direct.response_metadata["finish_reason"])
+    )
+
+
+def test_cut_reply_does_not_serve_a_higher_limit():
+    responses = ResponseCache()
+    cached(responses, 20).invoke(PROMPTS[0])
+
+    reply = cached(responses, 1024).invoke(PROMPTS[0])
+
+    assert responses.stats() == {"hits": 0, "misses": 2, "hit_ratio": 0.0}
+    assert reply.content == StubChatModel().invoke(PROMPTS[0]).content
+    # The full reply replaced the cut one and now serves both limits
+    cached(responses, 20).invoke(PROMPTS[0])
+    cached(responses, 1024).invoke(PROMPTS[0])
+    assert responses.stats()["hits"] == 2
+
+
+def test_sweep_shares_calls_across_output_limits_and_rounds():
+    configs = config_grid(
+        (DebateVariant.SIMPLE, DebateVariant.STRATEGIC),
+        steps=(2, 3),
+        max_output_tokens=(128, 1024),
+    )
+    responses = ResponseCache()
+
+    results = sweep(configs, responses)
+
+    assert responses.stats()["hit_ratio"] > 0.14
+    for config, result in results.items():
+        cached_calls = sum(debate.cached_calls for debate in result.debates)
+        if config.max_output_tokens == 128:
+            # At least the strategies, or the openings, come from the cache
+            assert cached_calls >= 2 * len(TOPICS), config.label
+    # Shared calls do not change what any configuration measures
+    for config, result in results.items():
+        alone = sweep([config], ResponseCache())[config]
+        assert [d.completion_tokens for d in result.debates] == [
+            d.completion_tokens for d in alone.debates
+        ]
+        assert result.quality == alone.quality
@@ -0,0 +1,118 @@
+from src.chains.debate_chains import DEFAULT_SYSTEM_PROMPTS
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.memory.strategy_store import StrategyStore, strategy_prompt_version
+from src.models.debate_state import AgentRole
+from src.utils.instrumentation import Instrumentation
+from src.utils.stub_llm import StubChatModel
+
+TOPIC = "Is AI beneficial for society?"
+KEY = ("stub", "favor", TOPIC, 3, "v1")
+
+
+def strategic_graph(
+    store: StrategyStore, model_name: str = "stub", **options
+) -> tuple[StrategicDebateGraph, Instrumentation]:
+    instrumentation = Instrumentation()
+    graph = StrategicDebateGraph(
+        llm=StubChatModel(model_name=model_name),
+        strategy_store=store,
+        instrumentation=instrumentation,
+        **options,
+    )
+    return graph, instrumentation
+
+
+def strategy_calls(instrumentation: Instrumentation) -> int:
+    return sum(record.phase == "strategy" for record in instrumentation.records)
+
+
+def test_topics_match_regardless_of_case_and_whitespace():
+    store = StrategyStore(":memory:")
+
+    store.put(*KEY, "Lead with productivity.")
+
+    assert store.get("stub", "favor", "  is AI  beneficial for SOCIETY? ", 3, "v1") == (
+        "Lead with productivity."
+    )
+    for index, other in enumerate(("other", "against", "Other topic?", 2, "v2")):
+        key = list(KEY)
+        key[index] = other
+        assert store.get(*key) is None
+
+
+def test_put_replaces_and_persists(tmp_path):
+    path = str(tmp_path / "strategies.sqlite")
+    store = StrategyStore(path)
+    store.put(*KEY, "First.")
+    store.put(*KEY, "Second.")
+    store.close()
+
+    reopened = StrategyStore(path)
+
+    assert len(reopened) == 1
+    assert reopened.get(*KEY) == "Second."
+
+
+def test_invalidate_keeps_the_given_prompt_versions():
+    store = StrategyStore(":memory:")
+    for version in ("v1", "v2", "v3"):
+        store.put(*KEY[:-1], version, f"Strategy {version}.")
+
+    assert store.invalidate(["v2", "v3"]) == 1
+    assert store.get(*KEY) is None
+    assert store.invalidate() == 2
+    assert len(store) == 0
+
+
+def test_prompt_version_follows_the_template_and_system_prompt():
+    version = strategy_prompt_version("You argue in favor.")
+
+    assert version == strategy_prompt_version("You argue in favor.")
+    assert version != strategy_prompt_version("You argue against.")
+    assert version != strategy_prompt_version("You argue in favor.", strategic=False)
+
+
+def test_second_debate_reuses_the_stored_strategies():
+    store = StrategyStore(":memory:")
+    graph, instrumentation = strategic_graph(store)
+
+    first = graph.run_debate(TOPIC, 2)
+    assert strategy_calls(instrumentation) == 2
+    assert len(store) == 2
+
+    second = graph.run_debate(TOPIC.upper(), 2)
+
+    assert strategy_calls(instrumentation) == 2
+    assert second["favor_strategy"] == first["favor_strategy"]
+    assert second["against_strategy"] == first["against_strategy"]
+
+
+def test_strategies_are_not_shared_across_models_or_rounds():
+    store = StrategyStore(":memory:")
+    graph, _ = strategic_graph(store)
+    graph.run_debate(TOPIC, 2)
+
+    other_model, instrumentation = strategic_graph(store, model_name="other")
+    other_model.run_debate(TOPIC, 2)
+    assert strategy_calls(instrumentation) == 2
+
+    graph, instrumentation = strategic_graph(store)
+    graph.run_debate(TOPIC, 3)
+    assert strategy_calls(instrumentation) == 2
+    assert len(store) == 6
+
+
+def test_precompute_generates_missing_strategies_only():
+    store = StrategyStore(":memory:")
+    graph, instrumentation = strategic_graph(store)
+    topics = [TOPIC, "Should college education be free?"]
+
+    assert graph.precompute_strategies(topics, max_steps=2) == 4
+    assert graph.precompute_strategies(topics, max_steps=2) == 0
+    assert strategy_calls(instrumentation) == 4
+
+    result = graph.run_debate(TOPIC, 2)
+
+    assert strategy_calls(instrumentation) == 4
+    version = strategy_prompt_version(DEFAULT_SYSTEM_PROMPTS[AgentRole.FAVOR])
+    assert result["favor_strategy"] == store.get("stub", "favor", TOPIC, 2, version)
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from src.graph.debate_profiles import create_graph
+from src.models.debate_request import DebateVariant
+from src.utils.call_policy import CallPolicy
+from src.utils.cancellation import CANCELLED, CancellationToken
+from src.utils.stub_llm import StubChatModel, StubLLMError
+from src.utils.tracing import InMemorySpanExporter, Span, Tracer
+
+TOPIC = "Is AI beneficial for society?"
+PANEL_SIZE = 3
+# Node spans and LLM calls of a two-round debate per variant
+NODES = {
+    DebateVariant.SIMPLE: {"favor_agent": 2, "against_agent": 2, "judge_agent": 1},
+    DebateVariant.STRATEGIC: {
+        "favor_agent": 2,
+        "against_agent": 2,
+        "judge_agent": 1,
+        "strategy_analysis": 1,
+    },
+    DebateVariant.PANEL: {"panelist_turn": 2 * PANEL_SIZE, "judge_agent": 1},
+}
+CALLS = {DebateVariant.SIMPLE: 5, DebateVariant.STRATEGIC: 8, DebateVariant.PANEL: 7}
+
+
+class CountingExporter(InMemorySpanExporter):
+    """In-memory exporter that also keeps every export as one batch."""
+
+    def __init__(self):
+        super().__init__()
+        self.exports: list[list[Span]] = []
+
+    def export(self, spans: list[Span]):
+        self.exports.append(list(spans))
+        super().export(spans)
+
+
+def traced_graph(variant: DebateVariant, llm=None, **options):
+    exporter = CountingExporter()
+    tracer = Tracer(exporter)
+    graph = create_graph(
+        variant, PANEL_SIZE, llm=llm or StubChatModel(), tracer=tracer, **options
+    )
+    return graph, tracer, exporter
+
+
+def by_id(spans: list[Span]) -> dict[str, Span]:
+    return {span.span_id: span for span in spans}
+
+
+@pytest.mark.parametrize("variant", list(DebateVariant))
+def test_span_tree_is_debate_node_llm_call(variant):
+    graph, _, exporter = traced_graph(variant)
+
+    graph.run_debate(TOPIC, 2)
+
+    spans = exporter.spans
+    spans_by_id = by_id(spans)
+    (root,) = [span for span in spans if span.parent_id is None]
+    assert root.name == "run_debate"
+    assert root.attributes["debate.graph"] == type(graph).__name__
+    assert {span.trace_id for span in spans} == {root.trace_id}
+    assert len(spans_by_id) == len(spans)
+
+    nodes = [span for span in spans if span.parent_id == root.span_id]
+    assert Counter(span.name for span in nodes) == NODES[variant]
+    calls = [span for span in spans if span.name == "llm_call"]
+    assert len(calls) == CALLS[variant]
+    for call in calls:
+        assert spans_by_id[call.parent_id] in nodes
+        assert call.attributes["gen_ai.request.model"] == "stub"
+        assert call.attributes["gen_ai.usage.output_tokens"] > 0
+    assert len(spans) == 1 + len(nodes) + len(calls)
+
+    for span in spans:
+        assert span.error is None
+        assert root.start_ns <= span.start_ns <= span.end_ns <= root.end_ns
+
+
+def test_parallel_panel_branches_keep_their_parents():
+    graph, _, exporter = traced_graph(DebateVariant.PANEL, StubChatModel(latency=0.05))
+
+    graph.run_debate(TOPIC, 2)
+
+    spans = exporter.spans
+    (root,) = [span for span in spans if span.parent_id is None]
+    turns = [span for span in spans if span.name == "panelist_turn"]
+    children = Counter(span.parent_id for span in spans if span.name == "llm_call")
+    for turn in turns:
+        assert turn.parent_id == root.span_id
+        assert children[turn.span_id] == 1
+
+    # The turns of a round overlap, so they ran on separate worker threads
+    for round_number in (1, 2):
+        round_turns = [
+            turn for turn in turns if turn.attributes["debate.round"] == round_number
+        ]
+        assert len(round_turns) == PANEL_SIZE
+        assert max(turn.start_ns for turn in round_turns) < min(
+            turn.end_ns for turn in round_turns
+        )
+
+
+def test_failing_call_is_recorded_on_its_spans():
+    graph, tracer, exporter = traced_graph(
+        DebateVariant.SIMPLE, StubChatModel(error_rate=1.0)
+    )
+
+    with pytest.raises(StubLLMError):
+        graph.run_debate(TOPIC, 2)
+
+    assert len(exporter.exports) == 1
+    errors = {span.name: span.error for span in exporter.spans}
+    assert set(errors) == {"run_debate", "favor_agent", "llm_call"}
+    assert all(error.startswith("StubLLMError") for error in errors.values())
+    assert tracer._traces == {}
+
+
+def test_retried_call_records_its_events():
+    graph, _, exporter = traced_graph(
+        DebateVariant.SIMPLE,
+        StubChatModel(error_rate=1.0),
+        call_policy=CallPolicy(max_retries=1, backoff_base=0.0, hedge=False),
+        fallback_llm=StubChatModel(),
+    )
+
+    graph.run_debate(TOPIC, 1)
+
+    calls = [span for span in exporter.spans if span.name == "llm_call"]
+    assert calls and all(span.error is None for span in calls)
+    assert all("fallback model" in span.attributes["debate.events"] for span in calls)
+
+
+def test_each_trace_is_exported_once():
+    graph, tracer, exporter = traced_graph(DebateVariant.PANEL)
+
+    graph.run_debate(TOPIC, 2)
+    graph.run_debate(TOPIC, 1)
+
+    assert len(exporter.exports) == 2
+    for spans in exporter.exports:
+        assert len({span.trace_id for span in spans}) == 1
+        assert [span.name for span in spans].count("run_debate") == 1
+        # A parent finishes after its children, so it is exported after them
+        assert spans[-1].name == "run_debate"
+    assert len(by_id(exporter.spans)) == len(exporter.spans)
+    assert tracer._traces == {}
+
+
+def test_cancelled_trace_is_exported_once():
+    graph, tracer, exporter = traced_graph(
+        DebateVariant.PANEL, StubChatModel(latency=0.05)
+    )
+    token = CancellationToken()
+    threading.Timer(0.07, token.cancel).start()
+
+    result = graph.run_debate(TOPIC, 3, token)
+    # Let the abandoned calls finish
+    time.sleep(0.1)
+
+    assert result["cancelled"] == CANCELLED
+    assert len(exporter.exports) == 1
+    (root,) = [span for span in exporter.spans if span.parent_id is None]
+    assert root.error is None
+    stopped = [span for span in exporter.spans if span.error]
+    assert stopped
+    assert all(span.error.startswith("DebateCancelledError") for span in stopped)
+    assert tracer._traces == {}
@@ -0,0 +1,164 @@
+import gc
+import os
+import threading
+
+import pytest
+from pydantic import PrivateAttr
+
+from src.graph.debate_graph import DebateGraph
+from src.graph.strategic_debate_graph import StrategicDebateGraph
+from src.memory.agent_memory import AgentMemory
+from src.memory.transcript_log import (
+    TranscriptLog,
+    TranscriptSpill,
+    TranscriptView,
+    finish_transcript,
+)
+from src.utils.cancellation import CancellationToken
+from src.utils.stub_llm import StubChatModel, StubLLMError
+
+TOPIC = "Is AI beneficial for society?"
+STEPS = 6
+
+
+class FailingStub(StubChatModel):
+    """Stub whose calls fail from the `fail_at`-th on."""
+
+    fail_at: int = 10
+    _calls: int = PrivateAttr(default=0)
+
+    def _generate(self, *args, **kwargs):
+        self._calls += 1
+        if self._calls >= self.fail_at:
+            raise StubLLMError("provider error")
+        return super()._generate(*args, **kwargs)
+
+
+def spill(tmp_path, **options) -> TranscriptSpill:
+    return TranscriptSpill(directory=str(tmp_path), recent_turns=2, **options)
+
+
+def logs(tmp_path) -> list[str]:
+    return os.listdir(tmp_path)
+
+
+@pytest.mark.parametrize("graph_class", [DebateGraph, StrategicDebateGraph])
+def test_spilled_run_returns_the_full_transcript(tmp_path, graph_class):
+    graph = graph_class(llm=StubChatModel(), spill=spill(tmp_path))
+    streamed = list(graph.stream_debate(TOPIC, STEPS))
+
+    result = graph.run_debate(TOPIC, STEPS)
+
+    assert result["spilled_turns"] > 0
+    assert len(result["messages"]) < len(streamed)
+    # Every turn, as produced, whether it was spilled or not, read lazily
+    with result["transcript"] as transcript:
+        assert isinstance(transcript, TranscriptView)
+        assert list(transcript) == streamed
+        assert len(logs(tmp_path)) == 1
+    # The view owns the log and deletes it when it is closed
+    assert logs(tmp_path) == []
+    with pytest.raises(ValueError, match="closed"):
+        transcript[0]
+
+
+def test_collected_view_deletes_its_log(tmp_path):
+    result = DebateGraph(llm=StubChatModel(), spill=spill(tmp_path)).run_debate(
+        TOPIC, STEPS
+    )
+    assert result["transcript"][0][0] == "Favor"
+    assert len(logs(tmp_path)) == 1
+
+    del result
+    gc.collect()
+    assert logs(tmp_path) == []
+
+
+def test_memory_remembers_spilled_turns(tmp_path):
+    memory = AgentMemory(":memory:")
+
+    result = DebateGraph(
+        llm=StubChatModel(), spill=spill(tmp_path), memory=memory
+    ).run_debate(TOPIC, STEPS)
+
+    assert result["spilled_turns"] > 0
+    # One note per debater turn, spilled or not, plus any judge feedback
+    assert len(memory) >= 2 * STEPS
+
+
+def test_kept_log_can_be_read_with_a_view(tmp_path):
+    result = DebateGraph(
+        llm=StubChatModel(), spill=spill(tmp_path, keep=True)
+    ).run_debate(TOPIC, STEPS)
+
+    assert logs(tmp_path) == [os.path.basename(result["transcript_path"])]
+    with TranscriptView(
+        result["transcript_path"], result["messages"], result["spilled_turns"]
+    ) as view:
+        assert list(view) == list(result["transcript"])
+        assert view._maps
+    assert view._maps == []
+    result["transcript"].close()
+    assert len(logs(tmp_path)) == 1
+
+
+def test_failed_run_deletes_its_log(tmp_path):
+    graph = DebateGraph(llm=FailingStub(fail_at=8), spill=spill(tmp_path))
+
+    with pytest.raises(StubLLMError):
+        graph.run_debate(TOPIC, STEPS)
+    assert logs(tmp_path) == []
+
+
+def test_cancelled_run_deletes_its_log(tmp_path):
+    token = CancellationToken()
+    graph = DebateGraph(llm=StubChatModel(latency=0.02), spill=spill(tmp_path))
+    # About seven of the thirteen calls, after the first spill
+    threading.Timer(0.15, token.cancel).start()
+
+    result = graph.run_debate(TOPIC, STEPS, token)
+
+    assert result["cancelled"]
+    assert result["spilled_turns"] > 0
+    with result["transcript"] as transcript:
+        assert len(transcript) == result["spilled_turns"] + len(result["messages"])
+        assert transcript[0][0] == "Favor"
+    assert logs(tmp_path) == []
+
+
+def test_streamed_run_deletes_its_log(tmp_path):
+    graph = DebateGraph(llm=StubChatModel(), spill=spill(tmp_path))
+
+    assert len(list(graph.stream_debate(TOPIC, STEPS))) == 2 * STEPS + 1
+    assert logs(tmp_path) == []
+
+
+def test_abandoned_stream_deletes_its_log(tmp_path):
+    graph = DebateGraph(llm=StubChatModel(), spill=spill(tmp_path))
+    stream = graph.stream_debate(TOPIC, STEPS)
+    for _ in range(6):
+        next(stream)
+    assert len(logs(tmp_path)) == 1
+
+    stream.close()
+    assert logs(tmp_path) == []
+
+
+def test_finish_transcript_without_spilled_turns():
+    state = {"messages": [("Favor", "a"), ("Against", "b")]}
+
+    assert list(finish_transcript(state, None)) == state["messages"]
+
+
+def test_view_reads_log_and_recent_turns(tmp_path):
+    path = str(tmp_path / "debate.log")
+    spilled = [("Favor", "first"), ("Against", "second ✓")]
+    TranscriptLog(path).extend(spilled)
+
+    with TranscriptView(path, [("Judge", "verdict")], len(spilled)) as view:
+        assert len(view) == 3
+        assert view[1] == ("Against", "second ✓")
+        assert view[-1] == ("Judge", "verdict")
+        assert view[:2] == spilled
+        with pytest.raises(IndexError):
+            view[3]